@@ -0,0 +1,291 @@
+"""
+Adaptive Monte Carlo for F1 Racing Simulator.
+Implements AdaptiveMonteCarlo, which estimates the win rate of several
+matchups on BatchRaceSimulator by streaming chunks of games, keeping a Wilson
+score interval per matchup and stopping each one as soon as its interval is
+narrower than a requested tolerance.
+
+Chunks run across a process pool. Whenever a worker frees up it is handed the
+undecided matchup with the widest interval, so compute flows to the matchups
+that are still uncertain instead of being spent on a fixed game count.
+
+Chunk k of a matchup always plays seeds k*chunk_size onwards, so with one
+worker a run is fully reproducible. With several workers the stopping point
+depends on which chunks finish first. Checking the interval after every chunk
+makes its true coverage slightly lower than the nominal confidence.
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from statistics import NormalDist
+from typing import Dict, List, NamedTuple, Optional, Tuple, Type
+
+import numpy as np
+
+from batch_simulator import BatchRaceSimulator
+from drivers import Driver, Mostafa, Verstappen
+from game_state import DRAW
+from policies import POLICIES
+
+
+def wilson_interval(successes: int, trials: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion.
+
+    Args:
+        successes: Number of successes
+        trials: Number of trials
+        z: Standard normal quantile of the two-sided confidence level
+
+    Returns:
+        Tuple of (lower, upper) bounds, (0.0, 1.0) when there are no trials
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    z2 = z * z
+    center = (p + z2 / (2 * trials)) / (1 + z2 / trials)
+    spread = (z * math.sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials))) / (
+        1 + z2 / trials
+    )
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+
+class Matchup(NamedTuple):
+    """Two batch policies racing in fixed seats."""
+
+    first: str  # Policy name for seat 0, which moves first
+    second: str  # Policy name for seat 1
+    driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa)
+
+    @property
+    def name(self) -> str:
+        """Label such as "greedy vs random"."""
+        return f"{self.first} vs {self.second}"
+
+
+class WinRateStats:
+    """Running win/draw/loss counts of one matchup with its Wilson interval."""
+
+    def __init__(self, z: float):
+        """Start with no games.
+
+        Args:
+            z: Standard normal quantile of the confidence level
+        """
+        self.z = z
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.chunks_started = 0
+
+    @property
+    def games(self) -> int:
+        """Games played so far."""
+        return self.wins + self.draws + self.losses
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of games won by the first seat."""
+        return self.wins / self.games if self.games else 0.0
+
+    def interval(self) -> Tuple[float, float]:
+        """Wilson interval of the first seat's win rate."""
+        return wilson_interval(self.wins, self.games, self.z)
+
+    def width(self) -> float:
+        """Width of the current interval."""
+        low, high = self.interval()
+        return high - low
+
+    def add(self, wins: int, draws: int, losses: int) -> None:
+        """Fold in the outcome of a chunk of games."""
+        self.wins += wins
+        self.draws += draws
+        self.losses += losses
+
+
+class Estimate(NamedTuple):
+    """Final win-rate estimate of one matchup."""
+
+    name: str
+    games: int
+    wins: int
+    draws: int
+    losses: int
+    win_rate: float
+    low: float
+    high: float
+    converged: bool  # False if max_games ran out first
+
+
+def _play_chunk(matchup: Matchup, first_seed: int, games: int) -> Tuple[int, int, int]:
+    """Play one chunk of a matchup; runs in a worker process.
+
+    Args:
+        matchup: Policies and drivers to race
+        first_seed: Seed of the chunk's first game
+        games: Number of games in the chunk
+
+    Returns:
+        Tuple of (first seat wins, draws, second seat wins)
+    """
+    batch = BatchRaceSimulator(
+        games,
+        (POLICIES[matchup.first](), POLICIES[matchup.second]()),
+        seeds=np.arange(first_seed, first_seed + games),
+        driver_classes=matchup.driver_classes,
+    )
+    batch.run()
+    wins = int(np.count_nonzero(batch.winner == 0))
+    draws = int(np.count_nonzero(batch.winner == DRAW))
+    return wins, draws, games - wins - draws
+
+
+class AdaptiveMonteCarlo:
+    """Streams games per matchup until each win rate is pinned down."""
+
+    def __init__(
+        self,
+        tolerance: float = 0.01,
+        confidence: float = 0.95,
+        chunk_size: int = 4_000,
+        max_games: int = 1_000_000,
+        workers: Optional[int] = None,
+    ):
+        """Configure the stopping rule and the pool.
+
+        Args:
+            tolerance: Stop a matchup once its interval is at most this wide
+            confidence: Two-sided confidence level of the Wilson intervals
+            chunk_size: Games per task handed to a worker
+            max_games: Games after which a matchup stops regardless
+            workers: Worker processes (defaults to the CPU count; 1 plays
+                every chunk in this process)
+        """
+        self.tolerance = tolerance
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.chunk_size = chunk_size
+        self.max_games = max_games
+        self.workers = workers
+
+    def _undecided(self, stats: WinRateStats) -> bool:
+        """Whether a matchup still needs more chunks started."""
+        started = stats.chunks_started * self.chunk_size
+        return started < self.max_games and stats.width() > self.tolerance
+
+    def _next_task(
+        self, matchups: List[Matchup], stats: Dict[Matchup, WinRateStats]
+    ) -> Optional[Tuple[Matchup, int, int]]:
+        """The widest undecided matchup's next chunk, or None when all are done."""
+        open_matchups = [m for m in matchups if self._undecided(stats[m])]
+        if not open_matchups:
+            return None
+        matchup = max(
+            open_matchups,
+            key=lambda m: (stats[m].width(), -stats[m].chunks_started),
+        )
+        entry = stats[matchup]
+        first_seed = entry.chunks_started * self.chunk_size
+        games = min(self.chunk_size, self.max_games - first_seed)
+        entry.chunks_started += 1
+        return matchup, first_seed, games
+
+    def run(self, matchups: List[Matchup]) -> List[Estimate]:
+        """Estimate every matchup's first-seat win rate.
+
+        Args:
+            matchups: Matchups to estimate
+
+        Returns:
+            One Estimate per matchup, in the same order
+        """
+        stats = {matchup: WinRateStats(self.z) for matchup in matchups}
+        if self.workers == 1:
+            while True:
+                task = self._next_task(matchups, stats)
+                if task is None:
+                    break
+                stats[task[0]].add(*_play_chunk(*task))
+        else:
+            workers = self.workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(workers) as pool:
+                in_flight = {}
+                while True:
+                    # Keep every worker busy on an undecided matchup.
+                    while len(in_flight) < workers:
+                        task = self._next_task(matchups, stats)
+                        if task is None:
+                            break
+                        in_flight[pool.submit(_play_chunk, *task)] = task[0]
+                    if not in_flight:
+                        break
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stats[in_flight.pop(future)].add(*future.result())
+
+        estimates = []
+        for matchup in matchups:
+            entry = stats[matchup]
+            low, high = entry.interval()
+            estimates.append(
+                Estimate(
+                    matchup.name,
+                    entry.games,
+                    entry.wins,
+                    entry.draws,
+                    entry.losses,
+                    entry.win_rate,
+                    low,
+                    high,
+                    high - low <= self.tolerance,
+                )
+            )
+        return estimates
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Estimate every pairing of the batch policies adaptively.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Adaptive Monte Carlo win rates")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.01, help="target interval width"
+    )
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--chunk", type=int, default=4_000, help="games per task")
+    parser.add_argument(
+        "--max-games", type=int, default=1_000_000, help="cap per matchup"
+    )
+    parser.add_argument("--workers", type=int, help="worker processes")
+    args = parser.parse_args(argv)
+
+    matchups = [Matchup(first, second) for first in POLICIES for second in POLICIES]
+    runner = AdaptiveMonteCarlo(
+        args.tolerance, args.confidence, args.chunk, args.max_games, args.workers
+    )
+    start = time.perf_counter()
+    estimates = runner.run(matchups)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'matchup':<28}{'games':>10}{'win rate':>10}  interval")
+    for estimate in estimates:
+        flag = "" if estimate.converged else "  (max games reached)"
+        print(
+            f"{estimate.name:<28}{estimate.games:>10,}{estimate.win_rate:>10.1%}"
+            f"  [{estimate.low:.3f}, {estimate.high:.3f}]{flag}"
+        )
+    total = sum(estimate.games for estimate in estimates)
+    fixed = args.max_games * len(matchups)
+    print(
+        f"{total:,} games in {elapsed:.1f}s "
+        f"({total / fixed:.1%} of a fixed {args.max_games:,} per matchup)"
+    )
+
+
+if __name__ == "__main__":
+    main()
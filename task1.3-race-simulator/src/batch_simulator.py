@@ -0,0 +1,504 @@
+"""
+Vectorized lockstep batch engine for F1 Racing Simulator.
+Implements BatchRaceSimulator, which plays N independent races at once with
+every rule of RaceSimulator.execute_turn expressed as masked NumPy operations.
+
+Policies without vectorized batch hooks (such as MCTSPolicy and TablePolicy)
+still play: their games are mirrored onto scalar RaceSimulators, one per game,
+and the policy decides one game at a time.
+"""
+
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from drivers import Driver, Mostafa, Verstappen
+from event_log import GameLog, TurnEvent
+from game_state import (
+    DRAW,
+    FUEL_PENALTY_DAMAGE,
+    FUEL_TIEBREAK_MARGIN,
+    GameState,
+    RaceRules,
+    REASON_EQUAL as _EQUAL,
+    REASON_FUEL as _FUEL,
+    REASON_TIRE as _TIRE,
+    REASON_TIRE_FAILURE as _TIRE_FAILURE,
+    REASON_UNFINISHED as _UNFINISHED,
+    TIRE_TIEBREAK_MARGIN,
+)
+from policies import POLICIES, Policy
+from race_simulator import RaceSimulator, Snapshot
+from renderers import NullRenderer
+
+UNLIMITED = -1
+
+REASONS = [_TIRE_FAILURE, _FUEL, _TIRE, _EQUAL, _UNFINISHED]
+REASON_TIRE_FAILURE = 0
+REASON_FUEL = 1
+REASON_TIRE = 2
+REASON_EQUAL = 3
+
+
+def _pad(rows: List[List[float]], fill: float, dtype) -> np.ndarray:
+    """Stack ragged per-driver rows into a rectangular array."""
+    width = max(len(row) for row in rows)
+    return np.array([row + [fill] * (width - len(row)) for row in rows], dtype=dtype)
+
+
+class MoveTable:
+    """Per-driver move attributes laid out as (driver, move) arrays."""
+
+    def __init__(self, drivers: Sequence[Driver]):
+        """Build the tables from freshly constructed drivers.
+
+        Args:
+            drivers: Driver instances in seat order
+        """
+        self.names = [driver.name for driver in drivers]
+        offensive = [driver.get_offensive_moves() for driver in drivers]
+        defensive = [driver.get_defensive_moves() for driver in drivers]
+
+        self.off_valid = _pad([[True] * len(m) for m in offensive], False, bool)
+        self.off_cost = _pad(
+            [[m.fuel_cost for m in ms] for ms in offensive], 0, np.int64
+        )
+        self.off_damage = _pad(
+            [[m.tire_damage for m in ms] for ms in offensive], 0, np.int64
+        )
+        self.off_uses = _pad(
+            [[_uses(m.uses_remaining) for m in ms] for ms in offensive], 0, np.int64
+        )
+
+        self.def_valid = _pad([[True] * len(m) for m in defensive], False, bool)
+        self.def_cost = _pad(
+            [[m.fuel_cost for m in ms] for ms in defensive], 0, np.int64
+        )
+        self.def_reduction = _pad(
+            [[m.damage_reduction_percent for m in ms] for ms in defensive],
+            0.0,
+            np.float64,
+        )
+        self.def_uses = _pad(
+            [[_uses(m.uses_remaining) for m in ms] for ms in defensive], 0, np.int64
+        )
+
+
+def _uses(uses_remaining: Optional[int]) -> int:
+    """Encode a move's remaining uses, with UNLIMITED standing in for None."""
+    return UNLIMITED if uses_remaining is None else uses_remaining
+
+
+def _check_policies(
+    policies: Sequence[Policy], driver_classes: Tuple[Type[Driver], Type[Driver]]
+) -> None:
+    """Reject policies a batch cannot play, before any game starts.
+
+    Raises:
+        TypeError: If a seat's policy is not a Policy
+        ValueError: If there are not two policies, or a policy that models the
+            rules (through a rules attribute) was built for other drivers
+    """
+    if len(policies) != 2:
+        raise ValueError(f"Expected a policy per seat, got {len(policies)}")
+    fingerprint = None
+    for seat, policy in enumerate(policies):
+        if not isinstance(policy, Policy):
+            raise TypeError(f"Seat {seat}: {policy!r} is not a Policy")
+        rules = getattr(policy, "rules", None)
+        if isinstance(rules, RaceRules):
+            fingerprint = fingerprint or RaceRules(driver_classes).fingerprint
+            if rules.fingerprint != fingerprint:
+                raise ValueError(
+                    f"Seat {seat}: the {policy.name} policy was built for other "
+                    "drivers; pass it the batch's driver_classes"
+                )
+
+
+class BatchRaceSimulator:
+    """Lockstep engine holding N two-driver races as arrays."""
+
+    def __init__(
+        self,
+        n_games: int,
+        policies: Tuple[Policy, Policy],
+        seeds: Optional[np.ndarray] = None,
+        driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa),
+        record_events: bool = False,
+    ):
+        """Initialize N races at their starting position.
+
+        Args:
+            n_games: Number of concurrent races
+            policies: Policy for each seat, in driver_classes order
+            seeds: Per-game seeds (defaults to 0..n_games-1)
+            driver_classes: Driver classes for seat 0 and seat 1
+            record_events: Keep per-turn events for game_logs()
+
+        Raises:
+            TypeError: If a seat's policy is not a Policy
+            ValueError: If there are not two policies, or a policy models
+                other drivers than driver_classes
+        """
+        _check_policies(policies, driver_classes)
+        drivers = [cls() for cls in driver_classes]
+        self.table = MoveTable(drivers)
+        self.policies = policies
+        self.driver_classes = driver_classes
+        # Scalar mirrors of games, for policies without vectorized hooks
+        self._mirrors: Dict[int, RaceSimulator] = {}
+        t = self.table
+        self._limited = (
+            t.off_valid & (t.off_uses != UNLIMITED),
+            t.def_valid & (t.def_uses != UNLIMITED),
+        )
+        self.n_games = n_games
+        self.seeds = (
+            np.arange(n_games, dtype=np.uint64)
+            if seeds is None
+            else np.asarray(seeds, dtype=np.uint64)
+        )
+
+        self.tire = np.array(
+            [[d.tire_health for d in drivers]] * n_games, dtype=np.int64
+        )
+        self.fuel = np.array([[d.fuel for d in drivers]] * n_games, dtype=np.int64)
+        self.off_uses = np.repeat(self.table.off_uses[None], n_games, axis=0)
+        self.def_uses = np.repeat(self.table.def_uses[None], n_games, axis=0)
+        self.current = np.zeros(n_games, dtype=np.int64)
+        self.turn = np.ones(n_games, dtype=np.int64)
+        self.active = np.ones(n_games, dtype=bool)
+        self.winner = np.full(n_games, DRAW, dtype=np.int64)
+        self.reason = np.full(n_games, len(REASONS) - 1, dtype=np.int64)
+        # Per step: (games, turn, actor, offensive, defensive, damage, fuel
+        # spent, defense fuel spent); offensive and defensive are -1 if unused.
+        self._events: Optional[List[Tuple[np.ndarray, ...]]] = (
+            [] if record_events else None
+        )
+
+    def _legal_offensive(self, games: np.ndarray, seat: np.ndarray) -> np.ndarray:
+        """Mask of offensive moves each seat can use (Move.can_use)."""
+        t = self.table
+        has_fuel = t.off_cost[seat] <= self.fuel[games, seat][:, None]
+        has_uses = self.off_uses[games, seat] != 0
+        return t.off_valid[seat] & has_fuel & has_uses
+
+    def _legal_defensive(self, games: np.ndarray, seat: np.ndarray) -> np.ndarray:
+        """Mask of defensive moves each seat can use (Move.can_use)."""
+        t = self.table
+        has_fuel = t.def_cost[seat] <= self.fuel[games, seat][:, None]
+        has_uses = self.def_uses[games, seat] != 0
+        return t.def_valid[seat] & has_fuel & has_uses
+
+    def _resolve_by_resources(self, games: np.ndarray) -> None:
+        """Vectorized RaceSimulator._determine_winner_by_resources."""
+        fuel = self.fuel[games]
+        tire = self.tire[games]
+        fuel_gap = fuel[:, 0] - fuel[:, 1]
+        tire_gap = tire[:, 0] - tire[:, 1]
+
+        by_fuel = np.abs(fuel_gap) >= FUEL_TIEBREAK_MARGIN
+        by_tire = ~by_fuel & (np.abs(tire_gap) >= TIRE_TIEBREAK_MARGIN)
+
+        winner = np.full(len(games), DRAW, dtype=np.int64)
+        winner[by_fuel] = np.where(fuel_gap[by_fuel] > 0, 0, 1)
+        winner[by_tire] = np.where(tire_gap[by_tire] > 0, 0, 1)
+        reason = np.select([by_fuel, by_tire], [REASON_FUEL, REASON_TIRE], REASON_EQUAL)
+
+        self.winner[games] = winner
+        self.reason[games] = reason
+        self.active[games] = False
+
+    def _eliminate(self, games: np.ndarray, loser: np.ndarray) -> None:
+        """Finish games whose `loser` seat has no tire health left."""
+        self.winner[games] = 1 - loser
+        self.reason[games] = REASON_TIRE_FAILURE
+        self.active[games] = False
+
+    def step(self) -> int:
+        """Advance every unfinished race by one turn.
+
+        Returns:
+            Number of races still running after the step
+        """
+        games = np.flatnonzero(self.active)
+        if games.size == 0:
+            return 0
+
+        cur = self.current[games]
+        opp = 1 - cur
+        legal_cur = self._legal_offensive(games, cur)
+        can_cur = legal_cur.any(axis=1)
+        can_opp = self._legal_offensive(games, opp).any(axis=1)
+
+        # Both drivers stranded: decide on remaining resources.
+        self._resolve_by_resources(games[~can_cur & ~can_opp])
+
+        # Only the current driver stranded: fuel-exhaustion penalty, skip turn.
+        stranded = ~can_cur & can_opp
+        s_games, s_cur = games[stranded], cur[stranded]
+        before = self.tire[s_games, s_cur]
+        self.tire[s_games, s_cur] = np.maximum(0, before - FUEL_PENALTY_DAMAGE)
+        if self._events is not None and s_games.size:
+            none = np.full(s_games.size, -1, dtype=np.int64)
+            zero = np.zeros(s_games.size, dtype=np.int64)
+            lost = before - self.tire[s_games, s_cur]
+            self._events.append(
+                (s_games, self.turn[s_games], s_cur, none, none, lost, zero, zero)
+            )
+        dead = self.tire[s_games, s_cur] == 0
+        self._eliminate(s_games[dead], s_cur[dead])
+
+        # Regular turn: offensive move plus optional defensive response.
+        self._attack(games[can_cur], cur[can_cur], legal_cur[can_cur])
+
+        running = games[self.active[games]]
+        self.current[running] = 1 - self.current[running]
+        self.turn[running] += 1
+        return int(self.active.sum())
+
+    def _attack(self, games: np.ndarray, cur: np.ndarray, legal: np.ndarray) -> None:
+        """Resolve one offensive move and defensive response per game."""
+        if games.size == 0:
+            return
+        t = self.table
+        opp = 1 - cur
+        seeds = self.seeds[games]
+        turns = self.turn[games]
+
+        off = self._choose_offensive(games, cur, legal, seeds, turns)
+        self.fuel[games, cur] -= t.off_cost[cur, off]
+        limited = self.off_uses[games, cur, off] > 0
+        self.off_uses[games[limited], cur[limited], off[limited]] -= 1
+        base = t.off_damage[cur, off]
+
+        def_legal = self._legal_defensive(games, opp)
+        dfn = self._choose_defensive(games, opp, off, def_legal, base, seeds, turns)
+        defended = dfn >= 0
+        dfn_idx = np.where(defended, dfn, 0)
+        cost = np.where(defended, t.def_cost[opp, dfn_idx], 0)
+        self.fuel[games, opp] -= cost
+        limited = defended & (self.def_uses[games, opp, dfn_idx] > 0)
+        self.def_uses[games[limited], opp[limited], dfn_idx[limited]] -= 1
+
+        reduction = np.where(defended, t.def_reduction[opp, dfn_idx], 0.0)
+        final = np.where(defended, (base * (1 - reduction)).astype(np.int64), base)
+        before = self.tire[games, opp]
+        self.tire[games, opp] = np.maximum(0, before - final)
+        if self._events is not None:
+            self._events.append(
+                (
+                    games,
+                    turns,
+                    cur,
+                    off,
+                    dfn,
+                    before - self.tire[games, opp],
+                    t.off_cost[cur, off],
+                    cost,
+                )
+            )
+
+        dead = self.tire[games, opp] == 0
+        self._eliminate(games[dead], opp[dead])
+
+    def _mirror(self, games: np.ndarray) -> List[RaceSimulator]:
+        """Scalar RaceSimulators set to the current position of each game."""
+        mirrors = []
+        for game in games.tolist():
+            mirror = self._mirrors.get(game)
+            if mirror is None:
+                mirror = self._mirrors[game] = RaceSimulator(
+                    seed=int(self.seeds[game]),
+                    driver_classes=self.driver_classes,
+                    renderer=NullRenderer(),
+                )
+            uses = tuple(
+                int(use)
+                for seat in (0, 1)
+                for uses, limited in zip((self.off_uses, self.def_uses), self._limited)
+                for use in uses[game, seat][limited[seat]]
+            )
+            state = GameState(
+                int(self.current[game]),
+                (int(self.tire[game, 0]), int(self.tire[game, 1])),
+                (int(self.fuel[game, 0]), int(self.fuel[game, 1])),
+                uses,
+            )
+            mirror.restore(Snapshot(state, int(self.turn[game]), None, None))
+            mirrors.append(mirror)
+        return mirrors
+
+    def _choose_offensive(self, games, cur, legal, seeds, turns):
+        """Dispatch offensive choices to each seat's policy."""
+        t = self.table
+        choice = np.zeros(games.size, dtype=np.int64)
+        for seat, policy in enumerate(self.policies):
+            mask = cur == seat
+            if mask.any():
+                extra = {}
+                if not policy.has_batch_hook("choose_offensive_batch"):
+                    extra["simulators"] = self._mirror(games[mask])
+                choice[mask] = policy.choose_offensive_batch(
+                    legal[mask],
+                    t.off_damage[cur[mask]],
+                    t.off_cost[cur[mask]],
+                    seeds[mask],
+                    turns[mask],
+                    **extra,
+                )
+        return choice
+
+    def _choose_defensive(self, games, opp, off, legal, base, seeds, turns):
+        """Dispatch defensive choices to each seat's policy.
+
+        Mirrors handed to scalar policies also record the offensive move being
+        answered, as RaceSimulator does before asking for a defense.
+        """
+        t = self.table
+        choice = np.full(games.size, -1, dtype=np.int64)
+        for seat, policy in enumerate(self.policies):
+            mask = (opp == seat) & legal.any(axis=1)
+            if mask.any():
+                extra = {}
+                if not policy.has_batch_hook("choose_defensive_batch"):
+                    mirrors = self._mirror(games[mask])
+                    for mirror, move in zip(mirrors, off[mask].tolist()):
+                        moves = mirror.current_driver.get_offensive_moves()
+                        mirror.last_offensive_move = moves[move]
+                    extra["simulators"] = mirrors
+                choice[mask] = policy.choose_defensive_batch(
+                    legal[mask],
+                    t.def_reduction[opp[mask]],
+                    t.def_cost[opp[mask]],
+                    base[mask],
+                    seeds[mask],
+                    turns[mask],
+                    **extra,
+                )
+        return choice
+
+    def run(self) -> None:
+        """Step until every race is decided."""
+        while self.step():
+            pass
+
+    def game_logs(self) -> Iterator[GameLog]:
+        """Recorded races, in game order, for event_log.EventLogWriter.
+
+        Yields:
+            GameLog per game
+
+        Raises:
+            ValueError: If the simulator was created without record_events
+        """
+        if self._events is None:
+            raise ValueError("Create the simulator with record_events=True")
+        if self._events:
+            columns = [np.concatenate(column) for column in zip(*self._events)]
+        else:
+            columns = [np.zeros(0, dtype=np.int64)] * 8
+        order = np.lexsort((columns[1], columns[0]))
+        games, _, actor, off, dfn, damage, fuel, defense_fuel = (
+            column[order].tolist() for column in columns
+        )
+        bounds = np.searchsorted(columns[0][order], np.arange(self.n_games + 1))
+
+        for game in range(self.n_games):
+            turns = tuple(
+                TurnEvent(
+                    actor[i],
+                    None if off[i] < 0 else off[i],
+                    None if dfn[i] < 0 else dfn[i],
+                    damage[i],
+                    fuel[i],
+                    defense_fuel[i],
+                )
+                for i in range(bounds[game], bounds[game + 1])
+            )
+            yield GameLog(
+                int(self.seeds[game]),
+                turns,
+                (int(self.tire[game, 0]), int(self.tire[game, 1])),
+                (int(self.fuel[game, 0]), int(self.fuel[game, 1])),
+            )
+
+    def results(self) -> List[Dict[str, object]]:
+        """Per-game results in the same shape as play_scalar_game.
+
+        Returns:
+            List of result dictionaries, one per game
+        """
+        names = self.table.names
+        return [
+            {
+                "winner": "Draw" if w == DRAW else names[w],
+                "reason": REASONS[r],
+                "turns": int(turn),
+                "tire_health": tuple(int(x) for x in tire),
+                "fuel": tuple(int(x) for x in fuel),
+            }
+            for w, r, turn, tire, fuel in zip(
+                self.winner, self.reason, self.turn, self.tire, self.fuel
+            )
+        ]
+
+
+def play_scalar_game(
+    policies: Tuple[Policy, Policy],
+    seed: int,
+    driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa),
+) -> Dict[str, object]:
+    """Play one race on RaceSimulator without any output.
+
+    Args:
+        policies: Policy for seat 0 and seat 1 respectively
+        seed: Game seed
+        driver_classes: Driver classes for seat 0 and seat 1
+
+    Returns:
+        Result dictionary comparable with BatchRaceSimulator.results()
+    """
+    simulator = RaceSimulator(
+        seed=seed, driver_classes=driver_classes, renderer=NullRenderer()
+    )
+    simulator.policies = {
+        simulator.verstappen.name: policies[0],
+        simulator.mostafa.name: policies[1],
+    }
+    winner, reason = simulator.run_race()
+    drivers = (simulator.verstappen, simulator.mostafa)
+    return {
+        "winner": winner,
+        "reason": reason,
+        "turns": simulator.turn_number,
+        "tire_health": tuple(d.tire_health for d in drivers),
+        "fuel": tuple(d.fuel for d in drivers),
+    }
+
+
+def main() -> None:
+    """Benchmark the batch engine against the scalar engine."""
+    n_games = 100_000
+    policies = (POLICIES["random"](), POLICIES["random"]())
+
+    start = time.perf_counter()
+    batch = BatchRaceSimulator(n_games, policies)
+    batch.run()
+    batch_elapsed = time.perf_counter() - start
+
+    n_scalar = 2_000
+    start = time.perf_counter()
+    for seed in range(n_scalar):
+        play_scalar_game(policies, seed)
+    scalar_elapsed = time.perf_counter() - start
+
+    wins = np.bincount(batch.winner + 1, minlength=3)
+    print(f"Batch:  {n_games / batch_elapsed:,.0f} games/sec ({n_games} games)")
+    print(f"Scalar: {n_scalar / scalar_elapsed:,.0f} games/sec ({n_scalar} games)")
+    print(f"Verstappen {wins[1]}, Mostafa {wins[2]}, Draw {wins[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,31 @@
 """
 Driver system for F1 Racing Simulator.
-Implements abstract Driver base class and concrete Verstappen and Mostafa classes.
+Implements abstract Driver base class, RosterDriver for drivers defined by data,
+and the default Verstappen and Mostafa classes.
+
+Verstappen and Mostafa are compiled from rosters/default.json, the only place
+their moves and starting resources are written down. roster.py imports this
+module, so they are built on first access rather than at import time.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
-from moves import OffensiveMove, DefensiveMove
+from typing import List, Dict, Optional, Tuple, Type
+from moves import OffensiveMove, DefensiveMove, OffensiveMoveSpec, DefensiveMoveSpec
+
+# Class name -> roster entry of the default drivers
+DEFAULT_DRIVERS = {"Verstappen": "Max Verstappen", "Mostafa": "Mostafa"}
 
 
 class Driver(ABC):
     """Abstract base class for all F1 drivers."""
 
+    STARTING_TIRE_HEALTH = 100
+    STARTING_FUEL = 500
+
+    # Shared move definitions; each driver instance builds per-race moves from them.
+    OFFENSIVE_MOVES: Tuple[OffensiveMoveSpec, ...] = ()
+    DEFENSIVE_MOVES: Tuple[DefensiveMoveSpec, ...] = ()
+
     def __init__(self, name: str):
         """Initialize driver with starting stats.
 
@@ -18,8 +33,8 @@ class Driver(ABC):
             name: Name of the driver
         """
         self._name = name
-        self._tire_health = 100
-        self._fuel = 500
+        self._tire_health = self.STARTING_TIRE_HEALTH
+        self._fuel = self.STARTING_FUEL
 
     @property
     def name(self) -> str:
@@ -52,6 +67,32 @@ class Driver(ABC):
         """
         self._fuel = max(0, self._fuel - amount)
 
+    def repair_tires(self, amount: int) -> None:
+        """Give back tire health previously lost (used to undo moves).
+
+        Args:
+            amount: Amount of tire health to restore
+        """
+        self._tire_health += amount
+
+    def refuel(self, amount: int) -> None:
+        """Give back fuel previously consumed (used to undo moves).
+
+        Args:
+            amount: Amount of fuel to restore
+        """
+        self._fuel += amount
+
+    def set_stats(self, tire_health: int, fuel: int) -> None:
+        """Overwrite tire health and fuel (used to restore snapshots).
+
+        Args:
+            tire_health: New tire health
+            fuel: New fuel level
+        """
+        self._tire_health = tire_health
+        self._fuel = fuel
+
     def is_alive(self) -> bool:
         """Check if driver can continue racing.
 
@@ -131,125 +172,60 @@ class Driver(ABC):
         return False
 
 
-class Verstappen(Driver):
-    """Max Verstappen driver implementation."""
+class RosterDriver(Driver):
+    """Driver defined by data; roster.py compiles one subclass per entry."""
 
-    def __init__(self):
-        """Initialize Verstappen with his specific move set."""
-        super().__init__("Max Verstappen")
-        self._initialize_moves()
+    NAME = ""
 
-    def _initialize_moves(self):
-        """Initialize move sets for Verstappen."""
+    def __init__(self):
+        """Initialize the driver from its class-level definition."""
+        super().__init__(self.NAME)
         self._offensive_moves = [
-            OffensiveMove(
-                "DRS Boost",
-                45,
-                12,
-                None,
-                "Drag Reduction System, allows drivers to temporarily "
-                "increase straight-line speed",
-            ),
-            OffensiveMove(
-                "Red Bull Surge",
-                80,
-                20,
-                None,
-                "Aggressive acceleration, high tire wear",
-            ),
-            OffensiveMove(
-                "Precision Turn",
-                30,
-                8,
-                None,
-                "Tactical turn to gain time with minimal fuel",
-            ),
+            OffensiveMove.from_spec(spec) for spec in self.OFFENSIVE_MOVES
         ]
-
         self._defensive_moves = [
-            DefensiveMove(
-                "Brake Late",
-                25,
-                0.30,
-                None,
-                "Uses ultra-late braking to reduce attack impact. Common but risky.",
-            ),
-            DefensiveMove(
-                "ERS Deployment",
-                40,
-                0.50,
-                3,
-                "Deploys electric recovery system defensively to absorb "
-                "incoming pressure and recover next turn",
-            ),
+            DefensiveMove.from_spec(spec) for spec in self.DEFENSIVE_MOVES
         ]
 
     def get_offensive_moves(self) -> List[OffensiveMove]:
-        """Get Verstappen's offensive moves.
+        """Get this driver's offensive moves.
 
         Returns:
-            List of OffensiveMove objects specific to Verstappen
+            List of OffensiveMove objects built from OFFENSIVE_MOVES
         """
         return self._offensive_moves
 
     def get_defensive_moves(self) -> List[DefensiveMove]:
-        """Get Verstappen's defensive moves.
+        """Get this driver's defensive moves.
 
         Returns:
-            List of DefensiveMove objects specific to Verstappen
+            List of DefensiveMove objects built from DEFENSIVE_MOVES
         """
         return self._defensive_moves
 
 
-class Mostafa(Driver):
-    """Mostafa driver implementation."""
+def __getattr__(name: str) -> Type[Driver]:
+    """Compile a default driver from the default roster on first access.
 
-    def __init__(self):
-        """Initialize Mostafa with his specific move set."""
-        super().__init__("Mostafa")
-        self._initialize_moves()
+    The class is a named subclass of the roster's, defined in this module so
+    that it pickles by reference like a hand-written class.
 
-    def _initialize_moves(self):
-        """Initialize move sets for Mostafa."""
-        self._offensive_moves = [
-            OffensiveMove("Turbo Start", 50, 10, None, "Early burst of speed"),
-            OffensiveMove("Mercedes Charge", 90, 22, None, "Full-throttle attack"),
-            OffensiveMove(
-                "Corner Mastery", 25, 7, None, "Skilled turning for efficiency"
-            ),
-        ]
+    Args:
+        name: Attribute looked up on this module
 
-        self._defensive_moves = [
-            DefensiveMove(
-                "Slipstream Cut",
-                20,
-                0.40,
-                None,
-                "Cuts into the airflow behind the leading car to reduce "
-                "their advantage and limit damage",
-            ),
-            DefensiveMove(
-                "Aggressive Block",
-                35,
-                1.00,
-                2,
-                "Swerves defensively to completely block a single incoming "
-                "move. Can only be used once due to risk",
-            ),
-        ]
+    Returns:
+        Driver class for a DEFAULT_DRIVERS name
 
-    def get_offensive_moves(self) -> List[OffensiveMove]:
-        """Get Mostafa's offensive moves.
+    Raises:
+        AttributeError: If name is not a DEFAULT_DRIVERS class name
+    """
+    if name not in DEFAULT_DRIVERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from roster import load_roster
 
-        Returns:
-            List of OffensiveMove objects specific to Mostafa
-        """
-        return self._offensive_moves
-
-    def get_defensive_moves(self) -> List[DefensiveMove]:
-        """Get Mostafa's defensive moves.
-
-        Returns:
-            List of DefensiveMove objects specific to Mostafa
-        """
-        return self._defensive_moves
+    compiled = load_roster().driver(DEFAULT_DRIVERS[name])
+    driver_class = type(
+        name, (compiled,), {"__module__": __name__, "__doc__": compiled.__doc__}
+    )
+    globals()[name] = driver_class
+    return driver_class
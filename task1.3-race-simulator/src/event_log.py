@@ -0,0 +1,364 @@
+"""
+Compact binary event log for F1 Racing Simulator.
+Implements EventLogWriter and read_games(), which store races as a few bytes
+per turn, and replay(), which rebuilds any turn's GameState from a log on
+RaceRules and verifies every recorded delta and the final stats.
+
+Stream layout (varints are unsigned LEB128):
+    header  magic, format version and the RaceRules fingerprint (32 bytes)
+    game    seed, turn count, turns, then final tire health and fuel per seat
+    turn    code byte: actor seat (bit 0), offensive move (bits 1-3, 7 for a
+            fuel-exhaustion penalty), defensive move + 1 (bits 4-7, 0 for
+            none); then tire damage, attacker fuel spent, defender fuel spent
+            (penalty turns store the damage only)
+
+Logs ending in .gz are gzip-compressed by open_log().
+"""
+
+import gzip
+import struct
+import time
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+
+from game_state import GameState, RaceRules
+
+MAGIC = b"F1EV"
+FORMAT_VERSION = 1
+PENALTY = 7
+MAX_OFFENSIVE_MOVES = 7
+MAX_DEFENSIVE_MOVES = 15
+
+_HEADER = struct.Struct("<4sH32s")
+_CHUNK_SIZE = 1 << 16
+
+
+class EventLogError(Exception):
+    """Raised when a log is malformed or does not replay to its recorded stats."""
+
+
+class TurnEvent(NamedTuple):
+    """What happened in one turn."""
+
+    actor: int  # Seat of the driver whose turn it was
+    offensive: Optional[int]  # None for a fuel-exhaustion penalty
+    defensive: Optional[int]  # Index into the defender's moves, None if skipped
+    damage: int  # Tire health lost (by the actor when penalized)
+    fuel_spent: int
+    defense_fuel_spent: int
+
+
+class GameLog(NamedTuple):
+    """One recorded race."""
+
+    seed: int
+    turns: Tuple[TurnEvent, ...]
+    tire_health: Tuple[int, int]
+    fuel: Tuple[int, int]
+
+
+def _put_varint(buffer: bytearray, value: int) -> None:
+    """Append an unsigned LEB128 varint."""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _get_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Read an unsigned LEB128 varint; raises IndexError past the end."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_game(game: GameLog) -> bytes:
+    """Serialize one game.
+
+    Args:
+        game: Recorded race
+
+    Returns:
+        Encoded game block
+
+    Raises:
+        ValueError: If a move index does not fit the turn code byte
+    """
+    buffer = bytearray()
+    _put_varint(buffer, game.seed)
+    _put_varint(buffer, len(game.turns))
+    for turn in game.turns:
+        if turn.offensive is None:
+            buffer.append(turn.actor | PENALTY << 1)
+            _put_varint(buffer, turn.damage)
+            continue
+        if turn.offensive >= MAX_OFFENSIVE_MOVES:
+            raise ValueError(f"Offensive move {turn.offensive} does not fit the log")
+        defensive = 0 if turn.defensive is None else turn.defensive + 1
+        if defensive > MAX_DEFENSIVE_MOVES:
+            raise ValueError(f"Defensive move {turn.defensive} does not fit the log")
+        buffer.append(turn.actor | turn.offensive << 1 | defensive << 4)
+        _put_varint(buffer, turn.damage)
+        _put_varint(buffer, turn.fuel_spent)
+        _put_varint(buffer, turn.defense_fuel_spent)
+    for value in game.tire_health + game.fuel:
+        _put_varint(buffer, value)
+    return bytes(buffer)
+
+
+def decode_game(data: bytes, pos: int = 0) -> Tuple[GameLog, int]:
+    """Deserialize one game.
+
+    Args:
+        data: Buffer holding encoded games
+        pos: Offset of the game block
+
+    Returns:
+        Tuple of (game, offset just past it)
+
+    Raises:
+        IndexError: If the buffer ends inside the game
+    """
+    seed, pos = _get_varint(data, pos)
+    n_turns, pos = _get_varint(data, pos)
+    turns: List[TurnEvent] = []
+    for _ in range(n_turns):
+        code = data[pos]
+        pos += 1
+        damage, pos = _get_varint(data, pos)
+        offensive = (code >> 1) & 7
+        if offensive == PENALTY:
+            turns.append(TurnEvent(code & 1, None, None, damage, 0, 0))
+            continue
+        fuel_spent, pos = _get_varint(data, pos)
+        defense_fuel_spent, pos = _get_varint(data, pos)
+        defensive = code >> 4
+        turns.append(
+            TurnEvent(
+                code & 1,
+                offensive,
+                defensive - 1 if defensive else None,
+                damage,
+                fuel_spent,
+                defense_fuel_spent,
+            )
+        )
+    stats = []
+    for _ in range(4):
+        value, pos = _get_varint(data, pos)
+        stats.append(value)
+    return GameLog(seed, tuple(turns), (stats[0], stats[1]), (stats[2], stats[3])), pos
+
+
+def open_log(path: str, mode: str = "rb") -> BinaryIO:
+    """Open a log file, gzip-compressed if the path ends in .gz.
+
+    Args:
+        path: Log file path
+        mode: "rb" or "wb"
+
+    Returns:
+        Binary file object
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+class EventLogWriter:
+    """Streams games into a binary log."""
+
+    def __init__(self, stream: BinaryIO, fingerprint: str):
+        """Write the log header.
+
+        Args:
+            stream: Binary file object to write to
+            fingerprint: RaceRules.fingerprint of the drivers being logged
+        """
+        self.stream = stream
+        self.games_written = 0
+        self.bytes_written = _HEADER.size
+        stream.write(_HEADER.pack(MAGIC, FORMAT_VERSION, bytes.fromhex(fingerprint)))
+
+    def write_game(self, game: GameLog) -> None:
+        """Append one game to the log.
+
+        Args:
+            game: Recorded race
+        """
+        block = encode_game(game)
+        self.stream.write(block)
+        self.games_written += 1
+        self.bytes_written += len(block)
+
+
+def read_games(
+    stream: BinaryIO, fingerprint: Optional[str] = None
+) -> Iterator[GameLog]:
+    """Stream games out of a log without loading it whole.
+
+    Args:
+        stream: Binary file object positioned at the log header
+        fingerprint: Expected RaceRules.fingerprint, or None to accept any
+
+    Yields:
+        GameLog for each recorded race
+
+    Raises:
+        EventLogError: If the header is wrong, the roster differs or the log
+            is truncated
+    """
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise EventLogError("Truncated event log header")
+    magic, version, digest = _HEADER.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise EventLogError("Not a supported event log")
+    if fingerprint is not None and digest != bytes.fromhex(fingerprint):
+        raise EventLogError("Event log was recorded with a different roster")
+
+    buffer, pos = b"", 0
+    while True:
+        chunk = stream.read(_CHUNK_SIZE)
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        while True:
+            try:
+                game, end = decode_game(buffer, pos)
+            except IndexError:
+                break
+            yield game
+            pos = end
+        if not chunk:
+            if pos < len(buffer):
+                raise EventLogError("Event log ends in the middle of a game")
+            return
+
+
+def replay(
+    game: GameLog,
+    rules: RaceRules,
+    turns: Optional[int] = None,
+    verify: bool = True,
+) -> GameState:
+    """Fast-forward a recorded race on RaceRules.
+
+    Args:
+        game: Recorded race
+        rules: Rules of the drivers that played it
+        turns: Number of turns to replay (defaults to the whole race)
+        verify: Check every turn's deltas and, after a full replay, the final
+            stats against the rules
+
+    Returns:
+        GameState after the requested number of turns
+
+    Raises:
+        EventLogError: If verification fails
+    """
+    state = rules.initial_state(game.turns[0].actor if game.turns else 0)
+    for number, turn in enumerate(game.turns[:turns], 1):
+        me = state.to_move
+        if verify and turn.actor != me:
+            raise EventLogError(f"Turn {number}: seat {turn.actor} moved out of turn")
+        if turn.offensive is None:
+            if verify and rules.can_attack(state, me):
+                raise EventLogError(f"Turn {number}: penalty while able to attack")
+            after = rules.penalize(state)
+            lost = state.tire_health[me] - after.tire_health[me]
+            fuel_spent = defense_fuel_spent = 0
+        else:
+            if verify and (
+                turn.offensive not in rules.legal_offensive(state)
+                or turn.defensive not in rules.legal_defensive(state) + [None]
+            ):
+                raise EventLogError(f"Turn {number}: illegal move")
+            after = rules.attack(state, turn.offensive, turn.defensive)
+            lost = state.tire_health[1 - me] - after.tire_health[1 - me]
+            fuel_spent = state.fuel[me] - after.fuel[me]
+            defense_fuel_spent = state.fuel[1 - me] - after.fuel[1 - me]
+        if verify and (lost, fuel_spent, defense_fuel_spent) != (
+            turn.damage,
+            turn.fuel_spent,
+            turn.defense_fuel_spent,
+        ):
+            raise EventLogError(f"Turn {number}: recorded deltas do not match rules")
+        state = after
+
+    if verify and turns is None:
+        if (state.tire_health, state.fuel) != (game.tire_health, game.fuel):
+            raise EventLogError("Replay does not reach the recorded final stats")
+    return state
+
+
+def game_log_of(simulator) -> GameLog:
+    """Package a finished RaceSimulator's recorded events.
+
+    Args:
+        simulator: RaceSimulator created with record_events=True
+
+    Returns:
+        GameLog of the race
+    """
+    drivers = (simulator.verstappen, simulator.mostafa)
+    return GameLog(
+        simulator.seed,
+        tuple(simulator.events),
+        (drivers[0].tire_health, drivers[1].tire_health),
+        (drivers[0].fuel, drivers[1].fuel),
+    )
+
+
+def main() -> None:
+    """Log a batch of random games, then stream and verify them back."""
+    # Imported here: batch_simulator itself depends on this module.
+    import io
+
+    from batch_simulator import BatchRaceSimulator
+    from policies import POLICIES
+
+    n_games = 100_000
+    rules = RaceRules()
+    start = time.perf_counter()
+    batch = BatchRaceSimulator(
+        n_games, (POLICIES["random"](), POLICIES["greedy"]()), record_events=True
+    )
+    batch.run()
+    simulated = time.perf_counter() - start
+
+    raw, compressed = io.BytesIO(), io.BytesIO()
+    start = time.perf_counter()
+    writer = EventLogWriter(raw, rules.fingerprint)
+    with gzip.GzipFile(fileobj=compressed, mode="wb") as packed:
+        gz_writer = EventLogWriter(packed, rules.fingerprint)
+        for game in batch.game_logs():
+            writer.write_game(game)
+            gz_writer.write_game(game)
+    encoded = time.perf_counter() - start
+
+    raw.seek(0)
+    start = time.perf_counter()
+    turns = sum(len(game.turns) for game in read_games(raw, rules.fingerprint))
+    read = time.perf_counter() - start
+
+    raw.seek(0)
+    start = time.perf_counter()
+    for game in read_games(raw, rules.fingerprint):
+        replay(game, rules)
+    verified = time.perf_counter() - start
+
+    size, packed_size = raw.getbuffer().nbytes, compressed.getbuffer().nbytes
+    print(f"{n_games:,} games, {turns:,} turns (simulated in {simulated:.1f}s)")
+    print(f"Log: {size / n_games:.1f} bytes/game, {size / turns:.2f} bytes/turn")
+    print(f"Gzip: {packed_size / n_games:.1f} bytes/game")
+    print(f"Encode: {n_games / encoded:,.0f} games/s (raw and gzip)")
+    print(f"Stream: {n_games / read:,.0f} games/s")
+    print(f"Replay + verify: {n_games / verified:,.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,606 @@
+"""
+Immutable game state and pure rules for F1 Racing Simulator.
+Implements GameState, a small hashable snapshot of everything that changes during
+a race, and RaceRules, which applies the RaceSimulator rules to GameStates
+without touching Driver or Move objects.
+
+Move definitions are the drivers' shared MoveSpec flyweights, so creating,
+hashing and comparing positions never builds new drivers or moves.
+"""
+
+import hashlib
+import json
+import random
+import sys
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Type
+
+from drivers import Driver, Mostafa, Verstappen
+from moves import DefensiveMoveSpec, OffensiveMoveSpec
+
+FUEL_PENALTY_DAMAGE = 5
+FUEL_TIEBREAK_MARGIN = 10
+TIRE_TIEBREAK_MARGIN = 5
+FUEL_WARNING_LEVEL = 50
+
+DRAW = -1
+
+REASON_TIRE_FAILURE = "Opponent tire failure"
+REASON_FUEL = "Superior fuel management"
+REASON_TIRE = "Better tire condition"
+REASON_EQUAL = "Equal resource management"
+REASON_UNFINISHED = "Both drivers unable to continue"
+
+
+def resource_winner(fuel: Sequence[int], tire_health: Sequence[int]) -> Tuple[int, str]:
+    """Resource tie-break between any number of stranded drivers.
+
+    A driver wins on fuel by leading every other driver by FUEL_TIEBREAK_MARGIN.
+    Otherwise the drivers within that margin of the most fuel are compared on
+    tire health, where the leader must be TIRE_TIEBREAK_MARGIN clear of them.
+
+    Args:
+        fuel: Fuel of each driver
+        tire_health: Tire health of each driver
+
+    Returns:
+        Tuple of (winning index or DRAW, reason)
+    """
+    top = max(fuel)
+    contenders = [i for i, f in enumerate(fuel) if top - f < FUEL_TIEBREAK_MARGIN]
+    if len(contenders) == 1:
+        return contenders[0], REASON_FUEL
+    best = max(contenders, key=lambda i: tire_health[i])
+    if all(
+        tire_health[best] - tire_health[i] >= TIRE_TIEBREAK_MARGIN
+        for i in contenders
+        if i != best
+    ):
+        return best, REASON_TIRE
+    return DRAW, REASON_EQUAL
+
+
+class GameState(NamedTuple):
+    """Hashable snapshot of a two-driver race.
+
+    Attributes:
+        to_move: Seat (0 or 1) of the driver taking the next turn
+        tire_health: Tire health per seat
+        fuel: Fuel per seat
+        uses: Remaining uses of every limited move, in RaceRules slot order
+    """
+
+    to_move: int
+    tire_health: Tuple[int, int]
+    fuel: Tuple[int, int]
+    uses: Tuple[int, ...]
+
+
+class SeatRules:
+    """Move definitions for one seat and where its limited uses are stored."""
+
+    __slots__ = (
+        "name",
+        "tire_health",
+        "fuel",
+        "offensive",
+        "defensive",
+        "offensive_slots",
+        "defensive_slots",
+        "cheapest_unlimited",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        tire_health: int,
+        fuel: int,
+        offensive: Sequence[OffensiveMoveSpec],
+        defensive: Sequence[DefensiveMoveSpec],
+        first_slot: int,
+    ):
+        """Assign limited-use moves to consecutive counter slots.
+
+        Args:
+            name: Driver name
+            tire_health: Starting tire health
+            fuel: Starting fuel
+            offensive: Offensive move definitions
+            defensive: Defensive move definitions
+            first_slot: First free slot in GameState.uses
+        """
+        self.name = name
+        self.tire_health = tire_health
+        self.fuel = fuel
+        self.offensive = tuple(offensive)
+        self.defensive = tuple(defensive)
+
+        slot = first_slot
+        slots = []
+        for spec in self.offensive + self.defensive:
+            if spec.max_uses is None:
+                slots.append(-1)
+            else:
+                slots.append(slot)
+                slot += 1
+        n_offensive = len(self.offensive)
+        self.offensive_slots = tuple(slots[:n_offensive])
+        self.defensive_slots = tuple(slots[n_offensive:])
+        self.cheapest_unlimited = min(
+            (
+                spec.fuel_cost
+                for spec, s in zip(self.offensive, self.offensive_slots)
+                if s < 0
+            ),
+            default=None,
+        )
+
+    @property
+    def limited(self) -> List[Tuple[int, int]]:
+        """(slot, max uses) for each limited move of this seat."""
+        specs = self.offensive + self.defensive
+        slots = self.offensive_slots + self.defensive_slots
+        return [(s, spec.max_uses) for spec, s in zip(specs, slots) if s >= 0]
+
+
+class RaceRules:
+    """Pure implementation of the RaceSimulator rules over GameStates."""
+
+    def __init__(
+        self,
+        driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa),
+    ):
+        """Prepare shared move tables for the two seats.
+
+        Args:
+            driver_classes: Driver classes for seat 0 and seat 1
+        """
+        seats = []
+        slot = 0
+        for cls in driver_classes:
+            driver = cls()
+            seat = SeatRules(
+                driver.name,
+                driver.tire_health,
+                driver.fuel,
+                cls.OFFENSIVE_MOVES,
+                cls.DEFENSIVE_MOVES,
+                slot,
+            )
+            slot += len(seat.limited)
+            seats.append(seat)
+        self.seats = tuple(seats)
+        self._initial_uses = tuple(
+            uses for seat in self.seats for _, uses in seat.limited
+        )
+        self._radix = self._build_radix()
+
+    def _build_radix(self) -> List[int]:
+        """Mixed-radix bases used by pack() and unpack()."""
+        radix = [2]
+        for seat in self.seats:
+            radix.append(seat.tire_health + 1)
+            radix.append(seat.fuel + 1)
+        radix.extend(uses + 1 for uses in self._initial_uses)
+        return radix
+
+    def initial_state(self, to_move: int = 0) -> GameState:
+        """Starting position of a race.
+
+        Args:
+            to_move: Seat that takes the first turn
+
+        Returns:
+            GameState with both drivers at full resources
+        """
+        return GameState(
+            to_move,
+            tuple(seat.tire_health for seat in self.seats),
+            tuple(seat.fuel for seat in self.seats),
+            self._initial_uses,
+        )
+
+    def state_of(self, simulator) -> GameState:
+        """Capture the current position of a RaceSimulator.
+
+        Args:
+            simulator: RaceSimulator mid-race
+
+        Returns:
+            Equivalent GameState
+        """
+        return simulator.snapshot().state
+
+    def pack(self, state: GameState) -> int:
+        """Encode a state as a single integer.
+
+        Args:
+            state: State to encode
+
+        Returns:
+            Unique non-negative integer for the state
+        """
+        radix = self._radix
+        key = state.to_move
+        key = key * radix[1] + state.tire_health[0]
+        key = key * radix[2] + state.fuel[0]
+        key = key * radix[3] + state.tire_health[1]
+        key = key * radix[4] + state.fuel[1]
+        for value, base in zip(state.uses, radix[5:]):
+            key = key * base + value
+        return key
+
+    def unpack(self, key: int) -> GameState:
+        """Decode an integer produced by pack().
+
+        Args:
+            key: Packed state
+
+        Returns:
+            The original GameState
+        """
+        fields = []
+        for base in reversed(self._radix):
+            key, value = divmod(key, base)
+            fields.append(value)
+        fields.reverse()
+        return GameState(
+            fields[0],
+            (fields[1], fields[3]),
+            (fields[2], fields[4]),
+            tuple(fields[5:]),
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the drivers, move definitions and rule constants.
+
+        Anything derived from these rules (solved tables, cached results) is
+        stale once the fingerprint changes.
+        """
+        roster = {
+            "rules": [FUEL_PENALTY_DAMAGE, FUEL_TIEBREAK_MARGIN, TIRE_TIEBREAK_MARGIN],
+            "seats": [
+                {
+                    "name": seat.name,
+                    "tire_health": seat.tire_health,
+                    "fuel": seat.fuel,
+                    "offensive": [
+                        [m.name, m.fuel_cost, m.tire_damage, m.max_uses]
+                        for m in seat.offensive
+                    ],
+                    "defensive": [
+                        [m.name, m.fuel_cost, m.damage_reduction_percent, m.max_uses]
+                        for m in seat.defensive
+                    ],
+                }
+                for seat in self.seats
+            ],
+        }
+        encoded = json.dumps(roster, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    @property
+    def key_space(self) -> int:
+        """Number of distinct values pack() can return."""
+        size = 1
+        for base in self._radix:
+            size *= base
+        return size
+
+    def can_attack(self, state: GameState, seat: int) -> bool:
+        """Whether a seat can use any offensive move (can_make_any_offensive_move).
+
+        Args:
+            state: Current state
+            seat: Seat to check
+
+        Returns:
+            True if at least one offensive move is usable
+        """
+        rules = self.seats[seat]
+        fuel = state.fuel[seat]
+        if rules.cheapest_unlimited is not None and fuel >= rules.cheapest_unlimited:
+            return True
+        uses = state.uses
+        for spec, slot in zip(rules.offensive, rules.offensive_slots):
+            if spec.fuel_cost <= fuel and (slot < 0 or uses[slot] > 0):
+                return True
+        return False
+
+    def legal_offensive(self, state: GameState) -> List[int]:
+        """Indices of offensive moves the side to move can use.
+
+        Args:
+            state: Current state
+
+        Returns:
+            Indices into the mover's offensive moves
+        """
+        rules = self.seats[state.to_move]
+        fuel, uses = state.fuel[state.to_move], state.uses
+        return [
+            i
+            for i, (spec, slot) in enumerate(
+                zip(rules.offensive, rules.offensive_slots)
+            )
+            if spec.fuel_cost <= fuel and (slot < 0 or uses[slot] > 0)
+        ]
+
+    def legal_defensive(self, state: GameState) -> List[int]:
+        """Indices of defensive moves the defender can use this turn.
+
+        Args:
+            state: Current state (the defender is the side not to move)
+
+        Returns:
+            Indices into the defender's defensive moves
+        """
+        defender = 1 - state.to_move
+        rules = self.seats[defender]
+        fuel, uses = state.fuel[defender], state.uses
+        return [
+            i
+            for i, (spec, slot) in enumerate(
+                zip(rules.defensive, rules.defensive_slots)
+            )
+            if spec.fuel_cost <= fuel and (slot < 0 or uses[slot] > 0)
+        ]
+
+    def attack(
+        self, state: GameState, offensive: int, defensive: Optional[int] = None
+    ) -> GameState:
+        """Play an offensive move and the defender's response.
+
+        Args:
+            state: Current state; both moves must be legal in it
+            offensive: Index of the mover's offensive move
+            defensive: Index of the defender's defensive move, or None to skip
+
+        Returns:
+            State after damage, with the defender to move
+        """
+        me = state.to_move
+        opp = 1 - me
+        attacker = self.seats[me]
+        spec = attacker.offensive[offensive]
+        fuel = list(state.fuel)
+        fuel[me] -= spec.fuel_cost
+        uses = state.uses
+        damage = spec.tire_damage
+
+        slot = attacker.offensive_slots[offensive]
+        if slot >= 0 or defensive is not None:
+            uses = list(uses)
+            if slot >= 0:
+                uses[slot] -= 1
+            if defensive is not None:
+                defender = self.seats[opp]
+                block = defender.defensive[defensive]
+                fuel[opp] -= block.fuel_cost
+                slot = defender.defensive_slots[defensive]
+                if slot >= 0:
+                    uses[slot] -= 1
+                damage = int(damage * (1 - block.damage_reduction_percent))
+            uses = tuple(uses)
+
+        tire = list(state.tire_health)
+        tire[opp] = max(0, tire[opp] - damage)
+        return GameState(opp, (tire[0], tire[1]), (fuel[0], fuel[1]), uses)
+
+    def commit_offensive(
+        self, state: GameState, offensive: int
+    ) -> Tuple[GameState, int]:
+        """Pay for an offensive move before the defender responds.
+
+        attack() is commit_offensive() followed by resolve_defense(), fused
+        into one step for searches that never stop between the two.
+
+        Args:
+            state: Current state; the move must be legal in it
+            offensive: Index of the mover's offensive move
+
+        Returns:
+            Tuple of (state with the attacker's fuel and uses spent and the
+            attacker still to move, incoming tire damage)
+        """
+        me = state.to_move
+        attacker = self.seats[me]
+        spec = attacker.offensive[offensive]
+        fuel = list(state.fuel)
+        fuel[me] -= spec.fuel_cost
+        uses = state.uses
+        slot = attacker.offensive_slots[offensive]
+        if slot >= 0:
+            uses = list(uses)
+            uses[slot] -= 1
+            uses = tuple(uses)
+        paid = GameState(me, state.tire_health, (fuel[0], fuel[1]), uses)
+        return paid, spec.tire_damage
+
+    def refund_offensive(self, state: GameState, offensive: int) -> GameState:
+        """Undo commit_offensive(), recovering the state before the attack.
+
+        Args:
+            state: State returned by commit_offensive()
+            offensive: Index of the committed offensive move
+
+        Returns:
+            State at the start of the attacker's turn
+        """
+        me = state.to_move
+        attacker = self.seats[me]
+        fuel = list(state.fuel)
+        fuel[me] += attacker.offensive[offensive].fuel_cost
+        uses = state.uses
+        slot = attacker.offensive_slots[offensive]
+        if slot >= 0:
+            uses = list(uses)
+            uses[slot] += 1
+            uses = tuple(uses)
+        return GameState(me, state.tire_health, (fuel[0], fuel[1]), uses)
+
+    def resolve_defense(
+        self, state: GameState, damage: int, defensive: Optional[int] = None
+    ) -> GameState:
+        """Apply the defender's response to a committed offensive move.
+
+        Args:
+            state: State returned by commit_offensive()
+            damage: Incoming tire damage returned by commit_offensive()
+            defensive: Index of the defender's defensive move, or None to skip
+
+        Returns:
+            State after damage, with the defender to move
+        """
+        opp = 1 - state.to_move
+        fuel = list(state.fuel)
+        uses = state.uses
+        if defensive is not None:
+            defender = self.seats[opp]
+            block = defender.defensive[defensive]
+            fuel[opp] -= block.fuel_cost
+            slot = defender.defensive_slots[defensive]
+            if slot >= 0:
+                uses = list(uses)
+                uses[slot] -= 1
+                uses = tuple(uses)
+            damage = int(damage * (1 - block.damage_reduction_percent))
+
+        tire = list(state.tire_health)
+        tire[opp] = max(0, tire[opp] - damage)
+        return GameState(opp, (tire[0], tire[1]), (fuel[0], fuel[1]), uses)
+
+    def penalize(self, state: GameState) -> GameState:
+        """Apply the fuel-exhaustion penalty to the mover and skip their turn.
+
+        Args:
+            state: State where the mover cannot attack
+
+        Returns:
+            State after the penalty, with the other seat to move
+        """
+        me = state.to_move
+        tire = list(state.tire_health)
+        tire[me] = max(0, tire[me] - FUEL_PENALTY_DAMAGE)
+        return GameState(1 - me, (tire[0], tire[1]), state.fuel, state.uses)
+
+    def resource_result(self, state: GameState) -> Tuple[int, str]:
+        """Resource tie-break used when neither driver can attack.
+
+        Args:
+            state: State where both drivers are out of fuel
+
+        Returns:
+            Tuple of (winning seat or DRAW, reason)
+        """
+        return resource_winner(state.fuel, state.tire_health)
+
+    def result(self, state: GameState) -> Optional[Tuple[int, str]]:
+        """Outcome of a finished race.
+
+        Args:
+            state: State at the start of a turn
+
+        Returns:
+            Tuple of (winning seat or DRAW, reason), or None if the race goes on
+        """
+        alive = (state.tire_health[0] > 0, state.tire_health[1] > 0)
+        if not alive[0] or not alive[1]:
+            if alive[0] or alive[1]:
+                return (0 if alive[0] else 1), REASON_TIRE_FAILURE
+            return DRAW, REASON_UNFINISHED
+        if not self.can_attack(state, 0) and not self.can_attack(state, 1):
+            return self.resource_result(state)
+        return None
+
+    def play(
+        self, state: GameState, offensive: int, defensive: Optional[int] = None
+    ) -> GameState:
+        """Play one full turn, applying the penalty if the mover is stranded.
+
+        Args:
+            state: State of an unfinished race
+            offensive: Offensive move index (ignored when stranded)
+            defensive: Defensive move index, or None to skip
+
+        Returns:
+            State at the start of the next turn
+        """
+        if not self.can_attack(state, state.to_move):
+            return self.penalize(state)
+        return self.attack(state, offensive, defensive)
+
+
+def _deep_sizeof(obj, seen=None) -> int:
+    """Approximate memory footprint of an object graph in bytes."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, type):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            _deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_sizeof(vars(obj), seen)
+    return size
+
+
+def _random_states(rules: RaceRules, rng: random.Random, n_states: int) -> int:
+    """Generate states by random playouts, returning how many were created."""
+    created = 0
+    while created < n_states:
+        state = rules.initial_state()
+        while rules.result(state) is None:
+            legal = rules.legal_offensive(state)
+            if legal:
+                defenses = rules.legal_defensive(state)
+                defense = rng.choice(defenses + [None])
+                state = rules.attack(state, rng.choice(legal), defense)
+            else:
+                state = rules.penalize(state)
+            created += 1
+    return created
+
+
+def main() -> None:
+    """Benchmark GameState creation and footprint against driver objects."""
+    from race_simulator import RaceSimulator
+
+    rules = RaceRules()
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    created = _random_states(rules, rng, 200_000)
+    elapsed = time.perf_counter() - start
+    print(f"GameState rollouts: {created / elapsed:,.0f} states/sec")
+
+    states = [rules.initial_state()] * 2
+    start = time.perf_counter()
+    n_lookups = 200_000
+    seen = set()
+    for i in range(n_lookups):
+        state = rules.attack(states[i & 1], 2)
+        seen.add(state)
+    elapsed = time.perf_counter() - start
+    print(f"GameState create+hash: {n_lookups / elapsed:,.0f} states/sec")
+
+    start = time.perf_counter()
+    n_objects = 5_000
+    for _ in range(n_objects):
+        RaceSimulator()
+    elapsed = time.perf_counter() - start
+    print(f"RaceSimulator construction: {n_objects / elapsed:,.0f} positions/sec")
+
+    state = rules.initial_state()
+    print(f"Bytes per GameState: {_deep_sizeof(state)}")
+    print(f"Bytes per packed state: {sys.getsizeof(rules.pack(state))}")
+    print(f"Bytes per RaceSimulator: {_deep_sizeof(RaceSimulator())}")
+
+
+if __name__ == "__main__":
+    main()
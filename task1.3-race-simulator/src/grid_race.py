@@ -0,0 +1,268 @@
+"""
+N-car race mode for F1 Racing Simulator.
+Implements GridRace, a headless race between any number of drivers in which
+every turn the current car picks a target, attacks it, and the target may
+defend, with the same moves, penalties and tie-breaks as the two-car race.
+
+Turn order comes from a heap of (round, grid slot) entries, so eliminated cars
+are dropped lazily when they surface instead of being searched for. Target
+selection, elimination and the stranded-car count are all maintained
+incrementally, so the cost of a turn stays flat as the field grows.
+"""
+
+import heapq
+import random
+import time
+from typing import List, Optional, Sequence, Tuple, Type
+
+from drivers import Driver, Mostafa, Verstappen
+from game_state import DRAW, FUEL_PENALTY_DAMAGE, REASON_TIRE_FAILURE, resource_winner
+from policies import POLICIES, Policy, RandomPolicy
+
+TARGETS = ("random", "weakest")
+
+
+class GridRace:
+    """Headless race between N cars with a heap-based turn scheduler."""
+
+    def __init__(
+        self,
+        drivers: Sequence[Driver],
+        policies: Optional[Sequence[Policy]] = None,
+        target: str = "random",
+        seed: int = 0,
+    ):
+        """Line up the grid.
+
+        Args:
+            drivers: One Driver instance per car, in starting order
+            policies: Policy per car (defaults to RandomPolicy for every car)
+            target: Target selection, "random" or "weakest" (lowest tire health)
+            seed: Seed for policies and random target selection
+
+        Raises:
+            ValueError: If fewer than two cars start or the target is unknown
+        """
+        if len(drivers) < 2:
+            raise ValueError("A grid race needs at least two cars")
+        if target not in TARGETS:
+            raise ValueError(f"Unknown target selection {target!r}")
+        self.cars = list(drivers)
+        self.labels = self._label_cars(self.cars)
+        default = RandomPolicy()
+        self.policies = list(policies) if policies else [default] * len(self.cars)
+        if len(self.policies) != len(self.cars):
+            raise ValueError("Need exactly one policy per car")
+        self.target = target
+        self.seed = seed
+        self.turn_number = 0
+        self.current_driver: Optional[Driver] = None
+        self.opponent: Optional[Driver] = None
+        self.eliminated: List[int] = []
+        self._rng = random.Random(seed)
+
+        n = len(self.cars)
+        self._queue = [(0, car) for car in range(n)]  # Already a valid heap
+        self._alive = list(range(n))
+        self._alive_slot = list(range(n))
+        self._mobile = [car.can_make_any_offensive_move() for car in self.cars]
+        self._n_mobile = sum(self._mobile)
+        self._weakest = [(car.tire_health, i) for i, car in enumerate(self.cars)]
+        heapq.heapify(self._weakest)
+
+    @staticmethod
+    def _label_cars(cars: Sequence[Driver]) -> List[str]:
+        """Unique display names, numbering drivers that share a name."""
+        counts = {}
+        for car in cars:
+            counts[car.name] = counts.get(car.name, 0) + 1
+        labels, seen = [], {}
+        for car in cars:
+            if counts[car.name] == 1:
+                labels.append(car.name)
+            else:
+                seen[car.name] = seen.get(car.name, 0) + 1
+                labels.append(f"{car.name} #{seen[car.name]}")
+        return labels
+
+    @property
+    def alive_count(self) -> int:
+        """Number of cars still racing."""
+        return len(self._alive)
+
+    def is_race_over(self) -> bool:
+        """Check whether one car is left or no car can attack.
+
+        Returns:
+            True if the race has been decided
+        """
+        return len(self._alive) <= 1 or self._n_mobile == 0
+
+    def _refresh_mobility(self, car: int) -> None:
+        """Update whether a car can still afford an attack."""
+        mobile = self.cars[car].is_alive() and (
+            self.cars[car].can_make_any_offensive_move()
+        )
+        if mobile != self._mobile[car]:
+            self._mobile[car] = mobile
+            self._n_mobile += 1 if mobile else -1
+
+    def _record_damage(self, car: int) -> None:
+        """Track a car's new tire health and eliminate it at zero."""
+        driver = self.cars[car]
+        if driver.is_alive():
+            heapq.heappush(self._weakest, (driver.tire_health, car))
+            return
+        # Swap-remove from the alive list in O(1).
+        slot, last = self._alive_slot[car], self._alive[-1]
+        self._alive[slot] = last
+        self._alive_slot[last] = slot
+        self._alive.pop()
+        self.eliminated.append(car)
+        self._refresh_mobility(car)
+
+    def _pick_target(self, attacker: int) -> int:
+        """Choose the car to attack."""
+        if self.target == "random":
+            target = self._alive[self._rng.randrange(len(self._alive) - 1)]
+            # Drawing from all but one slot and swapping in the last car for
+            # the attacker keeps the choice uniform over its opponents.
+            return self._alive[-1] if target == attacker else target
+
+        heap, skipped = self._weakest, None
+        while True:
+            tire, car = heap[0]
+            if not self.cars[car].is_alive() or tire != self.cars[car].tire_health:
+                heapq.heappop(heap)  # Stale entry
+            elif car == attacker:
+                skipped = heapq.heappop(heap)
+            else:
+                break
+        if skipped is not None:
+            heapq.heappush(heap, skipped)
+        return car
+
+    def _next_car(self) -> Tuple[int, int]:
+        """Pop the next car due to move, dropping eliminated cars."""
+        while True:
+            round_number, car = heapq.heappop(self._queue)
+            if self.cars[car].is_alive():
+                return round_number, car
+
+    def execute_turn(self) -> bool:
+        """Play one car's turn.
+
+        Returns:
+            True if the race continues, False once it has been decided
+        """
+        if self.is_race_over():
+            return False
+        round_number, car = self._next_car()
+        driver = self.cars[car]
+        self.turn_number += 1
+
+        if not self._mobile[car]:
+            driver.take_damage(FUEL_PENALTY_DAMAGE)
+            self._record_damage(car)
+        else:
+            target = self._pick_target(car)
+            defender = self.cars[target]
+            self.current_driver, self.opponent = driver, defender
+            offensive_moves = driver.get_offensive_moves()
+            choice = self.policies[car].choose_offensive(self, offensive_moves)
+            damage = driver.execute_offensive_move(offensive_moves[choice])
+            self._refresh_mobility(car)
+
+            available = [
+                move
+                for move in defender.get_defensive_moves()
+                if move.can_use(defender.fuel)
+            ]
+            if available:
+                block = self.policies[target].choose_defensive(self, available, damage)
+                if block is not None:
+                    reduction = defender.execute_defensive_move(available[block])
+                    damage = int(damage * (1 - reduction))
+                    self._refresh_mobility(target)
+            defender.take_damage(damage)
+            self._record_damage(target)
+
+        if driver.is_alive():
+            heapq.heappush(self._queue, (round_number + 1, car))
+        return not self.is_race_over()
+
+    def determine_winner(self) -> Tuple[str, str]:
+        """Decide the race once it is over.
+
+        Returns:
+            Tuple of (winner label or "Draw", reason)
+        """
+        if len(self._alive) == 1:
+            return self.labels[self._alive[0]], REASON_TIRE_FAILURE
+        alive = sorted(self._alive)
+        winner, reason = resource_winner(
+            [self.cars[car].fuel for car in alive],
+            [self.cars[car].tire_health for car in alive],
+        )
+        if winner == DRAW:
+            return "Draw", reason
+        return self.labels[alive[winner]], reason
+
+    def run_race(self) -> Tuple[str, str]:
+        """Play turns until the race is decided.
+
+        Returns:
+            Tuple of (winner label or "Draw", reason)
+        """
+        while self.execute_turn():
+            pass
+        return self.determine_winner()
+
+    def finishing_order(self) -> List[str]:
+        """Labels from winner to first car out (survivors by tire health)."""
+        survivors = sorted(self._alive, key=lambda car: -self.cars[car].tire_health)
+        return [self.labels[car] for car in survivors + self.eliminated[::-1]]
+
+
+def make_grid(
+    n_cars: int,
+    driver_classes: Sequence[Type[Driver]] = (Verstappen, Mostafa),
+) -> List[Driver]:
+    """Fill a grid by cycling through driver classes.
+
+    Args:
+        n_cars: Number of cars
+        driver_classes: Classes assigned to grid slots in turn
+
+    Returns:
+        List of new Driver instances
+    """
+    return [driver_classes[i % len(driver_classes)]() for i in range(n_cars)]
+
+
+def main() -> None:
+    """Show that the cost per turn stays flat as the grid grows."""
+    for target in TARGETS:
+        print(f"Target selection: {target}")
+        for n_cars in (2, 20, 200, 2000):
+            turns, races, elapsed = 0, 0, 0.0
+            while elapsed < 0.5:
+                race = GridRace(
+                    make_grid(n_cars),
+                    [POLICIES["random"]()] * n_cars,
+                    target=target,
+                    seed=races,
+                )
+                start = time.perf_counter()
+                race.run_race()
+                elapsed += time.perf_counter() - start
+                turns += race.turn_number
+                races += 1
+            print(
+                f"  {n_cars:>5} cars: {elapsed / turns * 1e6:6.1f} us/turn "
+                f"({turns / races:,.0f} turns per race)"
+            )
+
+
+if __name__ == "__main__":
+    main()
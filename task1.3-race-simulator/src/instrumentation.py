@@ -0,0 +1,216 @@
+"""
+Opt-in per-turn instrumentation for F1 Racing Simulator.
+Implements RaceMetrics, which times the phases of every RaceSimulator turn
+(offensive selection and execution, defensive selection and execution, and
+rendering), counts fuel-exhaustion penalties, resource-decided finishes and
+retries after choosing an unusable move, and periodically appends snapshots
+to a JSON-lines file.
+
+Attaching a simulator replaces its turn, choice and renderer methods, and its
+drivers' move methods, with timed wrappers on those instances only. Nothing
+in the engine checks whether metrics are enabled, so an uninstrumented race
+runs exactly the code it always has.
+
+Phase times are inclusive: rendering done while a human is choosing a move
+also counts toward selection, and "turn" is the whole of execute_turn.
+"""
+
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+
+PHASES = (
+    "selection",
+    "execution",
+    "defense_selection",
+    "defense_execution",
+    "rendering",
+    "turn",
+)
+COUNTERS = (
+    "races",
+    "turns",
+    "penalties",
+    "resource_finishes",
+    "illegal_retries",
+)
+
+# Renderer events that are counted as well as timed.
+_RENDER_COUNTERS = {
+    "fuel_penalty": "penalties",
+    "both_stranded": "resource_finishes",
+    "move_rejected": "illegal_retries",
+}
+
+
+class _InstrumentedRenderer:
+    """Renderer proxy that times every event passed to the real renderer."""
+
+    def __init__(self, renderer, metrics: "RaceMetrics"):
+        """Wrap a renderer.
+
+        Args:
+            renderer: Renderer the simulator was using
+            metrics: RaceMetrics to report to
+        """
+        self.renderer = renderer
+        self._metrics = metrics
+
+    def __getattr__(self, name: str) -> Any:
+        """Return a timed version of the renderer's attribute, caching it."""
+        value = getattr(self.renderer, name)
+        if callable(value):
+            value = self._metrics.timed("rendering", value, _RENDER_COUNTERS.get(name))
+            setattr(self, name, value)
+        return value
+
+
+class RaceMetrics:
+    """Phase timings and event counters for instrumented races."""
+
+    def __init__(self, path: Optional[str] = None, interval: float = 1.0):
+        """Create empty metrics.
+
+        Args:
+            path: JSON-lines file that snapshots are appended to, or None to
+                keep them in process only
+            interval: Minimum seconds between periodic snapshot writes
+        """
+        self.path = path
+        self.interval = interval
+        self.seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.calls: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.counts: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._started = time.time()
+        self._last_write = time.perf_counter()
+
+    def timed(
+        self, phase: str, func: Callable, counter: Optional[str] = None
+    ) -> Callable:
+        """Wrap a callable so each call is timed under a phase.
+
+        Args:
+            phase: One of PHASES
+            func: Callable to wrap
+            counter: Optional counter in COUNTERS incremented on every call
+
+        Returns:
+            Wrapped callable with the same signature and result
+        """
+        seconds, calls, counts = self.seconds, self.calls, self.counts
+        clock = time.perf_counter
+
+        def timed_call(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds[phase] += clock() - start
+                calls[phase] += 1
+                if counter is not None:
+                    counts[counter] += 1
+
+        return timed_call
+
+    def attach(self, simulator) -> None:
+        """Install timing hooks on a simulator and its two drivers.
+
+        Args:
+            simulator: RaceSimulator to instrument
+        """
+        self.counts["races"] += 1
+        simulator.renderer = _InstrumentedRenderer(simulator.renderer, self)
+        for driver in (simulator.verstappen, simulator.mostafa):
+            driver.execute_offensive_move = self.timed(
+                "execution", driver.execute_offensive_move
+            )
+            driver.execute_defensive_move = self.timed(
+                "defense_execution", driver.execute_defensive_move
+            )
+
+        offensive = self.timed("selection", simulator.get_move_choice)
+        defensive = self.timed("defense_selection", simulator.get_move_choice)
+
+        def get_move_choice(moves, move_type, base_damage=0):
+            choose = defensive if move_type == "Defensive" else offensive
+            return choose(moves, move_type, base_damage)
+
+        simulator.get_move_choice = get_move_choice
+
+        play_turn = self.timed("turn", simulator.execute_turn, "turns")
+
+        def execute_turn():
+            result = play_turn()
+            if (
+                self.path is not None
+                and time.perf_counter() - self._last_write >= self.interval
+            ):
+                self.write_snapshot()
+            return result
+
+        simulator.execute_turn = execute_turn
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current totals.
+
+        Returns:
+            Dictionary with the wall-clock time, the counters, and per phase
+            the total seconds, number of timed calls and mean microseconds
+        """
+        turns = self.counts["turns"]
+        return {
+            "time": time.time(),
+            "elapsed": time.time() - self._started,
+            **self.counts,
+            "seconds": dict(self.seconds),
+            "calls": dict(self.calls),
+            "us_per_call": {
+                phase: self.seconds[phase] / self.calls[phase] * 1e6
+                for phase in PHASES
+                if self.calls[phase]
+            },
+            "us_per_turn": (
+                {phase: self.seconds[phase] / turns * 1e6 for phase in PHASES}
+                if turns
+                else {}
+            ),
+        }
+
+    def write_snapshot(self) -> None:
+        """Append the current snapshot to the JSON-lines file, if any."""
+        self._last_write = time.perf_counter()
+        if self.path is None:
+            return
+        with open(self.path, "a") as handle:
+            handle.write(json.dumps(self.snapshot()) + "\n")
+
+
+def main() -> None:
+    """Compare race throughput with and without instrumentation."""
+    # Imported here: race_simulator itself depends on this module.
+    from policies import POLICIES
+    from race_simulator import RaceSimulator
+    from renderers import NullRenderer
+
+    n_games = 2_000
+    for instrumented in (False, True):
+        metrics = RaceMetrics() if instrumented else None
+        start = time.perf_counter()
+        for seed in range(n_games):
+            RaceSimulator(
+                policies={
+                    "Max Verstappen": POLICIES["random"](),
+                    "Mostafa": POLICIES["greedy"](),
+                },
+                seed=seed,
+                renderer=NullRenderer(),
+                metrics=metrics,
+            ).run_race()
+        elapsed = time.perf_counter() - start
+        label = "instrumented" if instrumented else "plain"
+        print(f"{label:>12}: {n_games / elapsed:,.0f} games/sec")
+    print(json.dumps(metrics.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Monte Carlo Tree Search opponent for F1 Racing Simulator.
+Implements MCTSPolicy, a Policy that picks offensive moves and defensive
+responses by UCT search under a hard per-decision time budget.
+
+The tree alternates between offense nodes (the mover picks an attack) and
+defense nodes (the defender has seen the attack and picks a response). Search
+and random playouts run on GameState/RaceRules, never on Driver objects, and
+the subtree under the actual line of play is kept between decisions.
+"""
+
+import math
+import random
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Type
+
+from drivers import Driver, Mostafa, Verstappen
+from game_state import DRAW, GameState, RaceRules
+from moves import DefensiveMove, OffensiveMove
+from policies import Policy
+
+NodeKey = Tuple[GameState, Optional[int]]
+
+
+class _Node:
+    """Search tree node; `damage` is None for offense nodes."""
+
+    __slots__ = (
+        "state",
+        "damage",
+        "player",
+        "children",
+        "untried",
+        "visits",
+        "reward",
+        "outcome",
+    )
+
+    def __init__(self, rules: RaceRules, state: GameState, damage: Optional[int]):
+        """Create a node and list its untried actions.
+
+        Args:
+            rules: Rules used to enumerate actions
+            state: Position at the node
+            damage: Incoming damage at a defense node, None at an offense node
+        """
+        self.state = state
+        self.damage = damage
+        self.children: Dict[Optional[int], "_Node"] = {}
+        self.visits = 0
+        self.reward = 0.0  # Total reward for the player who moved into this node
+        self.outcome = None if damage is not None else rules.result(state)
+        if damage is None:
+            self.player = state.to_move
+            self.untried = [] if self.outcome else rules.legal_offensive(state)
+        else:
+            self.player = 1 - state.to_move
+            self.untried = rules.legal_defensive(state) + [None]
+
+    @property
+    def key(self) -> NodeKey:
+        """Identity of the position this node represents."""
+        return self.state, self.damage
+
+
+class MCTSPolicy(Policy):
+    """UCT tree search with random playouts under a per-decision time budget."""
+
+    name = "mcts"
+    # Playouts per decision depend on machine speed and load
+    deterministic = False
+
+    def __init__(
+        self,
+        time_budget: float = 0.05,
+        exploration: float = 1.4,
+        seed: int = 0,
+        verbose: bool = False,
+        driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa),
+    ):
+        """Configure the search.
+
+        Args:
+            time_budget: Seconds of search per decision
+            exploration: UCT exploration constant
+            seed: Seed for the playout random number generator
+            verbose: Report playout statistics after each decision through
+                the simulator's renderer
+            driver_classes: Driver classes for seat 0 and seat 1
+        """
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.verbose = verbose
+        self.rules = RaceRules(driver_classes)
+        self._rng = random.Random(seed)
+        self._root: Optional[_Node] = None
+        self.last_playouts = 0
+        self.last_elapsed = 0.0
+        self.last_reused = 0
+
+    @property
+    def playouts_per_second(self) -> float:
+        """Playout rate of the most recent decision."""
+        if self.last_elapsed <= 0:
+            return 0.0
+        return self.last_playouts / self.last_elapsed
+
+    def _settle(self, state: GameState) -> GameState:
+        """Apply forced fuel-exhaustion penalties until someone can attack."""
+        rules = self.rules
+        while rules.result(state) is None and not rules.can_attack(
+            state, state.to_move
+        ):
+            state = rules.penalize(state)
+        return state
+
+    def _child_state(
+        self, node: _Node, action: Optional[int]
+    ) -> Tuple[GameState, Optional[int]]:
+        """Position reached by taking an action at a node."""
+        if node.damage is None:
+            return self.rules.commit_offensive(node.state, action)
+        state = self.rules.resolve_defense(node.state, node.damage, action)
+        return self._settle(state), None
+
+    def _find_root(self, key: NodeKey, max_depth: int = 4) -> _Node:
+        """Reuse the subtree for key from the previous search, if it exists."""
+        if self._root is not None:
+            queue = deque([(self._root, 0)])
+            while queue:
+                node, depth = queue.popleft()
+                if node.key == key:
+                    self.last_reused = node.visits
+                    return node
+                if depth < max_depth:
+                    queue.extend((child, depth + 1) for child in node.children.values())
+        self.last_reused = 0
+        return _Node(self.rules, *key)
+
+    def _select(self, node: _Node) -> _Node:
+        """Pick the child with the highest UCT score."""
+        log_visits = math.log(node.visits)
+        best, best_score = None, -math.inf
+        for child in node.children.values():
+            score = child.reward / child.visits + self.exploration * math.sqrt(
+                log_visits / child.visits
+            )
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def _rollout(self, state: GameState, damage: Optional[int]) -> int:
+        """Play random moves to the end of the race.
+
+        Returns:
+            Winning seat or DRAW
+        """
+        rules, rng = self.rules, self._rng
+        if damage is not None:
+            defenses = rules.legal_defensive(state)
+            choice = rng.randrange(len(defenses) + 1)
+            defense = defenses[choice] if choice < len(defenses) else None
+            state = rules.resolve_defense(state, damage, defense)
+        while True:
+            result = rules.result(state)
+            if result is not None:
+                return result[0]
+            attacks = rules.legal_offensive(state)
+            if not attacks:
+                state = rules.penalize(state)
+                continue
+            defenses = rules.legal_defensive(state)
+            choice = rng.randrange(len(defenses) + 1)
+            state = rules.attack(
+                state,
+                attacks[rng.randrange(len(attacks))],
+                defenses[choice] if choice < len(defenses) else None,
+            )
+
+    def _playout(self, root: _Node) -> None:
+        """One selection, expansion, simulation and backpropagation pass."""
+        path = [root]
+        node = root
+        while not node.untried and node.children:
+            node = self._select(node)
+            path.append(node)
+
+        if node.untried:
+            action = node.untried.pop(self._rng.randrange(len(node.untried)))
+            child = _Node(self.rules, *self._child_state(node, action))
+            node.children[action] = child
+            node = child
+            path.append(node)
+
+        if node.outcome is not None:
+            winner = node.outcome[0]
+        else:
+            winner = self._rollout(node.state, node.damage)
+
+        for parent, child in zip(path, path[1:]):
+            child.visits += 1
+            if winner == DRAW:
+                child.reward += 0.5
+            elif winner == parent.player:
+                child.reward += 1.0
+        root.visits += 1
+
+    def search(self, state: GameState, damage: Optional[int] = None) -> Optional[int]:
+        """Search a position for the allotted time budget.
+
+        Args:
+            state: Position to search
+            damage: Incoming damage when choosing a defense, None for offense
+
+        Returns:
+            Most visited action: an offensive index, a defensive index, or None
+            to skip defending
+        """
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+        root = self._find_root((state, damage))
+        self._root = root
+        playouts = 0
+        while True:
+            self._playout(root)
+            playouts += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.last_playouts = playouts
+        self.last_elapsed = time.perf_counter() - start
+
+        return max(root.children, key=lambda a: root.children[a].visits)
+
+    def _report(self, simulator) -> None:
+        """Show the last decision's statistics through the simulator's renderer."""
+        if self.verbose:
+            simulator.renderer.notice(
+                f"[AI] {self.last_playouts:,} playouts in "
+                f"{self.last_elapsed * 1000:.0f} ms "
+                f"({self.playouts_per_second:,.0f}/s, "
+                f"{self.last_reused:,} reused)"
+            )
+
+    def choose_offensive(self, simulator, moves: List[OffensiveMove]) -> int:
+        action = self.search(self.rules.state_of(simulator))
+        self._report(simulator)
+        return action
+
+    def choose_defensive(
+        self, simulator, moves: List[DefensiveMove], base_damage: int
+    ) -> Optional[int]:
+        action = self.search(self.rules.state_of(simulator), base_damage)
+        self._report(simulator)
+        if action is None:
+            return None
+        return moves.index(simulator.opponent.get_defensive_moves()[action])
@@ -1,11 +1,105 @@
 """
 Move system for F1 Racing Simulator.
-Implements Move base class and specialized OffensiveMove and DefensiveMove classes.
+Implements Move base class and specialized OffensiveMove and DefensiveMove classes,
+plus the immutable MoveSpec flyweights they are instantiated from.
 """
 
 from typing import Optional
 
 
+class MoveSpec:
+    """Immutable, shareable definition of a move.
+
+    A spec carries everything about a move except per-race state, so a single
+    instance is shared by every driver and every simulated race.
+    """
+
+    __slots__ = ("name", "fuel_cost", "max_uses", "description")
+
+    def __init__(
+        self, name: str, fuel_cost: int, max_uses: Optional[int], description: str
+    ):
+        """Initialize a move definition.
+
+        Args:
+            name: Name of the move
+            fuel_cost: Fuel required to execute the move
+            max_uses: Uses available per race (None for unlimited)
+            description: Description of what the move does
+        """
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "fuel_cost", fuel_cost)
+        object.__setattr__(self, "max_uses", max_uses)
+        object.__setattr__(self, "description", description)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __copy__(self) -> "MoveSpec":
+        return self
+
+    def __deepcopy__(self, memo) -> "MoveSpec":
+        return self
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class OffensiveMoveSpec(MoveSpec):
+    """Immutable definition of an offensive move."""
+
+    __slots__ = ("tire_damage",)
+
+    def __init__(
+        self,
+        name: str,
+        fuel_cost: int,
+        tire_damage: int,
+        max_uses: Optional[int],
+        description: str,
+    ):
+        """Initialize an offensive move definition.
+
+        Args:
+            name: Name of the move
+            fuel_cost: Fuel required to execute the move
+            tire_damage: Damage dealt to opponent's tire health
+            max_uses: Uses available per race (None for unlimited)
+            description: Description of what the move does
+        """
+        super().__init__(name, fuel_cost, max_uses, description)
+        object.__setattr__(self, "tire_damage", tire_damage)
+
+
+class DefensiveMoveSpec(MoveSpec):
+    """Immutable definition of a defensive move."""
+
+    __slots__ = ("damage_reduction_percent",)
+
+    def __init__(
+        self,
+        name: str,
+        fuel_cost: int,
+        damage_reduction_percent: float,
+        max_uses: Optional[int],
+        description: str,
+    ):
+        """Initialize a defensive move definition.
+
+        Args:
+            name: Name of the move
+            fuel_cost: Fuel required to execute the move
+            damage_reduction_percent: Percentage of damage to reduce (0.0 to 1.0)
+            max_uses: Uses available per race (None for unlimited)
+            description: Description of what the move does
+        """
+        super().__init__(name, fuel_cost, max_uses, description)
+        object.__setattr__(self, "damage_reduction_percent", damage_reduction_percent)
+
+
 class Move:
     """Base class for all racing moves with common attributes."""
 
@@ -24,6 +118,7 @@ class Move:
         self.fuel_cost = fuel_cost
         self.uses_remaining = uses_remaining
         self.description = description
+        self.spec: Optional[MoveSpec] = None
 
     def can_use(self, current_fuel: int) -> bool:
         """Check if move can be used based on fuel and remaining uses.
@@ -43,6 +138,11 @@ class Move:
         if self.uses_remaining is not None:
             self.uses_remaining -= 1
 
+    def restore_use(self) -> None:
+        """Give back one use of the move if it has limited uses."""
+        if self.uses_remaining is not None:
+            self.uses_remaining += 1
+
 
 class OffensiveMove(Move):
     """Offensive move that deals tire damage to opponent."""
@@ -67,6 +167,22 @@ class OffensiveMove(Move):
         super().__init__(name, fuel_cost, uses_remaining, description)
         self.tire_damage = tire_damage
 
+    @classmethod
+    def from_spec(cls, spec: OffensiveMoveSpec) -> "OffensiveMove":
+        """Create a fresh per-race move from a shared definition.
+
+        Args:
+            spec: Immutable offensive move definition
+
+        Returns:
+            OffensiveMove with a full set of uses
+        """
+        move = cls(
+            spec.name, spec.fuel_cost, spec.tire_damage, spec.max_uses, spec.description
+        )
+        move.spec = spec
+        return move
+
 
 class DefensiveMove(Move):
     """Defensive move that reduces incoming damage."""
@@ -90,3 +206,23 @@ class DefensiveMove(Move):
         """
         super().__init__(name, fuel_cost, uses_remaining, description)
         self.damage_reduction_percent = damage_reduction_percent
+
+    @classmethod
+    def from_spec(cls, spec: DefensiveMoveSpec) -> "DefensiveMove":
+        """Create a fresh per-race move from a shared definition.
+
+        Args:
+            spec: Immutable defensive move definition
+
+        Returns:
+            DefensiveMove with a full set of uses
+        """
+        move = cls(
+            spec.name,
+            spec.fuel_cost,
+            spec.damage_reduction_percent,
+            spec.max_uses,
+            spec.description,
+        )
+        move.spec = spec
+        return move
@@ -0,0 +1,388 @@
+"""
+Automated move policies for F1 Racing Simulator.
+Implements seeded Policy classes usable by both the interactive RaceSimulator
+and the vectorized BatchRaceSimulator. A policy that only implements the scalar
+choices still plays in a batch: the base batch hooks fall back to asking it
+one game at a time.
+
+Random decisions are derived from a counter-based hash of (seed, turn, role)
+rather than a stateful generator, so a scalar game and its lane in a batch
+make identical choices without sharing any RNG state.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from moves import DefensiveMove, OffensiveMove
+
+ROLE_OFFENSIVE = 0
+ROLE_DEFENSIVE = 1
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+
+
+def mix64(seed: int, turn: int, role: int) -> int:
+    """Hash a (seed, turn, role) triple into a 64-bit pseudo-random integer.
+
+    Args:
+        seed: Game seed
+        turn: Turn number the decision is made on
+        role: ROLE_OFFENSIVE or ROLE_DEFENSIVE
+
+    Returns:
+        Unsigned 64-bit hash value
+    """
+    z = (seed * _GOLDEN + turn * 2 + role) & _MASK64
+    z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+    return z ^ (z >> 31)
+
+
+def mix64_array(seeds: np.ndarray, turns: np.ndarray, role: int) -> np.ndarray:
+    """Vectorized mix64 over arrays of seeds and turn numbers.
+
+    Args:
+        seeds: Array of game seeds
+        turns: Array of turn numbers (same shape as seeds)
+        role: ROLE_OFFENSIVE or ROLE_DEFENSIVE
+
+    Returns:
+        uint64 array of hash values matching mix64 element-wise
+    """
+    z = seeds.astype(np.uint64) * np.uint64(_GOLDEN)
+    z = z + turns.astype(np.uint64) * np.uint64(2) + np.uint64(role)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+    return z ^ (z >> np.uint64(31))
+
+
+def _nth_legal(legal: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Return the column index of the n-th (0-based) True entry of each row."""
+    ranks = np.cumsum(legal, axis=1) - 1
+    hits = legal & (ranks == n[:, None])
+    return np.argmax(hits, axis=1)
+
+
+def _one_hot(choice: np.ndarray, columns: int) -> np.ndarray:
+    """Turn (n,) column indices into an (n, columns) 0/1 matrix; -1 is the last."""
+    probabilities = np.zeros((choice.shape[0], columns))
+    probabilities[np.arange(choice.shape[0]), choice] = 1.0
+    return probabilities
+
+
+class Policy(ABC):
+    """Abstract base class for automated move selection."""
+
+    name = "policy"
+    # Whether a seeded race always plays out the same way; False for policies
+    # whose choices depend on wall-clock time
+    deterministic = True
+
+    @abstractmethod
+    def choose_offensive(self, simulator, moves: List[OffensiveMove]) -> int:
+        """Choose an offensive move for the simulator's current driver.
+
+        Args:
+            simulator: RaceSimulator whose current driver is attacking
+            moves: Offensive moves of the current driver (at least one usable)
+
+        Returns:
+            Index into moves of a usable move
+        """
+        pass
+
+    @abstractmethod
+    def choose_defensive(
+        self, simulator, moves: List[DefensiveMove], base_damage: int
+    ) -> Optional[int]:
+        """Choose a defensive response for the simulator's opponent.
+
+        Args:
+            simulator: RaceSimulator whose opponent is defending
+            moves: Defensive moves the opponent can currently afford
+            base_damage: Damage of the incoming offensive move
+
+        Returns:
+            Index into moves, or None to skip defending
+        """
+        pass
+
+    def choose_offensive_batch(
+        self,
+        legal: np.ndarray,
+        damage: np.ndarray,
+        fuel_cost: np.ndarray,
+        seeds: np.ndarray,
+        turns: np.ndarray,
+        simulators: Optional[Sequence] = None,
+    ) -> np.ndarray:
+        """Vectorized offensive choice for a batch of games.
+
+        The base implementation is a scalar fallback: it asks choose_offensive
+        once per game, so it needs a simulator at each game's position.
+        Vectorized policies override it and ignore simulators.
+
+        Args:
+            legal: (n, k) mask of usable offensive moves, at least one per row
+            damage: (n, k) tire damage of each move
+            fuel_cost: (n, k) fuel cost of each move
+            seeds: (n,) game seeds
+            turns: (n,) turn numbers
+            simulators: n RaceSimulators at each game's position, for the
+                scalar fallback
+
+        Returns:
+            (n,) array of chosen move indices
+
+        Raises:
+            NotImplementedError: If the fallback is used without simulators
+        """
+        if simulators is None:
+            raise NotImplementedError(
+                f"{self.name} has no batch implementation and needs simulators"
+            )
+        choice = np.empty(len(simulators), dtype=np.int64)
+        for row, simulator in enumerate(simulators):
+            moves = simulator.current_driver.get_offensive_moves()
+            choice[row] = self.choose_offensive(simulator, moves)
+        return choice
+
+    def choose_defensive_batch(
+        self,
+        legal: np.ndarray,
+        reduction: np.ndarray,
+        fuel_cost: np.ndarray,
+        base_damage: np.ndarray,
+        seeds: np.ndarray,
+        turns: np.ndarray,
+        simulators: Optional[Sequence] = None,
+    ) -> np.ndarray:
+        """Vectorized defensive choice for a batch of games.
+
+        Like choose_offensive_batch, the base implementation asks
+        choose_defensive once per game.
+
+        Args:
+            legal: (n, k) mask of usable defensive moves
+            reduction: (n, k) damage reduction of each move
+            fuel_cost: (n, k) fuel cost of each move
+            base_damage: (n,) damage of the incoming offensive move
+            seeds: (n,) game seeds
+            turns: (n,) turn numbers
+            simulators: n RaceSimulators at each game's position, after the
+                attack, for the scalar fallback
+
+        Returns:
+            (n,) array of chosen move indices, -1 to skip defending
+
+        Raises:
+            NotImplementedError: If the fallback is used without simulators
+        """
+        if simulators is None:
+            raise NotImplementedError(
+                f"{self.name} has no batch implementation and needs simulators"
+            )
+        choice = np.full(len(simulators), -1, dtype=np.int64)
+        for row, simulator in enumerate(simulators):
+            moves = simulator.opponent.get_defensive_moves()
+            fuel = simulator.opponent.fuel
+            usable = [move for move in moves if move.can_use(fuel)]
+            chosen = self.choose_defensive(simulator, usable, int(base_damage[row]))
+            if chosen is not None:
+                choice[row] = moves.index(usable[chosen])
+        return choice
+
+    @classmethod
+    def has_batch_hook(cls, hook: str) -> bool:
+        """Whether a batch hook is vectorized rather than the scalar fallback.
+
+        Args:
+            hook: "choose_offensive_batch" or "choose_defensive_batch"
+
+        Returns:
+            True if the policy class overrides the hook
+        """
+        return getattr(cls, hook) is not getattr(Policy, hook)
+
+    def offensive_probabilities(
+        self, legal: np.ndarray, damage: np.ndarray, fuel_cost: np.ndarray
+    ) -> np.ndarray:
+        """Probability of each offensive choice, for exact analysis.
+
+        The base implementation puts all the weight on the vectorized batch
+        choice, which is exact for deterministic policies. Randomized policies
+        override it.
+
+        Args:
+            legal: (n, k) mask of usable offensive moves, at least one per row
+            damage: (n, k) tire damage of each move
+            fuel_cost: (n, k) fuel cost of each move
+
+        Returns:
+            (n, k) array of probabilities, each row summing to 1
+
+        Raises:
+            NotImplementedError: If the policy has no vectorized offensive hook
+        """
+        if not self.has_batch_hook("choose_offensive_batch"):
+            raise NotImplementedError(f"{self.name} has no probability model")
+        choice = self.choose_offensive_batch(legal, damage, fuel_cost, None, None)
+        return _one_hot(choice, legal.shape[1])
+
+    def defensive_probabilities(
+        self,
+        legal: np.ndarray,
+        reduction: np.ndarray,
+        fuel_cost: np.ndarray,
+        base_damage: np.ndarray,
+    ) -> np.ndarray:
+        """Probability of each defensive choice, for exact analysis.
+
+        Like offensive_probabilities, the base implementation puts all the
+        weight on the vectorized batch choice.
+
+        Args:
+            legal: (n, k) mask of usable defensive moves
+            reduction: (n, k) damage reduction of each move
+            fuel_cost: (n, k) fuel cost of each move
+            base_damage: (n,) damage of the incoming offensive move
+
+        Returns:
+            (n, k + 1) array of probabilities whose last column is skipping
+
+        Raises:
+            NotImplementedError: If the policy has no vectorized defensive hook
+        """
+        if not self.has_batch_hook("choose_defensive_batch"):
+            raise NotImplementedError(f"{self.name} has no probability model")
+        choice = self.choose_defensive_batch(
+            legal, reduction, fuel_cost, base_damage, None, None
+        )
+        return _one_hot(choice, legal.shape[1] + 1)
+
+    @classmethod
+    def has_probability_model(cls) -> bool:
+        """Whether offensive_ and defensive_probabilities can answer.
+
+        Returns:
+            True if, for both roles, the class overrides the probability hook
+            or has a vectorized batch hook for the base implementation
+        """
+        return all(
+            getattr(cls, probabilities) is not getattr(Policy, probabilities)
+            or cls.has_batch_hook(hook)
+            for probabilities, hook in (
+                ("offensive_probabilities", "choose_offensive_batch"),
+                ("defensive_probabilities", "choose_defensive_batch"),
+            )
+        )
+
+
+class RandomPolicy(Policy):
+    """Uniformly random choice among usable moves (and skipping, on defense)."""
+
+    name = "random"
+
+    def choose_offensive(self, simulator, moves: List[OffensiveMove]) -> int:
+        fuel = simulator.current_driver.fuel
+        legal = [i for i, move in enumerate(moves) if move.can_use(fuel)]
+        r = mix64(simulator.seed, simulator.turn_number, ROLE_OFFENSIVE)
+        return legal[r % len(legal)]
+
+    def choose_defensive(
+        self, simulator, moves: List[DefensiveMove], base_damage: int
+    ) -> Optional[int]:
+        fuel = simulator.opponent.fuel
+        legal = [i for i, move in enumerate(moves) if move.can_use(fuel)]
+        r = mix64(simulator.seed, simulator.turn_number, ROLE_DEFENSIVE)
+        r %= len(legal) + 1
+        return None if r == len(legal) else legal[r]
+
+    def choose_offensive_batch(self, legal, damage, fuel_cost, seeds, turns):
+        n_legal = legal.sum(axis=1).astype(np.uint64)
+        r = mix64_array(seeds, turns, ROLE_OFFENSIVE) % np.maximum(n_legal, 1)
+        return _nth_legal(legal, r.astype(np.int64))
+
+    def choose_defensive_batch(
+        self, legal, reduction, fuel_cost, base_damage, seeds, turns
+    ):
+        n_legal = legal.sum(axis=1)
+        r = mix64_array(seeds, turns, ROLE_DEFENSIVE) % (
+            n_legal.astype(np.uint64) + np.uint64(1)
+        )
+        r = r.astype(np.int64)
+        return np.where(r == n_legal, -1, _nth_legal(legal, r))
+
+    def offensive_probabilities(self, legal, damage, fuel_cost):
+        n_legal = np.maximum(legal.sum(axis=1, keepdims=True), 1)
+        return legal / n_legal
+
+    def defensive_probabilities(self, legal, reduction, fuel_cost, base_damage):
+        choices = np.concatenate([legal, np.ones((legal.shape[0], 1), bool)], axis=1)
+        return choices / choices.sum(axis=1, keepdims=True)
+
+
+class GreedyPolicy(Policy):
+    """Always attack with the hardest-hitting move and defend with the best block."""
+
+    name = "greedy"
+
+    def choose_offensive(self, simulator, moves: List[OffensiveMove]) -> int:
+        fuel = simulator.current_driver.fuel
+        legal = [i for i, move in enumerate(moves) if move.can_use(fuel)]
+        return max(legal, key=lambda i: (moves[i].tire_damage, -i))
+
+    def choose_defensive(
+        self, simulator, moves: List[DefensiveMove], base_damage: int
+    ) -> Optional[int]:
+        fuel = simulator.opponent.fuel
+        legal = [i for i, move in enumerate(moves) if move.can_use(fuel)]
+        if not legal:
+            return None
+        return max(legal, key=lambda i: (moves[i].damage_reduction_percent, -i))
+
+    def choose_offensive_batch(self, legal, damage, fuel_cost, seeds, turns):
+        return np.argmax(np.where(legal, damage, -1), axis=1)
+
+    def choose_defensive_batch(
+        self, legal, reduction, fuel_cost, base_damage, seeds, turns
+    ):
+        best = np.argmax(np.where(legal, reduction, -1.0), axis=1)
+        return np.where(legal.any(axis=1), best, -1)
+
+
+class ConservativePolicy(Policy):
+    """Attack with the cheapest move and never spend fuel on defense."""
+
+    name = "conservative"
+
+    def choose_offensive(self, simulator, moves: List[OffensiveMove]) -> int:
+        fuel = simulator.current_driver.fuel
+        legal = [i for i, move in enumerate(moves) if move.can_use(fuel)]
+        return min(legal, key=lambda i: (moves[i].fuel_cost, i))
+
+    def choose_defensive(
+        self, simulator, moves: List[DefensiveMove], base_damage: int
+    ) -> Optional[int]:
+        return None
+
+    def choose_offensive_batch(self, legal, damage, fuel_cost, seeds, turns):
+        big = np.iinfo(np.int64).max
+        return np.argmin(np.where(legal, fuel_cost, big), axis=1)
+
+    def choose_defensive_batch(
+        self, legal, reduction, fuel_cost, base_damage, seeds, turns
+    ):
+        return np.full(legal.shape[0], -1, dtype=np.int64)
+
+
+POLICIES = {
+    RandomPolicy.name: RandomPolicy,
+    GreedyPolicy.name: GreedyPolicy,
+    ConservativePolicy.name: ConservativePolicy,
+}
@@ -0,0 +1,354 @@
+"""
+Precomputed optimal-policy table for F1 Racing Simulator.
+Implements build_policy_table(), which solves every position a perfect driver
+can reach and writes its optimal actions to a compact binary file, and
+TablePolicy, a Policy that answers each decision with one lookup into that
+file through mmap.
+
+File layout (little-endian):
+    header  magic, format version, key bytes, record bytes, slot count, entry
+            count and the RaceRules fingerprint of the drivers it was solved for
+    slots   open-addressing hash table of (packed state + 1, record); a zero key
+            marks an empty slot
+
+Each record holds one byte for the best offensive move of the side to move
+followed by one byte per offensive move for the defender's best response
+(0 = skip, i + 1 = defensive move i). NO_ACTION marks entries that do not apply.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from drivers import Driver, Mostafa, Verstappen
+from game_state import GameState, RaceRules
+from moves import DefensiveMove, OffensiveMove
+from policies import Policy
+from solver import GameSolver
+
+MAGIC = b"F1PT"
+FORMAT_VERSION = 1
+NO_ACTION = 0xFF
+SKIP_DEFENSE = 0
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "policy_table.bin"
+)
+
+_HEADER = struct.Struct("<4sHBBQQ64s")
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class PolicyTableError(Exception):
+    """Raised when a policy table file is missing or unreadable."""
+
+
+class StalePolicyTableError(PolicyTableError):
+    """Raised when a policy table was solved for different move definitions."""
+
+
+def _slot_of(key: int, n_slots: int) -> int:
+    """Home slot of a packed key in a table of n_slots (a power of two)."""
+    return ((key * _HASH_MULTIPLIER) & _MASK64) % n_slots
+
+
+def _record_size(rules: RaceRules) -> int:
+    """Bytes per record: best attack plus one response per attack."""
+    return 1 + max(len(seat.offensive) for seat in rules.seats)
+
+
+def _key_size(rules: RaceRules) -> int:
+    """Bytes needed to store a packed key plus one."""
+    return (rules.key_space.bit_length() + 7) // 8
+
+
+class PolicyTable:
+    """Read-only, memory-mapped view of a policy table file."""
+
+    def __init__(self, path: str, rules: RaceRules):
+        """Map a table file and check it matches the rules.
+
+        Args:
+            path: Table file written by build_policy_table()
+            rules: Rules of the drivers that will use the table
+
+        Raises:
+            PolicyTableError: If the file is missing or malformed
+            StalePolicyTableError: If the file was built for other moves
+        """
+        self.rules = rules
+        try:
+            with open(path, "rb") as handle:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            raise PolicyTableError(f"Cannot open policy table {path}: {error}")
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise PolicyTableError(f"Truncated policy table {path}")
+        magic, version, key_size, record_size, n_slots, n_entries, fingerprint = (
+            _HEADER.unpack_from(self._map, 0)
+        )
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise PolicyTableError(f"Unsupported policy table {path}")
+        if (
+            fingerprint.decode("ascii") != rules.fingerprint
+            or key_size != _key_size(rules)
+            or record_size != _record_size(rules)
+        ):
+            self.close()
+            raise StalePolicyTableError(f"Policy table {path} is out of date")
+        if len(self._map) != _HEADER.size + n_slots * (key_size + record_size):
+            self.close()
+            raise PolicyTableError(f"Truncated policy table {path}")
+
+        self.n_slots = n_slots
+        self.n_entries = n_entries
+        self._key_size = key_size
+        self._record_size = record_size
+        self._slot_size = key_size + record_size
+
+    def close(self) -> None:
+        """Unmap the table file."""
+        self._map.close()
+
+    def lookup(self, state: GameState) -> Optional[bytes]:
+        """Find the record of a position.
+
+        Args:
+            state: Position at the start of a turn
+
+        Returns:
+            Record bytes, or None if the position is not in the table
+        """
+        key = self.rules.pack(state) + 1
+        data, key_size, slot_size = self._map, self._key_size, self._slot_size
+        slot = _slot_of(key - 1, self.n_slots)
+        while True:
+            start = _HEADER.size + slot * slot_size
+            split, end = start + key_size, start + slot_size
+            stored = int.from_bytes(data[start:split], "little")
+            if stored == key:
+                return data[split:end]
+            if stored == 0:
+                return None
+            slot = (slot + 1) % self.n_slots
+
+    def best_offensive(self, state: GameState) -> Optional[int]:
+        """Stored optimal attack for the side to move, None if not stored."""
+        record = self.lookup(state)
+        if record is None or record[0] == NO_ACTION:
+            return None
+        return record[0]
+
+    def best_defensive(self, state: GameState, offensive: int) -> Tuple[bool, int]:
+        """Stored optimal response to an attack.
+
+        Args:
+            state: Position before the attack, attacker to move
+            offensive: Index of the attacker's offensive move
+
+        Returns:
+            (found, defensive) where defensive is an index into the
+            defender's defensive moves, or None to skip
+        """
+        record = self.lookup(state)
+        if record is None or record[1 + offensive] == NO_ACTION:
+            return False, None
+        response = record[1 + offensive]
+        return True, None if response == SKIP_DEFENSE else response - 1
+
+
+def _settle(rules: RaceRules, state: GameState) -> GameState:
+    """Apply forced fuel-exhaustion penalties until someone can attack."""
+    while rules.result(state) is None and not rules.can_attack(state, state.to_move):
+        state = rules.penalize(state)
+    return state
+
+
+def _solve_records(
+    solver: GameSolver, roots: Iterable[GameState]
+) -> Dict[int, bytearray]:
+    """Solve every turn a table-following driver can face from the roots.
+
+    The table owner, in either seat, plays its stored move while the opponent
+    may play anything, so every line a TablePolicy can meet is covered. Only
+    the owner's side of each record is filled in; the rest stays NO_ACTION.
+    """
+    rules = solver.rules
+    width = _record_size(rules)
+    records: Dict[int, bytearray] = {}
+
+    for owner in (0, 1):
+        seen = set()
+        stack = [_settle(rules, root) for root in roots]
+        while stack:
+            state = stack.pop()
+            if state in seen or rules.result(state) is not None:
+                continue
+            seen.add(state)
+            key = rules.pack(state)
+            record = records.get(key)
+            if record is None:
+                record = records[key] = bytearray([NO_ACTION]) * width
+            children = []
+            if state.to_move == owner:
+                offensive = solver.best_offensive(state)
+                record[0] = offensive
+                for defensive in rules.legal_defensive(state) + [None]:
+                    children.append(rules.attack(state, offensive, defensive))
+            else:
+                for offensive in rules.legal_offensive(state):
+                    defensive = solver.best_defensive(state, offensive)
+                    record[1 + offensive] = (
+                        SKIP_DEFENSE if defensive is None else defensive + 1
+                    )
+                    children.append(rules.attack(state, offensive, defensive))
+            stack.extend(_settle(rules, child) for child in children)
+    return records
+
+
+def build_policy_table(
+    path: str = DEFAULT_TABLE_PATH,
+    driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa),
+    roots: Optional[List[GameState]] = None,
+) -> int:
+    """Solve the game and write the optimal-policy table file.
+
+    Args:
+        path: Destination file; replaced atomically
+        driver_classes: Driver classes for seat 0 and seat 1
+        roots: Starting positions to cover (defaults to both race starts)
+
+    Returns:
+        Number of positions written
+    """
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10_000))
+    solver = GameSolver(driver_classes)
+    rules = solver.rules
+    if roots is None:
+        roots = [rules.initial_state(0), rules.initial_state(1)]
+    records = _solve_records(solver, roots)
+
+    key_size, record_size = _key_size(rules), _record_size(rules)
+    slot_size = key_size + record_size
+    n_slots = 1 << max(4, (2 * len(records) - 1).bit_length())
+    slots = bytearray(n_slots * slot_size)
+    for key, record in records.items():
+        slot = _slot_of(key, n_slots)
+        while True:
+            start = slot * slot_size
+            split, end = start + key_size, start + slot_size
+            if not any(slots[start:split]):
+                break
+            slot = (slot + 1) % n_slots
+        slots[start:split] = (key + 1).to_bytes(key_size, "little")
+        slots[split:end] = record
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        key_size,
+        record_size,
+        n_slots,
+        len(records),
+        rules.fingerprint.encode("ascii"),
+    )
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(header)
+        handle.write(slots)
+    os.replace(temporary, path)
+    return len(records)
+
+
+class TablePolicy(Policy):
+    """Plays stored optimal moves, one table lookup per decision."""
+
+    name = "table"
+
+    def __init__(
+        self,
+        path: str = DEFAULT_TABLE_PATH,
+        driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa),
+        rebuild: bool = False,
+    ):
+        """Map the table.
+
+        Args:
+            path: Table file location
+            driver_classes: Driver classes for seat 0 and seat 1
+            rebuild: Solve and write a missing or stale table instead of
+                raising; for the full game this takes minutes
+
+        Raises:
+            PolicyTableError: If the table is missing, unreadable or stale
+                and rebuild is not set
+        """
+        self.rules = RaceRules(driver_classes)
+        self._driver_classes = driver_classes
+        self._solver: Optional[GameSolver] = None
+        try:
+            self.table = PolicyTable(path, self.rules)
+        except PolicyTableError as error:
+            if not rebuild:
+                raise type(error)(
+                    f"{error}; build it with build_policy_table() or pass "
+                    "rebuild=True"
+                ) from error
+            build_policy_table(path, driver_classes)
+            self.table = PolicyTable(path, self.rules)
+
+    def _fallback(self) -> GameSolver:
+        """Solver for positions the table does not cover."""
+        if self._solver is None:
+            self._solver = GameSolver(self._driver_classes)
+        return self._solver
+
+    def choose_offensive(self, simulator, moves: List[OffensiveMove]) -> int:
+        state = self.rules.state_of(simulator)
+        offensive = self.table.best_offensive(state)
+        if offensive is None:
+            offensive = self._fallback().best_offensive(state)
+        chosen = simulator.current_driver.get_offensive_moves()[offensive]
+        return moves.index(chosen)
+
+    def choose_defensive(
+        self, simulator, moves: List[DefensiveMove], base_damage: int
+    ) -> Optional[int]:
+        attacker = simulator.current_driver
+        offensive = attacker.get_offensive_moves().index(simulator.last_offensive_move)
+        paid = self.rules.state_of(simulator)
+        state = self.rules.refund_offensive(paid, offensive)
+        found, defensive = self.table.best_defensive(state, offensive)
+        if not found:
+            defensive = self._fallback().best_defensive(state, offensive)
+        if defensive is None:
+            return None
+        return moves.index(simulator.opponent.get_defensive_moves()[defensive])
+
+
+def main() -> None:
+    """Build the policy table and report its size."""
+    start = time.perf_counter()
+    count = build_policy_table()
+    size = os.path.getsize(DEFAULT_TABLE_PATH)
+    print(f"Solved {count:,} positions in {time.perf_counter() - start:.1f}s")
+    print(f"Wrote {os.path.abspath(DEFAULT_TABLE_PATH)} ({size / 1024:.0f} KiB)")
+
+    table = PolicyTable(DEFAULT_TABLE_PATH, RaceRules())
+    state = table.rules.initial_state()
+    n = 100_000
+    start = time.perf_counter()
+    for _ in range(n):
+        table.best_offensive(state)
+    elapsed = time.perf_counter() - start
+    print(f"Lookup: {elapsed / n * 1e6:.2f} us per decision")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,22 +3,95 @@ F1 Race Simulator main game logic.
 Implements the RaceSimulator class for turn-based racing between drivers.
 """
 
-from typing import Optional
-from drivers import Verstappen, Mostafa
+import argparse
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple, Type
+from drivers import Driver, Verstappen, Mostafa
+from event_log import TurnEvent
+from game_state import FUEL_PENALTY_DAMAGE, GameState
+from instrumentation import RaceMetrics
+from mcts import MCTSPolicy
+from moves import DefensiveMove, OffensiveMove
+from policies import Policy
+from policy_table import PolicyTableError, TablePolicy, build_policy_table
+from renderers import RENDERERS, Renderer, TextRenderer
+from roster import load_roster
+
+
+class MoveRecord(NamedTuple):
+    """Deltas applied by RaceSimulator.make_move, enough to undo the turn."""
+
+    attacker: Driver
+    defender: Driver
+    offensive: Optional[OffensiveMove]  # None for a fuel-exhaustion penalty
+    defensive: Optional[DefensiveMove]
+    fuel_spent: int
+    defense_fuel_spent: int
+    damage: int  # Tire health lost (by the attacker when penalized)
+    last_offensive_move: Optional[OffensiveMove]  # Value before the turn
+
+
+class Snapshot(NamedTuple):
+    """Complete position of a RaceSimulator."""
+
+    state: GameState
+    turn_number: int
+    winner: Optional[str]
+    win_reason: Optional[str]
 
 
 class RaceSimulator:
     """Main game controller for F1 Racing Simulator."""
 
-    def __init__(self):
-        """Initialize the race simulator with two drivers."""
-        self.verstappen = Verstappen()
-        self.mostafa = Mostafa()
+    def __init__(
+        self,
+        policies: Optional[Dict[str, Policy]] = None,
+        seed: int = 0,
+        driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa),
+        record_events: bool = False,
+        renderer: Optional[Renderer] = None,
+        metrics: Optional[RaceMetrics] = None,
+    ):
+        """Initialize the race simulator with two drivers.
+
+        Args:
+            policies: Optional mapping of driver name to Policy; drivers without
+                a policy are controlled interactively
+            seed: Seed used by randomized policies
+            driver_classes: Driver classes for seat 0 and seat 1 (defaults to
+                the drivers of rosters/default.json)
+            record_events: Keep a TurnEvent per turn in self.events, for
+                event_log.game_log_of()
+            renderer: Output for race events (defaults to TextRenderer; use
+                NullRenderer for headless races)
+            metrics: Optional RaceMetrics to time and count this race's turns;
+                without it the race carries no instrumentation at all
+
+        Raises:
+            ValueError: If both drivers have the same name, since policies and
+                results are keyed by driver name
+        """
+        self.verstappen = driver_classes[0]()
+        self.mostafa = driver_classes[1]()
+        if self.verstappen.name == self.mostafa.name:
+            raise ValueError(f"Both seats are driven by {self.verstappen.name}")
         self.current_driver = self.verstappen
         self.opponent = self.mostafa
         self.turn_number = 1
+        self.policies = dict(policies or {})
+        self.seed = seed
+        self.last_offensive_move: Optional[OffensiveMove] = None
+        self.events: Optional[List[TurnEvent]] = [] if record_events else None
+        self.renderer = renderer if renderer is not None else TextRenderer()
         self._winner = None
         self._win_reason = None
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.attach(self)
+
+    def _seat(self, driver: Driver) -> int:
+        """Seat index of a driver: 0 for the first driver, 1 for the second."""
+        return 0 if driver is self.verstappen else 1
 
     def switch_turns(self) -> None:
         """Switch active driver and opponent for next turn."""
@@ -30,6 +103,169 @@ class RaceSimulator:
             self.opponent = self.mostafa
         self.turn_number += 1
 
+    def is_race_over(self) -> bool:
+        """Check whether the race has been decided.
+
+        Returns:
+            True if a driver has no tire health left or neither can attack
+        """
+        if not self.verstappen.is_alive() or not self.mostafa.is_alive():
+            return True
+        return not (
+            self.current_driver.can_make_any_offensive_move()
+            or self.opponent.can_make_any_offensive_move()
+        )
+
+    def make_move(
+        self, offensive: Optional[int] = None, defensive: Optional[int] = None
+    ) -> MoveRecord:
+        """Play one turn without any input or output, for lookahead search.
+
+        A current driver who cannot attack takes the fuel-exhaustion penalty
+        instead and the move indices are ignored. Turns switch either way.
+
+        Args:
+            offensive: Index into the current driver's offensive moves
+            defensive: Index into the opponent's defensive moves, None to skip
+
+        Returns:
+            MoveRecord to pass to unmake_move
+
+        Raises:
+            ValueError: If a move index is missing or out of range, or a chosen
+                move cannot be used
+        """
+        attacker, defender = self.current_driver, self.opponent
+        previous = self.last_offensive_move
+
+        if not attacker.can_make_any_offensive_move():
+            before = attacker.tire_health
+            attacker.take_damage(FUEL_PENALTY_DAMAGE)
+            record = MoveRecord(
+                attacker,
+                defender,
+                None,
+                None,
+                0,
+                0,
+                before - attacker.tire_health,
+                previous,
+            )
+            self.switch_turns()
+            return record
+
+        move = self._move_at(attacker, attacker.get_offensive_moves(), offensive)
+        if not move.can_use(attacker.fuel):
+            raise ValueError(f"{attacker.name} cannot use {move.name}")
+        block = None
+        if defensive is not None:
+            block = self._move_at(defender, defender.get_defensive_moves(), defensive)
+            if not block.can_use(defender.fuel):
+                raise ValueError(f"{defender.name} cannot use {block.name}")
+
+        damage = attacker.execute_offensive_move(move)
+        self.last_offensive_move = move
+        if block is not None:
+            reduction = defender.execute_defensive_move(block)
+            damage = int(damage * (1 - reduction))
+
+        before = defender.tire_health
+        defender.take_damage(damage)
+        record = MoveRecord(
+            attacker,
+            defender,
+            move,
+            block,
+            move.fuel_cost,
+            0 if block is None else block.fuel_cost,
+            before - defender.tire_health,
+            previous,
+        )
+        self.switch_turns()
+        return record
+
+    @staticmethod
+    def _move_at(driver: Driver, moves: list, index: Optional[int]):
+        """Move at index in a driver's move list.
+
+        Raises:
+            ValueError: If index is None or out of range
+        """
+        if index is None or not 0 <= index < len(moves):
+            raise ValueError(f"{driver.name} has no move at index {index!r}")
+        return moves[index]
+
+    def unmake_move(self, record: MoveRecord) -> None:
+        """Revert the turn recorded by make_move.
+
+        Records must be unmade in reverse order of making them.
+
+        Args:
+            record: MoveRecord returned by make_move
+        """
+        self.current_driver = record.attacker
+        self.opponent = record.defender
+        self.turn_number -= 1
+        self.last_offensive_move = record.last_offensive_move
+
+        if record.offensive is None:
+            record.attacker.repair_tires(record.damage)
+            return
+
+        record.defender.repair_tires(record.damage)
+        if record.defensive is not None:
+            record.defender.refuel(record.defense_fuel_spent)
+            record.defensive.restore_use()
+        record.attacker.refuel(record.fuel_spent)
+        record.offensive.restore_use()
+
+    def _limited_moves(self, driver: Driver) -> list:
+        """Moves of a driver whose uses are limited, in a fixed order."""
+        return [
+            move
+            for move in driver.get_offensive_moves() + driver.get_defensive_moves()
+            if move.uses_remaining is not None
+        ]
+
+    def snapshot(self) -> Snapshot:
+        """Capture the whole position so it can be restored later.
+
+        Returns:
+            Immutable Snapshot of both drivers, turn and result
+        """
+        drivers = (self.verstappen, self.mostafa)
+        state = GameState(
+            0 if self.current_driver is self.verstappen else 1,
+            (self.verstappen.tire_health, self.mostafa.tire_health),
+            (self.verstappen.fuel, self.mostafa.fuel),
+            tuple(
+                move.uses_remaining
+                for driver in drivers
+                for move in self._limited_moves(driver)
+            ),
+        )
+        return Snapshot(state, self.turn_number, self._winner, self._win_reason)
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Return the simulator to a position captured by snapshot().
+
+        Args:
+            snapshot: Snapshot taken from this simulator
+        """
+        state = snapshot.state
+        drivers = (self.verstappen, self.mostafa)
+        uses = iter(state.uses)
+        for driver, tire_health, fuel in zip(drivers, state.tire_health, state.fuel):
+            driver.set_stats(tire_health, fuel)
+            for move in self._limited_moves(driver):
+                move.uses_remaining = next(uses)
+
+        self.current_driver = drivers[state.to_move]
+        self.opponent = drivers[1 - state.to_move]
+        self.turn_number = snapshot.turn_number
+        self._winner = snapshot.winner
+        self._win_reason = snapshot.win_reason
+
     def display_move_menu(self, moves: list, move_type: str) -> None:
         """Display numbered menu of available moves.
 
@@ -37,28 +273,34 @@ class RaceSimulator:
             moves: List of moves to display
             move_type: Type of moves ("Offensive" or "Defensive")
         """
-        print(f"\n{move_type} Moves:")
-        for i, move in enumerate(moves, 1):
-            uses_text = ""
-            if move.uses_remaining is not None:
-                uses_text = f" (Uses left: {move.uses_remaining})"
-
-            availability = "✓" if move.can_use(self.current_driver.fuel) else "✗"
-            print(
-                f"{i}. {move.name} - Fuel: {move.fuel_cost}{uses_text} [{availability}]"
-            )
-            print(f"   {move.description}")
+        self.renderer.move_menu(self, moves, move_type)
 
-    def get_move_choice(self, moves: list, move_type: str) -> Optional[int]:
+    def get_move_choice(
+        self, moves: list, move_type: str, base_damage: int = 0
+    ) -> Optional[int]:
         """Get player's move choice with validation.
 
+        Drivers with a registered policy choose automatically; everyone else
+        is prompted for input.
+
         Args:
             moves: List of available moves
             move_type: Type of moves being selected
+            base_damage: Incoming damage when choosing a defensive move
 
         Returns:
             Index of chosen move or None if skipping defensive move
         """
+        if move_type == "Defensive":
+            policy = self.policies.get(self.opponent.name)
+            if policy is not None:
+                return policy.choose_defensive(self, moves, base_damage)
+        else:
+            policy = self.policies.get(self.current_driver.name)
+            if policy is not None:
+                return policy.choose_offensive(self, moves)
+
+        self.renderer.flush()
         while True:
             if move_type == "Defensive":
                 choice = input(
@@ -76,14 +318,14 @@ class RaceSimulator:
                     if selected_move.can_use(self.current_driver.fuel):
                         return choice_num - 1
                     else:
-                        print(
-                            "Cannot use this move - insufficient fuel or "
-                            "no uses remaining!"
-                        )
+                        self.renderer.move_rejected(selected_move)
                 else:
-                    print(f"Please enter a number between 1 and {len(moves)}")
+                    self.renderer.notice(
+                        f"Please enter a number between 1 and {len(moves)}"
+                    )
             except ValueError:
-                print("Please enter a valid number")
+                self.renderer.notice("Please enter a valid number")
+            self.renderer.flush()
 
     def execute_turn(self) -> bool:
         """Execute a complete turn (offensive move + optional defensive response).
@@ -91,54 +333,47 @@ class RaceSimulator:
         Returns:
             True if game should continue, False if game is over
         """
-        print(f"\n{'='*50}")
-        print(f"Turn {self.turn_number}: {self.current_driver.name}'s Turn")
-        print(f"{'='*50}")
+        try:
+            return self._play_turn()
+        finally:
+            self.renderer.flush()
 
-        # Display current stats
-        print("\nCurrent Stats:")
-        verstappen_stats = self.verstappen.get_stats()
-        mostafa_stats = self.mostafa.get_stats()
-        v_health = verstappen_stats["tire_health"]
-        v_fuel = verstappen_stats["fuel"]
-        m_health = mostafa_stats["tire_health"]
-        m_fuel = mostafa_stats["fuel"]
-        print(f"Verstappen: Tire Health={v_health}, Fuel={v_fuel}")
-        print(f"Mostafa: Tire Health={m_health}, Fuel={m_fuel}")
+    def _play_turn(self) -> bool:
+        """Play the current driver's turn, reporting it to the renderer."""
+        self.renderer.turn_started(self)
 
         # Check for fuel exhaustion scenarios
         if not self.current_driver.can_make_any_offensive_move():
             if not self.opponent.can_make_any_offensive_move():
                 # Both players stuck - determine winner by resources
-                print("\nBoth drivers are out of fuel!")
-                print("Determining winner by remaining resources...")
+                self.renderer.both_stranded(self)
                 return self._determine_winner_by_resources()
             else:
                 # Only current player stuck - penalty and skip turn
-                print(
-                    f"\n{self.current_driver.name} is out of fuel and must skip turn!"
-                )
-                print("Applying 5 tire damage penalty for fuel exhaustion...")
+                before = self.current_driver.tire_health
                 self.current_driver.take_damage(5)
+                if self.events is not None:
+                    self.events.append(
+                        TurnEvent(
+                            self._seat(self.current_driver),
+                            None,
+                            None,
+                            before - self.current_driver.tire_health,
+                            0,
+                            0,
+                        )
+                    )
+                self.renderer.fuel_penalty(self.current_driver)
 
                 # Check if penalty caused elimination
                 if not self.current_driver.is_alive():
-                    print(
-                        f"{self.current_driver.name} eliminated by fuel "
-                        "exhaustion penalty!"
-                    )
                     return False
 
-                print(f"{self.current_driver.name} survives but skips turn.")
                 return True  # Continue game with turn switch
 
         # Display fuel warning if critical
         if self.current_driver.fuel <= 50:
-            fuel_remaining = self.current_driver.fuel
-            print(
-                f"\n⚠️  FUEL CRITICAL for {self.current_driver.name}! "
-                f"({fuel_remaining} remaining)"
-            )
+            self.renderer.fuel_warning(self.current_driver)
 
         # Get offensive move from current driver
         offensive_moves = self.current_driver.get_offensive_moves()
@@ -149,16 +384,15 @@ class RaceSimulator:
             return False
 
         chosen_offensive = offensive_moves[offensive_choice]
+        attacker_fuel, defender_fuel = self.current_driver.fuel, self.opponent.fuel
         base_damage = self.current_driver.execute_offensive_move(chosen_offensive)
+        self.last_offensive_move = chosen_offensive
 
         if base_damage is None:
-            print("Failed to execute move!")
+            self.renderer.move_failed()
             return False
 
-        print(
-            f"\n{self.current_driver.name} used {chosen_offensive.name} - "
-            f"{chosen_offensive.description}"
-        )
+        self.renderer.offensive_used(self.current_driver, chosen_offensive)
 
         # Get defensive response from opponent
         defensive_moves = self.opponent.get_defensive_moves()
@@ -167,12 +401,15 @@ class RaceSimulator:
         ]
 
         final_damage = base_damage
+        chosen_defensive = None
 
         if available_defensive:
-            print(f"\n{self.opponent.name} can respond defensively:")
+            self.renderer.defense_offered(self.opponent)
             self.display_move_menu(available_defensive, "Defensive")
 
-            defensive_choice = self.get_move_choice(available_defensive, "Defensive")
+            defensive_choice = self.get_move_choice(
+                available_defensive, "Defensive", base_damage
+            )
             if defensive_choice is not None:
                 chosen_defensive = available_defensive[defensive_choice]
                 damage_reduction = self.opponent.execute_defensive_move(
@@ -181,21 +418,27 @@ class RaceSimulator:
 
                 if damage_reduction is not None:
                     final_damage = int(base_damage * (1 - damage_reduction))
-                    print(f"{self.opponent.name} defended with {chosen_defensive.name}")
+                    self.renderer.defended(self.opponent, chosen_defensive)
 
         # Apply damage
+        before = self.opponent.tire_health
         self.opponent.take_damage(final_damage)
-        print(f"Damage dealt: {final_damage} tire health")
-
-        # Display updated stats
-        verstappen_stats = self.verstappen.get_stats()
-        mostafa_stats = self.mostafa.get_stats()
-        v_health = verstappen_stats["tire_health"]
-        v_fuel = verstappen_stats["fuel"]
-        m_health = mostafa_stats["tire_health"]
-        m_fuel = mostafa_stats["fuel"]
-        print(f"Verstappen: Tire Health={v_health}, Fuel={v_fuel}")
-        print(f"Mostafa: Tire Health={m_health}, Fuel={m_fuel}")
+        if self.events is not None:
+            self.events.append(
+                TurnEvent(
+                    self._seat(self.current_driver),
+                    offensive_choice,
+                    (
+                        None
+                        if chosen_defensive is None
+                        else defensive_moves.index(chosen_defensive)
+                    ),
+                    before - self.opponent.tire_health,
+                    attacker_fuel - self.current_driver.fuel,
+                    defender_fuel - self.opponent.fuel,
+                )
+            )
+        self.renderer.damage_dealt(self, final_damage)
 
         # Check for winner
         if not self.opponent.is_alive():
@@ -217,30 +460,24 @@ class RaceSimulator:
         fuel_diff = abs(verstappen_stats["fuel"] - mostafa_stats["fuel"])
         tire_diff = abs(verstappen_stats["tire_health"] - mostafa_stats["tire_health"])
 
-        print("\nResource Comparison:")
-        v_fuel = verstappen_stats["fuel"]
-        v_health = verstappen_stats["tire_health"]
-        m_fuel = mostafa_stats["fuel"]
-        m_health = mostafa_stats["tire_health"]
-        print(f"Verstappen: {v_fuel} fuel, {v_health} tire health")
-        print(f"Mostafa: {m_fuel} fuel, {m_health} tire health")
+        self.renderer.resource_comparison(self)
 
         # Primary comparison: fuel (if significant difference)
         if fuel_diff >= 10:
             if verstappen_stats["fuel"] > mostafa_stats["fuel"]:
-                self._winner = "Max Verstappen"
+                self._winner = self.verstappen.name
                 self._win_reason = "Superior fuel management"
             else:
-                self._winner = "Mostafa"
+                self._winner = self.mostafa.name
                 self._win_reason = "Superior fuel management"
 
         # Secondary comparison: tire health (if fuel is close)
         elif tire_diff >= 5:
             if verstappen_stats["tire_health"] > mostafa_stats["tire_health"]:
-                self._winner = "Max Verstappen"
+                self._winner = self.verstappen.name
                 self._win_reason = "Better tire condition"
             else:
-                self._winner = "Mostafa"
+                self._winner = self.mostafa.name
                 self._win_reason = "Better tire condition"
 
         # Draw if resources are very close
@@ -250,46 +487,43 @@ class RaceSimulator:
 
         return False  # End the game
 
-    def display_winner(self) -> None:
-        """Display race results and winner."""
-        print(f"\n{'='*50}")
-        print("RACE FINISHED!")
-        print(f"{'='*50}")
-
-        verstappen_stats = self.verstappen.get_stats()
-        mostafa_stats = self.mostafa.get_stats()
+    def determine_winner(self) -> Tuple[str, str]:
+        """Determine the race winner and the reason for the result.
 
+        Returns:
+            Tuple of (winner name or "Draw", reason)
+        """
         # Check if winner was determined by resources
         if hasattr(self, "_winner") and self._winner is not None:
-            winner = self._winner
-            reason = self._win_reason
-        else:
-            # Original win condition logic (tire health)
-            if self.verstappen.is_alive() and not self.mostafa.is_alive():
-                winner = "Max Verstappen"
-                reason = "Opponent tire failure"
-            elif self.mostafa.is_alive() and not self.verstappen.is_alive():
-                winner = "Mostafa"
-                reason = "Opponent tire failure"
-            else:
-                winner = "Draw"
-                reason = "Both drivers unable to continue"
-
-        print(f"Winner: {winner}")
-        print(f"Reason: {reason}")
-        print("\nFinal Race Statistics:")
-        v_health = verstappen_stats["tire_health"]
-        v_fuel = verstappen_stats["fuel"]
-        m_health = mostafa_stats["tire_health"]
-        m_fuel = mostafa_stats["fuel"]
-        print(f"Verstappen: Tire Health={v_health}, Fuel={v_fuel}")
-        print(f"Mostafa: Tire Health={m_health}, Fuel={m_fuel}")
+            return self._winner, self._win_reason
+
+        # Original win condition logic (tire health)
+        if self.verstappen.is_alive() and not self.mostafa.is_alive():
+            return self.verstappen.name, "Opponent tire failure"
+        if self.mostafa.is_alive() and not self.verstappen.is_alive():
+            return self.mostafa.name, "Opponent tire failure"
+        return "Draw", "Both drivers unable to continue"
+
+    def display_winner(self) -> None:
+        """Display race results and winner."""
+        winner, reason = self.determine_winner()
+        self.renderer.race_finished(self, winner, reason)
+        self.renderer.flush()
 
     def start_race(self) -> None:
         """Start the main race loop."""
-        print("Welcome to F1 Racing Simulator: The Final Race - Verstappen vs Mostafa")
-        print("Initial stats: Tire Health=100, Fuel=500 for both drivers")
+        self.renderer.race_started(self)
+        self.renderer.flush()
+
+        self.run_race()
+        self.display_winner()
 
+    def run_race(self) -> Tuple[str, str]:
+        """Play turns until the race is decided.
+
+        Returns:
+            Tuple of (winner name or "Draw", reason)
+        """
         while True:
             if not self.execute_turn():
                 break
@@ -299,13 +533,102 @@ class RaceSimulator:
 
             self.switch_turns()
 
-        self.display_winner()
-
+        return self.determine_winner()
+
+
+def _table_policy(driver_classes: Tuple[Type[Driver], Type[Driver]]) -> TablePolicy:
+    """TablePolicy for main(), solving the table first if missing or stale."""
+    try:
+        return TablePolicy(driver_classes=driver_classes)
+    except PolicyTableError:
+        print("Solving the race for the policy table (one-off)...")
+        start = time.perf_counter()
+        count = build_policy_table(driver_classes=driver_classes)
+        print(f"Stored {count:,} positions in {time.perf_counter() - start:.0f}s")
+        return TablePolicy(driver_classes=driver_classes)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main entry point for the race simulator.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(
+        description="F1 Racing Simulator: The Final Race - Verstappen vs Mostafa"
+    )
+    parser.add_argument(
+        "--ai",
+        choices=["verstappen", "mostafa", "both"],
+        help="driver(s) controlled by the computer opponent (with --roster, "
+        "verstappen is the first driver and mostafa the second)",
+    )
+    parser.add_argument("--roster", help="JSON or TOML roster of drivers and moves")
+    parser.add_argument(
+        "--drivers",
+        nargs=2,
+        default=(),
+        metavar=("FIRST", "SECOND"),
+        help="roster drivers to race (default: the first two in the roster)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["mcts", "table"],
+        default="mcts",
+        help="computer opponent: time-budgeted tree search or the precomputed "
+        "optimal-policy table (default: mcts)",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=50.0,
+        help="AI thinking time per decision in milliseconds (default: 50)",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=sorted(RENDERERS),
+        default="text",
+        help="race output: line by line, one write per turn, or none "
+        "(default: text)",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="append per-phase timings and event counts to this JSON-lines file",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+
+    driver_classes = (Verstappen, Mostafa)
+    if args.roster:
+        driver_classes = load_roster(args.roster).pair(*args.drivers)
+
+    simulator = RaceSimulator(
+        seed=args.seed,
+        driver_classes=driver_classes,
+        renderer=RENDERERS[args.renderer](),
+        metrics=RaceMetrics(args.metrics) if args.metrics else None,
+    )
+    table = None
+    for key, driver in (
+        ("verstappen", simulator.verstappen),
+        ("mostafa", simulator.mostafa),
+    ):
+        if args.ai in (key, "both"):
+            if args.engine == "table":
+                table = table or _table_policy(driver_classes)
+                simulator.policies[driver.name] = table
+            else:
+                simulator.policies[driver.name] = MCTSPolicy(
+                    args.budget_ms / 1000,
+                    seed=args.seed,
+                    verbose=True,
+                    driver_classes=driver_classes,
+                )
 
-def main() -> None:
-    """Main entry point for the race simulator."""
-    simulator = RaceSimulator()
     simulator.start_race()
+    if simulator.metrics is not None:
+        simulator.metrics.write_snapshot()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,357 @@
+"""
+Output renderers for F1 Racing Simulator.
+Implements the Renderer interface through which RaceSimulator reports race
+events, with TextRenderer (the classic terminal output), BufferedRenderer (one
+write per turn) and NullRenderer (no output at all).
+
+RaceSimulator hands renderers raw events (drivers, moves, damage) rather than
+text, so every string is formatted inside a renderer, and a NullRenderer never
+formats anything.
+"""
+
+import sys
+from typing import List, Optional, TextIO
+
+from drivers import Driver
+from moves import DefensiveMove, Move, OffensiveMove
+
+RULE = "=" * 50
+
+
+class Renderer:
+    """Receiver of race events; the base class ignores them all."""
+
+    name = "renderer"
+
+    def race_started(self, simulator) -> None:
+        """A race is about to start.
+
+        Args:
+            simulator: RaceSimulator with both drivers at their initial stats
+        """
+
+    def turn_started(self, simulator) -> None:
+        """A new turn begins.
+
+        Args:
+            simulator: RaceSimulator whose current driver is about to move
+        """
+
+    def both_stranded(self, simulator) -> None:
+        """Neither driver can attack, so resources decide the race.
+
+        Args:
+            simulator: RaceSimulator whose drivers are both out of fuel
+        """
+
+    def fuel_penalty(self, driver: Driver) -> None:
+        """A driver who cannot attack took the fuel-exhaustion penalty.
+
+        Args:
+            driver: Penalized driver (no longer alive if eliminated by it)
+        """
+
+    def fuel_warning(self, driver: Driver) -> None:
+        """The driver about to attack is low on fuel.
+
+        Args:
+            driver: Attacking driver
+        """
+
+    def move_menu(self, simulator, moves: list, move_type: str) -> None:
+        """Moves are offered to a driver.
+
+        Args:
+            simulator: RaceSimulator offering the moves
+            moves: Moves on offer
+            move_type: "Offensive" or "Defensive"
+        """
+
+    def notice(self, message: str) -> None:
+        """Feedback for the player, such as an invalid choice or AI statistics.
+
+        Args:
+            message: Text to show the player
+        """
+
+    def move_rejected(self, move: Move) -> None:
+        """An interactive player chose a move that cannot be used.
+
+        Args:
+            move: The rejected move
+        """
+
+    def offensive_used(self, driver: Driver, move: OffensiveMove) -> None:
+        """A driver attacked.
+
+        Args:
+            driver: Attacking driver
+            move: Offensive move used
+        """
+
+    def move_failed(self) -> None:
+        """A chosen offensive move could not be executed."""
+
+    def defense_offered(self, driver: Driver) -> None:
+        """The attacked driver may respond.
+
+        Args:
+            driver: Defending driver
+        """
+
+    def defended(self, driver: Driver, move: DefensiveMove) -> None:
+        """The attacked driver defended.
+
+        Args:
+            driver: Defending driver
+            move: Defensive move used
+        """
+
+    def damage_dealt(self, simulator, damage: int) -> None:
+        """The attack's final damage has been applied.
+
+        Args:
+            simulator: RaceSimulator after the damage
+            damage: Tire damage dealt
+        """
+
+    def resource_comparison(self, simulator) -> None:
+        """Both drivers' resources are compared to decide the race.
+
+        Args:
+            simulator: RaceSimulator being decided on resources
+        """
+
+    def race_finished(self, simulator, winner: str, reason: str) -> None:
+        """The race is over.
+
+        Args:
+            simulator: Finished RaceSimulator
+            winner: Winner name or "Draw"
+            reason: Reason for the result
+        """
+
+    def flush(self) -> None:
+        """Emit anything held back; called after each turn and before input."""
+
+
+class NullRenderer(Renderer):
+    """Renderer that formats and writes nothing, for headless simulation."""
+
+    name = "null"
+
+
+class TextRenderer(Renderer):
+    """The simulator's classic terminal output, written line by line."""
+
+    name = "text"
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """Create the renderer.
+
+        Args:
+            stream: Text stream to write to (defaults to sys.stdout at write time)
+        """
+        self.stream = stream
+
+    def write(self, text: str) -> None:
+        """Output one line of text.
+
+        Args:
+            text: Line to write, without the trailing newline
+        """
+        print(text, file=self.stream)
+
+    @staticmethod
+    def _label(driver: Driver) -> str:
+        """Short label of a driver in stats lines: the last word of their name."""
+        return driver.name.split()[-1]
+
+    def _stats(self, simulator) -> None:
+        """Write both drivers' tire health and fuel."""
+        for driver in (simulator.verstappen, simulator.mostafa):
+            self.write(
+                f"{self._label(driver)}: "
+                f"Tire Health={driver.tire_health}, Fuel={driver.fuel}"
+            )
+
+    def race_started(self, simulator) -> None:
+        """Write the welcome banner and initial stats."""
+        drivers = (simulator.verstappen, simulator.mostafa)
+        self.write(
+            "Welcome to F1 Racing Simulator: The Final Race - "
+            f"{self._label(drivers[0])} vs {self._label(drivers[1])}"
+        )
+        stats = {(driver.tire_health, driver.fuel) for driver in drivers}
+        if len(stats) == 1:
+            ((tire_health, fuel),) = stats
+            self.write(
+                f"Initial stats: Tire Health={tire_health}, Fuel={fuel} "
+                "for both drivers"
+            )
+            return
+        for driver in drivers:
+            self.write(
+                f"Initial stats for {driver.name}: "
+                f"Tire Health={driver.tire_health}, Fuel={driver.fuel}"
+            )
+
+    def turn_started(self, simulator) -> None:
+        """Write the turn header and current stats."""
+        self.write(f"\n{RULE}")
+        self.write(
+            f"Turn {simulator.turn_number}: {simulator.current_driver.name}'s Turn"
+        )
+        self.write(RULE)
+        self.write("\nCurrent Stats:")
+        self._stats(simulator)
+
+    def both_stranded(self, simulator) -> None:
+        """Announce that resources decide the race."""
+        self.write("\nBoth drivers are out of fuel!")
+        self.write("Determining winner by remaining resources...")
+
+    def fuel_penalty(self, driver: Driver) -> None:
+        """Announce the penalty and whether the driver survived it."""
+        self.write(f"\n{driver.name} is out of fuel and must skip turn!")
+        self.write("Applying 5 tire damage penalty for fuel exhaustion...")
+        if driver.is_alive():
+            self.write(f"{driver.name} survives but skips turn.")
+        else:
+            self.write(f"{driver.name} eliminated by fuel exhaustion penalty!")
+
+    def fuel_warning(self, driver: Driver) -> None:
+        """Warn that the attacking driver is low on fuel."""
+        self.write(f"\n⚠️  FUEL CRITICAL for {driver.name}! ({driver.fuel} remaining)")
+
+    def move_menu(self, simulator, moves: list, move_type: str) -> None:
+        """Write a numbered menu of moves with their availability."""
+        self.write(f"\n{move_type} Moves:")
+        for i, move in enumerate(moves, 1):
+            uses_text = ""
+            if move.uses_remaining is not None:
+                uses_text = f" (Uses left: {move.uses_remaining})"
+
+            availability = "✓" if move.can_use(simulator.current_driver.fuel) else "✗"
+            self.write(
+                f"{i}. {move.name} - Fuel: {move.fuel_cost}{uses_text} [{availability}]"
+            )
+            self.write(f"   {move.description}")
+
+    def notice(self, message: str) -> None:
+        """Write feedback for an interactive player."""
+        self.write(message)
+
+    def move_rejected(self, move: Move) -> None:
+        """Tell the player the chosen move cannot be used."""
+        self.notice("Cannot use this move - insufficient fuel or no uses remaining!")
+
+    def offensive_used(self, driver: Driver, move: OffensiveMove) -> None:
+        """Write the attack that was made."""
+        self.write(f"\n{driver.name} used {move.name} - {move.description}")
+
+    def move_failed(self) -> None:
+        """Report a move that could not be executed."""
+        self.write("Failed to execute move!")
+
+    def defense_offered(self, driver: Driver) -> None:
+        """Announce the defensive response menu."""
+        self.write(f"\n{driver.name} can respond defensively:")
+
+    def defended(self, driver: Driver, move: DefensiveMove) -> None:
+        """Write the defense that was made."""
+        self.write(f"{driver.name} defended with {move.name}")
+
+    def damage_dealt(self, simulator, damage: int) -> None:
+        """Write the damage dealt and the updated stats."""
+        self.write(f"Damage dealt: {damage} tire health")
+        self._stats(simulator)
+
+    def resource_comparison(self, simulator) -> None:
+        """Write both drivers' remaining resources."""
+        self.write("\nResource Comparison:")
+        for driver in (simulator.verstappen, simulator.mostafa):
+            self.write(
+                f"{self._label(driver)}: "
+                f"{driver.fuel} fuel, {driver.tire_health} tire health"
+            )
+
+    def race_finished(self, simulator, winner: str, reason: str) -> None:
+        """Write the result and final stats."""
+        self.write(f"\n{RULE}")
+        self.write("RACE FINISHED!")
+        self.write(RULE)
+        self.write(f"Winner: {winner}")
+        self.write(f"Reason: {reason}")
+        self.write("\nFinal Race Statistics:")
+        self._stats(simulator)
+
+
+class BufferedRenderer(TextRenderer):
+    """TextRenderer that collects each turn's lines and writes them at once."""
+
+    name = "buffered"
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """Create the renderer.
+
+        Args:
+            stream: Text stream to write to (defaults to sys.stdout at flush time)
+        """
+        super().__init__(stream)
+        self._lines: List[str] = []
+
+    def write(self, text: str) -> None:
+        """Hold one line until the next flush.
+
+        Args:
+            text: Line to write, without the trailing newline
+        """
+        self._lines.append(text)
+
+    def flush(self) -> None:
+        """Write all held lines as a single string."""
+        if self._lines:
+            self._lines.append("")
+            (self.stream or sys.stdout).write("\n".join(self._lines))
+            self._lines.clear()
+
+
+RENDERERS = {
+    TextRenderer.name: TextRenderer,
+    BufferedRenderer.name: BufferedRenderer,
+    NullRenderer.name: NullRenderer,
+}
+
+
+def main() -> None:
+    """Time automated races under each renderer, writing to the null device."""
+    import os
+    import time
+
+    # Imported here: race_simulator itself depends on this module.
+    from policies import POLICIES
+    from race_simulator import RaceSimulator
+
+    n_games = 2_000
+    with open(os.devnull, "w") as devnull:
+        for name, renderer_class in RENDERERS.items():
+            renderer = renderer_class() if name == "null" else renderer_class(devnull)
+            start = time.perf_counter()
+            for seed in range(n_games):
+                simulator = RaceSimulator(
+                    policies={
+                        "Max Verstappen": POLICIES["random"](),
+                        "Mostafa": POLICIES["greedy"](),
+                    },
+                    seed=seed,
+                    renderer=renderer,
+                )
+                simulator.run_race()
+                simulator.display_winner()
+            elapsed = time.perf_counter() - start
+            print(f"{name:>8}: {n_games / elapsed:,.0f} games/sec")
+
+
+if __name__ == "__main__":
+    main()
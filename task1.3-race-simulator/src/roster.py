@@ -0,0 +1,313 @@
+"""
+Data-driven driver roster for F1 Racing Simulator.
+Implements load_roster(), which reads drivers and their moves from a JSON or
+TOML file, validates them once and compiles each driver into a RosterDriver
+subclass whose move tables are shared, immutable MoveSpec flyweights.
+
+Compiled rosters are cached by the SHA-256 of the file contents, so starting
+thousands of simulators from one roster parses and validates it only once.
+Compiled driver classes pickle by their roster entry, so they can be sent to
+worker processes, which compile the entry again on arrival.
+
+Roster format (JSON shown; TOML uses [[drivers]] and [[drivers.offensive]]):
+    {"drivers": [{"name": "Max Verstappen", "tire_health": 100, "fuel": 500,
+                  "offensive": [{"name": "DRS Boost", "fuel_cost": 45,
+                                 "tire_damage": 12, "max_uses": null}],
+                  "defensive": [{"name": "Brake Late", "fuel_cost": 25,
+                                 "damage_reduction_percent": 0.3}]}]}
+"""
+
+import copyreg
+import hashlib
+import json
+import os
+import re
+import sys
+import weakref
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from drivers import Driver, RosterDriver
+from moves import DefensiveMoveSpec, MoveSpec, OffensiveMoveSpec
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+DEFAULT_ROSTER_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "rosters", "default.json"
+)
+
+_DRIVER_KEYS = {"name", "tire_health", "fuel", "offensive", "defensive"}
+_MOVE_KEYS = {"name", "fuel_cost", "max_uses", "description"}
+_OFFENSIVE_KEYS = _MOVE_KEYS | {"tire_damage"}
+_DEFENSIVE_KEYS = _MOVE_KEYS | {"damage_reduction_percent"}
+
+_CACHE: Dict[str, "Roster"] = {}
+# Compiled driver classes by canonical entry, so unpickling finds live classes
+_COMPILED: "weakref.WeakValueDictionary[str, type]" = weakref.WeakValueDictionary()
+
+
+class RosterError(ValueError):
+    """Raised when a roster file is malformed or fails validation."""
+
+
+class Roster(NamedTuple):
+    """Compiled roster: one Driver class per entry, in file order."""
+
+    drivers: Tuple[Type[Driver], ...]
+    digest: str
+
+    @property
+    def names(self) -> List[str]:
+        """Driver names in roster order."""
+        return [driver.NAME for driver in self.drivers]
+
+    def driver(self, name: str) -> Type[Driver]:
+        """Look up a driver class by name.
+
+        Args:
+            name: Driver name as written in the roster
+
+        Returns:
+            Compiled Driver subclass
+
+        Raises:
+            KeyError: If no driver has that name
+        """
+        for driver in self.drivers:
+            if driver.NAME == name:
+                return driver
+        raise KeyError(f"No driver named {name!r} in roster")
+
+    def pair(
+        self, first: Optional[str] = None, second: Optional[str] = None
+    ) -> Tuple[Type[Driver], Type[Driver]]:
+        """Driver classes for a two-car race.
+
+        Args:
+            first: Name of the driver who moves first (default: first entry)
+            second: Name of the other driver (default: second entry)
+
+        Returns:
+            Tuple of driver classes for seat 0 and seat 1
+
+        Raises:
+            RosterError: If the roster has fewer than two drivers, or both
+                seats name the same driver
+        """
+        if len(self.drivers) < 2:
+            raise RosterError("A race needs at least two drivers in the roster")
+        pair = (
+            self.driver(first) if first else self.drivers[0],
+            self.driver(second) if second else self.drivers[1],
+        )
+        if pair[0] is pair[1]:
+            raise RosterError(f"{pair[0].NAME} cannot race against themselves")
+        return pair
+
+
+def _check_keys(entry: Any, allowed: set, required: set, where: str) -> None:
+    """Check an entry is a table with only known keys and all required ones."""
+    if not isinstance(entry, dict):
+        raise RosterError(f"{where}: expected a table of fields")
+    unknown = set(entry) - allowed
+    if unknown:
+        raise RosterError(f"{where}: unknown field(s) {', '.join(sorted(unknown))}")
+    missing = required - set(entry)
+    if missing:
+        raise RosterError(f"{where}: missing field(s) {', '.join(sorted(missing))}")
+
+
+def _integer(value: Any, where: str, minimum: int) -> int:
+    """Validate an integer field (booleans are rejected)."""
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise RosterError(f"{where}: expected an integer >= {minimum}")
+    return value
+
+
+def _common(entry: Dict[str, Any], where: str) -> Tuple[str, int, Optional[int], str]:
+    """Validate the fields shared by offensive and defensive moves."""
+    name = entry["name"]
+    if not isinstance(name, str) or not name:
+        raise RosterError(f"{where}.name: expected a non-empty string")
+    description = entry.get("description", "")
+    if not isinstance(description, str):
+        raise RosterError(f"{where}.description: expected a string")
+    max_uses = entry.get("max_uses")
+    if max_uses is not None:
+        max_uses = _integer(max_uses, f"{where}.max_uses", 1)
+    return (
+        name,
+        _integer(entry["fuel_cost"], f"{where}.fuel_cost", 0),
+        max_uses,
+        description,
+    )
+
+
+def _offensive(entry: Any, where: str) -> OffensiveMoveSpec:
+    """Compile one offensive move."""
+    _check_keys(entry, _OFFENSIVE_KEYS, {"name", "fuel_cost", "tire_damage"}, where)
+    name, fuel_cost, max_uses, description = _common(entry, where)
+    tire_damage = _integer(entry["tire_damage"], f"{where}.tire_damage", 0)
+    if fuel_cost == 0 and max_uses is None:
+        # A free, unlimited attack lets a race (and the solvers) run forever
+        raise RosterError(
+            f"{where}.fuel_cost: an offensive move without max_uses must cost fuel"
+        )
+    return OffensiveMoveSpec(name, fuel_cost, tire_damage, max_uses, description)
+
+
+def _defensive(entry: Any, where: str) -> DefensiveMoveSpec:
+    """Compile one defensive move."""
+    _check_keys(
+        entry, _DEFENSIVE_KEYS, {"name", "fuel_cost", "damage_reduction_percent"}, where
+    )
+    name, fuel_cost, max_uses, description = _common(entry, where)
+    reduction = entry["damage_reduction_percent"]
+    if (
+        isinstance(reduction, bool)
+        or not isinstance(reduction, (int, float))
+        or not 0 <= reduction <= 1
+    ):
+        raise RosterError(
+            f"{where}.damage_reduction_percent: expected a number from 0 to 1"
+        )
+    return DefensiveMoveSpec(name, fuel_cost, float(reduction), max_uses, description)
+
+
+def _moves(entry: Dict[str, Any], kind: str, compile_move, where: str) -> tuple:
+    """Compile a driver's list of moves, rejecting duplicate names."""
+    moves = entry.get(kind, [])
+    if not isinstance(moves, list):
+        raise RosterError(f"{where}.{kind}: expected a list of moves")
+    specs: List[MoveSpec] = [
+        compile_move(move, f"{where}.{kind}[{i}]") for i, move in enumerate(moves)
+    ]
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise RosterError(f"{where}.{kind}: move names must be unique")
+    return tuple(specs)
+
+
+class _CompiledDriverType(type(RosterDriver)):
+    """Metaclass of compiled drivers, registered with copyreg below."""
+
+
+def _reduce_driver(driver_class: type) -> Any:
+    """Pickle a compiled driver by its roster entry.
+
+    Classes reachable by name, such as drivers.Verstappen, and subclasses
+    defined in code still pickle by reference.
+    """
+    module = sys.modules.get(driver_class.__module__)
+    named = getattr(module, driver_class.__qualname__, None) is driver_class
+    if named or "_ENTRY" not in vars(driver_class):
+        return driver_class.__qualname__
+    return _driver_from_entry, (driver_class._ENTRY,)
+
+
+def _driver_from_entry(entry: str) -> type:
+    """Compiled driver class for a canonical roster entry (unpickling)."""
+    driver_class = _COMPILED.get(entry)
+    if driver_class is None:
+        driver_class = compile_roster({"drivers": [json.loads(entry)]}).drivers[0]
+    return driver_class
+
+
+copyreg.pickle(_CompiledDriverType, _reduce_driver)
+
+
+def _class_name(name: str) -> str:
+    """Python class name for a driver, e.g. 'Max Verstappen' -> 'MaxVerstappen'."""
+    words = re.findall(r"[A-Za-z0-9]+", name)
+    return "".join(word[:1].upper() + word[1:] for word in words) or "Driver"
+
+
+def compile_roster(data: Any, digest: str = "") -> Roster:
+    """Validate parsed roster data and compile it into Driver classes.
+
+    Args:
+        data: Parsed JSON or TOML document
+        digest: Content hash recorded on the Roster
+
+    Returns:
+        Compiled Roster
+
+    Raises:
+        RosterError: If the data fails validation
+    """
+    _check_keys(data, {"drivers"}, {"drivers"}, "roster")
+    entries = data["drivers"]
+    if not isinstance(entries, list) or not entries:
+        raise RosterError("roster.drivers: expected a non-empty list of drivers")
+
+    drivers = []
+    for i, entry in enumerate(entries):
+        where = f"drivers[{i}]"
+        _check_keys(entry, _DRIVER_KEYS, {"name", "offensive"}, where)
+        name = entry["name"]
+        if not isinstance(name, str) or not name:
+            raise RosterError(f"{where}.name: expected a non-empty string")
+        offensive = _moves(entry, "offensive", _offensive, where)
+        if not offensive:
+            raise RosterError(f"{where}.offensive: a driver needs an offensive move")
+        attributes = {
+            "__module__": __name__,
+            "__doc__": f"{name}, compiled from a roster.",
+            "NAME": name,
+            "STARTING_TIRE_HEALTH": _integer(
+                entry.get("tire_health", Driver.STARTING_TIRE_HEALTH),
+                f"{where}.tire_health",
+                1,
+            ),
+            "STARTING_FUEL": _integer(
+                entry.get("fuel", Driver.STARTING_FUEL), f"{where}.fuel", 0
+            ),
+            "OFFENSIVE_MOVES": offensive,
+            "DEFENSIVE_MOVES": _moves(entry, "defensive", _defensive, where),
+        }
+        canonical = json.dumps(entry, sort_keys=True)
+        attributes["_ENTRY"] = canonical
+        driver_class = _CompiledDriverType(
+            _class_name(name), (RosterDriver,), attributes
+        )
+        drivers.append(_COMPILED.setdefault(canonical, driver_class))
+
+    names = [driver.NAME for driver in drivers]
+    if len(set(names)) != len(names):
+        raise RosterError("roster.drivers: driver names must be unique")
+    return Roster(tuple(drivers), digest)
+
+
+def load_roster(path: str = DEFAULT_ROSTER_PATH) -> Roster:
+    """Load a roster file, reusing the compiled result for identical contents.
+
+    Args:
+        path: JSON file, or TOML file with a .toml extension
+
+    Returns:
+        Compiled Roster
+
+    Raises:
+        RosterError: If the file cannot be parsed or fails validation
+    """
+    with open(path, "rb") as handle:
+        raw = handle.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    roster = _CACHE.get(digest)
+    if roster is None:
+        try:
+            if path.endswith(".toml"):
+                if tomllib is None:
+                    raise RosterError("TOML rosters need Python 3.11+ or tomli")
+                data = tomllib.loads(raw.decode("utf-8"))
+            else:
+                data = json.loads(raw)
+        except (UnicodeDecodeError, ValueError) as error:
+            raise RosterError(f"Cannot parse roster {path}: {error}")
+        roster = _CACHE[digest] = compile_roster(data, digest)
+    return roster
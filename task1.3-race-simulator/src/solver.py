@@ -0,0 +1,251 @@
+"""
+Exact game solver for F1 Racing Simulator.
+Implements GameSolver, a memoized alpha-beta minimax over the full two-driver
+state space (tire health, fuel and limited-use move counters).
+
+A turn is a two-stage decision: the attacker picks an offensive move, then the
+defender sees it and picks a defensive response or skips. Positions are stored
+in a transposition table keyed by RaceRules.pack(), with each entry holding a
+value and a bound flag so that cut-off searches can be reused.
+"""
+
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple, Type
+
+from drivers import Driver, Mostafa, Verstappen
+from game_state import DRAW as DRAWN_RACE
+from game_state import GameState, RaceRules
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+_EXACT = 0
+_LOWER = 1
+_UPPER = 2
+
+
+class SolveReport(NamedTuple):
+    """Outcome of solving a position."""
+
+    value: int
+    offensive: Optional[int]
+    seconds: float
+    table_size: int
+
+
+class GameSolver:
+    """Memoized minimax solver with a hashed transposition table."""
+
+    def __init__(
+        self,
+        driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa),
+    ):
+        """Prepare rules and move ordering for the two seats.
+
+        Args:
+            driver_classes: Driver classes for seat 0 and seat 1
+        """
+        self.rules = RaceRules(driver_classes)
+        self.table: Dict[int, Tuple[int, int]] = {}
+        # Strongest attacks and blocks first, so cut-offs come early.
+        self._offensive_order = [
+            sorted(
+                range(len(seat.offensive)), key=lambda i: -seat.offensive[i].tire_damage
+            )
+            for seat in self.rules.seats
+        ]
+        self._defensive_order = [
+            sorted(
+                range(len(seat.defensive)),
+                key=lambda i: -seat.defensive[i].damage_reduction_percent,
+            )
+            for seat in self.rules.seats
+        ]
+
+    def initial_position(self, to_move: int = 0) -> GameState:
+        """Starting position of a race.
+
+        Args:
+            to_move: Seat that takes the first turn
+
+        Returns:
+            GameState with both drivers at full resources
+        """
+        return self.rules.initial_state(to_move)
+
+    def position_of(self, simulator) -> GameState:
+        """Capture the current position of a RaceSimulator.
+
+        Args:
+            simulator: RaceSimulator mid-race
+
+        Returns:
+            Equivalent GameState
+        """
+        return self.rules.state_of(simulator)
+
+    def _resource_value(self, state: GameState) -> int:
+        """Value for the side to move when both drivers are out of fuel."""
+        winner, _ = self.rules.resource_result(state)
+        if winner == DRAWN_RACE:
+            return DRAW
+        return WIN if winner == state.to_move else LOSS
+
+    def _offensive_moves(self, state: GameState) -> List[int]:
+        """Legal offensive moves of the side to move, strongest first."""
+        legal = self.rules.legal_offensive(state)
+        return [i for i in self._offensive_order[state.to_move] if i in legal]
+
+    def _responses(self, state: GameState) -> List[Optional[int]]:
+        """Defender options, strongest block first and skipping last."""
+        legal = self.rules.legal_defensive(state)
+        order = self._defensive_order[1 - state.to_move]
+        return [i for i in order if i in legal] + [None]
+
+    def _search(self, state: GameState, alpha: int, beta: int) -> int:
+        """Alpha-beta negamax; returns the value for the side to move."""
+        key = self.rules.pack(state)
+        entry = self.table.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == _EXACT:
+                return value
+            if flag == _LOWER and value >= beta:
+                return value
+            if flag == _UPPER and value <= alpha:
+                return value
+
+        rules = self.rules
+        original_alpha = alpha
+        me = state.to_move
+        if not rules.can_attack(state, me):
+            if not rules.can_attack(state, 1 - me):
+                best = self._resource_value(state)
+            else:
+                child = rules.penalize(state)
+                if child.tire_health[me] == 0:
+                    best = LOSS
+                else:
+                    best = -self._search(child, -beta, -alpha)
+        else:
+            best = LOSS - 1
+            for offensive in self._offensive_moves(state):
+                worst = self._defend(state, offensive, alpha, beta)
+                if worst > best:
+                    best = worst
+                if best > alpha:
+                    alpha = best
+                if alpha >= beta:
+                    break
+
+        if best <= original_alpha:
+            flag = _UPPER
+        elif best >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self.table[key] = (best, flag)
+        return best
+
+    def _defend(self, state: GameState, offensive: int, alpha: int, beta: int) -> int:
+        """Attacker's value of an offensive move under the best defense."""
+        worst = WIN + 1
+        defender = 1 - state.to_move
+        for defensive in self._responses(state):
+            child = self.rules.attack(state, offensive, defensive)
+            if child.tire_health[defender] == 0:
+                value = WIN
+            else:
+                value = -self._search(child, -beta, -alpha)
+            if value < worst:
+                worst = value
+            if worst < beta:
+                beta = worst
+            if alpha >= beta:
+                break
+        return worst
+
+    def value(self, state: GameState) -> int:
+        """Game-theoretic value of a position for the side to move.
+
+        Args:
+            state: Position to evaluate
+
+        Returns:
+            WIN, DRAW or LOSS under optimal play by both drivers
+        """
+        return self._search(state, LOSS, WIN)
+
+    def best_offensive(self, state: GameState) -> Optional[int]:
+        """Optimal offensive move for the side to move.
+
+        Args:
+            state: Position to evaluate
+
+        Returns:
+            Index into the driver's offensive moves, or None if it cannot attack
+        """
+        best_index, best_value = None, LOSS - 1
+        for offensive in self._offensive_moves(state):
+            value = self._defend(state, offensive, LOSS, WIN)
+            if value > best_value:
+                best_index, best_value = offensive, value
+        return best_index
+
+    def best_defensive(self, state: GameState, offensive: int) -> Optional[int]:
+        """Optimal defensive response to an offensive move.
+
+        Args:
+            state: Position before the offensive move, attacker to move
+            offensive: Index of the attacker's offensive move
+
+        Returns:
+            Index into the defender's defensive moves, or None to skip
+        """
+        defender = 1 - state.to_move
+        best_index, best_value = None, LOSS - 1
+        for defensive in self._responses(state):
+            child = self.rules.attack(state, offensive, defensive)
+            if child.tire_health[defender] == 0:
+                value = LOSS
+            else:
+                value = self.value(child)
+            if value > best_value:
+                best_index, best_value = defensive, value
+        return best_index
+
+    def solve(self, state: Optional[GameState] = None) -> SolveReport:
+        """Solve a position and report the value, best move and cost.
+
+        Args:
+            state: Position to solve (defaults to the starting position)
+
+        Returns:
+            SolveReport with value for the side to move and timing data
+        """
+        if state is None:
+            state = self.initial_position()
+        start = time.perf_counter()
+        value = self.value(state)
+        offensive = self.best_offensive(state)
+        seconds = time.perf_counter() - start
+        return SolveReport(value, offensive, seconds, len(self.table))
+
+
+def main() -> None:
+    """Solve the starting position for each choice of first driver."""
+    sys.setrecursionlimit(10_000)
+    solver = GameSolver()
+    outcome = {WIN: "wins", DRAW: "draws", LOSS: "loses"}
+    for to_move in (0, 1):
+        report = solver.solve(solver.initial_position(to_move))
+        seat = solver.rules.seats[to_move]
+        print(f"{seat.name} moving first {outcome[report.value]} with perfect play")
+        print(f"  Best opening: {seat.offensive[report.offensive].name}")
+        print(f"  Solved in {report.seconds:.1f}s, {report.table_size:,} positions")
+
+
+if __name__ == "__main__":
+    main()
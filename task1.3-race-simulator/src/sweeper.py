@@ -0,0 +1,487 @@
+"""
+Parallel balance sweeper for F1 Racing Simulator.
+Implements Sweeper, which varies move parameters of the drivers in drivers.py
+(fuel cost, tire damage, damage reduction and maximum uses) over a grid or
+random samples and measures how fair each configuration is.
+
+Every configuration is played in both seat orders, either solved exactly by
+GameSolver or estimated by Monte Carlo on BatchRaceSimulator, giving:
+    first_mover_score   score of whichever driver moves first (0.5 is fair)
+    driver_score        score of the first-listed driver over both seat
+                        orders (0.5 means neither driver is stronger)
+Scores count a win as 1 and a draw as 0.5.
+
+Configurations are evaluated across a process pool and memoized in a SQLite
+cache under a hash of the configuration and evaluation method, so repeating or
+refining a sweep only evaluates configurations it has not seen before.
+"""
+
+import argparse
+import copy
+import hashlib
+import itertools
+import json
+import random
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from batch_simulator import BatchRaceSimulator
+from drivers import Driver, Mostafa, Verstappen
+from game_state import DRAW
+from policies import POLICIES
+from roster import RosterError, compile_roster
+from solver import GameSolver
+
+METHODS = ("montecarlo", "exact")
+FIELDS = ("fuel_cost", "tire_damage", "damage_reduction_percent", "max_uses")
+FIELD_ALIASES = {"uses_remaining": "max_uses"}
+DEFAULT_CACHE_PATH = "sweep_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    config TEXT NOT NULL,
+    first_mover_score REAL NOT NULL,
+    driver_score REAL NOT NULL,
+    games INTEGER NOT NULL,
+    seconds REAL NOT NULL
+)
+"""
+
+
+class Parameter(NamedTuple):
+    """One sweepable move attribute, e.g. Max Verstappen/DRS Boost/fuel_cost."""
+
+    driver: str
+    move: str
+    field: str
+
+    @classmethod
+    def parse(cls, text: str) -> "Parameter":
+        """Parse "driver/move/field".
+
+        Args:
+            text: Parameter path; uses_remaining is accepted for max_uses
+
+        Returns:
+            Parameter
+
+        Raises:
+            ValueError: If the path is malformed or the field is not sweepable
+        """
+        parts = text.split("/")
+        if len(parts) != 3:
+            raise ValueError(f"Expected driver/move/field, got {text!r}")
+        driver, move, field = parts
+        field = FIELD_ALIASES.get(field, field)
+        if field not in FIELDS:
+            raise ValueError(f"Cannot sweep {field!r}; choose from {FIELDS}")
+        return cls(driver, move, field)
+
+    def parse_value(self, text: str) -> Any:
+        """Convert a command-line value to this parameter's type."""
+        if self.field == "damage_reduction_percent":
+            return float(text)
+        if self.field == "max_uses" and text.lower() == "none":
+            return None
+        return int(text)
+
+    def __str__(self) -> str:
+        """The parameter path."""
+        return f"{self.driver}/{self.move}/{self.field}"
+
+
+Assignment = Tuple[Tuple[Parameter, Any], ...]
+
+
+class Fairness(NamedTuple):
+    """Fairness of one configuration."""
+
+    first_mover_score: float
+    driver_score: float
+    games: int  # Races played per seat order (0 when solved exactly)
+    seconds: float
+
+    @property
+    def imbalance(self) -> float:
+        """Largest distance of either score from a fair 0.5."""
+        return max(abs(self.first_mover_score - 0.5), abs(self.driver_score - 0.5))
+
+
+class SweepPoint(NamedTuple):
+    """One evaluated configuration of a sweep."""
+
+    assignment: Assignment
+    key: str
+    fairness: Fairness
+    cached: bool
+
+
+def base_config(
+    driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa),
+) -> Dict[str, Any]:
+    """Describe two driver classes in roster form.
+
+    Args:
+        driver_classes: Drivers whose moves are swept
+
+    Returns:
+        Roster data accepted by roster.compile_roster()
+    """
+    drivers = []
+    for driver_class in driver_classes:
+        driver = driver_class()
+        drivers.append(
+            {
+                "name": driver.name,
+                "tire_health": driver.tire_health,
+                "fuel": driver.fuel,
+                "offensive": [
+                    {
+                        "name": spec.name,
+                        "fuel_cost": spec.fuel_cost,
+                        "tire_damage": spec.tire_damage,
+                        "max_uses": spec.max_uses,
+                        "description": spec.description,
+                    }
+                    for spec in driver_class.OFFENSIVE_MOVES
+                ],
+                "defensive": [
+                    {
+                        "name": spec.name,
+                        "fuel_cost": spec.fuel_cost,
+                        "damage_reduction_percent": spec.damage_reduction_percent,
+                        "max_uses": spec.max_uses,
+                        "description": spec.description,
+                    }
+                    for spec in driver_class.DEFENSIVE_MOVES
+                ],
+            }
+        )
+    return {"drivers": drivers}
+
+
+def _find_move(config: Dict[str, Any], parameter: Parameter) -> Dict[str, Any]:
+    """The roster move entry a parameter refers to."""
+    for entry in config["drivers"]:
+        if entry["name"] != parameter.driver:
+            continue
+        for move in entry.get("offensive", []) + entry.get("defensive", []):
+            if move["name"] == parameter.move:
+                # Offensive moves have no damage reduction, defensive no damage.
+                if parameter.field in move or parameter.field == "max_uses":
+                    return move
+                raise RosterError(f"{parameter.move} has no {parameter.field}")
+    raise RosterError(f"No move matches {parameter}")
+
+
+def apply_assignment(config: Dict[str, Any], assignment: Assignment) -> Dict[str, Any]:
+    """Copy a configuration with some move parameters replaced.
+
+    Args:
+        config: Roster data from base_config()
+        assignment: (Parameter, value) pairs
+
+    Returns:
+        New roster data, validated by compile_roster()
+
+    Raises:
+        RosterError: If a parameter names an unknown move or a value is invalid
+    """
+    config = copy.deepcopy(config)
+    for parameter, value in assignment:
+        _find_move(config, parameter)[parameter.field] = value
+    compile_roster(config)
+    return config
+
+
+def grid(axes: Dict[Parameter, Sequence[Any]]) -> List[Assignment]:
+    """Every combination of the given parameter values.
+
+    Args:
+        axes: Values to try for each parameter
+
+    Returns:
+        One assignment per grid point
+    """
+    parameters = list(axes)
+    return [
+        tuple(zip(parameters, values))
+        for values in itertools.product(*(axes[p] for p in parameters))
+    ]
+
+
+def random_samples(
+    ranges: Dict[Parameter, Tuple[Any, Any]], n_samples: int, seed: int = 0
+) -> List[Assignment]:
+    """Uniform random assignments within inclusive ranges.
+
+    Args:
+        ranges: (low, high) for each parameter
+        n_samples: Number of assignments
+        seed: Random seed
+
+    Returns:
+        List of assignments (damage reductions rounded to two decimals)
+    """
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(n_samples):
+        assignment = []
+        for parameter, (low, high) in ranges.items():
+            if parameter.field == "damage_reduction_percent":
+                value = round(rng.uniform(low, high), 2)
+            else:
+                value = rng.randint(low, high)
+            assignment.append((parameter, value))
+        samples.append(tuple(assignment))
+    return samples
+
+
+def _first_mover_scores(
+    first: Type[Driver], second: Type[Driver], method: str, games: int, policy: str
+) -> Tuple[float, float]:
+    """Score of the first mover in each seat order: first, then second."""
+    if method == "exact":
+        solver = GameSolver((first, second))
+        values = [solver.value(solver.initial_position(to_move)) for to_move in (0, 1)]
+        return (values[0] + 1) / 2, (values[1] + 1) / 2
+
+    scores = []
+    for classes in ((first, second), (second, first)):
+        batch = BatchRaceSimulator(
+            games, (POLICIES[policy](), POLICIES[policy]()), driver_classes=classes
+        )
+        batch.run()
+        scores.append(
+            float(np.mean(batch.winner == 0) + 0.5 * np.mean(batch.winner == DRAW))
+        )
+    return scores[0], scores[1]
+
+
+def _evaluate(config: Dict[str, Any], method: str, games: int, policy: str) -> Fairness:
+    """Measure the fairness of one configuration; runs in a worker process.
+
+    Args:
+        config: Roster data with exactly two drivers
+        method: "montecarlo" or "exact"
+        games: Races per seat order for Monte Carlo
+        policy: Name of the policy both drivers use for Monte Carlo
+
+    Returns:
+        Fairness of the configuration
+    """
+    sys.setrecursionlimit(10_000)
+    start = time.perf_counter()
+    first, second = compile_roster(config).drivers
+    first_moves_first, second_moves_first = _first_mover_scores(
+        first, second, method, games, policy
+    )
+    return Fairness(
+        (first_moves_first + second_moves_first) / 2,
+        (first_moves_first + 1 - second_moves_first) / 2,
+        0 if method == "exact" else games,
+        time.perf_counter() - start,
+    )
+
+
+class Sweeper:
+    """Evaluates move-parameter sweeps in parallel with a SQLite cache."""
+
+    def __init__(
+        self,
+        method: str = "montecarlo",
+        games: int = 2_000,
+        policy: str = "random",
+        workers: Optional[int] = None,
+        cache_path: str = DEFAULT_CACHE_PATH,
+        base: Optional[Dict[str, Any]] = None,
+    ):
+        """Create a sweeper.
+
+        Args:
+            method: "montecarlo" (batch races) or "exact" (GameSolver)
+            games: Races per seat order for Monte Carlo
+            policy: Policy both drivers use for Monte Carlo (must support
+                batch play)
+            workers: Worker processes (defaults to the CPU count)
+            cache_path: SQLite file of evaluated configurations, or
+                ":memory:" for no persistence
+            base: Roster data being varied (defaults to base_config())
+
+        Raises:
+            ValueError: If the method or policy is unknown
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}; choose from {METHODS}")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}")
+        self.method = method
+        self.games = games
+        self.policy = policy
+        self.workers = workers
+        self.base = base if base is not None else base_config()
+        self.last_evaluated = 0
+        self._db = sqlite3.connect(cache_path)
+        self._db.execute(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the cache database."""
+        self._db.close()
+
+    def config_key(self, config: Dict[str, Any]) -> str:
+        """Cache key of a configuration under this sweeper's method.
+
+        Args:
+            config: Roster data
+
+        Returns:
+            SHA-256 hex digest
+        """
+        method = [self.method]
+        if self.method == "montecarlo":
+            method += [self.games, self.policy]
+        payload = json.dumps([config, method], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cached(self, key: str) -> Optional[Fairness]:
+        """Look up a previously evaluated configuration."""
+        row = self._db.execute(
+            "SELECT first_mover_score, driver_score, games, seconds "
+            "FROM results WHERE key = ?",
+            (key,),
+        ).fetchone()
+        return None if row is None else Fairness(*row)
+
+    def run(self, assignments: Sequence[Assignment]) -> List[SweepPoint]:
+        """Evaluate assignments, skipping those already in the cache.
+
+        Args:
+            assignments: Parameter assignments applied to the base config
+
+        Returns:
+            One SweepPoint per assignment, in the same order
+
+        Raises:
+            RosterError: If an assignment produces an invalid configuration
+        """
+        configs = [apply_assignment(self.base, a) for a in assignments]
+        keys = [self.config_key(config) for config in configs]
+        known = {key: self._cached(key) for key in set(keys)}
+        pending = {
+            key: config for key, config in zip(keys, configs) if known[key] is None
+        }
+
+        self.last_evaluated = len(pending)
+        if pending:
+            with ProcessPoolExecutor(self.workers) as pool:
+                futures = {
+                    pool.submit(
+                        _evaluate, config, self.method, self.games, self.policy
+                    ): key
+                    for key, config in pending.items()
+                }
+                # Store each result as it arrives so an interrupted sweep
+                # keeps everything it finished.
+                for future in as_completed(futures):
+                    key = futures[future]
+                    fairness = future.result()
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, json.dumps(pending[key], sort_keys=True), *fairness),
+                    )
+                    self._db.commit()
+                    known[key] = fairness
+
+        return [
+            SweepPoint(assignment, key, known[key], key not in pending)
+            for assignment, key in zip(assignments, keys)
+        ]
+
+
+def format_points(points: Sequence[SweepPoint]) -> str:
+    """Render sweep points as a table, fairest first.
+
+    Args:
+        points: Evaluated sweep points
+
+    Returns:
+        Multi-line table
+    """
+    lines = ["first-mover  driver  imbalance  configuration"]
+    for point in sorted(points, key=lambda p: p.fairness.imbalance):
+        settings = ", ".join(f"{p}={value}" for p, value in point.assignment)
+        fairness = point.fairness
+        lines.append(
+            f"{fairness.first_mover_score:>11.1%}{fairness.driver_score:>8.1%}"
+            f"{fairness.imbalance:>11.3f}  {settings or '(base)'}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a sweep from the command line.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="F1 move balance sweeper")
+    parser.add_argument(
+        "--vary",
+        action="append",
+        default=[],
+        metavar="DRIVER/MOVE/FIELD=VALUES",
+        help="parameter to sweep: comma-separated values for a grid, or LOW:HIGH "
+        "with --samples, e.g. 'Max Verstappen/DRS Boost/fuel_cost=30,45,60'",
+    )
+    parser.add_argument(
+        "--samples", type=int, help="draw this many random points from LOW:HIGH"
+    )
+    parser.add_argument("--method", choices=METHODS, default="montecarlo")
+    parser.add_argument("--games", type=int, default=2_000, help="races per seat order")
+    parser.add_argument(
+        "--policy",
+        choices=sorted(POLICIES),
+        default="random",
+        help="policy both drivers use for Monte Carlo (default: random)",
+    )
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="sampling seed")
+    parser.add_argument(
+        "--cache", default=DEFAULT_CACHE_PATH, help="SQLite result cache"
+    )
+    args = parser.parse_args(argv)
+
+    axes = {}
+    for spec in args.vary:
+        path, _, values = spec.partition("=")
+        parameter = Parameter.parse(path)
+        if args.samples:
+            low, high = values.split(":")
+            axes[parameter] = (parameter.parse_value(low), parameter.parse_value(high))
+        else:
+            axes[parameter] = [parameter.parse_value(v) for v in values.split(",")]
+    if args.samples:
+        assignments = random_samples(axes, args.samples, args.seed)
+    else:
+        assignments = grid(axes)
+
+    sweeper = Sweeper(args.method, args.games, args.policy, args.workers, args.cache)
+    start = time.perf_counter()
+    points = sweeper.run(assignments)
+    elapsed = time.perf_counter() - start
+    sweeper.close()
+    print(
+        f"{len(points)} configurations, {sweeper.last_evaluated} evaluated "
+        f"in {elapsed:.1f}s, the rest from {args.cache}"
+    )
+    print(format_points(points))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Round-robin tournament runner for F1 Racing Simulator.
+Implements Tournament, which plays every pairing of registered entrants in both
+seat orders across a process pool and rates them on the Elo scale.
+
+An entrant is a policy class with its parameters, plus the Verstappen and
+Mostafa classes it drives, so driver variants and AI strengths compete side by
+side. Each match is one pairing in one seat order; its result is cached under a
+hash of both entrants' configurations, so registering a new entrant only plays
+that entrant's matches. Matches involving a time-budgeted policy depend on
+machine load, so they are never cached and are replayed on every run.
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from drivers import Driver, Mostafa, Verstappen
+from game_state import RaceRules
+from mcts import MCTSPolicy
+from policies import ConservativePolicy, GreedyPolicy, Policy, RandomPolicy
+from race_simulator import RaceSimulator
+from renderers import NullRenderer
+
+BASE_RATING = 1500.0
+_ELO_SCALE = 400.0 / math.log(10)
+_Z95 = 1.96
+
+
+class Entrant(NamedTuple):
+    """A registered competitor: a policy and the cars it drives."""
+
+    name: str
+    policy: Type[Policy]
+    params: Tuple[Tuple[str, Any], ...] = ()
+    driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa)
+
+    def make_policy(
+        self, driver_classes: Optional[Tuple[Type[Driver], Type[Driver]]] = None
+    ) -> Policy:
+        """Create a fresh policy instance for one match.
+
+        Args:
+            driver_classes: Driver classes the match is raced with, passed to
+                policies that model the rules themselves (such as MCTSPolicy)
+
+        Returns:
+            The policy
+        """
+        params = dict(self.params)
+        accepted = inspect.signature(self.policy).parameters
+        if driver_classes is not None and "driver_classes" in accepted:
+            params["driver_classes"] = driver_classes
+        return self.policy(**params)
+
+    @property
+    def deterministic(self) -> bool:
+        """Whether this entrant's seeded matches always end the same way."""
+        return self.policy.deterministic
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Everything that determines how this entrant plays."""
+        return {
+            "policy": f"{self.policy.__module__}.{self.policy.__qualname__}",
+            "params": [list(param) for param in self.params],
+            "rules": RaceRules(self.driver_classes).fingerprint,
+        }
+
+
+class MatchResult(NamedTuple):
+    """Outcome of one pairing in one seat order."""
+
+    first: str
+    second: str
+    first_wins: int
+    draws: int
+    second_wins: int
+
+
+class Rating(NamedTuple):
+    """Standing of one entrant."""
+
+    name: str
+    elo: float
+    margin: float
+    games: int
+    wins: int
+    draws: int
+    losses: int
+
+
+def _play_match(first: Entrant, second: Entrant, games: int) -> Tuple[int, int, int]:
+    """Play one seat order of a pairing; runs in a worker process.
+
+    Args:
+        first: Entrant driving first (in its Verstappen car)
+        second: Entrant driving second (in its Mostafa car)
+        games: Number of races, seeded 0..games-1
+
+    Returns:
+        Tuple of (first wins, draws, second wins)
+    """
+    classes = (first.driver_classes[0], second.driver_classes[1])
+    tally = [0, 0, 0]
+    for seed in range(games):
+        simulator = RaceSimulator(
+            seed=seed, driver_classes=classes, renderer=NullRenderer()
+        )
+        simulator.policies = {
+            simulator.verstappen.name: first.make_policy(classes),
+            simulator.mostafa.name: second.make_policy(classes),
+        }
+        winner, _ = simulator.run_race()
+        if winner == simulator.verstappen.name:
+            tally[0] += 1
+        elif winner == simulator.mostafa.name:
+            tally[2] += 1
+        else:
+            tally[1] += 1
+    return tally[0], tally[1], tally[2]
+
+
+class Tournament:
+    """Round-robin tournament with cached matches and Elo standings."""
+
+    def __init__(
+        self,
+        games_per_match: int = 10,
+        workers: Optional[int] = None,
+        cache_path: Optional[str] = None,
+    ):
+        """Configure the tournament.
+
+        Args:
+            games_per_match: Races per pairing and seat order
+            workers: Worker processes (defaults to the CPU count)
+            cache_path: JSON file of finished matches, reused between runs
+        """
+        self.games_per_match = games_per_match
+        self.workers = workers
+        self.cache_path = cache_path
+        self.entrants: Dict[str, Entrant] = {}
+        self.results: Dict[Tuple[str, str], MatchResult] = {}
+        self.last_played = 0
+        self._cache: Dict[str, List[int]] = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path) as handle:
+                self._cache = json.load(handle)
+
+    def register(self, entrant: Entrant) -> None:
+        """Add an entrant.
+
+        Args:
+            entrant: Competitor to add
+
+        Raises:
+            ValueError: If an entrant with the same name is registered
+        """
+        if entrant.name in self.entrants:
+            raise ValueError(f"Entrant {entrant.name!r} is already registered")
+        self.entrants[entrant.name] = entrant
+
+    def _match_key(self, first: Entrant, second: Entrant) -> str:
+        """Cache key of a match: both configurations, seat order and length."""
+        payload = json.dumps(
+            [first.config, second.config, self.games_per_match], sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def run(self) -> List[MatchResult]:
+        """Play every pairing in both seat orders, reusing cached matches.
+
+        Matches with a non-deterministic entrant are always played and never
+        cached.
+
+        Returns:
+            Results of all matches
+        """
+        pending = {}
+        for first in self.entrants.values():
+            for second in self.entrants.values():
+                if first is second:
+                    continue
+                key = self._match_key(first, second)
+                if key in self._cache and first.deterministic and second.deterministic:
+                    self.results[first.name, second.name] = MatchResult(
+                        first.name, second.name, *self._cache[key]
+                    )
+                else:
+                    pending[key] = (first, second)
+
+        self.last_played = len(pending)
+        if pending:
+            with ProcessPoolExecutor(self.workers) as pool:
+                futures = {
+                    key: pool.submit(_play_match, first, second, self.games_per_match)
+                    for key, (first, second) in pending.items()
+                }
+                for key, future in futures.items():
+                    first, second = pending[key]
+                    tally = future.result()
+                    if first.deterministic and second.deterministic:
+                        self._cache[key] = list(tally)
+                    self.results[first.name, second.name] = MatchResult(
+                        first.name, second.name, *tally
+                    )
+            if self.cache_path:
+                with open(self.cache_path, "w") as handle:
+                    json.dump(self._cache, handle)
+        return list(self.results.values())
+
+    def ratings(self, iterations: int = 200) -> List[Rating]:
+        """Fit Elo ratings to all results, strongest first.
+
+        Ratings are the maximum-likelihood Bradley-Terry fit (draws count half)
+        on the Elo scale, anchored by one virtual draw against a BASE_RATING
+        player so that unbeaten entrants stay finite. The margin is a 95%
+        confidence half-width from the Fisher information.
+
+        Args:
+            iterations: Minorization-maximization steps
+
+        Returns:
+            List of Rating
+        """
+        names = list(self.entrants)
+        index = {name: i for i, name in enumerate(names)}
+        n = len(names)
+        games = [[0] * n for _ in range(n)]
+        wins, draws, losses = [0] * n, [0] * n, [0] * n
+        for result in self.results.values():
+            if result.first not in index or result.second not in index:
+                continue
+            a, b = index[result.first], index[result.second]
+            total = result.first_wins + result.draws + result.second_wins
+            games[a][b] += total
+            games[b][a] += total
+            wins[a] += result.first_wins
+            wins[b] += result.second_wins
+            losses[a] += result.second_wins
+            losses[b] += result.first_wins
+            draws[a] += result.draws
+            draws[b] += result.draws
+
+        scores = [wins[i] + 0.5 * draws[i] + 0.5 for i in range(n)]
+        strength = [1.0] * n
+        for _ in range(iterations):
+            strength = [
+                scores[i]
+                / (
+                    1.0 / (strength[i] + 1.0)
+                    + sum(
+                        games[i][j] / (strength[i] + strength[j])
+                        for j in range(n)
+                        if games[i][j]
+                    )
+                )
+                for i in range(n)
+            ]
+
+        ratings = []
+        for i, name in enumerate(names):
+            information = strength[i] / (strength[i] + 1.0) ** 2
+            for j in range(n):
+                if games[i][j]:
+                    p = strength[i] / (strength[i] + strength[j])
+                    information += games[i][j] * p * (1.0 - p)
+            ratings.append(
+                Rating(
+                    name,
+                    BASE_RATING + _ELO_SCALE * math.log(strength[i]),
+                    _Z95 * _ELO_SCALE / math.sqrt(information),
+                    wins[i] + draws[i] + losses[i],
+                    wins[i],
+                    draws[i],
+                    losses[i],
+                )
+            )
+        return sorted(ratings, key=lambda rating: -rating.elo)
+
+    def standings(self) -> str:
+        """Format the ratings as a text table."""
+        lines = [
+            f"{'#':>2}  {'Entrant':<24}{'Elo':>7}{'±95%':>7}"
+            f"{'Games':>7}{'W':>6}{'D':>6}{'L':>6}{'Score':>8}"
+        ]
+        for rank, rating in enumerate(self.ratings(), 1):
+            score = (rating.wins + 0.5 * rating.draws) / max(rating.games, 1)
+            lines.append(
+                f"{rank:>2}  {rating.name:<24}{rating.elo:>7.0f}{rating.margin:>7.0f}"
+                f"{rating.games:>7}{rating.wins:>6}{rating.draws:>6}"
+                f"{rating.losses:>6}{score:>8.1%}"
+            )
+        return "\n".join(lines)
+
+
+DEFAULT_ENTRANTS = [
+    Entrant("random", RandomPolicy),
+    Entrant("greedy", GreedyPolicy),
+    Entrant("conservative", ConservativePolicy),
+    Entrant("mcts-5ms", MCTSPolicy, (("time_budget", 0.005),)),
+    Entrant("mcts-20ms", MCTSPolicy, (("time_budget", 0.02),)),
+]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the default round robin and write the standings.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="F1 policy round-robin tournament")
+    parser.add_argument("--games", type=int, default=10, help="races per match")
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument(
+        "--cache", default="tournament_cache.json", help="match cache file"
+    )
+    parser.add_argument(
+        "--output", default="standings.txt", help="standings table file"
+    )
+    args = parser.parse_args(argv)
+
+    tournament = Tournament(args.games, args.workers, args.cache)
+    for entrant in DEFAULT_ENTRANTS:
+        tournament.register(entrant)
+    tournament.run()
+    table = tournament.standings()
+    print(f"Played {tournament.last_played} new matches")
+    print(table)
+    with open(args.output, "w") as handle:
+        handle.write(table + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+"""
+Win-probability tables for F1 Racing Simulator.
+Implements WinProbabilityDP, which computes for two fixed policies the first
+seat's expected score from every (tire health, fuel, limited uses) position,
+bottom-up over NumPy arrays instead of a recursive search.
+
+The value of a position is the probability that seat 0 wins, with a draw
+counting one half; seat 1's value is one minus it. Offensive moves always cost
+fuel and fuel never comes back, so the table is filled one (seat 0 fuel,
+seat 1 fuel) layer at a time in increasing order. An attack only reads layers
+that are already complete, and a stranded mover's penalty turn only reads the
+other seat's entries of the same layer. Each layer is vectorized over limited
+uses and both tire healths.
+
+The full game does not fit in memory (about 10 GB at 500 fuel per seat), so
+the table covers a box of fuel up to max_fuel and tire health up to max_tire.
+Fuel and tire health only go down, so every position in the box is solved
+exactly.
+
+Damage, fuel and penalty rules are those of Driver.execute_offensive_move,
+Driver.execute_defensive_move and the fuel-exhaustion penalty of
+RaceSimulator.execute_turn, as encoded in RaceRules.
+"""
+
+import argparse
+import itertools
+import math
+import time
+from typing import List, Optional, Tuple, Type
+
+import numpy as np
+
+from drivers import Driver, Mostafa, Verstappen
+from game_state import (
+    FUEL_PENALTY_DAMAGE,
+    FUEL_TIEBREAK_MARGIN,
+    TIRE_TIEBREAK_MARGIN,
+    GameState,
+    RaceRules,
+)
+from policies import POLICIES, Policy
+
+
+class _SeatTable:
+    """One seat's moves as arrays over its combinations of limited uses."""
+
+    def __init__(self, rules: RaceRules, seat: int, max_fuel: int, max_tire: int):
+        """Enumerate use combinations and where each move sends them.
+
+        Args:
+            rules: Rules of both seats
+            seat: Seat described by this table
+            max_fuel: Highest fuel level kept
+            max_tire: Highest tire health kept
+        """
+        seat_rules = rules.seats[seat]
+        self.slots = [slot for slot, _ in seat_rules.limited]
+        self.combos = list(
+            itertools.product(*(range(uses + 1) for _, uses in seat_rules.limited))
+        )
+        index = {combo: i for i, combo in enumerate(self.combos)}
+        self.fuel = min(max_fuel, seat_rules.fuel)
+        self.tire = min(max_tire, seat_rules.tire_health)
+
+        self.off_cost = np.array([s.fuel_cost for s in seat_rules.offensive])
+        self.off_damage = np.array([s.tire_damage for s in seat_rules.offensive])
+        self.def_cost = np.array([s.fuel_cost for s in seat_rules.defensive])
+        self.def_reduction = np.array(
+            [s.damage_reduction_percent for s in seat_rules.defensive]
+        )
+        self.off_allowed, self.off_next = self._transitions(
+            seat_rules.offensive_slots, index
+        )
+        self.def_allowed, self.def_next = self._transitions(
+            seat_rules.defensive_slots, index
+        )
+
+    def _transitions(self, slots, index) -> Tuple[np.ndarray, np.ndarray]:
+        """(combos, moves) masks of available moves and the combo after each."""
+        allowed = np.ones((len(self.combos), len(slots)), dtype=bool)
+        after = np.tile(np.arange(len(self.combos))[:, None], (1, len(slots)))
+        for move, slot in enumerate(slots):
+            if slot < 0:
+                continue
+            position = self.slots.index(slot)
+            for i, combo in enumerate(self.combos):
+                if combo[position] == 0:
+                    allowed[i, move] = False
+                else:
+                    spent = list(combo)
+                    spent[position] -= 1
+                    after[i, move] = index[tuple(spent)]
+        return allowed, after
+
+    def damage_after(self, damage: int) -> np.ndarray:
+        """Tire index reached from each tire index when hit for damage."""
+        return np.maximum(np.arange(self.tire + 1) - damage, 0)
+
+    def offensive_legal(self, fuel: int) -> np.ndarray:
+        """(combos, moves) mask of usable offensive moves at a fuel level."""
+        return self.off_allowed & (self.off_cost <= fuel)
+
+    def defensive_legal(self, fuel: int) -> np.ndarray:
+        """(combos, moves) mask of usable defensive moves at a fuel level."""
+        return self.def_allowed & (self.def_cost <= fuel)
+
+    def combo_of(self, uses: Tuple[int, ...]) -> int:
+        """Combination index of this seat's counters in a GameState.uses."""
+        return self.combos.index(tuple(uses[slot] for slot in self.slots))
+
+
+def _finish(layer: np.ndarray) -> None:
+    """Score positions where a tire has failed, in place.
+
+    Args:
+        layer: (mover, uses a, uses b, tire a, tire b) scores of one fuel layer
+    """
+    layer[..., 0, :] = 0.0
+    layer[..., :, 0] = 1.0
+    layer[..., 0, 0] = 0.5
+
+
+class WinProbabilityDP:
+    """Bottom-up expected-score table of two fixed policies."""
+
+    def __init__(
+        self,
+        policies: Tuple[Policy, Policy],
+        driver_classes: Tuple[Type[Driver], Type[Driver]] = (Verstappen, Mostafa),
+        max_fuel: int = 100,
+        max_tire: int = 100,
+    ):
+        """Lay out the table; solve() fills it.
+
+        Args:
+            policies: Policy for each seat, with offensive_probabilities() and
+                defensive_probabilities()
+            driver_classes: Driver classes for seat 0 and seat 1
+            max_fuel: Highest fuel level kept per seat
+            max_tire: Highest tire health kept per seat
+
+        Raises:
+            TypeError: If a policy has no probability model
+            ValueError: If an offensive move is free, which breaks the
+                fuel-layer order
+        """
+        for policy in policies:
+            if not policy.has_probability_model():
+                raise TypeError(
+                    f"{policy.name} has no probability model: override "
+                    "offensive_probabilities() and defensive_probabilities() "
+                    "or the vectorized batch hooks"
+                )
+        self.policies = policies
+        self.rules = RaceRules(driver_classes)
+        for seat in self.rules.seats:
+            if any(spec.fuel_cost <= 0 for spec in seat.offensive):
+                raise ValueError(f"{seat.name} has an offensive move costing no fuel")
+        self.tables = tuple(
+            _SeatTable(self.rules, seat, max_fuel, max_tire) for seat in (0, 1)
+        )
+        # Every reachable fuel level is a multiple of the step
+        costs = [
+            int(cost)
+            for table in self.tables
+            for cost in np.concatenate([table.off_cost, table.def_cost])
+        ]
+        starts = [seat.fuel for seat in self.rules.seats]
+        self.fuel_step = math.gcd(*costs, *starts) or 1
+        for table in self.tables:
+            table.fuel -= table.fuel % self.fuel_step
+        self.fuel_levels = tuple(
+            np.arange(0, table.fuel + 1, self.fuel_step) for table in self.tables
+        )
+        a, b = self.tables
+        self.values = np.zeros(
+            (
+                2,
+                len(self.fuel_levels[0]),
+                len(self.fuel_levels[1]),
+                len(a.combos),
+                len(b.combos),
+                a.tire + 1,
+                b.tire + 1,
+            ),
+            dtype=np.float32,
+        )
+        self.seconds = 0.0
+
+    def _resource_scores(self, fuel_a: int, fuel_b: int) -> np.ndarray:
+        """(tire a, tire b) scores of the resource tie-break at given fuel."""
+        if fuel_a - fuel_b >= FUEL_TIEBREAK_MARGIN:
+            return np.ones((self.tables[0].tire + 1, self.tables[1].tire + 1))
+        if fuel_b - fuel_a >= FUEL_TIEBREAK_MARGIN:
+            return np.zeros((self.tables[0].tire + 1, self.tables[1].tire + 1))
+        lead = (
+            np.arange(self.tables[0].tire + 1)[:, None]
+            - np.arange(self.tables[1].tire + 1)[None, :]
+        )
+        return np.where(
+            lead >= TIRE_TIEBREAK_MARGIN,
+            1.0,
+            np.where(lead <= -TIRE_TIEBREAK_MARGIN, 0.0, 0.5),
+        )
+
+    def _attack_value(self, mover: int, i: int, j: Optional[int]) -> Tuple:
+        """Fuel spent by each seat, uses-after indices and damage of a turn."""
+        attacker, defender = self.tables[mover], self.tables[1 - mover]
+        damage = int(attacker.off_damage[i])
+        spent = [0, 0]
+        spent[mover] = int(attacker.off_cost[i])
+        after = [None, None]
+        after[mover] = attacker.off_next[:, i]
+        after[1 - mover] = np.arange(len(defender.combos))
+        if j is not None:
+            spent[1 - mover] = int(defender.def_cost[j])
+            after[1 - mover] = defender.def_next[:, j]
+            damage = int(damage * (1 - defender.def_reduction[j]))
+        return spent, after, damage
+
+    def _mobile_layer(self, mover: int, fa: int, fb: int) -> np.ndarray:
+        """Scores of the mover's turn at a fuel layer, where they can attack.
+
+        Args:
+            mover: Seat to move
+            fa: Fuel index of seat 0
+            fb: Fuel index of seat 1
+
+        Returns:
+            (uses a, uses b, tire a, tire b) scores; rows where the mover
+            cannot attack are meaningless
+        """
+        attacker, defender = self.tables[mover], self.tables[1 - mover]
+        index = (fa, fb)
+        fuel = (int(self.fuel_levels[0][fa]), int(self.fuel_levels[1][fb]))
+        opp = 1 - mover
+
+        legal = attacker.offensive_legal(fuel[mover])
+        shape = (legal.shape[0], legal.shape[1])
+        # Rows without a legal attack are stranded and solved elsewhere
+        p_off = legal * self.policies[mover].offensive_probabilities(
+            legal,
+            np.broadcast_to(attacker.off_damage, shape),
+            np.broadcast_to(attacker.off_cost, shape),
+        )
+        def_legal = defender.defensive_legal(fuel[opp])
+        def_shape = (def_legal.shape[0], def_legal.shape[1])
+
+        layer = np.zeros(self.values.shape[3:], dtype=np.float64)
+        for i in np.flatnonzero(p_off.any(axis=0)):
+            p_def = self.policies[opp].defensive_probabilities(
+                def_legal,
+                np.broadcast_to(defender.def_reduction, def_shape),
+                np.broadcast_to(defender.def_cost, def_shape),
+                np.full(def_legal.shape[0], attacker.off_damage[i]),
+            )
+            for j in np.flatnonzero(p_def.any(axis=0)):
+                block = None if j == def_legal.shape[1] else int(j)
+                spent, after, damage = self._attack_value(mover, int(i), block)
+                source = list(index)
+                source[0] -= spent[0] // self.fuel_step
+                source[1] -= spent[1] // self.fuel_step
+                nxt = self.values[opp, source[0], source[1]]
+                nxt = nxt[after[0]][:, after[1]]
+                hit = defender.damage_after(damage)
+                nxt = nxt[:, :, hit, :] if opp == 0 else nxt[:, :, :, hit]
+
+                weight = p_off[:, i][:, None] * p_def[:, j][None, :]
+                if mover == 1:
+                    weight = weight.T
+                layer += weight[:, :, None, None] * nxt
+        return layer
+
+    def _fill_layer(self, fa: int, fb: int) -> None:
+        """Solve both movers' positions at one (seat 0, seat 1) fuel layer."""
+        a, b = self.tables
+        fuel = (int(self.fuel_levels[0][fa]), int(self.fuel_levels[1][fb]))
+        mobile = (
+            a.offensive_legal(fuel[0]).any(axis=1),
+            b.offensive_legal(fuel[1]).any(axis=1),
+        )
+        layer = self.values[:, fa, fb]  # A view: writes go into the table
+        for mover in (0, 1):
+            layer[mover] = self._mobile_layer(mover, fa, fb)
+        _finish(layer)
+
+        # A stranded mover takes the penalty and hands the turn over
+        stranded_a = layer[1][:, :, a.damage_after(FUEL_PENALTY_DAMAGE), :]
+        layer[0][~mobile[0]] = stranded_a[~mobile[0]]
+        stranded_b = layer[0][:, :, :, b.damage_after(FUEL_PENALTY_DAMAGE)]
+        layer[1][:, ~mobile[1]] = stranded_b[:, ~mobile[1]]
+        both = np.ix_(~mobile[0], ~mobile[1])
+        layer[(slice(None),) + both] = self._resource_scores(*fuel)
+        _finish(layer)
+
+    def solve(self) -> float:
+        """Fill the whole table.
+
+        Returns:
+            Seconds taken
+        """
+        start = time.perf_counter()
+        for fa in range(self.values.shape[1]):
+            for fb in range(self.values.shape[2]):
+                self._fill_layer(fa, fb)
+        self.seconds = time.perf_counter() - start
+        return self.seconds
+
+    def _index(self, state: GameState) -> Tuple[int, ...]:
+        """Table index of a GameState.
+
+        Raises:
+            ValueError: If the state is outside the table's box
+        """
+        for seat, table in enumerate(self.tables):
+            if (
+                state.fuel[seat] > table.fuel
+                or state.fuel[seat] % self.fuel_step
+                or state.tire_health[seat] > table.tire
+            ):
+                raise ValueError(f"{state} is outside the solved box")
+        return (
+            state.to_move,
+            state.fuel[0] // self.fuel_step,
+            state.fuel[1] // self.fuel_step,
+            self.tables[0].combo_of(state.uses),
+            self.tables[1].combo_of(state.uses),
+            state.tire_health[0],
+            state.tire_health[1],
+        )
+
+    def win_probability(self, state: GameState, seat: int = 0) -> float:
+        """Expected score of a seat from a position (a draw counts one half).
+
+        Args:
+            state: Position inside the solved box
+            seat: Seat whose score is returned
+
+        Returns:
+            Probability of winning plus half the probability of a draw
+        """
+        value = float(self.values[self._index(state)])
+        return value if seat == 0 else 1.0 - value
+
+    def heatmap(
+        self,
+        seat: int,
+        opponent_tire: int,
+        opponent_fuel: int,
+        to_move: Optional[int] = None,
+    ) -> np.ndarray:
+        """A seat's expected score over its own tire health and fuel.
+
+        Limited moves keep all their uses.
+
+        Args:
+            seat: Seat whose score is mapped
+            opponent_tire: Tire health of the other seat
+            opponent_fuel: Fuel of the other seat
+            to_move: Seat to move (defaults to seat)
+
+        Returns:
+            (tire health, fuel level) array; fuel levels are fuel_levels[seat]
+        """
+        to_move = seat if to_move is None else to_move
+        other = 1 - seat
+        tire = [0, 0]
+        fuel = [0, 0]
+        tire[other] = opponent_tire
+        fuel[other] = opponent_fuel
+        probe = GameState(
+            to_move, tuple(tire), tuple(fuel), self.rules.initial_state().uses
+        )
+        index = list(self._index(probe))
+        index[1 + seat] = slice(None)
+        index[5 + seat] = slice(None)
+        values = self.values[tuple(index)]  # (fuel, tire) of the seat
+        values = values.T
+        return values if seat == 0 else 1.0 - values
+
+    def save(self, path: str) -> None:
+        """Write the table and its axes as a compressed .npz archive.
+
+        Args:
+            path: Output file
+        """
+        np.savez_compressed(
+            path,
+            values=self.values,
+            fuel_levels_0=self.fuel_levels[0],
+            fuel_levels_1=self.fuel_levels[1],
+            uses_0=np.array(self.tables[0].combos).reshape(
+                len(self.tables[0].combos), -1
+            ),
+            uses_1=np.array(self.tables[1].combos).reshape(
+                len(self.tables[1].combos), -1
+            ),
+            names=np.array([seat.name for seat in self.rules.seats]),
+            policies=np.array([policy.name for policy in self.policies]),
+        )
+
+
+def plot_heatmaps(dp: WinProbabilityDP, path: str) -> None:
+    """Plot each seat's expected score over its own tire health and fuel.
+
+    The opponent is fixed at the top of the box with full uses. Needs
+    matplotlib, which is imported here so the rest of the module does not.
+
+    Args:
+        dp: Solved table
+        path: Image file to write
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    figure, axes = plt.subplots(1, 2, figsize=(11, 4.5), constrained_layout=True)
+    for seat, axis in enumerate(axes):
+        other = dp.tables[1 - seat]
+        grid = dp.heatmap(seat, other.tire, other.fuel)
+        image = axis.imshow(
+            grid,
+            origin="lower",
+            aspect="auto",
+            vmin=0.0,
+            vmax=1.0,
+            cmap="RdYlGn",
+            extent=(
+                -dp.fuel_step / 2,
+                dp.fuel_levels[seat][-1] + dp.fuel_step / 2,
+                -0.5,
+                grid.shape[0] - 0.5,
+            ),
+        )
+        rival = dp.rules.seats[1 - seat].name
+        axis.set_title(
+            f"{dp.rules.seats[seat].name} ({dp.policies[seat].name}) to move\n"
+            f"vs {rival} at {other.tire} tire, {other.fuel} fuel"
+        )
+        axis.set_xlabel("fuel")
+        axis.set_ylabel("tire health")
+    figure.colorbar(image, ax=axes, label="win probability (draw = 1/2)")
+    figure.savefig(path, dpi=120)
+    plt.close(figure)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Solve a policy matchup and save its table and heatmaps.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Win-probability tables")
+    parser.add_argument("--first", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--second", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--max-fuel", type=int, default=100)
+    parser.add_argument("--max-tire", type=int, default=100)
+    parser.add_argument("--output", default="win_probability.npz")
+    parser.add_argument("--plot", default="win_probability.png")
+    args = parser.parse_args(argv)
+
+    dp = WinProbabilityDP(
+        (POLICIES[args.first](), POLICIES[args.second]()),
+        max_fuel=args.max_fuel,
+        max_tire=args.max_tire,
+    )
+    print(f"Table of {dp.values.size:,} positions ({dp.values.nbytes / 2**20:.0f} MiB)")
+    dp.solve()
+    print(f"Solved in {dp.seconds:.1f}s")
+    a, b = dp.tables
+    corner = GameState(
+        0, (a.tire, b.tire), (a.fuel, b.fuel), dp.rules.initial_state().uses
+    )
+    print(
+        f"{dp.rules.seats[0].name} ({args.first}) moving first at "
+        f"{a.tire}/{a.fuel} vs {b.tire}/{b.fuel}: {dp.win_probability(corner):.3f}"
+    )
+    dp.save(args.output)
+    print(f"Saved table to {args.output}")
+    try:
+        plot_heatmaps(dp, args.plot)
+    except ImportError:
+        print("matplotlib is not installed; skipping heatmaps")
+    else:
+        print(f"Saved heatmaps to {args.plot}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Test suite for adaptive Monte Carlo win-rate estimation.
+Covers Wilson intervals, the stopping rule and allocation across matchups.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from adaptive_mc import AdaptiveMonteCarlo, Matchup, wilson_interval
+from batch_simulator import BatchRaceSimulator
+from policies import POLICIES
+
+
+class TestAdaptiveMonteCarlo(unittest.TestCase):
+    """Test sequential stopping on Wilson intervals."""
+
+    def test_wilson_interval(self):
+        """Test the interval against known values and edge cases."""
+        low, high = wilson_interval(50, 100, 1.96)
+        self.assertAlmostEqual(low, 0.4038, places=4)
+        self.assertAlmostEqual(high, 0.5962, places=4)
+
+        low, high = wilson_interval(0, 40, 1.96)
+        self.assertEqual(low, 0.0)
+        self.assertAlmostEqual(high, 0.0876, places=4)
+        self.assertEqual(wilson_interval(0, 0, 1.96), (0.0, 1.0))
+
+    def test_stops_once_tolerance_is_met(self):
+        """Test a matchup stops early, on exactly the seeds it reports."""
+        runner = AdaptiveMonteCarlo(tolerance=0.05, chunk_size=500, workers=1)
+        (estimate,) = runner.run([Matchup("random", "greedy")])
+
+        self.assertTrue(estimate.converged)
+        self.assertLessEqual(estimate.high - estimate.low, 0.05)
+        self.assertLess(estimate.games, 10_000)
+        self.assertEqual(estimate.games % 500, 0)
+
+        batch = BatchRaceSimulator(
+            estimate.games, (POLICIES["random"](), POLICIES["greedy"]())
+        )
+        batch.run()
+        self.assertEqual(estimate.wins, int(np.count_nonzero(batch.winner == 0)))
+
+    def test_max_games_caps_a_matchup(self):
+        """Test a too-tight tolerance stops at max_games unconverged."""
+        runner = AdaptiveMonteCarlo(
+            tolerance=0.001, chunk_size=300, max_games=1_000, workers=1
+        )
+        (estimate,) = runner.run([Matchup("random", "random")])
+        self.assertEqual(estimate.games, 1_000)
+        self.assertFalse(estimate.converged)
+
+    def test_compute_goes_to_uncertain_matchups(self):
+        """Test a foregone matchup stops while a close one keeps playing."""
+        runner = AdaptiveMonteCarlo(tolerance=0.02, chunk_size=1_000, workers=2)
+        foregone, close = runner.run(
+            [Matchup("greedy", "greedy"), Matchup("random", "random")]
+        )
+        # At most one speculative chunk per extra worker before its first result
+        self.assertLessEqual(foregone.games, 2_000)
+        self.assertTrue(foregone.converged and close.converged)
+        self.assertGreater(close.games, 3 * foregone.games)
+
+
+if __name__ == "__main__":
+    unittest.main()
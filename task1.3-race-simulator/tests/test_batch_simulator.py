@@ -0,0 +1,192 @@
+"""
+Test suite for the vectorized batch simulator and automated policies.
+Verifies the lockstep engine reproduces RaceSimulator game-for-game, including
+through the scalar fallback for policies without batch hooks.
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from policies import POLICIES, Policy, RandomPolicy, GreedyPolicy, mix64, mix64_array
+from batch_simulator import BatchRaceSimulator, play_scalar_game, DRAW
+from drivers import Mostafa, Verstappen
+from mcts import MCTSPolicy
+from moves import OffensiveMoveSpec
+from policy_table import TablePolicy, build_policy_table
+from roster import compile_roster
+from sweeper import base_config
+
+
+class ScalarRandomPolicy(Policy):
+    """RandomPolicy's scalar choices, without its vectorized batch hooks."""
+
+    name = "scalar-random"
+    choose_offensive = RandomPolicy.choose_offensive
+    choose_defensive = RandomPolicy.choose_defensive
+
+
+class BoostedVerstappen(Verstappen):
+    """Verstappen with a harder-hitting DRS Boost."""
+
+    OFFENSIVE_MOVES = (
+        OffensiveMoveSpec("DRS Boost", 45, 30, None, "Boosted"),
+    ) + Verstappen.OFFENSIVE_MOVES[1:]
+
+
+class TestPolicies(unittest.TestCase):
+    """Test seeded policy building blocks."""
+
+    def test_mix64_matches_vectorized(self):
+        """Test scalar and vectorized hashes agree, including large seeds."""
+        seeds = np.array([0, 1, 12345, 2**63 + 7], dtype=np.uint64)
+        turns = np.array([1, 2, 30, 99], dtype=np.int64)
+        hashed = mix64_array(seeds, turns, 1)
+
+        for seed, turn, value in zip(seeds, turns, hashed):
+            self.assertEqual(mix64(int(seed), int(turn), 1), int(value))
+
+    def test_greedy_batch_prefers_highest_damage(self):
+        """Test greedy picks the strongest legal offensive move."""
+        legal = np.array([[True, True, True], [True, False, True]])
+        damage = np.array([[12, 20, 8], [12, 20, 8]])
+        choice = GreedyPolicy().choose_offensive_batch(
+            legal, damage, damage, np.zeros(2), np.ones(2)
+        )
+        np.testing.assert_array_equal(choice, [1, 0])
+
+    def test_random_batch_only_picks_legal_moves(self):
+        """Test random choices never select an unusable move."""
+        legal = np.array([[False, True, False], [True, False, True]] * 50)
+        seeds = np.arange(100, dtype=np.uint64)
+        choice = RandomPolicy().choose_offensive_batch(
+            legal, legal, legal, seeds, np.ones(100)
+        )
+        self.assertTrue(legal[np.arange(100), choice].all())
+
+
+class TestBatchRaceSimulator(unittest.TestCase):
+    """Test BatchRaceSimulator against the scalar RaceSimulator."""
+
+    def test_matches_scalar_engine_for_all_policy_pairs(self):
+        """Test every game matches the scalar engine under the same seeds."""
+        n_games = 60
+        for first in POLICIES:
+            for second in POLICIES:
+                policies = (POLICIES[first](), POLICIES[second]())
+                batch = BatchRaceSimulator(n_games, policies)
+                batch.run()
+                results = batch.results()
+
+                for seed in range(n_games):
+                    with self.subTest(first=first, second=second, seed=seed):
+                        self.assertEqual(
+                            results[seed], play_scalar_game(policies, seed)
+                        )
+
+    def test_custom_seeds_are_respected(self):
+        """Test explicit seeds drive the same games as the scalar engine."""
+        policies = (RandomPolicy(), RandomPolicy())
+        seeds = np.array([7, 1_000_003, 2**40], dtype=np.uint64)
+        batch = BatchRaceSimulator(len(seeds), policies, seeds=seeds)
+        batch.run()
+
+        for seed, result in zip(seeds, batch.results()):
+            self.assertEqual(result, play_scalar_game(policies, int(seed)))
+
+    def test_all_games_finish(self):
+        """Test every game terminates with a valid result."""
+        batch = BatchRaceSimulator(500, (RandomPolicy(), RandomPolicy()))
+        batch.run()
+
+        self.assertFalse(batch.active.any())
+        self.assertTrue(np.isin(batch.winner, [DRAW, 0, 1]).all())
+        self.assertTrue((batch.fuel >= 0).all())
+        self.assertTrue((batch.tire >= 0).all())
+        self.assertTrue((batch.off_uses >= -1).all())
+        self.assertTrue((batch.def_uses >= -1).all())
+
+
+class TestScalarFallback(unittest.TestCase):
+    """Test policies without batch hooks play through the scalar fallback."""
+
+    def test_fallback_matches_vectorized_hooks(self):
+        """Test scalar-only play equals the vectorized policy it copies."""
+        n_games = 60
+        for seat in (0, 1):
+            scalar = [GreedyPolicy(), GreedyPolicy()]
+            vector = [GreedyPolicy(), GreedyPolicy()]
+            scalar[seat], vector[seat] = ScalarRandomPolicy(), RandomPolicy()
+            fallback = BatchRaceSimulator(n_games, tuple(scalar))
+            vectorized = BatchRaceSimulator(n_games, tuple(vector))
+            fallback.run()
+            vectorized.run()
+            with self.subTest(seat=seat):
+                self.assertEqual(fallback.results(), vectorized.results())
+                np.testing.assert_array_equal(fallback.def_uses, vectorized.def_uses)
+                for seed, result in enumerate(fallback.results()):
+                    self.assertEqual(result, play_scalar_game(tuple(scalar), seed))
+
+    def test_search_policy_plays_in_a_batch(self):
+        """Test MCTSPolicy, which has no batch hooks, finishes batch games."""
+        batch = BatchRaceSimulator(3, (MCTSPolicy(time_budget=0.0005), GreedyPolicy()))
+        batch.run()
+        self.assertFalse(batch.active.any())
+        self.assertTrue(np.isin(batch.winner, [DRAW, 0, 1]).all())
+
+    def test_table_policy_defends_in_a_batch(self):
+        """Test TablePolicy sees the offensive move it answers in a batch."""
+        config = base_config()
+        for entry in config["drivers"]:
+            entry["fuel"], entry["tire_health"] = 120, 30
+        small = compile_roster(config).drivers
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "table.bin")
+            build_policy_table(path, small)
+            for seat in (0, 1):
+                policies = [GreedyPolicy(), GreedyPolicy()]
+                policies[seat] = TablePolicy(path, small, rebuild=False)
+                batch = BatchRaceSimulator(8, tuple(policies), driver_classes=small)
+                batch.run()
+                for seed, result in enumerate(batch.results()):
+                    with self.subTest(seat=seat, seed=seed):
+                        self.assertEqual(
+                            result, play_scalar_game(tuple(policies), seed, small)
+                        )
+        finally:
+            shutil.rmtree(directory)
+
+    def test_fallback_needs_simulators(self):
+        """Test calling the fallback without positions says what is missing."""
+        legal = np.ones((1, 3), dtype=bool)
+        with self.assertRaisesRegex(NotImplementedError, "scalar-random"):
+            ScalarRandomPolicy().choose_offensive_batch(
+                legal, legal, legal, np.zeros(1), np.ones(1)
+            )
+
+    def test_unsupported_policies_rejected_up_front(self):
+        """Test non-policies and policies for other drivers fail at construction."""
+        with self.assertRaises(TypeError):
+            BatchRaceSimulator(2, (GreedyPolicy(), "greedy"))
+        with self.assertRaises(ValueError):
+            BatchRaceSimulator(2, (GreedyPolicy(),))
+        boosted = (BoostedVerstappen, Mostafa)
+        with self.assertRaisesRegex(ValueError, "mcts"):
+            BatchRaceSimulator(2, (MCTSPolicy(driver_classes=boosted), GreedyPolicy()))
+        BatchRaceSimulator(
+            2,
+            (MCTSPolicy(driver_classes=boosted), GreedyPolicy()),
+            driver_classes=boosted,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
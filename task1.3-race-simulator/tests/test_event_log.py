@@ -0,0 +1,156 @@
+"""
+Test suite for the binary event log and replayer.
+Covers encoding, streaming, scalar/batch parity and replay verification.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from batch_simulator import BatchRaceSimulator
+from drivers import Mostafa
+from event_log import (
+    EventLogError,
+    EventLogWriter,
+    GameLog,
+    TurnEvent,
+    decode_game,
+    encode_game,
+    game_log_of,
+    open_log,
+    read_games,
+    replay,
+)
+from game_state import RaceRules
+from policies import POLICIES, GreedyPolicy, RandomPolicy
+from race_simulator import RaceSimulator
+from test_roster import driver_entry
+from roster import compile_roster
+
+
+def record_scalar_game(policies, seed):
+    """Play one logged RaceSimulator race, with the state after every turn."""
+    simulator = RaceSimulator(
+        policies=dict(zip(("Max Verstappen", "Mostafa"), policies)),
+        seed=seed,
+        record_events=True,
+    )
+    rules = RaceRules()
+    states = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        while simulator.execute_turn() and simulator.opponent.is_alive():
+            simulator.switch_turns()
+            states.append(rules.state_of(simulator))
+    return game_log_of(simulator), states
+
+
+def write_log(games, fingerprint):
+    """Encode games into an in-memory log."""
+    stream = io.BytesIO()
+    writer = EventLogWriter(stream, fingerprint)
+    for game in games:
+        writer.write_game(game)
+    stream.seek(0)
+    return stream
+
+
+class TestEventLog(unittest.TestCase):
+    """Test recording, streaming and replaying race logs."""
+
+    def setUp(self):
+        """Create shared rules for each test."""
+        self.rules = RaceRules()
+
+    def test_encode_round_trip(self):
+        """Test a game decodes to exactly what was encoded."""
+        game = GameLog(
+            123456,
+            (
+                TurnEvent(0, 1, None, 20, 80, 0),
+                TurnEvent(1, 2, 1, 0, 25, 40),
+                TurnEvent(0, None, None, 5, 0, 0),
+            ),
+            (75, 100),
+            (395, 435),
+        )
+        block = encode_game(game)
+        self.assertEqual(decode_game(block), (game, len(block)))
+        self.assertLess(len(block), 24)
+
+    def test_scalar_and_batch_logs_agree(self):
+        """Test RaceSimulator and the batch engine record identical logs."""
+        policies = (RandomPolicy(), GreedyPolicy())
+        batch = BatchRaceSimulator(10, policies, record_events=True)
+        batch.run()
+        for seed, batch_game in enumerate(batch.game_logs()):
+            scalar_game, _ = record_scalar_game(policies, seed)
+            self.assertEqual(scalar_game, batch_game)
+
+    def test_replay_rebuilds_every_turn(self):
+        """Test fast-forwarding k turns reaches the live race's k-th state."""
+        game, states = record_scalar_game((RandomPolicy(), RandomPolicy()), 4)
+        for turns, state in enumerate(states, 1):
+            self.assertEqual(replay(game, self.rules, turns), state)
+        replay(game, self.rules)  # Verifies the final stats
+
+    def test_streams_large_batches(self):
+        """Test many games stream back across read-chunk boundaries."""
+        batch = BatchRaceSimulator(
+            3000, (POLICIES["random"](), POLICIES["conservative"]()), record_events=True
+        )
+        batch.run()
+        games = list(batch.game_logs())
+        stream = write_log(games, self.rules.fingerprint)
+        self.assertGreater(len(stream.getvalue()), 1 << 16)
+
+        streamed = list(read_games(stream, self.rules.fingerprint))
+        self.assertEqual(streamed, games)
+        for game in streamed:
+            replay(game, self.rules)
+
+    def test_gzip_log_file(self):
+        """Test .gz logs are compressed transparently."""
+        directory = tempfile.mkdtemp()
+        try:
+            game, _ = record_scalar_game((GreedyPolicy(), RandomPolicy()), 1)
+            path = os.path.join(directory, "races.f1ev.gz")
+            with open_log(path, "wb") as handle:
+                EventLogWriter(handle, self.rules.fingerprint).write_game(game)
+            with open_log(path) as handle:
+                self.assertEqual(list(read_games(handle)), [game])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_tampered_log_fails_verification(self):
+        """Test replay rejects deltas or final stats that do not match."""
+        game, _ = record_scalar_game((GreedyPolicy(), GreedyPolicy()), 0)
+        first = game.turns[0]
+        wrong_damage = game._replace(
+            turns=(first._replace(damage=first.damage + 1),) + game.turns[1:]
+        )
+        with self.assertRaises(EventLogError):
+            replay(wrong_damage, self.rules)
+        with self.assertRaises(EventLogError):
+            replay(game._replace(fuel=(0, 0)), self.rules)
+
+    def test_rejects_other_roster_and_truncation(self):
+        """Test the header fingerprint and truncated games are checked."""
+        game, _ = record_scalar_game((GreedyPolicy(), GreedyPolicy()), 0)
+        data = write_log([game], self.rules.fingerprint).getvalue()
+
+        other = compile_roster({"drivers": [driver_entry()]}).drivers[0]
+        with self.assertRaises(EventLogError):
+            list(read_games(io.BytesIO(data), RaceRules((other, Mostafa)).fingerprint))
+        with self.assertRaises(EventLogError):
+            list(read_games(io.BytesIO(data[:-3])))
+
+
+if __name__ == "__main__":
+    unittest.main()
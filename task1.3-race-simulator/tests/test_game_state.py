@@ -0,0 +1,136 @@
+"""
+Test suite for immutable GameState, RaceRules and MoveSpec flyweights.
+Checks the pure rules path stays in lockstep with the Driver-based engine.
+"""
+
+import random
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from moves import OffensiveMoveSpec, OffensiveMove
+from drivers import Verstappen, Mostafa
+from race_simulator import RaceSimulator
+from game_state import GameState, RaceRules, DRAW
+
+
+class TestMoveSpecs(unittest.TestCase):
+    """Test immutable, shared move definitions."""
+
+    def test_specs_are_immutable(self):
+        """Test move definitions reject attribute changes."""
+        spec = Verstappen.OFFENSIVE_MOVES[0]
+        with self.assertRaises(AttributeError):
+            spec.fuel_cost = 1
+        with self.assertRaises(AttributeError):
+            spec.extra = True
+
+    def test_specs_are_shared_between_drivers(self):
+        """Test every driver instance builds moves from the same specs."""
+        first, second = Mostafa(), Mostafa()
+        for a, b in zip(first.get_defensive_moves(), second.get_defensive_moves()):
+            self.assertIs(a.spec, b.spec)
+            self.assertIsNot(a, b)
+
+    def test_per_race_uses_do_not_leak_into_spec(self):
+        """Test spending a move's uses leaves its definition untouched."""
+        spec = OffensiveMoveSpec("Test", 10, 5, 2, "Test")
+        move = OffensiveMove.from_spec(spec)
+        move.use_move()
+
+        self.assertEqual(move.uses_remaining, 1)
+        self.assertEqual(spec.max_uses, 2)
+
+
+class TestRaceRules(unittest.TestCase):
+    """Test pure rules over GameStates."""
+
+    def setUp(self):
+        """Create shared rules for each test."""
+        self.rules = RaceRules()
+
+    def test_initial_state_matches_simulator(self):
+        """Test the starting GameState equals a fresh simulator's state."""
+        self.assertEqual(self.rules.initial_state(), self.rules.state_of(RaceSimulator()))
+        self.assertEqual(self.rules.initial_state().uses, (3, 2))
+
+    def test_pack_round_trip(self):
+        """Test packed integers decode back to the same state."""
+        states = [
+            self.rules.initial_state(1),
+            GameState(0, (1, 99), (0, 475), (0, 2)),
+            GameState(1, (100, 5), (500, 25), (3, 0)),
+        ]
+        for state in states:
+            key = self.rules.pack(state)
+            self.assertLess(key, self.rules.key_space)
+            self.assertEqual(self.rules.unpack(key), state)
+
+    def test_states_are_hashable_and_comparable(self):
+        """Test equal positions reached separately compare and hash equal."""
+        a = self.rules.attack(self.rules.initial_state(), 2)
+        b = self.rules.attack(self.rules.initial_state(), 2)
+        self.assertEqual(a, b)
+        self.assertEqual(len({a, b}), 1)
+
+    def test_rules_track_driver_engine(self):
+        """Test random games on RaceRules mirror the Driver-based engine."""
+        rng = random.Random(7)
+        for _ in range(30):
+            simulator = RaceSimulator()
+            state = self.rules.initial_state()
+            while self.rules.result(state) is None:
+                current, opponent = simulator.current_driver, simulator.opponent
+                legal = self.rules.legal_offensive(state)
+                if not legal:
+                    current.take_damage(5)
+                    state = self.rules.penalize(state)
+                else:
+                    offensive = rng.choice(legal)
+                    defensive = rng.choice(self.rules.legal_defensive(state) + [None])
+                    damage = current.execute_offensive_move(
+                        current.get_offensive_moves()[offensive]
+                    )
+                    if defensive is not None:
+                        reduction = opponent.execute_defensive_move(
+                            opponent.get_defensive_moves()[defensive]
+                        )
+                        damage = int(damage * (1 - reduction))
+                    opponent.take_damage(damage)
+                    state = self.rules.attack(state, offensive, defensive)
+                simulator.switch_turns()
+                self.assertEqual(self.rules.state_of(simulator), state)
+
+    def test_commit_then_resolve_equals_attack(self):
+        """Test the two half-steps compose to a full attack."""
+        state = GameState(1, (60, 40), (200, 150), (2, 1))
+        for offensive in self.rules.legal_offensive(state):
+            for defensive in self.rules.legal_defensive(state) + [None]:
+                paid, damage = self.rules.commit_offensive(state, offensive)
+                self.assertEqual(paid.to_move, state.to_move)
+                self.assertEqual(
+                    self.rules.resolve_defense(paid, damage, defensive),
+                    self.rules.attack(state, offensive, defensive),
+                )
+
+    def test_result_by_resources(self):
+        """Test the resource tie-break mirrors _determine_winner_by_resources."""
+        self.assertEqual(
+            self.rules.result(GameState(0, (80, 70), (15, 20), (3, 2))),
+            (0, "Better tire condition"),
+        )
+        self.assertEqual(
+            self.rules.result(GameState(0, (70, 70), (10, 20), (3, 2))),
+            (1, "Superior fuel management"),
+        )
+        self.assertEqual(
+            self.rules.result(GameState(0, (70, 72), (15, 20), (3, 2))),
+            (DRAW, "Equal resource management"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Test suite for the N-car grid race.
+Checks two-car parity with RaceSimulator, scheduling, targeting and tie-breaks.
+"""
+
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from batch_simulator import play_scalar_game
+from drivers import Mostafa, Verstappen
+from game_state import (
+    DRAW,
+    REASON_EQUAL,
+    REASON_FUEL,
+    REASON_TIRE,
+    REASON_TIRE_FAILURE,
+    resource_winner,
+)
+from grid_race import GridRace, make_grid
+from policies import POLICIES, ConservativePolicy, GreedyPolicy
+
+
+class TestGridRace(unittest.TestCase):
+    """Test GridRace turn order, targeting and results."""
+
+    def test_two_cars_match_race_simulator(self):
+        """Test a two-car grid plays exactly like RaceSimulator."""
+        for seed in range(20):
+            for first in POLICIES:
+                for second in POLICIES:
+                    policies = (POLICIES[first](), POLICIES[second]())
+                    expected = play_scalar_game(policies, seed)
+                    race = GridRace([Verstappen(), Mostafa()], policies, seed=seed)
+                    winner, reason = race.run_race()
+                    self.assertEqual(
+                        (winner, reason), (expected["winner"], expected["reason"])
+                    )
+                    self.assertEqual(
+                        tuple(car.fuel for car in race.cars), expected["fuel"]
+                    )
+
+    def test_full_grid_runs_to_a_result(self):
+        """Test a 20-car grid finishes with every car accounted for."""
+        for target in ("random", "weakest"):
+            with self.subTest(target=target):
+                race = GridRace(make_grid(20), target=target, seed=3)
+                winner, reason = race.run_race()
+
+                self.assertTrue(race.is_race_over())
+                self.assertEqual(len(set(race.labels)), 20)
+                self.assertEqual(sorted(race.finishing_order()), sorted(race.labels))
+                if reason == REASON_TIRE_FAILURE:
+                    self.assertEqual(race.alive_count, 1)
+                    self.assertEqual(race.finishing_order()[0], winner)
+
+    def test_eliminated_cars_never_move(self):
+        """Test the scheduler skips cars once they are out."""
+        race = GridRace(make_grid(6), [GreedyPolicy()] * 6, seed=1)
+        moved_after_elimination = False
+        while True:
+            out = set(race.eliminated)
+            before = [car.fuel for car in race.cars]
+            if not race.execute_turn():
+                break
+            for car in out:
+                moved_after_elimination |= race.cars[car].fuel != before[car]
+        self.assertFalse(moved_after_elimination)
+        self.assertGreater(len(race.eliminated), 0)
+
+    def test_weakest_target_is_lowest_tire_opponent(self):
+        """Test weakest targeting attacks the opponent with least tire health."""
+        cars = make_grid(4)
+        for car, tire in zip(cars, (10, 90, 40, 20)):
+            car.take_damage(car.tire_health - tire)
+        race = GridRace(cars, [ConservativePolicy()] * 4, target="weakest")
+        race.execute_turn()  # Car 0 is weakest, so it attacks car 3
+        self.assertEqual([car.tire_health for car in cars], [10, 90, 40, 12])
+        race.execute_turn()  # Car 1 attacks car 0
+        self.assertEqual([car.tire_health for car in cars], [3, 90, 40, 12])
+
+    def test_rejects_bad_grids(self):
+        """Test invalid grids raise ValueError."""
+        with self.assertRaises(ValueError):
+            GridRace([Verstappen()])
+        with self.assertRaises(ValueError):
+            GridRace(make_grid(3), target="leader")
+        with self.assertRaises(ValueError):
+            GridRace(make_grid(3), [GreedyPolicy()])
+
+
+class TestResourceWinner(unittest.TestCase):
+    """Test the N-driver resource tie-break."""
+
+    def test_fuel_leader_wins(self):
+        """Test a clear fuel lead over every rival wins."""
+        self.assertEqual(resource_winner([40, 25, 10], [5, 90, 90]), (0, REASON_FUEL))
+
+    def test_close_fuel_goes_to_tires(self):
+        """Test drivers close on fuel are separated by tire health."""
+        self.assertEqual(resource_winner([40, 35, 0], [20, 60, 99]), (1, REASON_TIRE))
+
+    def test_draw_when_contenders_are_close(self):
+        """Test close fuel and tire health is a draw."""
+        self.assertEqual(
+            resource_winner([40, 35, 38], [50, 52, 20]), (DRAW, REASON_EQUAL)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Test suite for opt-in race instrumentation.
+Checks counters against recorded events, JSON-lines output and that races
+without metrics carry no hooks.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from game_state import REASON_TIRE_FAILURE
+from instrumentation import PHASES, RaceMetrics
+from policies import GreedyPolicy, RandomPolicy
+from race_simulator import RaceSimulator
+from renderers import NullRenderer
+
+
+def race(seed, metrics=None, record_events=False):
+    """A headless random-vs-greedy race."""
+    return RaceSimulator(
+        policies={"Max Verstappen": RandomPolicy(), "Mostafa": GreedyPolicy()},
+        seed=seed,
+        renderer=NullRenderer(),
+        metrics=metrics,
+        record_events=record_events,
+    )
+
+
+class TestRaceMetrics(unittest.TestCase):
+    """Test RaceMetrics timings, counters and output."""
+
+    def test_counters_match_races(self):
+        """Test turn, penalty and resource-finish counts are exact."""
+        metrics = RaceMetrics()
+        turns = penalties = resource_finishes = 0
+        for seed in range(30):
+            plain = race(seed, record_events=True)
+            _, reason = plain.run_race()
+            turns += len(plain.events) + (reason != REASON_TIRE_FAILURE)
+            penalties += sum(event.offensive is None for event in plain.events)
+            resource_finishes += reason != REASON_TIRE_FAILURE
+
+            instrumented = race(seed, metrics)
+            self.assertEqual(instrumented.run_race(), plain.determine_winner())
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["races"], 30)
+        self.assertEqual(snapshot["turns"], turns)
+        self.assertEqual(snapshot["penalties"], penalties)
+        self.assertEqual(snapshot["resource_finishes"], resource_finishes)
+        self.assertEqual(snapshot["illegal_retries"], 0)
+        for phase in PHASES:
+            self.assertGreater(snapshot["calls"][phase], 0)
+            self.assertGreater(snapshot["seconds"][phase], 0.0)
+        self.assertLessEqual(
+            snapshot["seconds"]["execution"], snapshot["seconds"]["turn"]
+        )
+
+    def test_counts_illegal_choice_retries(self):
+        """Test only choices of an unusable move count as retries."""
+        metrics = RaceMetrics()
+        simulator = RaceSimulator(
+            policies={"Mostafa": GreedyPolicy()},
+            renderer=NullRenderer(),
+            metrics=metrics,
+        )
+        simulator.verstappen.consume_fuel(430)  # 70 left: Red Bull Surge costs 80
+        with patch("builtins.input", side_effect=["9", "fast", "2", "2", "1"]):
+            simulator.execute_turn()
+        self.assertEqual(metrics.snapshot()["illegal_retries"], 2)
+
+    def test_writes_json_lines(self):
+        """Test snapshots are appended periodically and on demand."""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "metrics.jsonl")
+            metrics = RaceMetrics(path, interval=0.0)
+            simulator = race(2, metrics)
+            simulator.run_race()
+            metrics.write_snapshot()
+
+            with open(path) as handle:
+                lines = [json.loads(line) for line in handle]
+            self.assertEqual(len(lines), metrics.counts["turns"] + 1)
+            self.assertEqual([line["turns"] for line in lines[:3]], [1, 2, 3])
+            self.assertEqual(lines[-1]["turns"], lines[-2]["turns"])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_uninstrumented_race_has_no_hooks(self):
+        """Test a race without metrics runs the plain class methods."""
+        simulator = race(0)
+        self.assertNotIn("execute_turn", vars(simulator))
+        self.assertNotIn("get_move_choice", vars(simulator))
+        self.assertNotIn("execute_offensive_move", vars(simulator.verstappen))
+        self.assertIsInstance(simulator.renderer, NullRenderer)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Test suite for the time-budgeted MCTS opponent.
+Covers time budget, move legality, subtree reuse and playing strength.
+"""
+
+import contextlib
+import io
+import time
+import unittest
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from game_state import GameState
+from mcts import MCTSPolicy
+from solver import GameSolver, WIN
+from policies import RandomPolicy
+from race_simulator import RaceSimulator
+from renderers import NullRenderer, TextRenderer
+
+
+class TestMCTSPolicy(unittest.TestCase):
+    """Test MCTSPolicy decisions through RaceSimulator."""
+
+    def test_respects_time_budget(self):
+        """Test a decision returns close to its time budget."""
+        policy = MCTSPolicy(time_budget=0.02)
+        start = time.perf_counter()
+        policy.search(policy.rules.initial_state())
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.02 + 0.05)
+        self.assertGreater(policy.last_playouts, 0)
+        self.assertGreater(policy.playouts_per_second, 0)
+
+    def test_finds_only_winning_move(self):
+        """Test the AI picks the one attack the exact solver proves wins."""
+        solver = GameSolver()
+        state = GameState(0, (10, 10), (120, 90), (3, 2))
+        policy = MCTSPolicy(time_budget=0.03)
+
+        choice = policy.search(state)
+        self.assertEqual(solver.value(state), WIN)
+        self.assertEqual(choice, solver.best_offensive(state))
+
+    def test_defends_when_skipping_loses(self):
+        """Test the AI defends against a lethal hit it can survive and win from."""
+        simulator = RaceSimulator()
+        simulator.verstappen.take_damage(95)
+        simulator.verstappen.consume_fuel(400)
+        simulator.mostafa.take_damage(85)
+        simulator.mostafa.consume_fuel(440)
+        simulator.verstappen.execute_offensive_move(
+            simulator.verstappen.get_offensive_moves()[1]
+        )
+        available = [
+            move
+            for move in simulator.mostafa.get_defensive_moves()
+            if move.can_use(simulator.mostafa.fuel)
+        ]
+
+        policy = MCTSPolicy(time_budget=0.02)
+        choice = policy.choose_defensive(simulator, available, 20)
+        # Any block survives and wins with Corner Mastery next turn.
+        self.assertIn(choice, range(len(available)))
+
+    def test_reuses_subtree_between_decisions(self):
+        """Test the next decision starts from the previous search tree."""
+        policy = MCTSPolicy(time_budget=0.03)
+        state = policy.rules.initial_state()
+        offensive = policy.search(state)
+
+        paid, damage = policy.rules.commit_offensive(state, offensive)
+        policy.search(paid, damage)
+        self.assertGreater(policy.last_reused, 0)
+
+    def test_beats_random_policy(self):
+        """Test the AI wins most races against random play from either seat."""
+        wins = 0
+        for seed in range(4):
+            ai_seat = seed % 2
+            names = ("Max Verstappen", "Mostafa")
+            policies = {
+                names[ai_seat]: MCTSPolicy(time_budget=0.01, seed=seed),
+                names[1 - ai_seat]: RandomPolicy(),
+            }
+            simulator = RaceSimulator(policies=policies, seed=seed)
+            with contextlib.redirect_stdout(io.StringIO()):
+                winner, _ = simulator.run_race()
+            wins += winner == names[ai_seat]
+        self.assertGreaterEqual(wins, 3)
+
+    def test_verbose_statistics_follow_the_renderer(self):
+        """Test playout statistics go to the renderer, never to bare stdout."""
+        for renderer in (NullRenderer(), TextRenderer(io.StringIO())):
+            simulator = RaceSimulator(renderer=renderer)
+            policy = MCTSPolicy(time_budget=0.001, verbose=True)
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                policy.choose_offensive(
+                    simulator, simulator.current_driver.get_offensive_moves()
+                )
+            self.assertEqual(stdout.getvalue(), "")
+            if isinstance(renderer, TextRenderer):
+                self.assertIn("playouts", renderer.stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Test suite for the precomputed optimal-policy table.
+Builds small tables and checks lookups, staleness detection and play.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from drivers import Mostafa, Verstappen
+from moves import OffensiveMoveSpec
+from game_state import GameState
+from policies import RandomPolicy
+from policy_table import (
+    PolicyTable,
+    PolicyTableError,
+    StalePolicyTableError,
+    TablePolicy,
+    build_policy_table,
+)
+from race_simulator import RaceSimulator
+from roster import compile_roster
+from solver import GameSolver, WIN
+from sweeper import base_config
+
+ROOTS = [
+    GameState(0, (30, 30), (180, 150), (3, 2)),
+    GameState(1, (30, 30), (150, 180), (3, 2)),
+]
+
+
+class NerfedVerstappen(Verstappen):
+    """Verstappen with a weaker Red Bull Surge."""
+
+    OFFENSIVE_MOVES = (
+        Verstappen.OFFENSIVE_MOVES[0],
+        OffensiveMoveSpec("Red Bull Surge", 80, 15, None, "Nerfed"),
+        Verstappen.OFFENSIVE_MOVES[2],
+    )
+
+
+def make_simulator(state, policies):
+    """Build a RaceSimulator at a GameState."""
+    simulator = RaceSimulator(policies=policies)
+    for seat, driver in enumerate((simulator.verstappen, simulator.mostafa)):
+        driver.set_stats(state.tire_health[seat], state.fuel[seat])
+    if state.to_move == 1:
+        simulator.switch_turns()
+    return simulator
+
+
+class TestPolicyTable(unittest.TestCase):
+    """Test building, mapping and playing from a policy table."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one small table shared by the tests."""
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, "table.bin")
+        cls.count = build_policy_table(cls.path, roots=ROOTS)
+        cls.solver = GameSolver()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the table directory."""
+        shutil.rmtree(cls.directory)
+
+    def test_lookups_match_solver(self):
+        """Test stored moves equal the solver's choices."""
+        table = PolicyTable(self.path, self.solver.rules)
+        self.assertEqual(table.n_entries, self.count)
+        for root in ROOTS:
+            self.assertEqual(
+                table.best_offensive(root), self.solver.best_offensive(root)
+            )
+            for offensive in self.solver.rules.legal_offensive(root):
+                self.assertEqual(
+                    table.best_defensive(root, offensive),
+                    (True, self.solver.best_defensive(root, offensive)),
+                )
+        table.close()
+
+    def test_unknown_position_is_missing(self):
+        """Test a position outside the table is reported as missing."""
+        table = PolicyTable(self.path, self.solver.rules)
+        self.assertIsNone(table.lookup(GameState(0, (100, 100), (500, 500), (3, 2))))
+        table.close()
+
+    def test_changed_moves_make_table_stale(self):
+        """Test a table built for other move definitions is rejected."""
+        rules = GameSolver((NerfedVerstappen, Mostafa)).rules
+        with self.assertRaises(StalePolicyTableError):
+            PolicyTable(self.path, rules)
+
+    def test_missing_file_raises(self):
+        """Test a missing table raises by default instead of solving."""
+        missing = os.path.join(self.directory, "missing.bin")
+        with self.assertRaisesRegex(PolicyTableError, "rebuild=True"):
+            TablePolicy(missing)
+        self.assertFalse(os.path.exists(missing))
+
+    def test_rebuild_solves_quietly(self):
+        """Test rebuild=True writes the table without printing anything."""
+        config = base_config()
+        for entry in config["drivers"]:
+            entry["fuel"], entry["tire_health"] = 120, 30
+        small = compile_roster(config).drivers
+        path = os.path.join(self.directory, "small.bin")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            policy = TablePolicy(path, small, rebuild=True)
+        self.assertEqual(output.getvalue(), "")
+        self.assertGreater(policy.table.n_entries, 0)
+        policy.table.close()
+
+    def test_table_policy_never_loses_a_won_position(self):
+        """Test the table driver converts solver wins against random play."""
+        for root in ROOTS:
+            seat = root.to_move
+            self.assertEqual(self.solver.value(root), WIN)
+            names = ("Max Verstappen", "Mostafa")
+            for seed in range(5):
+                policies = {
+                    names[seat]: TablePolicy(self.path, rebuild=False),
+                    names[1 - seat]: RandomPolicy(),
+                }
+                simulator = make_simulator(root, policies)
+                simulator.seed = seed
+                with contextlib.redirect_stdout(io.StringIO()):
+                    winner, _ = simulator.run_race()
+                self.assertEqual(winner, names[seat])
+
+
+if __name__ == "__main__":
+    unittest.main()
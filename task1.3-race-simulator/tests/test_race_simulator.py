@@ -5,6 +5,7 @@ Tests all OOP principles, game mechanics, and edge cases.
 
 import unittest
 from unittest.mock import patch, MagicMock
+import random
 import sys
 import os
 
@@ -434,6 +435,132 @@ class TestEdgeCases(unittest.TestCase):
             self.assertIsInstance(move, Move)
 
 
+class TestSearchAPI(unittest.TestCase):
+    """Test make/unmake and snapshot/restore used by lookahead search."""
+
+    def play_random(self, simulator, rng, depth):
+        """Make up to depth random legal turns, returning their records."""
+        records = []
+        for _ in range(depth):
+            if simulator.is_race_over():
+                break
+            attacker, defender = simulator.current_driver, simulator.opponent
+            offensive = [
+                i
+                for i, move in enumerate(attacker.get_offensive_moves())
+                if move.can_use(attacker.fuel)
+            ]
+            defensive = [
+                i
+                for i, move in enumerate(defender.get_defensive_moves())
+                if move.can_use(defender.fuel)
+            ]
+            records.append(
+                simulator.make_move(
+                    rng.choice(offensive) if offensive else None,
+                    rng.choice(defensive + [None]),
+                )
+            )
+        return records
+
+    def test_make_move_applies_turn(self):
+        """Test make_move spends fuel, deals reduced damage and switches turn."""
+        simulator = RaceSimulator()
+        record = simulator.make_move(1, 1)  # Red Bull Surge vs Aggressive Block
+
+        self.assertEqual(simulator.verstappen.fuel, 420)
+        self.assertEqual(simulator.mostafa.fuel, 465)
+        self.assertEqual(simulator.mostafa.tire_health, 100)
+        self.assertEqual(simulator.mostafa.get_defensive_moves()[1].uses_remaining, 1)
+        self.assertEqual(simulator.current_driver, simulator.mostafa)
+        self.assertEqual(simulator.turn_number, 2)
+        self.assertEqual(record.damage, 0)
+
+    def test_make_move_rejects_illegal_moves(self):
+        """Test unusable moves raise without changing the position."""
+        simulator = RaceSimulator()
+        simulator.mostafa.consume_fuel(490)
+        before = simulator.snapshot()
+
+        with self.assertRaises(ValueError):
+            simulator.make_move(0, 0)  # Mostafa cannot afford Slipstream Cut
+        self.assertEqual(simulator.snapshot(), before)
+
+    def test_make_move_rejects_bad_indices(self):
+        """Test missing or out-of-range indices raise without changing the position."""
+        simulator = RaceSimulator()
+        before = simulator.snapshot()
+
+        for offensive, defensive in ((None, None), (3, None), (-1, None), (0, 3)):
+            with self.subTest(offensive=offensive, defensive=defensive):
+                with self.assertRaises(ValueError):
+                    simulator.make_move(offensive, defensive)
+                self.assertEqual(simulator.snapshot(), before)
+
+    def test_unmake_restores_last_offensive_move(self):
+        """Test unmaking turns brings back the previous last offensive move."""
+        simulator = RaceSimulator()
+        first = simulator.make_move(0)
+        attack = simulator.last_offensive_move
+        second = simulator.make_move(1, 0)
+        self.assertIsNot(simulator.last_offensive_move, attack)
+
+        simulator.unmake_move(second)
+        self.assertIs(simulator.last_offensive_move, attack)
+        simulator.unmake_move(first)
+        self.assertIsNone(simulator.last_offensive_move)
+
+    def test_unmake_reverts_random_lines(self):
+        """Test unmaking every turn in reverse returns to the start position."""
+        rng = random.Random(3)
+        for _ in range(50):
+            simulator = RaceSimulator()
+            start = simulator.snapshot()
+            positions = [start]
+            records = []
+            while not simulator.is_race_over():
+                records.extend(self.play_random(simulator, rng, 1))
+                positions.append(simulator.snapshot())
+            positions.pop()
+
+            for record in reversed(records):
+                simulator.unmake_move(record)
+                self.assertEqual(simulator.snapshot(), positions.pop())
+            self.assertEqual(simulator.snapshot(), start)
+
+    def test_penalty_turn_is_undone(self):
+        """Test a fuel-exhaustion penalty made and unmade leaves no trace."""
+        simulator = RaceSimulator()
+        simulator.verstappen.consume_fuel(500)
+        before = simulator.snapshot()
+
+        record = simulator.make_move()
+        self.assertEqual(simulator.verstappen.tire_health, 95)
+        self.assertEqual(simulator.current_driver, simulator.mostafa)
+
+        simulator.unmake_move(record)
+        self.assertEqual(simulator.snapshot(), before)
+
+    def test_snapshot_restore(self):
+        """Test restore returns to a snapshot taken mid-race."""
+        rng = random.Random(11)
+        simulator = RaceSimulator()
+        self.play_random(simulator, rng, 5)
+        saved = simulator.snapshot()
+
+        self.play_random(simulator, rng, 10)
+        self.assertNotEqual(simulator.snapshot(), saved)
+
+        simulator.restore(saved)
+        self.assertEqual(simulator.snapshot(), saved)
+        self.assertIs(
+            simulator.opponent,
+            simulator.mostafa
+            if simulator.current_driver is simulator.verstappen
+            else simulator.verstappen,
+        )
+
+
 class TestOOPPrinciples(unittest.TestCase):
     """Test implementation of OOP principles."""
 
@@ -0,0 +1,125 @@
+"""
+Test suite for the simulator's output renderers.
+Checks text output, one write per turn when buffered, and silence when null.
+Interactive races are compared byte for byte with recordings of the original
+simulator, kept in tests/golden as pairs of typed input and printed output.
+"""
+
+import contextlib
+import io
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from policies import GreedyPolicy, RandomPolicy
+from race_simulator import RaceSimulator
+from renderers import BufferedRenderer, NullRenderer, TextRenderer
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts write calls."""
+
+    def __init__(self):
+        """Create an empty stream."""
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        """Count and store a write."""
+        self.writes += 1
+        return super().write(text)
+
+
+def automated_race(renderer, seed=0):
+    """Run a full computer-vs-computer race with a renderer."""
+    simulator = RaceSimulator(
+        policies={"Max Verstappen": RandomPolicy(), "Mostafa": GreedyPolicy()},
+        seed=seed,
+        renderer=renderer,
+    )
+    simulator.start_race()
+    return simulator
+
+
+class TestRenderers(unittest.TestCase):
+    """Test that renderers only change output, never the race."""
+
+    def test_text_renderer_output(self):
+        """Test the text renderer writes the turn, moves and result."""
+        stream = io.StringIO()
+        simulator = automated_race(TextRenderer(stream))
+        text = stream.getvalue()
+
+        self.assertTrue(text.startswith("Welcome to F1 Racing Simulator"))
+        self.assertIn("Turn 1: Max Verstappen's Turn", text)
+        self.assertIn("Offensive Moves:", text)
+        self.assertIn(f"Winner: {simulator.determine_winner()[0]}", text)
+
+    def test_buffered_matches_text_with_one_write_per_turn(self):
+        """Test buffered output equals text output, written once per turn."""
+        text, buffered = io.StringIO(), CountingStream()
+        automated_race(TextRenderer(text), seed=3)
+        simulator = automated_race(BufferedRenderer(buffered), seed=3)
+
+        self.assertEqual(buffered.getvalue(), text.getvalue())
+        # Turns, plus the welcome banner and the result
+        self.assertEqual(buffered.writes, simulator.turn_number + 2)
+
+    def test_null_renderer_is_silent(self):
+        """Test a null-rendered race prints nothing and plays identically."""
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            silent = automated_race(NullRenderer(), seed=5)
+        self.assertEqual(stdout.getvalue(), "")
+
+        loud = automated_race(TextRenderer(io.StringIO()), seed=5)
+        self.assertEqual(silent.determine_winner(), loud.determine_winner())
+        self.assertEqual(silent.turn_number, loud.turn_number)
+
+    def test_buffered_flushes_before_prompting(self):
+        """Test a human player sees the held menu before being asked."""
+        stream = io.StringIO()
+        simulator = RaceSimulator(
+            policies={"Mostafa": GreedyPolicy()}, renderer=BufferedRenderer(stream)
+        )
+        prompts = []
+
+        def answer(prompt):
+            prompts.append(stream.getvalue())
+            return "1"
+
+        with patch("builtins.input", side_effect=answer):
+            simulator.execute_turn()
+        self.assertIn("Offensive Moves:", prompts[0])
+
+
+class TestBaselineOutput(unittest.TestCase):
+    """Test interactive races print exactly what the original simulator did."""
+
+    def play_recording(self, name, renderer):
+        """Replay a recording's input and return the race's output."""
+        with open(os.path.join(GOLDEN_DIR, f"{name}.in"), encoding="utf-8") as f:
+            typed = f.read()
+        stdout = io.StringIO()
+        with patch("sys.stdin", io.StringIO(typed)), contextlib.redirect_stdout(stdout):
+            RaceSimulator(renderer=renderer).start_race()
+        return stdout.getvalue()
+
+    def test_matches_recordings(self):
+        """Test text and buffered output match every recording byte for byte."""
+        for name in ("resources", "tire_failure"):
+            with open(os.path.join(GOLDEN_DIR, f"{name}.out"), encoding="utf-8") as f:
+                expected = f.read()
+            for renderer in (TextRenderer(), BufferedRenderer()):
+                with self.subTest(recording=name, renderer=renderer.name):
+                    self.assertEqual(self.play_recording(name, renderer), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+"""
+Test suite for data-driven driver rosters.
+Covers the default drivers, validation, pairing and the parse cache.
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import drivers
+from drivers import Mostafa, Verstappen
+from policies import GreedyPolicy, RandomPolicy
+from race_simulator import RaceSimulator
+import roster
+from roster import RosterError, compile_roster, load_roster
+from tournament import Entrant, _play_match
+
+TOML_ROSTER = """
+[[drivers]]
+name = "Lewis Hamilton"
+fuel = 400
+
+[[drivers.offensive]]
+name = "Hammer Time"
+fuel_cost = 60
+tire_damage = 18
+
+[[drivers.defensive]]
+name = "Tyre Whisperer"
+fuel_cost = 30
+damage_reduction_percent = 0.6
+max_uses = 2
+
+[[drivers]]
+name = "Charles Leclerc"
+
+[[drivers.offensive]]
+name = "Scuderia Push"
+fuel_cost = 50
+tire_damage = 14
+"""
+
+
+def driver_entry(**overrides):
+    """A valid roster entry with some fields replaced."""
+    entry = {
+        "name": "Test Driver",
+        "offensive": [{"name": "Push", "fuel_cost": 10, "tire_damage": 5}],
+        "defensive": [
+            {"name": "Block", "fuel_cost": 5, "damage_reduction_percent": 0.5}
+        ],
+    }
+    entry.update(overrides)
+    return entry
+
+
+class TestRoster(unittest.TestCase):
+    """Test loading, validating and racing roster drivers."""
+
+    def setUp(self):
+        """Create a temporary directory for roster files."""
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        """Write a roster file and return its path."""
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as handle:
+            handle.write(text)
+        return path
+
+    def test_default_drivers_are_compiled_from_the_roster(self):
+        """Test Verstappen and Mostafa take their definitions from default.json."""
+        default = load_roster()
+        for driver_class, entry in (
+            (Verstappen, "Max Verstappen"),
+            (Mostafa, "Mostafa"),
+        ):
+            with self.subTest(driver=entry):
+                compiled = default.driver(entry)
+                self.assertTrue(issubclass(driver_class, compiled))
+                self.assertIs(driver_class.OFFENSIVE_MOVES, compiled.OFFENSIVE_MOVES)
+                self.assertIs(driver_class.DEFENSIVE_MOVES, compiled.DEFENSIVE_MOVES)
+                self.assertEqual(driver_class().name, entry)
+                self.assertIs(pickle.loads(pickle.dumps(driver_class)), driver_class)
+        with self.assertRaises(AttributeError):
+            drivers.Hamilton
+
+    def test_same_driver_pair_rejected(self):
+        """Test a driver cannot be paired with themselves."""
+        loaded = compile_roster(
+            {"drivers": [driver_entry(name="Alpha"), driver_entry(name="Beta")]}
+        )
+        self.assertEqual(loaded.pair("Beta", "Alpha"), loaded.drivers[::-1])
+        with self.assertRaises(RosterError):
+            loaded.pair("Alpha", "Alpha")
+        with self.assertRaises(RosterError):
+            loaded.pair(second="Alpha")
+        with self.assertRaises(ValueError):
+            RaceSimulator(driver_classes=(Verstappen, Verstappen))
+
+    def test_roster_pair_crosses_a_process_pool(self):
+        """Test compiled drivers pickle by content into a fresh worker process."""
+        loaded = compile_roster(
+            {"drivers": [driver_entry(name="Alpha"), driver_entry(name="Beta")]}
+        )
+        pair = loaded.pair()
+        self.assertEqual(pickle.loads(pickle.dumps(pair)), pair)
+        first = Entrant("alpha", GreedyPolicy, driver_classes=pair)
+        second = Entrant("beta", RandomPolicy, driver_classes=pair)
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(1, mp_context=context) as pool:
+            remote = pool.submit(_play_match, first, second, 3).result()
+        self.assertEqual(remote, _play_match(first, second, 3))
+
+    def test_toml_roster(self):
+        """Test TOML rosters load with defaults for omitted fields."""
+        if roster.tomllib is None:
+            self.skipTest("TOML support needs Python 3.11+ or tomli")
+        hamilton, leclerc = load_roster(self.write("grid.toml", TOML_ROSTER)).pair()
+        driver = hamilton()
+        self.assertEqual(driver.name, "Lewis Hamilton")
+        self.assertEqual((driver.tire_health, driver.fuel), (100, 400))
+        self.assertEqual(driver.get_defensive_moves()[0].uses_remaining, 2)
+        self.assertEqual(leclerc().get_defensive_moves(), [])
+
+    def test_parsed_rosters_are_cached_by_content(self):
+        """Test identical contents reuse one compiled roster."""
+        text = json.dumps({"drivers": [driver_entry()]})
+        first = load_roster(self.write("a.json", text))
+        self.assertIs(load_roster(self.write("b.json", text)), first)
+
+        changed = json.dumps({"drivers": [driver_entry(fuel=300)]})
+        self.assertIsNot(load_roster(self.write("a.json", changed)), first)
+
+    def test_move_tables_are_shared(self):
+        """Test every instance of a roster driver shares its move specs."""
+        driver_class = compile_roster({"drivers": [driver_entry()]}).drivers[0]
+        first, second = driver_class(), driver_class()
+        self.assertIs(
+            first.get_offensive_moves()[0].spec, second.get_offensive_moves()[0].spec
+        )
+        self.assertIsNot(
+            first.get_offensive_moves()[0], second.get_offensive_moves()[0]
+        )
+
+    def test_validation_errors(self):
+        """Test malformed entries are rejected with their location."""
+        bad_rosters = {
+            "unknown field": [driver_entry(speed=3)],
+            "negative fuel": [driver_entry(fuel=-1)],
+            "boolean tires": [driver_entry(tire_health=True)],
+            "no attacks": [driver_entry(offensive=[])],
+            "reduction above one": [
+                driver_entry(
+                    defensive=[
+                        {"name": "B", "fuel_cost": 5, "damage_reduction_percent": 1.5}
+                    ]
+                )
+            ],
+            "zero max uses": [
+                driver_entry(
+                    offensive=[
+                        {"name": "P", "fuel_cost": 5, "tire_damage": 5, "max_uses": 0}
+                    ]
+                )
+            ],
+            "free unlimited attack": [
+                driver_entry(
+                    offensive=[{"name": "P", "fuel_cost": 0, "tire_damage": 0}]
+                )
+            ],
+            "duplicate drivers": [driver_entry(), driver_entry()],
+        }
+        for case, drivers in bad_rosters.items():
+            with self.subTest(case=case):
+                with self.assertRaises(RosterError) as raised:
+                    compile_roster({"drivers": drivers})
+                self.assertIn("drivers", str(raised.exception))
+
+        free = {"name": "P", "fuel_cost": 0, "tire_damage": 0, "max_uses": 2}
+        compile_roster({"drivers": [driver_entry(offensive=[free])]})
+        with self.assertRaises(RosterError):
+            load_roster(self.write("broken.json", "{not json"))
+
+    def test_race_between_roster_drivers(self):
+        """Test RaceSimulator runs a race with drivers from a roster."""
+        loaded = compile_roster(
+            {"drivers": [driver_entry(name="Alpha"), driver_entry(name="Beta")]}
+        )
+        simulator = RaceSimulator(
+            policies={"Alpha": GreedyPolicy(), "Beta": RandomPolicy()},
+            driver_classes=loaded.pair(),
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            winner, _ = simulator.run_race()
+        self.assertIn(winner, ("Alpha", "Beta", "Draw"))
+
+
+if __name__ == "__main__":
+    unittest.main()
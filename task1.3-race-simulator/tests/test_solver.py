@@ -0,0 +1,142 @@
+"""
+Test suite for the exact game solver.
+Cross-checks solver values against a naive minimax over RaceSimulator copies.
+"""
+
+import copy
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from race_simulator import RaceSimulator
+from game_state import GameState
+from solver import GameSolver, WIN, DRAW, LOSS
+
+
+def make_simulator(tires, fuels, verstappen_first=True):
+    """Build a RaceSimulator at a reduced-resource position."""
+    simulator = RaceSimulator()
+    for driver, tire, fuel in zip(
+        (simulator.verstappen, simulator.mostafa), tires, fuels
+    ):
+        driver.take_damage(driver.tire_health - tire)
+        driver.consume_fuel(driver.fuel - fuel)
+    if not verstappen_first:
+        simulator.switch_turns()
+    return simulator
+
+
+def naive_value(simulator):
+    """Plain minimax straight on the game objects, for the side to move."""
+    current, opponent = simulator.current_driver, simulator.opponent
+    if not current.can_make_any_offensive_move():
+        if not opponent.can_make_any_offensive_move():
+            with patch("builtins.print"):
+                simulator._determine_winner_by_resources()
+            if simulator._winner == "Draw":
+                return DRAW
+            return WIN if simulator._winner == current.name else LOSS
+        current.take_damage(5)
+        if not current.is_alive():
+            return LOSS
+        simulator.switch_turns()
+        return -naive_value(simulator)
+
+    best = LOSS - 1
+    for i, move in enumerate(current.get_offensive_moves()):
+        if not move.can_use(current.fuel):
+            continue
+        attacked = copy.deepcopy(simulator)
+        attacker = attacked.current_driver
+        damage = attacker.execute_offensive_move(attacker.get_offensive_moves()[i])
+
+        worst = WIN + 1
+        defenses = attacked.opponent.get_defensive_moves()
+        for j in [None] + list(range(len(defenses))):
+            if j is not None and not defenses[j].can_use(attacked.opponent.fuel):
+                continue
+            branch = copy.deepcopy(attacked)
+            final = damage
+            if j is not None:
+                defender = branch.opponent
+                reduction = defender.execute_defensive_move(
+                    defender.get_defensive_moves()[j]
+                )
+                final = int(damage * (1 - reduction))
+            branch.opponent.take_damage(final)
+            if not branch.opponent.is_alive():
+                value = WIN
+            else:
+                branch.switch_turns()
+                value = -naive_value(branch)
+            worst = min(worst, value)
+        best = max(best, worst)
+    return best
+
+
+class TestGameSolver(unittest.TestCase):
+    """Test GameSolver values, moves and reporting."""
+
+    def setUp(self):
+        """Create a fresh solver for each test."""
+        self.solver = GameSolver()
+
+    def test_matches_naive_minimax_on_endgames(self):
+        """Test solver values equal a naive minimax on small endgames."""
+        cases = [
+            ((20, 20), (90, 90), True),
+            ((15, 30), (120, 60), True),
+            ((30, 12), (75, 100), False),
+            ((10, 10), (45, 50), False),
+            ((25, 25), (130, 110), True),
+        ]
+        for tires, fuels, verstappen_first in cases:
+            with self.subTest(tires=tires, fuels=fuels, first=verstappen_first):
+                simulator = make_simulator(tires, fuels, verstappen_first)
+                position = self.solver.position_of(simulator)
+                self.assertEqual(
+                    self.solver.value(position), naive_value(simulator)
+                )
+
+    def test_finishing_blow_is_a_win(self):
+        """Test a defender with no fuel and low tires is beaten at once."""
+        position = GameState(0, (100, 8), (500, 0), (3, 2))
+        self.assertEqual(self.solver.value(position), WIN)
+        self.assertIsNotNone(self.solver.best_offensive(position))
+
+    def test_resource_tiebreak_when_both_stranded(self):
+        """Test the fuel tie-break decides a position with no legal moves."""
+        position = GameState(1, (70, 70), (25, 10), (3, 2))
+        self.assertEqual(self.solver.value(position), LOSS)
+        self.assertIsNone(self.solver.best_offensive(position))
+
+    def test_penalty_elimination_is_a_loss(self):
+        """Test a stranded driver on 5 tire health loses to the penalty."""
+        position = GameState(0, (5, 50), (0, 500), (3, 2))
+        self.assertEqual(self.solver.value(position), LOSS)
+
+    def test_best_defensive_blocks_lethal_attack(self):
+        """Test the defender blocks when the attack would eliminate them."""
+        position = GameState(0, (100, 20), (500, 500), (3, 2))
+        names = [spec.name for spec in self.solver.rules.seats[0].offensive]
+        surge = names.index("Red Bull Surge")
+        response = self.solver.best_defensive(position, surge)
+        self.assertIsNotNone(response)
+
+    def test_solve_reports_table_size_and_time(self):
+        """Test solve() reports value, move and search cost."""
+        position = self.solver.position_of(make_simulator((30, 30), (150, 150)))
+        report = self.solver.solve(position)
+
+        self.assertIn(report.value, (WIN, DRAW, LOSS))
+        self.assertIsNotNone(report.offensive)
+        self.assertGreater(report.table_size, 0)
+        self.assertGreaterEqual(report.seconds, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
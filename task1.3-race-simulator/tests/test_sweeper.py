@@ -0,0 +1,132 @@
+"""
+Test suite for the balance sweeper.
+Covers parameter assignment, grids and samples, fairness scores and the
+SQLite result cache.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from game_state import RaceRules
+from roster import RosterError, compile_roster
+from solver import GameSolver
+from sweeper import (
+    Parameter,
+    Sweeper,
+    apply_assignment,
+    base_config,
+    grid,
+    random_samples,
+)
+
+DRS_COST = Parameter.parse("Max Verstappen/DRS Boost/fuel_cost")
+SLIPSTREAM = Parameter.parse("Mostafa/Slipstream Cut/damage_reduction_percent")
+
+
+class TestSweeper(unittest.TestCase):
+    """Test configuration sweeps and their cache."""
+
+    def setUp(self):
+        """Create a temporary directory for the cache."""
+        self.directory = tempfile.mkdtemp()
+        self.cache = os.path.join(self.directory, "sweep.sqlite")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.directory)
+
+    def test_base_config_matches_drivers(self):
+        """Test the swept base configuration is exactly the default drivers."""
+        compiled = compile_roster(base_config()).drivers
+        self.assertEqual(RaceRules(compiled).fingerprint, RaceRules().fingerprint)
+
+    def test_apply_assignment(self):
+        """Test assignments replace only the named fields, and are validated."""
+        uses = Parameter.parse("Mostafa/Slipstream Cut/uses_remaining")
+        config = apply_assignment(base_config(), ((DRS_COST, 33), (uses, 4)))
+        verstappen, mostafa = compile_roster(config).drivers
+        self.assertEqual(verstappen.OFFENSIVE_MOVES[0].fuel_cost, 33)
+        self.assertEqual(mostafa.DEFENSIVE_MOVES[0].max_uses, 4)
+        self.assertEqual(base_config()["drivers"][0]["offensive"][0]["fuel_cost"], 45)
+
+        bad = [
+            ((Parameter("Mostafa", "Warp Drive", "fuel_cost"), 10),),
+            ((Parameter("Mostafa", "Turbo Start", "damage_reduction_percent"), 0.5),),
+            ((SLIPSTREAM, 1.5),),
+        ]
+        for assignment in bad:
+            with self.assertRaises(RosterError):
+                apply_assignment(base_config(), assignment)
+        with self.assertRaises(ValueError):
+            Parameter.parse("Mostafa/Turbo Start/description")
+
+    def test_grid_and_samples(self):
+        """Test grids cover every combination and samples stay in range."""
+        points = grid({DRS_COST: [30, 45, 60], SLIPSTREAM: [0.2, 0.4]})
+        self.assertEqual(len(set(points)), 6)
+
+        ranges = {DRS_COST: (30, 60), SLIPSTREAM: (0.1, 0.5)}
+        samples = random_samples(ranges, 20)
+        self.assertEqual(samples, random_samples(ranges, 20))
+        for (_, cost), (_, reduction) in samples:
+            self.assertTrue(30 <= cost <= 60 and isinstance(cost, int))
+            self.assertTrue(0.1 <= reduction <= 0.5)
+
+    def test_mirror_match_has_no_driver_skew(self):
+        """Test two identical drivers split their score exactly."""
+        config = base_config()
+        twin = dict(config["drivers"][0], name="Twin")
+        sweeper = Sweeper(
+            games=200,
+            workers=1,
+            cache_path=self.cache,
+            base={"drivers": [config["drivers"][0], twin]},
+        )
+        (point,) = sweeper.run([()])
+        sweeper.close()
+        self.assertAlmostEqual(point.fairness.driver_score, 0.5)
+        self.assertEqual(point.fairness.games, 200)
+
+    def test_exact_matches_solver(self):
+        """Test exact fairness comes from solving both seat orders."""
+        config = base_config()
+        for entry in config["drivers"]:
+            entry["fuel"] = 150
+        sweeper = Sweeper("exact", workers=1, cache_path=self.cache, base=config)
+        (point,) = sweeper.run([()])
+        sweeper.close()
+
+        solver = GameSolver(compile_roster(config).drivers)
+        first, second = (
+            (solver.value(solver.initial_position(seat)) + 1) / 2 for seat in (0, 1)
+        )
+        self.assertEqual(point.fairness.first_mover_score, (first + second) / 2)
+        self.assertEqual(point.fairness.driver_score, (first + 1 - second) / 2)
+
+    def test_cache_skips_seen_configurations(self):
+        """Test repeated and refined sweeps only evaluate new points."""
+        sweeper = Sweeper(games=100, workers=2, cache_path=self.cache)
+        first = sweeper.run(grid({DRS_COST: [30, 45]}))
+        self.assertEqual(sweeper.last_evaluated, 2)
+        sweeper.close()
+
+        sweeper = Sweeper(games=100, workers=2, cache_path=self.cache)
+        refined = sweeper.run(grid({DRS_COST: [30, 40, 45]}))
+        self.assertEqual(sweeper.last_evaluated, 1)
+        self.assertEqual([p.cached for p in refined], [True, False, True])
+        self.assertEqual(refined[0].fairness, first[0].fairness)
+
+        sweeper.games = 150  # A different sample size is a different result
+        sweeper.run(grid({DRS_COST: [30]}))
+        self.assertEqual(sweeper.last_evaluated, 1)
+        sweeper.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Test suite for the round-robin tournament runner.
+Covers seat orders, match caching, driver variants and Elo standings.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from drivers import Mostafa, Verstappen
+from game_state import RaceRules
+from mcts import MCTSPolicy
+from moves import OffensiveMoveSpec
+from policies import ConservativePolicy, GreedyPolicy, RandomPolicy
+from tournament import BASE_RATING, Entrant, Tournament
+
+
+class BoostedVerstappen(Verstappen):
+    """Verstappen with a harder-hitting DRS Boost."""
+
+    OFFENSIVE_MOVES = (
+        OffensiveMoveSpec("DRS Boost", 45, 30, None, "Boosted"),
+    ) + Verstappen.OFFENSIVE_MOVES[1:]
+
+
+class CheckedMCTSPolicy(MCTSPolicy):
+    """MCTSPolicy that fails if its rules are not the race's."""
+
+    def check_rules(self, simulator):
+        classes = (type(simulator.verstappen), type(simulator.mostafa))
+        if self.rules.fingerprint != RaceRules(classes).fingerprint:
+            raise AssertionError("policy searched with another race's rules")
+
+    def choose_offensive(self, simulator, moves):
+        self.check_rules(simulator)
+        return super().choose_offensive(simulator, moves)
+
+    def choose_defensive(self, simulator, moves, base_damage):
+        self.check_rules(simulator)
+        return super().choose_defensive(simulator, moves, base_damage)
+
+
+class TestTournament(unittest.TestCase):
+    """Test Tournament scheduling, caching and ratings."""
+
+    def setUp(self):
+        """Create a temporary cache directory."""
+        self.directory = tempfile.mkdtemp()
+        self.cache = os.path.join(self.directory, "cache.json")
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        shutil.rmtree(self.directory)
+
+    def make_tournament(self, entrants):
+        """Build a small two-worker tournament over the entrants."""
+        tournament = Tournament(games_per_match=4, workers=2, cache_path=self.cache)
+        for entrant in entrants:
+            tournament.register(entrant)
+        return tournament
+
+    def test_plays_every_pairing_in_both_seat_orders(self):
+        """Test each ordered pair of entrants plays one full match."""
+        entrants = [
+            Entrant("random", RandomPolicy),
+            Entrant("greedy", GreedyPolicy),
+            Entrant("conservative", ConservativePolicy),
+        ]
+        tournament = self.make_tournament(entrants)
+        results = tournament.run()
+
+        self.assertEqual(tournament.last_played, 6)
+        pairs = {(result.first, result.second) for result in results}
+        self.assertEqual(len(pairs), 6)
+        for result in results:
+            self.assertEqual(result.first_wins + result.draws + result.second_wins, 4)
+
+    def test_new_entrant_only_plays_new_matches(self):
+        """Test cached matches are reused when an entrant joins."""
+        entrants = [Entrant("random", RandomPolicy), Entrant("greedy", GreedyPolicy)]
+        first = self.make_tournament(entrants)
+        first.run()
+
+        second = self.make_tournament(entrants + [Entrant("safe", ConservativePolicy)])
+        second.run()
+        self.assertEqual(second.last_played, 4)
+        self.assertEqual(
+            second.results["random", "greedy"], first.results["random", "greedy"]
+        )
+
+    def test_changed_config_is_replayed(self):
+        """Test a driver variant is not served another entrant's results."""
+        self.make_tournament(
+            [Entrant("random", RandomPolicy), Entrant("greedy", GreedyPolicy)]
+        ).run()
+        boosted = Entrant(
+            "greedy", GreedyPolicy, driver_classes=(BoostedVerstappen, Mostafa)
+        )
+        tournament = self.make_tournament([Entrant("random", RandomPolicy), boosted])
+        tournament.run()
+        self.assertEqual(tournament.last_played, 2)
+
+    def test_policies_model_the_match_drivers(self):
+        """Test policies that take driver_classes get the match's classes."""
+        classes = (BoostedVerstappen, Mostafa)
+        entrant = Entrant("mcts", MCTSPolicy, (("time_budget", 0.001),))
+        policy = entrant.make_policy(classes)
+        self.assertEqual(policy.rules.fingerprint, RaceRules(classes).fingerprint)
+        self.assertEqual(policy.time_budget, 0.001)
+        self.assertIsInstance(
+            Entrant("greedy", GreedyPolicy).make_policy(classes), GreedyPolicy
+        )
+
+    def test_non_default_roster_entrant(self):
+        """Test a search entrant plays its variant car with matching rules."""
+        boosted = Entrant(
+            "mcts",
+            CheckedMCTSPolicy,
+            (("time_budget", 0.001),),
+            driver_classes=(BoostedVerstappen, Mostafa),
+        )
+        tournament = self.make_tournament([boosted, Entrant("greedy", GreedyPolicy)])
+        tournament.games_per_match = 2
+        results = tournament.run()
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertEqual(result.first_wins + result.draws + result.second_wins, 2)
+
+    def test_time_budgeted_matches_are_not_cached(self):
+        """Test matches with a time-budgeted policy are replayed every run."""
+        entrants = [
+            Entrant("mcts", MCTSPolicy, (("time_budget", 0.001),)),
+            Entrant("random", RandomPolicy),
+            Entrant("greedy", GreedyPolicy),
+        ]
+        for _ in range(2):
+            tournament = self.make_tournament(entrants)
+            tournament.games_per_match = 2
+            tournament.run()
+        self.assertEqual(tournament.last_played, 4)
+        self.assertEqual(len(tournament.results), 6)
+
+    def test_duplicate_name_rejected(self):
+        """Test registering two entrants with one name raises ValueError."""
+        tournament = Tournament()
+        tournament.register(Entrant("random", RandomPolicy))
+        with self.assertRaises(ValueError):
+            tournament.register(Entrant("random", GreedyPolicy))
+
+    def test_ratings_order_and_standings(self):
+        """Test the stronger entrant rates higher and standings list everyone."""
+        tournament = self.make_tournament(
+            [Entrant("random", RandomPolicy), Entrant("greedy", GreedyPolicy)]
+        )
+        tournament.games_per_match = 20
+        tournament.run()
+        ratings = {rating.name: rating for rating in tournament.ratings()}
+        greedy_score = ratings["greedy"].wins - ratings["greedy"].losses
+        random_score = ratings["random"].wins - ratings["random"].losses
+        self.assertEqual(
+            ratings["greedy"].elo > ratings["random"].elo, greedy_score > random_score
+        )
+        for rating in ratings.values():
+            self.assertEqual(rating.games, 40)
+            self.assertGreater(rating.margin, 0)
+        self.assertAlmostEqual(
+            sum(r.elo for r in ratings.values()) / 2, BASE_RATING, delta=400
+        )
+
+        table = tournament.standings()
+        self.assertIn("greedy", table)
+        self.assertIn("random", table)
+
+
+if __name__ == "__main__":
+    unittest.main()
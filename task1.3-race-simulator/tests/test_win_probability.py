@@ -0,0 +1,234 @@
+"""
+Test suite for the win-probability DP.
+Checks the bottom-up tables against a recursive expectation over RaceRules,
+against batch races, and the policies' move probabilities.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from functools import lru_cache
+
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from batch_simulator import BatchRaceSimulator
+from game_state import DRAW, GameState, RaceRules
+from mcts import MCTSPolicy
+from policies import ConservativePolicy, GreedyPolicy, Policy, RandomPolicy
+from roster import compile_roster
+from sweeper import base_config
+from win_probability import WinProbabilityDP
+
+
+def small_drivers(fuel=120, tire_health=30):
+    """Verstappen and Mostafa with a small enough tank to recurse over."""
+    config = base_config()
+    for entry in config["drivers"]:
+        entry["fuel"] = fuel
+        entry["tire_health"] = tire_health
+    return compile_roster(config).drivers
+
+
+def recursive_scores(policies, driver_classes):
+    """Memoized seat-0 expected score, following RaceRules turn by turn."""
+    rules = RaceRules(driver_classes)
+
+    @lru_cache(maxsize=None)
+    def score(state):
+        result = rules.result(state)
+        if result is not None:
+            winner = result[0]
+            return 0.5 if winner == DRAW else float(winner == 0)
+        if not rules.can_attack(state, state.to_move):
+            return score(rules.penalize(state))
+
+        attacker = rules.seats[state.to_move]
+        defender = rules.seats[1 - state.to_move]
+        legal = np.zeros((1, len(attacker.offensive)), dtype=bool)
+        legal[0, rules.legal_offensive(state)] = True
+        p_off = policies[state.to_move].offensive_probabilities(
+            legal,
+            np.array([[s.tire_damage for s in attacker.offensive]]),
+            np.array([[s.fuel_cost for s in attacker.offensive]]),
+        )[0]
+        blocks = np.zeros((1, len(defender.defensive)), dtype=bool)
+        blocks[0, rules.legal_defensive(state)] = True
+        total = 0.0
+        for i in np.flatnonzero(p_off):
+            p_def = policies[1 - state.to_move].defensive_probabilities(
+                blocks,
+                np.array([[s.damage_reduction_percent for s in defender.defensive]]),
+                np.array([[s.fuel_cost for s in defender.defensive]]),
+                np.array([attacker.offensive[i].tire_damage]),
+            )[0]
+            for j in np.flatnonzero(p_def):
+                block = None if j == len(defender.defensive) else int(j)
+                total += p_off[i] * p_def[j] * score(rules.attack(state, int(i), block))
+        return total
+
+    return rules, score
+
+
+class TestWinProbabilityDP(unittest.TestCase):
+    """Test DP tables of fixed-policy matchups."""
+
+    def test_matches_recursive_expectation(self):
+        """Test every checked position equals a recursive expectation."""
+        drivers = small_drivers()
+        policies = (RandomPolicy(), GreedyPolicy())
+        dp = WinProbabilityDP(policies, drivers, max_fuel=120)
+        dp.solve()
+        rules, score = recursive_scores(policies, drivers)
+
+        rng = np.random.default_rng(0)
+        states = [rules.initial_state(0), rules.initial_state(1)]
+        for _ in range(300):
+            states.append(
+                GameState(
+                    int(rng.integers(2)),
+                    tuple(int(t) for t in rng.integers(1, 31, 2)),
+                    tuple(5 * int(f) for f in rng.integers(0, 25, 2)),
+                    tuple(int(rng.integers(0, u + 1)) for u in (3, 2)),
+                )
+            )
+        for state in states:
+            self.assertAlmostEqual(dp.win_probability(state), score(state), places=5)
+
+    def test_deterministic_matchup_matches_a_race(self):
+        """Test greedy vs conservative scores exactly what a batch race plays."""
+        drivers = small_drivers(fuel=300, tire_health=60)
+        for policies in [
+            (GreedyPolicy(), ConservativePolicy()),
+            (ConservativePolicy(), GreedyPolicy()),
+        ]:
+            dp = WinProbabilityDP(policies, drivers, max_fuel=300)
+            dp.solve()
+            batch = BatchRaceSimulator(1, policies, driver_classes=drivers)
+            batch.run()
+            winner = int(batch.winner[0])
+            expected = 0.5 if winner == DRAW else float(winner == 0)
+            start = dp.rules.initial_state()
+            self.assertEqual(dp.win_probability(start), expected)
+            self.assertEqual(dp.win_probability(start, seat=1), 1.0 - expected)
+
+    def test_random_matchup_agrees_with_monte_carlo(self):
+        """Test random vs random is within sampling error of batch races."""
+        drivers = small_drivers(fuel=200, tire_health=50)
+        policies = (RandomPolicy(), RandomPolicy())
+        dp = WinProbabilityDP(policies, drivers, max_fuel=200)
+        dp.solve()
+        expected = dp.win_probability(dp.rules.initial_state())
+
+        batch = BatchRaceSimulator(20_000, policies, driver_classes=drivers)
+        batch.run()
+        observed = np.mean(np.where(batch.winner == DRAW, 0.5, batch.winner == 0))
+        self.assertLess(abs(observed - expected), 4 * 0.5 / np.sqrt(20_000))
+
+    def test_box_is_solved_exactly(self):
+        """Test a smaller box gives the same values as the whole game."""
+        drivers = small_drivers()
+        policies = (GreedyPolicy(), RandomPolicy())
+        full = WinProbabilityDP(policies, drivers, max_fuel=120)
+        full.solve()
+        box = WinProbabilityDP(policies, drivers, max_fuel=60, max_tire=20)
+        box.solve()
+        np.testing.assert_array_equal(
+            box.values, full.values[:, :13, :13, :, :, :21, :21]
+        )
+        with self.assertRaises(ValueError):
+            box.win_probability(box.rules.initial_state())
+
+    def test_heatmap_and_save(self):
+        """Test heatmap orientation and the saved archive."""
+        drivers = small_drivers()
+        dp = WinProbabilityDP((GreedyPolicy(), GreedyPolicy()), drivers, max_fuel=120)
+        dp.solve()
+        grid = dp.heatmap(1, opponent_tire=30, opponent_fuel=120)
+        self.assertEqual(grid.shape, (31, 25))
+        state = GameState(1, (30, 17), (120, 45), dp.rules.initial_state().uses)
+        self.assertAlmostEqual(grid[17, 9], dp.win_probability(state, seat=1))
+        self.assertTrue((grid[0] == 0.0).all())
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "table.npz")
+            dp.save(path)
+            with np.load(path) as archive:
+                np.testing.assert_array_equal(archive["values"], dp.values)
+                self.assertEqual(list(archive["fuel_levels_0"]), list(range(0, 125, 5)))
+                self.assertEqual(list(archive["policies"]), ["greedy", "greedy"])
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestMoveProbabilities(unittest.TestCase):
+    """Test the policies' probability models."""
+
+    def test_rows_sum_to_one_and_match_batch_choices(self):
+        """Test deterministic policies put all weight on their batch choice."""
+        rng = np.random.default_rng(1)
+        legal = rng.random((50, 3)) < 0.6
+        legal[:, 2] |= ~legal.any(axis=1)
+        damage = rng.integers(5, 25, (50, 3))
+        cost = rng.integers(10, 90, (50, 3))
+        reduction = rng.random((50, 3))
+        base = rng.integers(5, 25, 50)
+        zeros = np.zeros(50, dtype=np.int64)
+
+        for policy in (RandomPolicy(), GreedyPolicy(), ConservativePolicy()):
+            p_off = policy.offensive_probabilities(legal, damage, cost)
+            p_def = policy.defensive_probabilities(legal, reduction, cost, base)
+            np.testing.assert_allclose(p_off.sum(axis=1), 1.0)
+            np.testing.assert_allclose(p_def.sum(axis=1), 1.0)
+            self.assertFalse((p_off * ~legal).any())
+            self.assertFalse((p_def[:, :3] * ~legal).any())
+            if not isinstance(policy, RandomPolicy):
+                choice = policy.choose_offensive_batch(
+                    legal, damage, cost, zeros, zeros
+                )
+                np.testing.assert_array_equal(p_off.argmax(axis=1), choice)
+
+        p_def = RandomPolicy().defensive_probabilities(legal, reduction, cost, base)
+        np.testing.assert_allclose(p_def[:, 3], 1.0 / (legal.sum(axis=1) + 1))
+
+    def test_base_model_follows_vectorized_batch_hooks(self):
+        """Test a policy with only batch hooks gets a one-hot model."""
+
+        class Cheapest(Policy):
+            name = "cheapest"
+            choose_offensive = ConservativePolicy.choose_offensive
+            choose_defensive = GreedyPolicy.choose_defensive
+            choose_offensive_batch = ConservativePolicy.choose_offensive_batch
+            choose_defensive_batch = GreedyPolicy.choose_defensive_batch
+
+        legal = np.array([[True, True, False], [False, False, False]])
+        cost = np.array([[30, 10, 5], [30, 10, 5]])
+        reduction = np.array([[0.2, 0.5, 0.9], [0.2, 0.5, 0.9]])
+        self.assertTrue(Cheapest.has_probability_model())
+        np.testing.assert_array_equal(
+            Cheapest().offensive_probabilities(legal[:1], cost[:1], cost[:1]),
+            [[0, 1, 0]],
+        )
+        np.testing.assert_array_equal(
+            Cheapest().defensive_probabilities(legal, reduction, cost, cost[:, 0]),
+            [[0, 1, 0, 0], [0, 0, 0, 1]],
+        )
+
+    def test_policies_without_a_model_rejected_up_front(self):
+        """Test the DP refuses a search policy before laying out the table."""
+        self.assertFalse(MCTSPolicy.has_probability_model())
+        with self.assertRaisesRegex(TypeError, "mcts"):
+            WinProbabilityDP((GreedyPolicy(), MCTSPolicy()), max_fuel=5, max_tire=5)
+        with self.assertRaisesRegex(NotImplementedError, "mcts"):
+            MCTSPolicy().offensive_probabilities(
+                np.ones((1, 3), dtype=bool), np.ones((1, 3)), np.ones((1, 3))
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
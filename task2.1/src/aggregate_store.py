@@ -0,0 +1,614 @@
+"""
+Incrementally maintained aggregates for the F1 driver performance analysis.
+Implements AggregateStore, which keeps the five headline analyses (driver
+points, constructor stats, yearly reliability, driver consistency and era
+stats) as mergeable per-key state, and update_store(), which folds only the
+rows appended to results.csv since the last update into a persisted store.
+
+Every grouped column is rebuilt from state that new rows simply add to:
+counts, sums, sums of squares, finished counts and min/max years, in dense
+arrays indexed by driverId, constructorId and season. Decade figures are sums
+of their seasons. Distinct counts (races per season, drivers and constructors
+per decade) are kept as sorted sets of packed (group, id) pairs. Points are
+stored as integer hundredths, so sums are exact in any ingestion order.
+
+results.csv is treated as append-only. The store records how far into the
+file it has read and the bytes just before that point. If those bytes change,
+or races.csv moves an already ingested race to another season, the store is
+rebuilt from scratch. Rows whose resultId was already ingested are skipped.
+An update reads only the new lines and the two columns of races.csv, so its
+cost follows the size of the delta and of the race calendar, not of the
+results history.
+"""
+
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import analyses
+from dimensions import DimensionTable
+from features import position_features
+from loaders import read_table
+from master_data import CACHE_DIR, DATA_DIR
+
+STORE_PATH = os.path.join(CACHE_DIR, "aggregates.npz")
+
+# Bump whenever the stored state changes meaning
+STORE_VERSION = 2
+
+POINT_SCALE = 100
+GUARD_BYTES = 256
+NO_YEAR = np.iinfo(np.int32).max
+PAIR_SHIFT = 16
+
+# Per-key state, by the key that indexes it, with the value of an empty slot
+FAMILIES: Dict[str, Dict[str, int]] = {
+    "driver": {
+        "results": 0,
+        "points": 0,
+        "first_year": NO_YEAR,
+        "last_year": 0,
+        "finished": 0,
+        # Over classified starts (positions_lost known) only
+        "classified": 0,
+        "lost_sum": 0,
+        "lost_squares": 0,
+        "classified_grid": 0,
+        "classified_finish": 0,
+        "classified_points": 0,
+    },
+    "constructor": {
+        "results": 0,
+        "points": 0,
+        "first_year": NO_YEAR,
+        "last_year": 0,
+        "finished": 0,
+        "classified": 0,
+        "lost_sum": 0,
+    },
+    "year": {
+        "results": 0,
+        "finished": 0,
+        "points": 0,
+        "point_squares": 0,
+        "grid": 0,
+        "placed": 0,
+        "placed_sum": 0,
+        "classified": 0,
+        "lost_sum": 0,
+    },
+    "result": {"seen": 0},
+}
+PAIR_SETS = ("year_races", "decade_drivers", "decade_constructors")
+
+# results.csv columns the aggregates read
+RESULT_COLUMNS = [
+    "resultId",
+    "raceId",
+    "driverId",
+    "constructorId",
+    "grid",
+    "positionText",
+    "points",
+    "statusId",
+]
+
+
+def _pairs(group: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Distinct (group, id) pairs packed into sorted int64 values."""
+    return np.unique((group.astype(np.int64) << PAIR_SHIFT) | ids.astype(np.int64))
+
+
+def _sample_std(count, total, squares) -> np.ndarray:
+    """Sample standard deviation from integer moments, NaN below two values."""
+    count = count.astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread = (count * squares - total.astype(np.float64) * total) / (
+            count * (count - 1)
+        )
+        return np.where(count > 1, np.sqrt(np.maximum(spread, 0.0)), np.nan)
+
+
+def _ratio(numerator, denominator) -> np.ndarray:
+    """numerator / denominator, NaN where the denominator is zero."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+class AggregateStore:
+    """Mergeable state behind the five headline analyses."""
+
+    def __init__(self):
+        """Start an empty store."""
+        self.arrays: Dict[str, np.ndarray] = {}
+        for family, fields in FAMILIES.items():
+            for field in fields:
+                self.arrays[f"{family}.{field}"] = np.zeros(0, dtype=np.int64)
+        for name in PAIR_SETS:
+            self.arrays[name] = np.zeros(0, dtype=np.int64)
+        self.offset = 0
+        self.guard = b""
+
+    @property
+    def results(self) -> int:
+        """Number of results ingested."""
+        return int(self.arrays["year.results"].sum())
+
+    def _family(self, family: str) -> Dict[str, np.ndarray]:
+        return {field: self.arrays[f"{family}.{field}"] for field in FAMILIES[family]}
+
+    def _reserve(self, family: str, keys: np.ndarray) -> None:
+        """Grow a family's arrays so every key has a slot."""
+        size = int(keys.max(initial=-1)) + 1
+        for field, empty in FAMILIES[family].items():
+            name = f"{family}.{field}"
+            current = self.arrays[name]
+            if size > len(current):
+                grown = np.full(size, empty, dtype=np.int64)
+                grown[: len(current)] = current
+                self.arrays[name] = grown
+
+    def _add(self, family: str, keys: np.ndarray, **values) -> None:
+        """Add per-row values into their keys' slots."""
+        for field, weights in values.items():
+            target = self.arrays[f"{family}.{field}"]
+            sums = np.bincount(keys, weights=weights, minlength=len(target))
+            target += np.rint(sums).astype(np.int64)
+
+    def _span(self, family: str, keys: np.ndarray, years: np.ndarray) -> None:
+        """Widen the first/last year of each key to cover years."""
+        np.minimum.at(self.arrays[f"{family}.first_year"], keys, years)
+        np.maximum.at(self.arrays[f"{family}.last_year"], keys, years)
+
+    def ingest(self, rows: pd.DataFrame, skip_seen: bool = True) -> int:
+        """Fold master_df rows into the state.
+
+        Args:
+            rows: Results with race year and features.position_features()
+                columns, such as master_df rows
+            skip_seen: Skip results whose resultId was already ingested. This
+                keeps one slot per resultId, so one-pass streams of very large
+                tables turn it off
+
+        Returns:
+            Number of rows ingested
+
+        Raises:
+            ValueError: If a points value is not a whole number of hundredths
+        """
+        if skip_seen:
+            result_ids = rows["resultId"].to_numpy(dtype=np.intp)
+            self._reserve("result", result_ids)
+            _, first = np.unique(result_ids, return_index=True)
+            fresh = np.zeros(len(rows), dtype=bool)
+            fresh[first] = True
+            fresh &= self.arrays["result.seen"][result_ids] == 0
+            if not fresh.any():
+                return 0
+            rows = rows[fresh]
+            self.arrays["result.seen"][result_ids[fresh]] = 1
+
+        points = rows["points"].to_numpy(dtype=np.float64) * POINT_SCALE
+        scaled = np.rint(points)
+        if not np.allclose(points, scaled, rtol=0.0, atol=1e-6):
+            raise ValueError(f"points must be multiples of 1/{POINT_SCALE}")
+        driver = rows["driverId"].to_numpy(dtype=np.intp)
+        constructor = rows["constructorId"].to_numpy(dtype=np.intp)
+        year = rows["year"].to_numpy(dtype=np.intp)
+        race = rows["raceId"].to_numpy(dtype=np.intp)
+        decade = (year // 10) * 10
+        finished = rows["finished_race"].to_numpy(dtype=np.float64)
+        grid = rows["grid"].to_numpy(dtype=np.float64)
+        finish = rows["final_position"].to_numpy(dtype=np.float64)
+        lost = rows["positions_lost"].to_numpy(dtype=np.float64)
+        ones = np.ones(len(rows))
+
+        self._reserve("driver", driver)
+        self._add("driver", driver, results=ones, points=scaled, finished=finished)
+        self._span("driver", driver, year)
+        classified = ~np.isnan(lost)
+        on = classified.astype(np.float64)
+        self._add(
+            "driver",
+            driver,
+            classified=on,
+            lost_sum=np.where(classified, lost, 0.0),
+            lost_squares=np.where(classified, lost * lost, 0.0),
+            classified_grid=grid * on,
+            classified_finish=np.where(classified, finish, 0.0),
+            classified_points=scaled * on,
+        )
+
+        self._reserve("constructor", constructor)
+        self._add("constructor", constructor, results=ones, points=scaled)
+        self._add(
+            "constructor",
+            constructor,
+            finished=finished,
+            classified=on,
+            lost_sum=np.where(classified, lost, 0.0),
+        )
+        self._span("constructor", constructor, year)
+
+        placed = ~np.isnan(finish)
+        self._reserve("year", year)
+        self._add(
+            "year",
+            year,
+            results=ones,
+            finished=finished,
+            points=scaled,
+            point_squares=scaled * scaled,
+            grid=grid,
+            placed=placed.astype(np.float64),
+            placed_sum=np.where(placed, finish, 0.0),
+            classified=on,
+            lost_sum=np.where(classified, lost, 0.0),
+        )
+
+        for name, group, ids in [
+            ("year_races", year, race),
+            ("decade_drivers", decade, driver),
+            ("decade_constructors", decade, constructor),
+        ]:
+            self.arrays[name] = np.union1d(self.arrays[name], _pairs(group, ids))
+        return len(rows)
+
+    def _pair_counts(self, name: str, groups: np.ndarray) -> np.ndarray:
+        """Distinct ids per group, for sorted groups."""
+        pair_groups = self.arrays[name] >> PAIR_SHIFT
+        return np.bincount(np.searchsorted(groups, pair_groups), minlength=len(groups))[
+            : len(groups)
+        ]
+
+    def driver_points(self) -> pd.DataFrame:
+        """Analysis 1, as analyses.driver_points() computes it."""
+        state = self._family("driver")
+        ids = np.flatnonzero(state["results"])
+        stats = pd.DataFrame(
+            {
+                "total_points": state["points"][ids] / POINT_SCALE,
+                "race_starts": state["results"][ids],
+                "first_year": state["first_year"][ids],
+                "last_year": state["last_year"][ids],
+            },
+            index=pd.Index(ids, name="driverId"),
+        )
+        return analyses.finish_driver_points(stats.round(1))
+
+    def constructor_stats(self) -> pd.DataFrame:
+        """Analysis 2, as analyses.constructor_stats() computes it."""
+        state = self._family("constructor")
+        ids = np.flatnonzero(state["results"])
+        stats = pd.DataFrame(
+            {
+                "total_points": state["points"][ids] / POINT_SCALE,
+                "race_starts": state["results"][ids],
+                "first_year": state["first_year"][ids],
+                "last_year": state["last_year"][ids],
+                "finished_races": state["finished"][ids],
+            },
+            index=pd.Index(ids, name="constructorId"),
+        )
+        return analyses.finish_constructor_stats(stats.round(1))
+
+    def yearly_reliability(self) -> pd.DataFrame:
+        """Analysis 3, as analyses.yearly_reliability() computes it."""
+        state = self._family("year")
+        years = np.flatnonzero(state["results"])
+        stats = pd.DataFrame(
+            {
+                "total_results": state["results"][years],
+                "finished_results": state["finished"][years],
+                "num_races": self._pair_counts("year_races", years),
+            },
+            index=pd.Index(years, name="year"),
+        )
+        return analyses.finish_yearly_reliability(stats)
+
+    def driver_consistency(self) -> pd.DataFrame:
+        """Analysis 4, as analyses.driver_consistency() computes it."""
+        state = self._family("driver")
+        ids = np.flatnonzero(state["classified"])
+        count = state["classified"][ids]
+        stats = pd.DataFrame(
+            {
+                "avg_positions_lost": state["lost_sum"][ids] / count,
+                "std_positions_lost": _sample_std(
+                    count, state["lost_sum"][ids], state["lost_squares"][ids]
+                ),
+                "race_count": count,
+                "avg_grid": state["classified_grid"][ids] / count,
+                "avg_finish": state["classified_finish"][ids] / count,
+                "total_points": state["classified_points"][ids] / POINT_SCALE,
+            },
+            index=pd.Index(ids, name="driverId"),
+        )
+        return stats.round(2)
+
+    def era_stats(self) -> pd.DataFrame:
+        """Analysis 5, as analyses.era_stats() computes it."""
+        state = self._family("year")
+        years = np.flatnonzero(state["results"])
+        decades, group = np.unique((years // 10) * 10, return_inverse=True)
+        starts = np.flatnonzero(np.r_[True, np.diff(group) != 0])
+
+        def total(field: str) -> np.ndarray:
+            return np.add.reduceat(state[field][years], starts)
+
+        results = total("results")
+        points = total("points")
+        stats = pd.DataFrame(
+            {
+                "total_points": points / POINT_SCALE,
+                "avg_points": points / results / POINT_SCALE,
+                "std_points": _sample_std(results, points, total("point_squares"))
+                / POINT_SCALE,
+                "total_results": results,
+                "num_races": np.add.reduceat(
+                    self._pair_counts("year_races", years), starts
+                ),
+                "unique_drivers": self._pair_counts("decade_drivers", decades),
+                "unique_constructors": self._pair_counts(
+                    "decade_constructors", decades
+                ),
+                "finished_count": total("finished"),
+                "finish_rate": total("finished") / results,
+                "avg_final_pos": _ratio(total("placed_sum"), total("placed")),
+                "avg_grid_pos": total("grid") / results,
+                "first_year": years[starts],
+                "last_year": np.maximum.reduceat(years, starts),
+            },
+            index=pd.Index([f"{d}s" for d in decades], name="decade_label"),
+        )
+        return analyses.finish_era_stats(stats.round(2))
+
+    def agrees_with(self, races: DimensionTable) -> bool:
+        """Whether every ingested race still has the season it was stored under.
+
+        Args:
+            races: Race dimension with a year column
+
+        Returns:
+            False if a race is gone or moved to another season
+        """
+        pairs = self.arrays["year_races"]
+        race = pairs & ((1 << PAIR_SHIFT) - 1)
+        rows = races.rows(race)
+        if (rows < 0).any():
+            return False
+        years = races.columns["year"][rows]
+        return bool((years == pairs >> PAIR_SHIFT).all())
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """All five analyses, keyed as analyses.ANALYSES."""
+        return {name: getattr(self, name)() for name in analyses.ANALYSES}
+
+    def save(self, path: str = STORE_PATH) -> None:
+        """Write the store atomically.
+
+        Args:
+            path: Destination .npz file
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        partial = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            partial,
+            version=STORE_VERSION,
+            offset=self.offset,
+            guard=np.frombuffer(self.guard, dtype=np.uint8),
+            **self.arrays,
+        )
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path: str = STORE_PATH) -> Optional["AggregateStore"]:
+        """Read a saved store.
+
+        Args:
+            path: .npz file written by save()
+
+        Returns:
+            The store, or None if the file is missing or from another version
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as archive:
+            if int(archive["version"]) != STORE_VERSION:
+                return None
+            store = cls()
+            store.offset = int(archive["offset"])
+            store.guard = archive["guard"].tobytes()
+            for name in store.arrays:
+                store.arrays[name] = archive[name]
+        return store
+
+
+def _tail_bytes(path: str, end: int) -> bytes:
+    """Up to GUARD_BYTES bytes of a file ending at offset end."""
+    with open(path, "rb") as handle:
+        handle.seek(max(end - GUARD_BYTES, 0))
+        return handle.read(min(end, GUARD_BYTES))
+
+
+def read_appended_results(path: str, offset: int) -> Tuple[pd.DataFrame, int]:
+    """Read the complete results.csv lines after a byte offset.
+
+    A partly written last line is left for the next read.
+
+    Args:
+        path: results.csv
+        offset: Byte offset already read (0 reads the whole file)
+
+    Returns:
+        Tuple of (typed rows, offset after the last complete line)
+    """
+    with open(path, "rb") as handle:
+        header = handle.readline()
+        start = max(offset, handle.tell())
+        handle.seek(start)
+        body = handle.read()
+    body = body[: body.rfind(b"\n") + 1]
+    # A handful of appended lines parse faster without pyarrow's startup cost
+    engine = None if offset == 0 else "c"
+    rows = read_table(
+        "results", columns=RESULT_COLUMNS, path=io.BytesIO(header + body), engine=engine
+    )
+    return rows, start + len(body)
+
+
+def prepare_rows(rows: pd.DataFrame, races: DimensionTable) -> pd.DataFrame:
+    """Add race year and position features to results rows for ingest().
+
+    Args:
+        rows: results.csv rows with at least RESULT_COLUMNS
+        races: Race dimension with a year column
+
+    Returns:
+        A new frame
+
+    Raises:
+        ValueError: If a row's race is missing from races
+    """
+    rows = races.decorate(rows, ["year"])
+    if rows["year"].isna().any():
+        raise ValueError("results reference races missing from races.csv")
+    return position_features(rows)
+
+
+def update_store(
+    data_dir: str = DATA_DIR, path: str = STORE_PATH, rebuild: bool = False
+) -> Tuple[AggregateStore, int]:
+    """Fold the rows appended to results.csv into the saved store.
+
+    Args:
+        data_dir: Directory holding results.csv, races.csv and status.csv
+        path: Store file
+        rebuild: Discard the saved store and ingest every row
+
+    Returns:
+        Tuple of (updated store, number of rows ingested)
+    """
+    results_path = os.path.join(data_dir, "results.csv")
+    races = DimensionTable(
+        "races",
+        "raceId",
+        read_table("races", data_dir, columns=["raceId", "year"], engine="c"),
+    )
+    store = None if rebuild else AggregateStore.load(path)
+    if store is not None and (
+        os.path.getsize(results_path) < store.offset
+        or _tail_bytes(results_path, store.offset) != store.guard
+        or not store.agrees_with(races)
+    ):
+        store = None
+    if store is None:
+        store = AggregateStore()
+
+    rows, offset = read_appended_results(results_path, store.offset)
+    ingested = 0
+    if len(rows):
+        ingested = store.ingest(prepare_rows(rows, races))
+    store.offset = offset
+    store.guard = _tail_bytes(results_path, offset)
+    store.save(path)
+    return store, ingested
+
+
+def full_recompute(data_dir: str = DATA_DIR) -> Dict[str, pd.DataFrame]:
+    """All five analyses from a fresh master_df, without any cache."""
+    from master_data import load_master_df
+
+    master_df = load_master_df(data_dir, cache_dir=None)
+    return {name: analysis(master_df) for name, analysis in analyses.ANALYSES.items()}
+
+
+def assert_same_analyses(
+    actual: Dict[str, pd.DataFrame], expected: Dict[str, pd.DataFrame]
+) -> None:
+    """Assert two sets of analysis frames hold the same values.
+
+    Index and integer dtypes may differ (the store's keys are int64, and a
+    full recompute groups by int16 ids and a categorical decade label).
+
+    Raises:
+        AssertionError: If any frame differs
+    """
+    for name, frame in expected.items():
+        frame = frame.copy()
+        frame.index = pd.Index(
+            np.asarray(frame.index).astype(str), name=frame.index.name
+        )
+        other = actual[name].copy()
+        other.index = pd.Index(
+            np.asarray(other.index).astype(str), name=other.index.name
+        )
+        pd.testing.assert_frame_equal(other, frame, check_dtype=False)
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Replay the last race weekends as appends, against full recomputes.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Incremental aggregate benchmark")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--weekends", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(args.data_dir, "results.csv"), "rb") as handle:
+        header, *lines = handle.read().splitlines(keepends=True)
+    race_of_line = [line.split(b",", 2)[1] for line in lines]
+    cut = len(lines)
+    weekends = []
+    for _ in range(args.weekends):
+        start = cut
+        while start > 0 and race_of_line[start - 1] == race_of_line[cut - 1]:
+            start -= 1
+        weekends.insert(0, lines[start:cut])
+        cut = start
+
+    directory = tempfile.mkdtemp()
+    try:
+        for name in ("races.csv", "status.csv"):
+            shutil.copy(os.path.join(args.data_dir, name), directory)
+        results_path = os.path.join(directory, "results.csv")
+        store_path = os.path.join(directory, "aggregates.npz")
+        with open(results_path, "wb") as handle:
+            handle.write(header + b"".join(lines[:cut]))
+        seconds, (store, ingested) = _timed(update_store, directory, store_path)
+        print(f"Initial build from {ingested:,} results: {seconds * 1000:.1f} ms")
+
+        print(f"{'appended':>9}{'incremental':>14}{'full recompute':>17}")
+        for weekend in weekends:
+            with open(results_path, "ab") as handle:
+                handle.write(b"".join(weekend))
+            incremental, (store, ingested) = _timed(update_store, directory, store_path)
+            full, expected = _timed(full_recompute, directory)
+            assert_same_analyses(store.frames(), expected)
+            print(
+                f"{ingested:>9}{incremental * 1000:>11.1f} ms"
+                f"{full * 1000:>14.1f} ms"
+            )
+        print(f"Store holds {store.results:,} results; all analyses match")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+The notebook's five headline aggregations as functions of master_df.
+Implements driver_points(), constructor_stats(), yearly_reliability(),
+driver_consistency() and era_stats(), each a full groupby over every result,
+exactly as the analysis cells compute them.
+
+These are the reference results. Faster or incremental implementations
+elsewhere in src/ are checked against them. Each analysis is a grouped
+aggregate followed by a finish_*() step that derives ratio columns, so other
+implementations only have to reproduce the grouped columns.
+"""
+
+from typing import Callable, Dict
+
+import pandas as pd
+
+# master_df columns read by the five analyses
+COLUMNS = [
+    "driverId",
+    "constructorId",
+    "raceId",
+    "year",
+    "points",
+    "grid",
+    "final_position",
+    "finished_race",
+    "positions_lost",
+    "decade_label",
+]
+
+
+def driver_points(master_df: pd.DataFrame) -> pd.DataFrame:
+    """Analysis 1: career points, starts and span per driver."""
+    stats = master_df.groupby("driverId").agg(
+        {"points": "sum", "raceId": "count", "year": ["min", "max"]}
+    )
+    stats = stats.round(1)
+    stats.columns = ["total_points", "race_starts", "first_year", "last_year"]
+    return finish_driver_points(stats)
+
+
+def finish_driver_points(stats: pd.DataFrame) -> pd.DataFrame:
+    """Add career_span and points_per_race to grouped driver points."""
+    stats["career_span"] = stats["last_year"] - stats["first_year"] + 1
+    stats["points_per_race"] = (stats["total_points"] / stats["race_starts"]).round(2)
+    return stats
+
+
+def constructor_stats(master_df: pd.DataFrame) -> pd.DataFrame:
+    """Analysis 2: points, starts, finishes and span per constructor."""
+    stats = master_df.groupby("constructorId").agg(
+        {
+            "points": "sum",
+            "raceId": "count",
+            "year": ["min", "max"],
+            "finished_race": "sum",
+        }
+    )
+    stats = stats.round(1)
+    stats.columns = [
+        "total_points",
+        "race_starts",
+        "first_year",
+        "last_year",
+        "finished_races",
+    ]
+    return finish_constructor_stats(stats)
+
+
+def finish_constructor_stats(stats: pd.DataFrame) -> pd.DataFrame:
+    """Add points_per_race, finish_rate and career_span to constructor stats."""
+    stats["points_per_race"] = (stats["total_points"] / stats["race_starts"]).round(2)
+    stats["finish_rate"] = (stats["finished_races"] / stats["race_starts"] * 100).round(
+        1
+    )
+    stats["career_span"] = stats["last_year"] - stats["first_year"] + 1
+    return stats
+
+
+def yearly_reliability(master_df: pd.DataFrame) -> pd.DataFrame:
+    """Analysis 3: results, finishes and races per season."""
+    stats = master_df.groupby("year").agg(
+        {"finished_race": ["count", "sum"], "raceId": "nunique"}
+    )
+    stats.columns = ["total_results", "finished_results", "num_races"]
+    return finish_yearly_reliability(stats)
+
+
+def finish_yearly_reliability(stats: pd.DataFrame) -> pd.DataFrame:
+    """Add dnf_rate and finish_rate to per-season result counts."""
+    stats["dnf_rate"] = (
+        (stats["total_results"] - stats["finished_results"])
+        / stats["total_results"]
+        * 100
+    ).round(1)
+    stats["finish_rate"] = (
+        stats["finished_results"] / stats["total_results"] * 100
+    ).round(1)
+    return stats
+
+
+def driver_consistency(master_df: pd.DataFrame) -> pd.DataFrame:
+    """Analysis 4: positions gained or lost per driver, over classified starts."""
+    position_analysis = master_df[master_df["positions_lost"].notna()]
+    stats = position_analysis.groupby("driverId").agg(
+        {
+            "positions_lost": ["mean", "std", "count"],
+            "grid": "mean",
+            "final_position": "mean",
+            "points": "sum",
+        }
+    )
+    stats = stats.round(2)
+    stats.columns = [
+        "avg_positions_lost",
+        "std_positions_lost",
+        "race_count",
+        "avg_grid",
+        "avg_finish",
+        "total_points",
+    ]
+    return stats
+
+
+def era_stats(master_df: pd.DataFrame) -> pd.DataFrame:
+    """Analysis 5: scoring, field size and reliability per decade."""
+    stats = master_df.groupby("decade_label").agg(
+        {
+            "points": ["sum", "mean", "std"],
+            "raceId": ["count", "nunique"],
+            "driverId": "nunique",
+            "constructorId": "nunique",
+            "finished_race": ["sum", "mean"],
+            "final_position": "mean",
+            "grid": "mean",
+            "year": ["min", "max"],
+        }
+    )
+    stats = stats.round(2)
+    stats.columns = [
+        "total_points",
+        "avg_points",
+        "std_points",
+        "total_results",
+        "num_races",
+        "unique_drivers",
+        "unique_constructors",
+        "finished_count",
+        "finish_rate",
+        "avg_final_pos",
+        "avg_grid_pos",
+        "first_year",
+        "last_year",
+    ]
+    return finish_era_stats(stats)
+
+
+def finish_era_stats(stats: pd.DataFrame) -> pd.DataFrame:
+    """Add points_per_race, entries_per_race and dnf_rate to decade stats."""
+    stats["points_per_race"] = (stats["total_points"] / stats["num_races"]).round(1)
+    stats["entries_per_race"] = (stats["total_results"] / stats["num_races"]).round(1)
+    stats["dnf_rate"] = ((1 - stats["finish_rate"]) * 100).round(1)
+    return stats
+
+
+ANALYSES: Dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {
+    "driver_points": driver_points,
+    "constructor_stats": constructor_stats,
+    "yearly_reliability": yearly_reliability,
+    "driver_consistency": driver_consistency,
+    "era_stats": era_stats,
+}
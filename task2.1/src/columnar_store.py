@@ -0,0 +1,243 @@
+"""
+Year-partitioned Parquet store of the master dataset.
+Implements write_dataset(), which writes master_df (results joined with race
+and status data) as a Parquet dataset with one hive-style year=YYYY directory
+per season and rows sorted by raceId, and query(), which reads it back for a
+year range, driver and constructor filters and a column selection.
+
+A query touches as little as the layout allows. Partition pruning skips every
+season outside the year range before a file is opened. Within the files that
+remain, row groups whose raceId/driverId/constructorId statistics cannot
+match are skipped, and only the requested columns (plus those the filter
+needs) are decoded. query() reports the compressed size of the column chunks
+it actually scanned, so a one-season query can be checked to read only that
+season's bytes.
+
+Rows are sorted by raceId, so within a season a driver's or constructor's
+rows are spread across every row group. Their filters therefore prune by
+partition and row, rarely by row group. Requires pyarrow.
+"""
+
+import argparse
+import os
+import shutil
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from master_data import CACHE_DIR, DATA_DIR, load_master_df, load_sources
+
+ROOT = os.path.join(CACHE_DIR, "results_by_year")
+ROW_GROUP_ROWS = 64 * 1024
+PARTITIONING = ds.partitioning(pa.schema([("year", pa.int16())]), flavor="hive")
+
+
+class ScanStats(NamedTuple):
+    """What a query read."""
+
+    files: int
+    row_groups: int
+    bytes_read: int
+    total_bytes: int
+
+
+def write_dataset(
+    master_df: pd.DataFrame, root: str = ROOT, row_group_rows: int = ROW_GROUP_ROWS
+) -> None:
+    """Write master_df as a year-partitioned Parquet dataset, replacing root.
+
+    Args:
+        master_df: Master dataset with year and raceId columns
+        root: Dataset directory
+        row_group_rows: Maximum rows per row group
+    """
+    frame = master_df.sort_values(["year", "raceId", "resultId"], kind="stable")
+    frame = frame.astype({"year": "int16"})
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    # Write beside root and swap in, so readers never see half a dataset
+    partial = f"{root}.{os.getpid()}.tmp"
+    shutil.rmtree(partial, ignore_errors=True)
+    ds.write_dataset(
+        table,
+        partial,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template="part-{i}.parquet",
+        max_rows_per_group=row_group_rows,
+        preserve_order=True,
+    )
+    shutil.rmtree(root, ignore_errors=True)
+    os.replace(partial, root)
+
+
+def open_dataset(root: str = ROOT) -> ds.Dataset:
+    """Open a dataset written by write_dataset()."""
+    return ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+
+
+def _predicate(
+    years: Optional[Tuple[int, int]],
+    driver_ids: Optional[Sequence[int]],
+    constructor_ids: Optional[Sequence[int]],
+) -> Optional[ds.Expression]:
+    """Filter expression for the query arguments, or None for everything."""
+    terms = []
+    if years is not None:
+        first, last = years
+        terms.append((ds.field("year") >= first) & (ds.field("year") <= last))
+    if driver_ids is not None:
+        terms.append(ds.field("driverId").isin([int(i) for i in driver_ids]))
+    if constructor_ids is not None:
+        terms.append(ds.field("constructorId").isin([int(i) for i in constructor_ids]))
+    predicate = None
+    for term in terms:
+        predicate = term if predicate is None else predicate & term
+    return predicate
+
+
+def _chunk_bytes(fragment, row_group: int, columns: Sequence[str]) -> int:
+    """Compressed size of some columns' chunks in one row group."""
+    metadata = fragment.metadata.row_group(row_group)
+    return sum(
+        metadata.column(i).total_compressed_size
+        for i in range(metadata.num_columns)
+        if metadata.column(i).path_in_schema in columns
+    )
+
+
+def query(
+    columns: Optional[Sequence[str]] = None,
+    years: Optional[Tuple[int, int]] = None,
+    driver_ids: Optional[Sequence[int]] = None,
+    constructor_ids: Optional[Sequence[int]] = None,
+    dataset: Optional[ds.Dataset] = None,
+) -> Tuple[pd.DataFrame, ScanStats]:
+    """Read the rows and columns matching a filter.
+
+    Args:
+        columns: Columns to return (defaults to all)
+        years: Inclusive (first, last) season range
+        driver_ids: Keep only these drivers
+        constructor_ids: Keep only these constructors
+        dataset: Dataset to read (defaults to open_dataset())
+
+    Returns:
+        Tuple of (matching rows in year and raceId order, scan statistics)
+    """
+    dataset = open_dataset() if dataset is None else dataset
+    columns = list(dataset.schema.names if columns is None else columns)
+    predicate = _predicate(years, driver_ids, constructor_ids)
+    scanned = set(columns)
+    scanned.update(
+        name
+        for name, wanted in [
+            ("driverId", driver_ids),
+            ("constructorId", constructor_ids),
+        ]
+        if wanted is not None
+    )
+
+    pieces = []
+    files = bytes_read = 0
+    for fragment in dataset.get_fragments(filter=predicate):
+        files += 1
+        for piece in fragment.split_by_row_group(predicate, schema=dataset.schema):
+            pieces.append(piece)
+            for row_group in piece.row_groups:
+                bytes_read += _chunk_bytes(fragment, row_group.id, scanned)
+    # One scan over the surviving row groups, in file order
+    survivors = ds.FileSystemDataset(
+        pieces, dataset.schema, dataset.format, dataset.filesystem
+    )
+    table = survivors.to_table(columns=columns, filter=predicate)
+    total_bytes = sum(os.path.getsize(path) for path in dataset.files)
+    stats = ScanStats(files, len(pieces), bytes_read, total_bytes)
+    return table.to_pandas(), stats
+
+
+def _comparable(frame: pd.DataFrame) -> pd.DataFrame:
+    """frame with categoricals as plain values and a fresh index."""
+    frame = frame.reset_index(drop=True)
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(frame[column].cat.categories.dtype)
+    return frame
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Convert master_df and compare filtered queries with a full CSV load.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    from master_data import build_master_df
+
+    parser = argparse.ArgumentParser(description="Year-partitioned Parquet store")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--root", default=ROOT)
+    args = parser.parse_args(argv)
+
+    master_df = load_master_df(args.data_dir)
+    start = time.perf_counter()
+    write_dataset(master_df, args.root)
+    seconds = time.perf_counter() - start
+    dataset = open_dataset(args.root)
+    total = sum(os.path.getsize(path) for path in dataset.files)
+    csv_bytes = os.path.getsize(os.path.join(args.data_dir, "results.csv"))
+    print(
+        f"Wrote {len(dataset.files)} season files, {total / 2**20:.2f} MB "
+        f"(results.csv is {csv_bytes / 2**20:.2f} MB), in {seconds * 1000:.0f} ms"
+    )
+
+    queries = [
+        ("season 2021, all columns", {"years": (2021, 2021)}),
+        (
+            "2010-2019, driver 1, 4 columns",
+            {
+                "years": (2010, 2019),
+                "driver_ids": [1],
+                "columns": ["raceId", "year", "points", "final_position"],
+            },
+        ),
+        (
+            "constructor 6, 3 columns",
+            {"constructor_ids": [6], "columns": ["year", "points", "finished_race"]},
+        ),
+    ]
+    print(f"{'query':<34}{'rows':>6}{'files':>7}{'read':>10}{'dataset':>10}{'csv':>9}")
+    for label, kwargs in queries:
+        start = time.perf_counter()
+        rows, stats = query(dataset=dataset, **kwargs)
+        scan_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        full = build_master_df(**load_sources(args.data_dir))
+        mask = np.ones(len(full), dtype=bool)
+        if "years" in kwargs:
+            first, last = kwargs["years"]
+            mask &= full["year"].between(first, last).to_numpy()
+        if "driver_ids" in kwargs:
+            mask &= full["driverId"].isin(kwargs["driver_ids"]).to_numpy()
+        if "constructor_ids" in kwargs:
+            mask &= full["constructorId"].isin(kwargs["constructor_ids"]).to_numpy()
+        expected = full[mask].sort_values(["year", "raceId", "resultId"])
+        expected = expected[kwargs.get("columns", list(rows.columns))]
+        csv_seconds = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(
+            _comparable(rows), _comparable(expected), check_dtype=False
+        )
+        print(
+            f"{label:<34}{len(rows):>6}{stats.files:>7}"
+            f"{stats.bytes_read / 1024:>7.0f} KB"
+            f"{scan_seconds * 1000:>7.1f} ms{csv_seconds * 1000:>6.0f} ms"
+        )
+    print(f"Every query matches filtering a full load ({total / 1024:.0f} KB stored)")
+
+
+if __name__ == "__main__":
+    main()
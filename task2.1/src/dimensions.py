@@ -0,0 +1,300 @@
+"""
+Dense dimension tables for the F1 driver performance analysis.
+Implements DimensionTable, which maps small integer keys (statusId, raceId,
+circuitId) to attribute arrays by position, and load_dimensions(), which
+builds the tables shared by the analyses.
+
+The identifiers are dense: about 1,100 races, 140 statuses and 80 circuits,
+numbered from 1. A table therefore keeps one slot per possible key, holding
+the row of that key's attributes. Decorating fact rows is two array gathers,
+slot[key] and then column[row], with no hashing and no boolean scans. The
+notebook's status cell instead filtered status_df once per status, and its
+master dataset was built from two hash merges.
+
+The dataset ships no circuits.csv, so the circuit table is derived from
+races.csv: each circuit's race count and first and last season.
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from loaders import read_table
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+MISSING = -1
+
+
+def _take(values, rows: np.ndarray, allow_fill: bool):
+    """values[rows], with rows of -1 missing when allow_fill is set."""
+    if isinstance(values, np.ndarray):
+        return pd.api.extensions.take(values, rows, allow_fill=allow_fill)
+    return values.take(rows, allow_fill=allow_fill)
+
+
+class DimensionTable:
+    """Attributes of a dimension, addressed by integer key."""
+
+    def __init__(self, name: str, key: str, frame: pd.DataFrame):
+        """Index a dimension frame by its key column.
+
+        Args:
+            name: Table name, used in error messages
+            key: Key column; its values must be unique, non-negative integers
+            frame: One row per key
+
+        Raises:
+            ValueError: If keys are missing, negative or duplicated
+        """
+        keys = frame[key].to_numpy()
+        if frame[key].isna().any() or (keys < 0).any():
+            raise ValueError(f"{name}.{key} must be non-negative integers")
+        keys = keys.astype(np.intp)
+        self.name = name
+        self.key = key
+        self.slot = np.full(int(keys.max(initial=-1)) + 1, MISSING, dtype=np.int32)
+        self.slot[keys] = np.arange(len(keys), dtype=np.int32)
+        if len(np.unique(keys)) != len(keys):
+            raise ValueError(f"{name}.{key} has duplicate values")
+        # NumPy columns as ndarrays, extension columns (categoricals, Arrow
+        # strings, nullable integers) as their own arrays
+        self.columns = {
+            column: (
+                frame[column].to_numpy()
+                if isinstance(frame[column].dtype, np.dtype)
+                else frame[column].array
+            )
+            for column in frame.columns
+            if column != key
+        }
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+    def rows(self, keys) -> np.ndarray:
+        """Row positions of keys, with MISSING for unknown keys.
+
+        Args:
+            keys: Integer keys, as an array or Series
+
+        Returns:
+            int32 array of row positions
+        """
+        keys = np.asarray(keys)
+        inside = (keys >= 0) & (keys < len(self.slot))
+        if inside.all():
+            return self.slot[keys]
+        return np.where(inside, self.slot[np.where(inside, keys, 0)], MISSING)
+
+    def take(
+        self, keys, columns: Optional[Sequence[str]] = None, index=None
+    ) -> pd.DataFrame:
+        """Gather attributes for each key, like a left join.
+
+        Columns keep their dtypes unless a key is unknown, in which case its
+        row is missing (NaN for NumPy integer columns, as a merge gives).
+
+        Args:
+            keys: Integer keys, as an array or Series
+            columns: Attributes to gather (defaults to all)
+            index: Index of the returned frame (defaults to keys' index)
+
+        Returns:
+            One row per key
+        """
+        rows = self.rows(keys)
+        allow_fill = bool((rows == MISSING).any())
+        if index is None:
+            index = keys.index if isinstance(keys, pd.Series) else None
+        columns = list(self.columns) if columns is None else list(columns)
+        return pd.DataFrame(
+            {
+                column: _take(self.columns[column], rows, allow_fill)
+                for column in columns
+            },
+            index=index,
+        )
+
+    def lookup(self, key: int, column: str):
+        """One attribute of one key.
+
+        Raises:
+            KeyError: If the key is unknown
+        """
+        row = self.rows(np.array([key]))[0]
+        if row == MISSING:
+            raise KeyError(f"{self.name} has no {self.key} {key}")
+        return self.columns[column][row]
+
+    def decorate(
+        self, facts: pd.DataFrame, columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """Facts with the attributes of their key appended.
+
+        Args:
+            facts: Frame holding this table's key column
+            columns: Attributes to append (defaults to all)
+
+        Returns:
+            A new frame; facts is not modified
+        """
+        attributes = self.take(facts[self.key], columns)
+        return pd.concat([facts, attributes], axis=1)
+
+
+def circuit_frame(races: pd.DataFrame) -> pd.DataFrame:
+    """Per-circuit race count and first and last season, from races.csv.
+
+    Args:
+        races: races.csv with circuitId and year
+
+    Returns:
+        One row per circuit, ordered by circuitId
+    """
+    circuit = races["circuitId"].to_numpy().astype(np.intp)
+    year = races["year"].to_numpy()
+    size = int(circuit.max(initial=-1)) + 1
+    count = np.bincount(circuit, minlength=size)
+    first = np.full(size, np.iinfo(year.dtype).max, dtype=year.dtype)
+    last = np.full(size, np.iinfo(year.dtype).min, dtype=year.dtype)
+    np.minimum.at(first, circuit, year)
+    np.maximum.at(last, circuit, year)
+    present = np.flatnonzero(count)
+    return pd.DataFrame(
+        {
+            "circuitId": present.astype(races["circuitId"].dtype),
+            "races": count[present],
+            "first_year": first[present],
+            "last_year": last[present],
+        }
+    )
+
+
+def load_dimensions(data_dir: str = DATA_DIR) -> Dict[str, DimensionTable]:
+    """Read the dimension tables shared by the analyses.
+
+    Args:
+        data_dir: Directory holding races.csv and status.csv
+
+    Returns:
+        Dict with "races", "status" and "circuits" tables
+    """
+    races = read_table(
+        "races", data_dir, columns=["raceId", "year", "round", "circuitId", "name"]
+    )
+    return {
+        "races": DimensionTable("races", "raceId", races),
+        "status": DimensionTable("status", "statusId", read_table("status", data_dir)),
+        "circuits": DimensionTable("circuits", "circuitId", circuit_frame(races)),
+    }
+
+
+def status_distribution(
+    status_ids, status: DimensionTable, top: Optional[int] = None
+) -> pd.DataFrame:
+    """Results per status, most frequent first, with status names.
+
+    Replaces the notebook loop that filtered status_df once per status.
+
+    Args:
+        status_ids: statusId of every result
+        status: Status dimension
+        top: Keep only this many statuses
+
+    Returns:
+        Frame with statusId, status and count columns
+    """
+    counts = np.bincount(np.asarray(status_ids, dtype=np.intp))
+    order = np.argsort(-counts, kind="stable")
+    order = order[counts[order] > 0][:top]
+    names = status.take(order, ["status"])["status"].to_numpy()
+    return pd.DataFrame({"statusId": order, "status": names, "count": counts[order]})
+
+
+def _best_of(func, repeats: int = 5) -> float:
+    """Best wall time of several calls, in seconds."""
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Compare hash merges and dense gathers for building master_df.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    from master_data import RACE_COLUMNS, build_master_df, load_sources
+
+    parser = argparse.ArgumentParser(description="Dimension table benchmark")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100])
+    args = parser.parse_args(argv)
+
+    sources = load_sources(args.data_dir)
+    results, races, status = sources["results"], sources["races"], sources["status"]
+
+    def merged(results):
+        master_df = results.merge(races[RACE_COLUMNS], on="raceId", how="left")
+        return master_df.merge(status, on="statusId", how="left")
+
+    race_table = DimensionTable("races", "raceId", races[RACE_COLUMNS])
+    status_table = DimensionTable("status", "statusId", status)
+
+    def gathered(results):
+        return status_table.decorate(race_table.decorate(results))
+
+    for scale in args.scales:
+        facts = results.iloc[np.resize(np.arange(len(results)), len(results) * scale)]
+        facts = facts.reset_index(drop=True)
+        pd.testing.assert_frame_equal(gathered(facts), merged(facts))
+        merge_seconds = _best_of(lambda: merged(facts))
+        gather_seconds = _best_of(lambda: gathered(facts))
+        print(f"Joining {len(facts):,} results to races and status")
+        print(f"  two merges    {merge_seconds * 1000:9.1f} ms")
+        print(
+            f"  two gathers   {gather_seconds * 1000:9.1f} ms"
+            f"  (x{merge_seconds / gather_seconds:.1f})"
+        )
+
+    def scanned():
+        counts = results["statusId"].value_counts().head(10)
+        return [
+            status[status["statusId"] == status_id]["status"].iloc[0]
+            for status_id in counts.index
+        ]
+
+    loop_seconds = _best_of(scanned)
+    table_seconds = _best_of(
+        lambda: status_distribution(results["statusId"], status_table, top=10)
+    )
+    top = status_distribution(results["statusId"], status_table, top=10)
+    # Ties in count are ordered by statusId, which value_counts() leaves open
+    expected = results["statusId"].value_counts().rename_axis("statusId")
+    expected = expected.reset_index(name="count").sort_values(
+        ["count", "statusId"], ascending=[False, True], ignore_index=True
+    )[:10]
+    expected.insert(
+        1,
+        "status",
+        status.set_index("statusId").loc[expected["statusId"], "status"].to_numpy(),
+    )
+    pd.testing.assert_frame_equal(top, expected, check_dtype=False)
+    print("Top 10 statuses with names")
+    print(f"  filter loop   {loop_seconds * 1000:9.1f} ms")
+    print(f"  gather        {table_seconds * 1000:9.1f} ms")
+
+    build_seconds = _best_of(lambda: build_master_df(**sources))
+    print(f"build_master_df (gathers and features): {build_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Typed CSV loading for the Ergast-style source tables.
+Implements read_table(), which reads results.csv, races.csv or status.csv with
+an explicit schema instead of pandas' inferred dtypes.
+
+The Ergast exports mark missing values with the \\N sentinel, which plain
+pd.read_csv() keeps as text, so numeric columns such as position,
+milliseconds and fastestLapSpeed come back as strings. The schemas below
+treat \\N as missing, keep identifiers and counters in the narrowest integer
+type that fits (nullable Int types where values can be missing), store
+repeated labels as categoricals and read only the requested columns.
+
+Whole-file reads use pandas' pyarrow CSV engine when pyarrow is installed;
+chunked reads fall back to the C engine, which yields identical frames.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+NA_VALUES = ["\\N"]
+
+SCHEMAS: Dict[str, Dict[str, str]] = {
+    "results": {
+        "resultId": "int32",
+        "raceId": "int16",
+        "driverId": "int16",
+        "constructorId": "int16",
+        "number": "Int16",
+        "grid": "int16",
+        "position": "Int8",
+        "positionText": "category",
+        "positionOrder": "int16",
+        "points": "float64",
+        "laps": "int16",
+        "time": "str",
+        "milliseconds": "Int32",
+        "fastestLap": "Int16",
+        "rank": "Int8",
+        "fastestLapTime": "str",
+        "fastestLapSpeed": "float32",
+        "statusId": "int16",
+    },
+    "races": {
+        "raceId": "int16",
+        "year": "int16",
+        "round": "int8",
+        "circuitId": "int16",
+        "name": "category",
+        "date": "str",
+        "time": "str",
+        "url": "str",
+        "fp1_date": "str",
+        "fp1_time": "str",
+        "fp2_date": "str",
+        "fp2_time": "str",
+        "fp3_date": "str",
+        "fp3_time": "str",
+        "quali_date": "str",
+        "quali_time": "str",
+        "sprint_date": "str",
+        "sprint_time": "str",
+    },
+    "status": {
+        "statusId": "int16",
+        "status": "category",
+    },
+}
+
+
+def _pyarrow_available() -> bool:
+    """Whether pandas can use its multithreaded pyarrow CSV engine."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def read_table(
+    table: str,
+    data_dir: str = DATA_DIR,
+    columns: Optional[Sequence[str]] = None,
+    path=None,
+    engine: Optional[str] = None,
+    **read_csv_kwargs,
+) -> pd.DataFrame:
+    """Read a source table with its schema.
+
+    Args:
+        table: "results", "races" or "status"
+        data_dir: Directory holding <table>.csv
+        columns: Columns to read (defaults to the whole schema)
+        path: Read this file or buffer instead of <data_dir>/<table>.csv
+        engine: "c" or "pyarrow" (defaults to pyarrow for whole-file reads;
+            the C engine starts faster on a few rows)
+        **read_csv_kwargs: Passed on to pd.read_csv, e.g. chunksize
+
+    Returns:
+        The table (or a chunk iterator), with columns in file order
+
+    Raises:
+        KeyError: If the table or a requested column has no schema
+    """
+    schema = SCHEMAS[table]
+    columns = list(schema) if columns is None else list(columns)
+    unknown = [column for column in columns if column not in schema]
+    if unknown:
+        raise KeyError(f"{table} has no column(s) {', '.join(unknown)}")
+    streaming = "chunksize" in read_csv_kwargs or "iterator" in read_csv_kwargs
+    if engine is None:
+        engine = "c" if streaming or not _pyarrow_available() else "pyarrow"
+    text = [column for column in columns if schema[column] == "str"]
+    dtype = {column: schema[column] for column in columns}
+    if engine != "c":
+        # pandas < 3 casts the pyarrow engine's nulls to the string "None"
+        dtype = {column: kind for column, kind in dtype.items() if kind != "str"}
+    frame = pd.read_csv(
+        path or os.path.join(data_dir, f"{table}.csv"),
+        usecols=columns,
+        dtype=dtype,
+        na_values=NA_VALUES,
+        keep_default_na=False,
+        engine=engine,
+        **read_csv_kwargs,
+    )
+    if engine == "c":
+        return frame
+    # The pyarrow engine infers its own types for text columns, can keep the
+    # sentinel in them, and uses its own column order
+    for column in text:
+        missing = frame[column].isna() | (frame[column] == NA_VALUES[0])
+        frame[column] = frame[column].astype("str").mask(missing, np.nan)
+    return frame[[column for column in schema if column in columns]]
+
+
+def write_scaled_copy(source: str, destination: str, scale: int) -> None:
+    """Write a CSV whose body is the source's rows repeated scale times.
+
+    Args:
+        source: CSV to copy
+        destination: Output path
+        scale: Number of copies of the body
+    """
+    with open(source, "rb") as handle:
+        header = handle.readline()
+        body = handle.read()
+    if not body.endswith(b"\n"):
+        body += b"\n"
+    with open(destination, "wb") as handle:
+        handle.write(header)
+        for _ in range(scale):
+            handle.write(body)
+
+
+def _measure(read) -> Tuple[float, int]:
+    """Best-of-three load time and the loaded frame's deep memory footprint."""
+    seconds = []
+    for _ in range(3):
+        start = time.perf_counter()
+        frame = read()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds), int(frame.memory_usage(deep=True).sum())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Compare default and typed loading of results.csv at several scales.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Typed CSV loader benchmark")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100])
+    args = parser.parse_args(argv)
+
+    analysis_columns = [
+        "raceId",
+        "driverId",
+        "constructorId",
+        "grid",
+        "positionText",
+        "points",
+        "statusId",
+    ]
+    source = os.path.join(args.data_dir, "results.csv")
+    directory = tempfile.mkdtemp()
+    try:
+        for scale in args.scales:
+            path = source
+            if scale != 1:
+                path = os.path.join(directory, f"results_x{scale}.csv")
+                write_scaled_copy(source, path, scale)
+            loaders = [
+                ("pd.read_csv", lambda: pd.read_csv(path)),
+                ("typed", lambda: read_table("results", path=path)),
+                (
+                    "typed, 7 columns",
+                    lambda: read_table("results", path=path, columns=analysis_columns),
+                ),
+            ]
+            print(f"results.csv at {scale}x ({os.path.getsize(path) / 2**20:.0f} MB)")
+            measured = [(label, *_measure(read)) for label, read in loaders]
+            _, base_seconds, base_memory = measured[0]
+            for label, seconds, memory in measured:
+                print(
+                    f"  {label:<18}{seconds * 1000:>9.0f} ms"
+                    f"{memory / 2**20:>9.1f} MB  memory /{base_memory / memory:.1f}, "
+                    f"speed x{base_seconds / seconds:.1f}"
+                )
+            if path != source:
+                os.remove(path)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
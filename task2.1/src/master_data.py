@@ -0,0 +1,164 @@
+"""
+Master dataset builder for the F1 driver performance analysis.
+Implements load_sources() and build_master_df(), the notebook's loading,
+merging and feature-engineering cells as functions, and load_master_df(),
+which caches the built frame as a Feather file.
+
+The cache key is a hash of every source CSV's size, modification time and
+content, plus CACHE_VERSION. Editing, replacing or touching any source
+therefore rebuilds the frame on the next call. A warm start only hashes the
+sources and memory-maps the uncompressed Feather file, which takes a few
+milliseconds. Feather needs pyarrow; without it every call rebuilds.
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from dimensions import DimensionTable
+from features import engineer_features
+from loaders import read_table
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+SOURCES = ("results.csv", "races.csv", "status.csv")
+
+# Bump whenever build_master_df() changes what it produces
+CACHE_VERSION = 5
+
+RACE_COLUMNS = ["raceId", "year", "round", "name", "date"]
+
+
+def load_sources(data_dir: str = DATA_DIR) -> Dict[str, pd.DataFrame]:
+    """Read the source tables with their typed schemas.
+
+    Args:
+        data_dir: Directory holding results.csv, races.csv and status.csv
+
+    Returns:
+        Dict with "results", "races" (RACE_COLUMNS only) and "status" frames
+    """
+    return {
+        "results": read_table("results", data_dir),
+        "races": read_table("races", data_dir, columns=RACE_COLUMNS),
+        "status": read_table("status", data_dir),
+    }
+
+
+def build_master_df(
+    results: pd.DataFrame, races: pd.DataFrame, status: pd.DataFrame
+) -> pd.DataFrame:
+    """Join results to race and status data and add the analysis features.
+
+    The joins are dense gathers through dimensions.DimensionTable, with the
+    same result as left merges. The features are those of features.engineer_features().
+
+    Args:
+        results: results.csv
+        races: races.csv
+        status: status.csv
+
+    Returns:
+        One row per result, in results order
+    """
+    race_table = DimensionTable("races", "raceId", races[RACE_COLUMNS])
+    status_table = DimensionTable("status", "statusId", status)
+    master_df = status_table.decorate(race_table.decorate(results))
+
+    return engineer_features(master_df)
+
+
+def source_fingerprint(data_dir: str = DATA_DIR) -> str:
+    """Hash of the sources' sizes, modification times and contents.
+
+    Args:
+        data_dir: Directory holding the source CSVs
+
+    Returns:
+        Hex digest that changes whenever any source changes
+    """
+    digest = hashlib.sha256(f"master_df v{CACHE_VERSION}".encode())
+    for name in SOURCES:
+        path = os.path.join(data_dir, name)
+        stat = os.stat(path)
+        with open(path, "rb") as handle:
+            content = hashlib.sha256(handle.read()).hexdigest()
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}:{content}".encode())
+    return digest.hexdigest()
+
+
+def load_master_df(
+    data_dir: str = DATA_DIR,
+    cache_dir: Optional[str] = CACHE_DIR,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """Return master_df, from the cache when the sources are unchanged.
+
+    Args:
+        data_dir: Directory holding the source CSVs
+        cache_dir: Directory for cached frames (None disables caching)
+        refresh: Rebuild even if a cached frame matches
+
+    Returns:
+        The master dataset
+    """
+    try:
+        from pyarrow import feather
+    except ImportError:
+        cache_dir = None
+    if cache_dir is None:
+        return build_master_df(**load_sources(data_dir))
+
+    path = os.path.join(cache_dir, f"master_{source_fingerprint(data_dir)}.feather")
+    if not refresh and os.path.exists(path):
+        return feather.read_table(path, memory_map=True).to_pandas()
+
+    master_df = build_master_df(**load_sources(data_dir))
+    os.makedirs(cache_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(cache_dir, "master_*.feather")):
+        os.remove(stale)
+    # Write then rename, so a crash never leaves a truncated cache behind
+    partial = f"{path}.{os.getpid()}.tmp"
+    # Uncompressed, so a warm load maps the file instead of decoding it
+    master_df.to_feather(partial, compression="uncompressed")
+    os.replace(partial, path)
+    return master_df
+
+
+def _timed(func, *args, **kwargs) -> Tuple[float, pd.DataFrame]:
+    """Run func and return (seconds, result)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Compare building master_df with a cold and a warm cache.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Build or load the cached master_df")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    uncached, master_df = _timed(load_master_df, args.data_dir, None)
+    cold, _ = _timed(load_master_df, args.data_dir, args.cache_dir, refresh=True)
+    warm, cached = _timed(load_master_df, args.data_dir, args.cache_dir)
+
+    print(f"master_df: {len(master_df):,} rows, {master_df.shape[1]} columns")
+    print(f"Build from CSVs:   {uncached * 1000:8.1f} ms")
+    print(f"Build and cache:   {cold * 1000:8.1f} ms")
+    print(f"Load from cache:   {warm * 1000:8.1f} ms")
+    pd.testing.assert_frame_equal(cached, master_df)
+    print("Cached frame matches a fresh build")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Parallel runner for the five headline analyses over shared memory.
+Implements SharedColumns, which publishes master_df's analysis columns once
+as multiprocessing.shared_memory blocks, and run_parallel(), which runs each
+analysis as its own task in a process pool whose workers attach to those
+blocks instead of receiving a pickled frame.
+
+Each column is one block holding the raw NumPy buffer; categoricals such as
+decade_label are published as their integer codes, with the few category
+labels sent alongside. A worker wraps the blocks in read-only arrays and a
+DataFrame without copying, so only the analysis name goes in and only the
+small result frame comes back. Workers are spawned, not forked, so nothing is
+inherited implicitly.
+
+Parallelism pays only with spare cores. On a single core the pool adds
+process start-up and scheduling on top of the serial work.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import analyses
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Column name -> (block name, dtype, length, categories or None)
+Spec = Dict[str, Tuple[str, str, int, Optional[list]]]
+
+
+class SharedColumns:
+    """DataFrame columns copied once into shared memory blocks."""
+
+    def __init__(self, frame: pd.DataFrame, columns: Optional[Sequence[str]] = None):
+        """Publish columns of frame.
+
+        Args:
+            frame: Source frame
+            columns: Columns to publish (defaults to analyses.COLUMNS)
+
+        Raises:
+            TypeError: If a column is neither NumPy-backed nor categorical
+        """
+        self.blocks: List[shared_memory.SharedMemory] = []
+        self.spec: Spec = {}
+        columns = analyses.COLUMNS if columns is None else columns
+        try:
+            for column in columns:
+                self._publish(column, frame[column])
+        except BaseException:
+            self.close()
+            raise
+
+    def _publish(self, column: str, series: pd.Series) -> None:
+        categories = None
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories.tolist()
+            values = series.cat.codes.to_numpy()
+        elif isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+        else:
+            raise TypeError(f"{column} has unsupported dtype {series.dtype}")
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self.blocks.append(block)
+        np.ndarray(values.shape, values.dtype, buffer=block.buf)[:] = values
+        self.spec[column] = (block.name, values.dtype.str, len(values), categories)
+
+    def close(self) -> None:
+        """Release and remove the blocks."""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self) -> "SharedColumns":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """Open a block published by this pool's parent process."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching also registers the block, but pool
+        # workers share the publisher's resource tracker, so this is a no-op
+        # and the publisher's unlink still clears it
+        return shared_memory.SharedMemory(name=name)
+
+
+def attach_columns(spec: Spec) -> Tuple[pd.DataFrame, List[shared_memory.SharedMemory]]:
+    """Rebuild a read-only frame over published blocks, without copying.
+
+    Args:
+        spec: SharedColumns.spec
+
+    Returns:
+        Tuple of (frame, open blocks); keep the blocks while using the frame
+    """
+    blocks = []
+    data = {}
+    for column, (name, dtype, length, categories) in spec.items():
+        block = _attach_block(name)
+        blocks.append(block)
+        values = np.ndarray((length,), np.dtype(dtype), buffer=block.buf)
+        values.flags.writeable = False
+        if categories is not None:
+            values = pd.Categorical.from_codes(values, categories)
+        data[column] = values
+    return pd.DataFrame(data, copy=False), blocks
+
+
+_worker_frame: Optional[pd.DataFrame] = None
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _start_worker(spec: Spec) -> None:
+    """Pool initializer: attach to the published columns once per worker."""
+    global _worker_frame, _worker_blocks
+    _worker_frame, _worker_blocks = attach_columns(spec)
+
+
+def _run_in_worker(name: str) -> pd.DataFrame:
+    """Pool task: run one analysis on the attached frame."""
+    return analyses.ANALYSES[name](_worker_frame)
+
+
+def run_serial(
+    master_df: pd.DataFrame, names: Optional[Sequence[str]] = None
+) -> Dict[str, pd.DataFrame]:
+    """Run analyses one after another in this process.
+
+    Args:
+        master_df: The master dataset
+        names: Analyses to run (defaults to all of analyses.ANALYSES)
+
+    Returns:
+        Result frame per analysis name
+    """
+    names = list(analyses.ANALYSES) if names is None else names
+    return {name: analyses.ANALYSES[name](master_df) for name in names}
+
+
+def run_parallel(
+    master_df: pd.DataFrame,
+    names: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Run each analysis as a pool task over shared columns.
+
+    Args:
+        master_df: The master dataset
+        names: Analyses to run (defaults to all of analyses.ANALYSES)
+        workers: Pool size (defaults to one per analysis, up to the CPU count)
+
+    Returns:
+        Result frame per analysis name
+    """
+    names = list(analyses.ANALYSES) if names is None else names
+    if workers is None:
+        workers = max(1, min(len(names), os.cpu_count() or 1))
+    with SharedColumns(master_df) as shared:
+        with ProcessPoolExecutor(
+            workers,
+            mp_context=get_context("spawn"),
+            initializer=_start_worker,
+            initargs=(shared.spec,),
+        ) as pool:
+            futures = {name: pool.submit(_run_in_worker, name) for name in names}
+            return {name: future.result() for name, future in futures.items()}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Time the five analyses serially and in parallel on a scaled master_df.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    from master_data import load_master_df
+
+    parser = argparse.ArgumentParser(description="Parallel analyses benchmark")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    master_df = load_master_df(args.data_dir)[analyses.COLUMNS]
+    master_df = master_df.iloc[np.resize(np.arange(len(master_df)), args.rows)]
+    master_df = master_df.reset_index(drop=True)
+    print(
+        f"Five analyses over {len(master_df):,} rows "
+        f"({os.cpu_count()} CPU(s) available)"
+    )
+
+    start = time.perf_counter()
+    expected = {}
+    for name, analysis in analyses.ANALYSES.items():
+        began = time.perf_counter()
+        expected[name] = analysis(master_df)
+        print(f"  {name:<20}{time.perf_counter() - began:>8.2f} s")
+    serial = time.perf_counter() - start
+    print(f"Serial:   {serial:8.2f} s")
+
+    start = time.perf_counter()
+    results = run_parallel(master_df, workers=args.workers)
+    parallel = time.perf_counter() - start
+    print(f"Parallel: {parallel:8.2f} s  (x{serial / parallel:.2f} vs serial)")
+    for name, frame in expected.items():
+        pd.testing.assert_frame_equal(results[name], frame)
+    print("Parallel results match the serial run")
+
+
+if __name__ == "__main__":
+    main()
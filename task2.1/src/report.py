@@ -0,0 +1,752 @@
+"""
+Headless figure report for the five headline analyses.
+Implements FIGURES, the notebook's five 2x2 analysis figures as pairs of an
+input builder, which reduces master_df to the small aggregates a figure
+plots, and a draw function; and build_report(), which writes every figure to
+a report directory as a PNG.
+
+Nothing in this module imports a plotting library at import time.
+matplotlib (with the Agg backend, so no display is needed) is imported the
+first time a figure is actually drawn, in the worker that draws it. Figures
+that need drawing are rendered in a process pool.
+
+Every figure is cached under a content hash of its input aggregates, its
+plot spec (title, options, size and resolution) and RENDER_VERSION. A figure
+whose inputs and spec are unchanged is copied from the cache without being
+redrawn. If every figure is cached, matplotlib is never imported at all.
+seaborn is optional and only sets the colour palette when present.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import analyses
+from master_data import CACHE_DIR, DATA_DIR, load_master_df
+
+FIGURE_CACHE = os.path.join(CACHE_DIR, "figures")
+REPORT_DIR = os.path.join(DATA_DIR, "report")
+
+# Bump whenever a draw function changes what it draws
+RENDER_VERSION = 1
+
+FIGSIZE = (16, 12)
+DPI = 100
+
+Inputs = Dict[str, pd.DataFrame]
+
+
+class Figure(NamedTuple):
+    """One 2x2 analysis figure."""
+
+    title: str
+    inputs: Callable[[pd.DataFrame], Inputs]
+    draw: Callable[[Any, Inputs, Dict[str, Any]], None]
+    options: Dict[str, Any]
+
+
+class Rendered(NamedTuple):
+    """Where a figure was written and what it cost."""
+
+    name: str
+    path: str
+    key: str
+    cached: bool
+    import_seconds: float
+    render_seconds: float
+
+
+_plt = None
+
+
+def _pyplot():
+    """matplotlib.pyplot on the Agg backend, imported on first use."""
+    global _plt
+    if _plt is None:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        plt.style.use("seaborn-v0_8")
+        try:
+            import seaborn
+        except ImportError:
+            pass
+        else:
+            seaborn.set_palette("husl")
+        _plt = plt
+    return _plt
+
+
+def _label_bars(ax, bars, text, offset, horizontal, **kwargs) -> None:
+    """Write text(value) at the end of each bar."""
+    for bar in bars:
+        if horizontal:
+            value = bar.get_width()
+            ax.text(
+                value + offset,
+                bar.get_y() + bar.get_height() / 2,
+                text(value),
+                ha="left",
+                va="center",
+                fontweight="bold",
+                **kwargs,
+            )
+        else:
+            value = bar.get_height()
+            ax.text(
+                bar.get_x() + bar.get_width() / 2,
+                value + offset,
+                text(value),
+                ha="center",
+                va="bottom",
+                fontweight="bold",
+                **kwargs,
+            )
+
+
+def _annotate(ax, frame: pd.DataFrame, x: str, y: str, prefix: str) -> None:
+    """Label each scatter point with its index."""
+    for idx, row in frame.iterrows():
+        ax.annotate(
+            f"{prefix}{idx}",
+            (row[x], row[y]),
+            xytext=(5, 5),
+            textcoords="offset points",
+            fontsize=8,
+        )
+
+
+def driver_points_inputs(master_df: pd.DataFrame) -> Inputs:
+    """Analysis 1 aggregates."""
+    return {"drivers": analyses.driver_points(master_df)}
+
+
+def draw_driver_points(axes, inputs: Inputs, options: Dict[str, Any]) -> None:
+    """Top scorers, points vs starts, efficiency and career span."""
+    plt = _pyplot()
+    (ax1, ax2), (ax3, ax4) = axes
+    drivers = inputs["drivers"]
+    top = drivers.sort_values("total_points", ascending=False).head(options["top"])
+    colors = plt.cm.Set3(np.linspace(0, 1, len(top)))
+
+    bars = ax1.barh(range(len(top)), top["total_points"], color=colors)
+    ax1.set_yticks(range(len(top)))
+    ax1.set_yticklabels([f"Driver {idx}" for idx in top.index])
+    ax1.set_xlabel("Total Points")
+    ax1.set_title(f"Top {len(top)} Drivers by Total Points")
+    ax1.invert_yaxis()
+    _label_bars(ax1, bars, lambda v: f"{v:.0f}", 20, horizontal=True)
+
+    ax2.scatter(
+        top["race_starts"],
+        top["total_points"],
+        c=colors,
+        s=100,
+        alpha=0.7,
+        edgecolors="black",
+    )
+    ax2.set_xlabel("Race Starts")
+    ax2.set_ylabel("Total Points")
+    ax2.set_title("Points vs Race Participation")
+    ax2.grid(True, alpha=0.3)
+    _annotate(ax2, top, "race_starts", "total_points", "D")
+
+    efficient = drivers[drivers["race_starts"] >= options["min_races"]]
+    efficient = efficient.sort_values("points_per_race", ascending=False)
+    efficient = efficient.head(options["top"])
+    bars = ax3.bar(range(len(efficient)), efficient["points_per_race"], color=colors)
+    ax3.set_xticks(range(len(efficient)))
+    ax3.set_xticklabels([f"D{idx}" for idx in efficient.index], rotation=45)
+    ax3.set_ylabel("Points per Race")
+    ax3.set_title(f"Most Efficient Drivers ({options['min_races']}+ races)")
+    _label_bars(ax3, bars, lambda v: f"{v:.1f}", 0.05, horizontal=False, fontsize=9)
+
+    spans = top["career_span"].sort_values(ascending=True)
+    bars = ax4.barh(range(len(spans)), spans, color=colors)
+    ax4.set_yticks(range(len(spans)))
+    ax4.set_yticklabels([f"Driver {idx}" for idx in spans.index])
+    ax4.set_xlabel("Career Span (Years)")
+    ax4.set_title("Career Longevity")
+    _label_bars(ax4, bars, lambda v: f"{v:.0f}", 0.2, horizontal=True)
+
+
+def constructor_stats_inputs(master_df: pd.DataFrame) -> Inputs:
+    """Analysis 2 aggregates."""
+    return {"constructors": analyses.constructor_stats(master_df)}
+
+
+def draw_constructor_stats(axes, inputs: Inputs, options: Dict[str, Any]) -> None:
+    """Efficiency, points vs starts, efficiency vs reliability, top scorers."""
+    plt = _pyplot()
+    (ax1, ax2), (ax3, ax4) = axes
+    constructors = inputs["constructors"]
+    qualified = constructors[constructors["race_starts"] >= options["min_races"]]
+    top = qualified.sort_values("points_per_race", ascending=False)
+    top = top.head(options["top"])
+    colors = plt.cm.tab20(np.linspace(0, 1, len(top)))
+
+    bars = ax1.barh(range(len(top)), top["points_per_race"], color=colors)
+    ax1.set_yticks(range(len(top)))
+    ax1.set_yticklabels([f"Constructor {idx}" for idx in top.index])
+    ax1.set_xlabel("Points per Race")
+    ax1.set_title("Most Efficient Constructors")
+    ax1.invert_yaxis()
+    _label_bars(ax1, bars, lambda v: f"{v:.2f}", 0.02, horizontal=True)
+
+    for ax, x, y, title in [
+        (ax2, "race_starts", "total_points", "Total Points vs Participation"),
+        (ax3, "finish_rate", "points_per_race", "Efficiency vs Reliability"),
+    ]:
+        ax.scatter(top[x], top[y], c=colors, s=120, alpha=0.7, edgecolors="black")
+        ax.grid(True, alpha=0.3)
+        ax.set_title(title)
+        _annotate(ax, top, x, y, "C")
+    ax2.set_xlabel("Race Starts")
+    ax2.set_ylabel("Total Points")
+    ax3.set_xlabel("Finish Rate (%)")
+    ax3.set_ylabel("Points per Race")
+
+    scorers = constructors.sort_values("total_points", ascending=False)
+    scorers = scorers.head(options["top"])
+    bars = ax4.bar(range(len(scorers)), scorers["total_points"], color=colors)
+    ax4.set_xticks(range(len(scorers)))
+    ax4.set_xticklabels([f"C{idx}" for idx in scorers.index], rotation=45)
+    ax4.set_ylabel("Total Points")
+    ax4.set_title("Highest Scoring Constructors")
+    _label_bars(ax4, bars, lambda v: f"{int(v)}", 50, horizontal=False, fontsize=9)
+
+
+def yearly_reliability_inputs(master_df: pd.DataFrame) -> Inputs:
+    """Analysis 3 aggregates: seasons, decades and DNF causes."""
+    decades = master_df.groupby("decade_label")["finished_race"].agg(["count", "sum"])
+    decades["dnf_rate"] = (
+        (decades["count"] - decades["sum"]) / decades["count"] * 100
+    ).round(1)
+    dnfs = master_df[~master_df["finished_race"]]
+    by_decade = (
+        dnfs.groupby(["decade_label", "dnf_reason"]).size().unstack(fill_value=0)
+    )
+    return {
+        "seasons": analyses.yearly_reliability(master_df),
+        "decades": decades[["dnf_rate"]],
+        "causes": dnfs["dnf_reason"].value_counts().to_frame("count"),
+        "cause_shares": by_decade.div(by_decade.sum(axis=1), axis=0) * 100,
+    }
+
+
+def draw_yearly_reliability(axes, inputs: Inputs, options: Dict[str, Any]) -> None:
+    """DNF rate trend, DNF rate per decade, top causes and their evolution."""
+    plt = _pyplot()
+    (ax1, ax2), (ax3, ax4) = axes
+    years = inputs["seasons"].index.to_numpy()
+    dnf_rates = inputs["seasons"]["dnf_rate"].to_numpy()
+    ax1.plot(years, dnf_rates, linewidth=2, color="red", alpha=0.7)
+    ax1.fill_between(years, dnf_rates, alpha=0.3, color="red")
+    ax1.set_xlabel("Year")
+    ax1.set_ylabel("DNF Rate (%)")
+    ax1.set_title("DNF Rate Evolution Over Time")
+    ax1.grid(True, alpha=0.3)
+    ax1.set_ylim(0, max(dnf_rates) * 1.1)
+    slope, intercept = np.polyfit(years, dnf_rates, 1)
+    ax1.plot(
+        years,
+        slope * years + intercept,
+        "--",
+        color="darkred",
+        alpha=0.8,
+        linewidth=2,
+        label=f"Trend (slope: {slope:.2f}%/year)",
+    )
+    ax1.legend()
+
+    decade_dnf = inputs["decades"]["dnf_rate"].sort_index()
+    bars = ax2.bar(
+        range(len(decade_dnf)),
+        decade_dnf.to_numpy(),
+        color=plt.cm.Reds(np.linspace(0.3, 0.9, len(decade_dnf))),
+    )
+    ax2.set_xticks(range(len(decade_dnf)))
+    ax2.set_xticklabels(decade_dnf.index, rotation=45)
+    ax2.set_ylabel("DNF Rate (%)")
+    ax2.set_title("DNF Rate by Decade")
+    _label_bars(ax2, bars, lambda v: f"{v:.1f}%", 0.5, horizontal=False)
+
+    causes = inputs["causes"]["count"].head(options["top_causes"])
+    bars = ax3.barh(
+        range(len(causes)),
+        causes.to_numpy(),
+        color=plt.cm.Set3(np.linspace(0, 1, len(causes))),
+    )
+    ax3.set_yticks(range(len(causes)))
+    ax3.set_yticklabels(causes.index)
+    ax3.set_xlabel("Number of DNFs")
+    ax3.set_title("Most Common DNF Causes")
+    ax3.invert_yaxis()
+    _label_bars(ax3, bars, lambda v: f"{int(v)}", 20, horizontal=True)
+
+    shares = inputs["cause_shares"]
+    available = [cause for cause in options["causes"] if cause in shares.columns]
+    ax4.set_title("DNF Cause Evolution by Decade")
+    if not available or shares.empty:
+        ax4.text(
+            0.5,
+            0.5,
+            "Insufficient data\nfor cause analysis",
+            ha="center",
+            va="center",
+            transform=ax4.transAxes,
+            fontsize=12,
+        )
+        return
+    shares = shares[available].fillna(0)
+    bottom = np.zeros(len(shares))
+    colors = plt.cm.Set2(np.linspace(0, 1, len(available)))
+    for color, cause in zip(colors, available):
+        ax4.bar(
+            range(len(shares)),
+            shares[cause],
+            bottom=bottom,
+            label=cause,
+            color=color,
+            alpha=0.8,
+        )
+        bottom += shares[cause].to_numpy()
+    ax4.set_xticks(range(len(shares)))
+    ax4.set_xticklabels(shares.index, rotation=45)
+    ax4.set_ylabel("Percentage of DNFs")
+    ax4.legend(bbox_to_anchor=(1.05, 1), loc="upper left")
+
+
+def driver_consistency_inputs(master_df: pd.DataFrame) -> Inputs:
+    """Analysis 4 aggregates: per driver and per starting grid slot."""
+    classified = master_df[master_df["positions_lost"].notna()]
+    grid = classified.groupby("grid").agg(
+        {"positions_lost": "mean", "final_position": "mean", "driverId": "count"}
+    )
+    grid = grid.round(2)
+    grid.columns = ["avg_positions_lost", "avg_final_position", "sample_size"]
+    return {"drivers": analyses.driver_consistency(master_df), "grid": grid}
+
+
+def draw_driver_consistency(axes, inputs: Inputs, options: Dict[str, Any]) -> None:
+    """Gainers, losers, change by grid slot and consistency vs change."""
+    plt = _pyplot()
+    (ax1, ax2), (ax3, ax4) = axes
+    drivers = inputs["drivers"]
+    qualified = drivers[drivers["race_count"] >= options["min_races"]]
+    ranked = qualified.sort_values("avg_positions_lost")
+
+    for ax, rows, values, cmap, xlabel, title in [
+        (
+            ax1,
+            ranked.head(options["top"]),
+            -ranked["avg_positions_lost"].head(options["top"]),
+            plt.cm.Greens,
+            "Average Positions Gained",
+            "Top Position Gainers",
+        ),
+        (
+            ax2,
+            ranked[::-1].head(options["top"]),
+            ranked["avg_positions_lost"][::-1].head(options["top"]),
+            plt.cm.Reds,
+            "Average Positions Lost",
+            "Biggest Position Losers",
+        ),
+    ]:
+        bars = ax.barh(
+            range(len(rows)), values, color=cmap(np.linspace(0.4, 0.9, len(rows)))
+        )
+        ax.set_yticks(range(len(rows)))
+        ax.set_yticklabels([f"Driver {idx}" for idx in rows.index])
+        ax.set_xlabel(xlabel)
+        ax.set_title(title)
+        ax.invert_yaxis()
+        _label_bars(ax, bars, lambda v: f"+{v:.2f}", 0.05, horizontal=True)
+
+    grid = inputs["grid"]
+    grid = grid[grid["sample_size"] >= options["min_grid_samples"]]
+    grid = grid.head(options["grid_positions"])
+    changes = -grid["avg_positions_lost"]
+    colors = ["green" if x > 0 else "red" if x < 0 else "gray" for x in changes]
+    bars = ax3.bar(grid.index, changes, color=colors, alpha=0.7)
+    ax3.axhline(y=0, color="black", linestyle="-", alpha=0.3)
+    ax3.set_xlabel("Starting Grid Position")
+    ax3.set_ylabel("Average Position Change")
+    ax3.set_title("Position Change by Starting Grid")
+    ax3.grid(True, alpha=0.3)
+    for bar in bars:
+        height = bar.get_height()
+        if abs(height) > 0.1:
+            ax3.text(
+                bar.get_x() + bar.get_width() / 2,
+                height + (0.1 if height > 0 else -0.1),
+                f"{height:+.1f}",
+                ha="center",
+                va="bottom" if height > 0 else "top",
+                fontweight="bold",
+                fontsize=8,
+            )
+
+    points = ax4.scatter(
+        qualified["avg_positions_lost"],
+        qualified["std_positions_lost"],
+        alpha=0.6,
+        s=60,
+        c=qualified["race_count"],
+        cmap="viridis",
+    )
+    ax4.axvline(x=0, color="red", linestyle="--", alpha=0.5, label="No change")
+    ax4.set_xlabel("Average Positions Lost/Gained")
+    ax4.set_ylabel("Standard Deviation (Consistency)")
+    ax4.set_title("Consistency vs Performance")
+    ax4.grid(True, alpha=0.3)
+    ax4.legend()
+    colorbar = ax4.figure.colorbar(points, ax=ax4)
+    colorbar.set_label("Number of Races", rotation=270, labelpad=15)
+
+
+def era_stats_inputs(master_df: pd.DataFrame) -> Inputs:
+    """Analysis 5 aggregates, with per-result points for the box plot."""
+    participation = master_df.groupby("year").agg(
+        {"driverId": "nunique", "constructorId": "nunique"}
+    )
+    participation.columns = ["drivers_per_year", "constructors_per_year"]
+    return {
+        "eras": analyses.era_stats(master_df),
+        "points": master_df[["decade_label", "points"]],
+        "participation": participation,
+    }
+
+
+def draw_era_stats(axes, inputs: Inputs, options: Dict[str, Any]) -> None:
+    """Scoring, points distribution, reliability and participation by era."""
+    plt = _pyplot()
+    (ax1, ax2), (ax3, ax4) = axes
+    eras = inputs["eras"].sort_index()
+    decades = eras.index
+    positions = range(len(decades))
+    colors = plt.cm.viridis(np.linspace(0, 1, len(decades)))
+
+    bars = ax1.bar(positions, eras["avg_points"], color=colors, alpha=0.8)
+    ax1.set_xticks(positions)
+    ax1.set_xticklabels(decades, rotation=45)
+    ax1.set_ylabel("Average Points per Result")
+    ax1.set_title("Scoring Evolution by Decade")
+    _label_bars(ax1, bars, lambda v: f"{v:.2f}", 0.1, horizontal=False, fontsize=9)
+
+    points = inputs["points"]
+    groups = [
+        points.loc[points["decade_label"] == decade, "points"].to_numpy()
+        for decade in decades
+    ]
+    boxes = ax2.boxplot(groups, tick_labels=list(decades), patch_artist=True)
+    for patch, color in zip(boxes["boxes"], colors):
+        patch.set_facecolor(color)
+        patch.set_alpha(0.7)
+    ax2.set_xlabel("Decade")
+    ax2.set_ylabel("Points Distribution")
+    ax2.set_title("Points Distribution by Era")
+    ax2.tick_params(axis="x", rotation=45)
+
+    ax3.plot(
+        positions, eras["dnf_rate"], "ro-", linewidth=2, markersize=8, label="DNF Rate"
+    )
+    ax3.fill_between(positions, eras["dnf_rate"], alpha=0.3, color="red")
+    ax3.set_xticks(positions)
+    ax3.set_xticklabels(decades, rotation=45)
+    ax3.set_ylabel("DNF Rate (%)", color="red")
+    ax3.set_title("Reliability Evolution")
+    ax3.tick_params(axis="y", labelcolor="red")
+    twin = ax3.twinx()
+    twin.plot(
+        positions,
+        eras["unique_drivers"],
+        "bo-",
+        linewidth=2,
+        markersize=8,
+        label="Unique Drivers",
+    )
+    twin.set_ylabel("Unique Drivers", color="blue")
+    twin.tick_params(axis="y", labelcolor="blue")
+
+    participation = inputs["participation"]
+    years = participation.index
+    for column, label in [
+        ("drivers_per_year", "Drivers per Year"),
+        ("constructors_per_year", "Constructors per Year"),
+    ]:
+        ax4.plot(years, participation[column], linewidth=2, label=label, alpha=0.8)
+        ax4.fill_between(years, participation[column], alpha=0.2)
+    ax4.set_xlabel("Year")
+    ax4.set_ylabel("Count")
+    ax4.set_title("Participation Trends Over Time")
+    ax4.legend()
+    ax4.grid(True, alpha=0.3)
+
+
+FIGURES: Dict[str, Figure] = {
+    "driver_points": Figure(
+        "Top F1 Drivers Performance Analysis",
+        driver_points_inputs,
+        draw_driver_points,
+        {"top": 10, "min_races": 50},
+    ),
+    "constructor_stats": Figure(
+        "Constructor Performance and Efficiency Analysis",
+        constructor_stats_inputs,
+        draw_constructor_stats,
+        {"top": 10, "min_races": 100},
+    ),
+    "yearly_reliability": Figure(
+        "F1 Reliability Analysis: DNF Trends and Causes",
+        yearly_reliability_inputs,
+        draw_yearly_reliability,
+        {
+            "top_causes": 10,
+            "causes": ["Engine", "Accident", "Transmission", "Gearbox", "Collision"],
+        },
+    ),
+    "driver_consistency": Figure(
+        "F1 Performance Consistency and Position Change Analysis",
+        driver_consistency_inputs,
+        draw_driver_consistency,
+        {"top": 10, "min_races": 20, "min_grid_samples": 20, "grid_positions": 15},
+    ),
+    "era_stats": Figure(
+        "F1 Era Analysis: Evolution and Comparison",
+        era_stats_inputs,
+        draw_era_stats,
+        {},
+    ),
+}
+
+
+def figure_key(name: str, figure: Figure, inputs: Inputs) -> str:
+    """Content hash of a figure's input aggregates and plot spec.
+
+    Args:
+        name: Figure name
+        figure: Its spec
+        inputs: Its input aggregates
+
+    Returns:
+        Hex digest; equal digests draw equal figures
+    """
+    digest = hashlib.sha256()
+    spec = {
+        "name": name,
+        "title": figure.title,
+        "options": figure.options,
+        "figsize": FIGSIZE,
+        "dpi": DPI,
+        "version": RENDER_VERSION,
+    }
+    digest.update(json.dumps(spec, sort_keys=True).encode())
+    for label in sorted(inputs):
+        frame = inputs[label]
+        layout = [label, list(map(str, frame.columns)), list(map(str, frame.dtypes))]
+        digest.update(json.dumps(layout).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy())
+    return digest.hexdigest()
+
+
+def render_figure(figure: Figure, inputs: Inputs, path: str) -> Tuple[float, float]:
+    """Draw a figure headlessly and save it as a PNG, atomically.
+
+    Args:
+        figure: Spec to draw
+        inputs: Its input aggregates
+        path: Destination file
+
+    Returns:
+        Tuple of (seconds spent importing matplotlib, zero once imported;
+        seconds spent drawing and saving)
+    """
+    start = time.perf_counter()
+    plt = _pyplot()
+    imported = time.perf_counter()
+    fig, axes = plt.subplots(2, 2, figsize=FIGSIZE)
+    try:
+        fig.suptitle(figure.title, fontsize=16, fontweight="bold")
+        figure.draw(axes, inputs, figure.options)
+        fig.tight_layout()
+        partial = f"{path}.{os.getpid()}.tmp.png"
+        fig.savefig(partial, dpi=DPI)
+        os.replace(partial, path)
+    finally:
+        plt.close(fig)
+    return imported - start, time.perf_counter() - imported
+
+
+def build_report(
+    master_df: Optional[pd.DataFrame] = None,
+    out_dir: str = REPORT_DIR,
+    cache_dir: Optional[str] = FIGURE_CACHE,
+    figures: Optional[Dict[str, Figure]] = None,
+    workers: Optional[int] = None,
+) -> List[Rendered]:
+    """Write every figure to out_dir, drawing only those not already cached.
+
+    Args:
+        master_df: The master dataset (defaults to load_master_df())
+        out_dir: Report directory; each figure is written as <name>.png
+        cache_dir: Content-hash figure cache; None redraws everything
+        figures: Figures to write (defaults to FIGURES)
+        workers: Pool size for drawing (defaults to one per figure to draw, up
+            to the CPU count); 0 draws in this process
+
+    Returns:
+        One Rendered per figure, in figures order
+    """
+    master_df = load_master_df() if master_df is None else master_df
+    figures = FIGURES if figures is None else figures
+    directory = tempfile.mkdtemp() if cache_dir is None else cache_dir
+    os.makedirs(directory, exist_ok=True)
+    os.makedirs(out_dir, exist_ok=True)
+    try:
+        pending = {}
+        keys = {}
+        for name, figure in figures.items():
+            inputs = figure.inputs(master_df)
+            keys[name] = figure_key(name, figure, inputs)
+            if not os.path.exists(os.path.join(directory, f"{keys[name]}.png")):
+                pending[name] = inputs
+
+        timings: Dict[str, Tuple[float, float]] = {}
+        paths = {name: os.path.join(directory, f"{keys[name]}.png") for name in pending}
+        if workers is None:
+            workers = max(1, min(len(pending), os.cpu_count() or 1))
+        if pending and workers == 0:
+            for name, inputs in pending.items():
+                timings[name] = render_figure(figures[name], inputs, paths[name])
+        elif pending:
+            with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as pool:
+                futures = {
+                    name: pool.submit(render_figure, figures[name], inputs, paths[name])
+                    for name, inputs in pending.items()
+                }
+                timings = {name: future.result() for name, future in futures.items()}
+
+        rendered = []
+        for name in figures:
+            path = os.path.join(out_dir, f"{name}.png")
+            shutil.copyfile(os.path.join(directory, f"{keys[name]}.png"), path)
+            imported, drawn = timings.get(name, (0.0, 0.0))
+            rendered.append(
+                Rendered(name, path, keys[name], name not in pending, imported, drawn)
+            )
+        return rendered
+    finally:
+        if cache_dir is None:
+            shutil.rmtree(directory)
+
+
+# Imports of the notebook's first cell, for comparison with this module's
+NOTEBOOK_IMPORTS = [
+    "pandas",
+    "numpy",
+    "matplotlib.pyplot",
+    "seaborn",
+    "plotly.express",
+    "plotly.graph_objects",
+    "plotly.subplots",
+    "scipy.stats",
+]
+
+
+def _import_seconds(modules: List[str]) -> Tuple[float, List[str]]:
+    """Time importing modules in a fresh interpreter.
+
+    Returns:
+        Tuple of (seconds, modules that are not installed)
+    """
+    code = (
+        "import importlib, json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "missing = []\n"
+        "for name in sys.argv[1:]:\n"
+        "    try:\n"
+        "        importlib.import_module(name)\n"
+        "    except ImportError:\n"
+        "        missing.append(name)\n"
+        "print(json.dumps([time.perf_counter() - start, missing]))\n"
+    )
+    here = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run(
+        [sys.executable, "-c", code, *modules],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=here,
+    ).stdout
+    seconds, missing = json.loads(output)
+    return seconds, missing
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Write the figure report and print import and render times.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Headless figure report")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--out", default=REPORT_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true", help="redraw every figure")
+    parser.add_argument(
+        "--compare-imports",
+        action="store_true",
+        help="time the notebook's imports against this module's",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare_imports:
+        eager, missing = _import_seconds(NOTEBOOK_IMPORTS)
+        lazy, _ = _import_seconds(["report"])
+        absent = f" ({', '.join(missing)} not installed)" if missing else ""
+        print(f"Notebook imports:   {eager * 1000:6.0f} ms{absent}")
+        print(f"report.py imports:  {lazy * 1000:6.0f} ms")
+
+    master_df = load_master_df(args.data_dir)
+    start = time.perf_counter()
+    rendered = build_report(
+        master_df,
+        args.out,
+        None if args.no_cache else FIGURE_CACHE,
+        workers=args.workers,
+    )
+    seconds = time.perf_counter() - start
+
+    print(f"{'figure':<22}{'status':<10}{'import':>10}{'render':>10}")
+    for figure in rendered:
+        status = "cached" if figure.cached else "rendered"
+        print(
+            f"{figure.name:<22}{status:<10}"
+            f"{figure.import_seconds * 1000:>7.0f} ms"
+            f"{figure.render_seconds * 1000:>7.0f} ms"
+        )
+    imported = "yes" if "matplotlib" in sys.modules else "no"
+    print(
+        f"Report written to {os.path.abspath(args.out)} in {seconds * 1000:.0f} ms "
+        f"(matplotlib imported by this process: {imported})"
+    )
+
+
+if __name__ == "__main__":
+    main()
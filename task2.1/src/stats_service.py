@@ -0,0 +1,351 @@
+"""
+Low-latency stats lookups for drivers, constructors and seasons.
+Implements StatsTable, a materialized table of points, starts, points per
+start, finish rate and average positions gained, stored as dense arrays
+indexed by driverId, constructorId or year; StatsService, a Python API that
+keeps one table per key up to date from aggregate_store.update_store(); and
+make_server(), a localhost JSON endpoint over the same service.
+
+Every table is derived from the store's per-key sums, so a refresh costs one
+incremental store update plus a few vectorized divisions over a few hundred
+keys. A lookup is a bounds check and a read of one row of a 2-D array. No
+grouping or searching happens while a request is being served. A refresh
+builds new tables and swaps them in with one assignment, so readers never see
+a half-built table.
+"""
+
+import argparse
+import json
+import math
+import threading
+import time
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from aggregate_store import POINT_SCALE, STORE_PATH, AggregateStore, update_store
+from master_data import DATA_DIR
+
+FIELDS = ("points", "starts", "points_per_race", "finish_rate", "avg_positions_gained")
+
+# URL path segment -> (table name, store family)
+KINDS = {
+    "drivers": ("driverId", "driver"),
+    "constructors": ("constructorId", "constructor"),
+    "seasons": ("year", "year"),
+}
+
+Stats = Dict[str, Optional[float]]
+
+
+class StatsTable:
+    """Per-key stats in one dense array, one row per possible key."""
+
+    def __init__(self, key: str, state: Dict[str, np.ndarray]):
+        """Materialize stats from one family of aggregate state.
+
+        Args:
+            key: Name of the key column (driverId, constructorId or year)
+            state: Arrays with results, points, finished, classified and
+                lost_sum per key, as kept by AggregateStore
+        """
+        self.key = key
+        starts = state["results"].astype(np.float64)
+        classified = state["classified"].astype(np.float64)
+        points = state["points"] / POINT_SCALE
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns = [
+                points,
+                starts,
+                points / starts,
+                state["finished"] / starts * 100,
+                # positions_lost is grid minus final position, so it counts
+                # places gained
+                state["lost_sum"] / classified,
+            ]
+        self.present = starts > 0
+        self.values = np.column_stack(columns)
+        self.values.flags.writeable = False
+
+    def __len__(self) -> int:
+        return int(self.present.sum())
+
+    def keys(self) -> np.ndarray:
+        """Keys that have at least one result."""
+        return np.flatnonzero(self.present)
+
+    def get(self, key: int) -> Optional[Stats]:
+        """Stats for one key.
+
+        Args:
+            key: driverId, constructorId or year
+
+        Returns:
+            Dict of FIELDS (None where undefined, e.g. no classified start),
+            or None if the key has no results
+        """
+        if not 0 <= key < len(self.present) or not self.present[key]:
+            return None
+        stats = {
+            field: None if math.isnan(value) else value
+            for field, value in zip(FIELDS, self.values[key].tolist())
+        }
+        stats["starts"] = int(stats["starts"])
+        return stats
+
+    def frame(self) -> pd.DataFrame:
+        """The whole table, one row per present key."""
+        keys = self.keys()
+        return pd.DataFrame(
+            self.values[keys], columns=FIELDS, index=pd.Index(keys, name=self.key)
+        )
+
+
+def materialize(store: AggregateStore) -> Dict[str, StatsTable]:
+    """Build the driver, constructor and season tables from a store.
+
+    Args:
+        store: Aggregate state
+
+    Returns:
+        StatsTable per KINDS name
+    """
+    tables = {}
+    for kind, (key, family) in KINDS.items():
+        state = {
+            field: store.arrays[f"{family}.{field}"]
+            for field in ("results", "points", "finished", "classified", "lost_sum")
+        }
+        tables[kind] = StatsTable(key, state)
+    return tables
+
+
+class StatsService:
+    """Driver, constructor and season stats kept in step with results.csv."""
+
+    def __init__(self, data_dir: str = DATA_DIR, store_path: str = STORE_PATH):
+        """Load or build the aggregate store and materialize the tables.
+
+        Args:
+            data_dir: Directory holding results.csv, races.csv and status.csv
+            store_path: Aggregate store file
+        """
+        self.data_dir = data_dir
+        self.store_path = store_path
+        self.tables: Dict[str, StatsTable] = {}
+        self._refreshing = threading.Lock()
+        self.refresh()
+
+    def refresh(self, rebuild: bool = False) -> int:
+        """Fold rows appended to results.csv into the tables.
+
+        Args:
+            rebuild: Rebuild the aggregate store from every row
+
+        Returns:
+            Number of results ingested
+        """
+        with self._refreshing:
+            store, ingested = update_store(self.data_dir, self.store_path, rebuild)
+            self.tables = materialize(store)
+        return ingested
+
+    def lookup(self, kind: str, key: int) -> Optional[Stats]:
+        """Stats for one key of one KINDS table.
+
+        Raises:
+            KeyError: If kind is not in KINDS
+        """
+        return self.tables[kind].get(key)
+
+    def driver(self, driver_id: int) -> Optional[Stats]:
+        """Career stats of one driver, or None if they have no results."""
+        return self.tables["drivers"].get(driver_id)
+
+    def constructor(self, constructor_id: int) -> Optional[Stats]:
+        """Stats of one constructor, or None if it has no results."""
+        return self.tables["constructors"].get(constructor_id)
+
+    def season(self, year: int) -> Optional[Stats]:
+        """Stats over every result of one season, or None if it has none."""
+        return self.tables["seasons"].get(year)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """GET /<kind>/<key> returns stats; POST /refresh updates them."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this the body waits on
+    # the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def _reply(self, status: int, body) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] not in KINDS:
+            self._reply(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            key = int(parts[1])
+        except ValueError:
+            self._reply(400, {"error": f"{parts[1]!r} is not an integer key"})
+            return
+        stats = self.server.service.lookup(parts[0], key)
+        if stats is None:
+            self._reply(404, {"error": f"no results for {KINDS[parts[0]][0]} {key}"})
+        else:
+            self._reply(200, stats)
+
+    def do_POST(self) -> None:
+        if self.path.strip("/") != "refresh":
+            self._reply(404, {"error": f"unknown path {self.path}"})
+            return
+        self._reply(200, {"ingested": self.server.service.refresh()})
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def make_server(
+    service: StatsService, host: str = "127.0.0.1", port: int = 8000
+) -> ThreadingHTTPServer:
+    """An HTTP server answering lookups from service.
+
+    Routes are GET /drivers/<driverId>, /constructors/<constructorId> and
+    /seasons/<year>, and POST /refresh.
+
+    Args:
+        service: Service to answer from
+        host: Interface to bind (localhost by default)
+        port: Port to bind (0 picks a free one)
+
+    Returns:
+        The bound server; call serve_forever() to start it
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.service = service
+    return server
+
+
+def _latency_report(label: str, latencies: np.ndarray, seconds: float) -> None:
+    p50, p99 = np.percentile(latencies, [50, 99]) / 1000
+    print(
+        f"{label:<8}{len(latencies) / seconds:>10,.0f} QPS"
+        f"{p50:>9.1f} us p50{p99:>9.1f} us p99{latencies.max() / 1000:>9.1f} us max"
+    )
+
+
+def _random_requests(service: StatsService, count: int, seed: int = 0) -> List:
+    """count (kind, key) pairs drawn evenly over present keys of each table."""
+    rng = np.random.default_rng(seed)
+    kinds = list(KINDS)
+    requests = []
+    for choice in rng.integers(len(kinds), size=count):
+        keys = service.tables[kinds[choice]].keys()
+        requests.append((kinds[choice], int(keys[rng.integers(len(keys))])))
+    return requests
+
+
+def _check_against(service: StatsService, data_dir: str) -> None:
+    """Assert the driver table equals a groupby over a fresh master_df."""
+    from master_data import load_master_df
+
+    master_df = load_master_df(data_dir, cache_dir=None)
+    grouped = master_df.groupby("driverId")
+    expected = pd.DataFrame(
+        {
+            "points": grouped["points"].sum(),
+            "starts": grouped["raceId"].count(),
+            "points_per_race": grouped["points"].mean(),
+            "finish_rate": grouped["finished_race"].mean() * 100,
+            "avg_positions_gained": grouped["positions_lost"].mean(),
+        }
+    )
+    actual = service.tables["drivers"].frame()
+    pd.testing.assert_frame_equal(
+        actual, expected, check_dtype=False, check_index_type=False
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Serve stats over HTTP, or load-test the Python API and the HTTP endpoint.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Stats query service")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--store", default=STORE_PATH)
+    parser.add_argument("--serve", action="store_true", help="serve until stopped")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    service = StatsService(args.data_dir, args.store)
+    seconds = time.perf_counter() - start
+    sizes = ", ".join(f"{len(table)} {kind}" for kind, table in service.tables.items())
+    print(f"Loaded {sizes} in {seconds * 1000:.1f} ms")
+
+    if args.serve:
+        server = make_server(service, port=args.port)
+        print(f"Serving on http://127.0.0.1:{server.server_address[1]}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    start = time.perf_counter()
+    ingested = service.refresh()
+    seconds = time.perf_counter() - start
+    print(f"Refresh with {ingested} new results: {seconds * 1000:.1f} ms")
+    _check_against(service, args.data_dir)
+    print("Driver stats match a groupby over master_df")
+
+    requests = _random_requests(service, args.requests)
+    latencies = np.empty(len(requests), dtype=np.int64)
+    start = time.perf_counter()
+    for i, (kind, key) in enumerate(requests):
+        began = time.perf_counter_ns()
+        service.lookup(kind, key)
+        latencies[i] = time.perf_counter_ns() - began
+    _latency_report("API", latencies, time.perf_counter() - start)
+
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    connection = HTTPConnection("127.0.0.1", server.server_address[1])
+    requests = requests[: max(1, args.requests // 10)]
+    latencies = np.empty(len(requests), dtype=np.int64)
+    try:
+        start = time.perf_counter()
+        for i, (kind, key) in enumerate(requests):
+            began = time.perf_counter_ns()
+            connection.request("GET", f"/{kind}/{key}")
+            response = connection.getresponse()
+            response.read()
+            latencies[i] = time.perf_counter_ns() - began
+            if response.status != 200:
+                raise RuntimeError(f"/{kind}/{key} returned {response.status}")
+        _latency_report("HTTP", latencies, time.perf_counter() - start)
+    finally:
+        connection.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Out-of-core aggregation for results tables larger than memory.
+Implements stream_aggregates(), which reads a results CSV in fixed-size
+chunks, joins each chunk to the in-memory race dimension and folds it into an
+aggregate_store.AggregateStore, and write_synthetic_results(), which scales
+results.csv up to any row count for testing.
+
+Only one chunk of rows is alive at a time. Everything else is the store's
+per-driver, per-constructor and per-season state, whose size depends on how
+many drivers, constructors and seasons there are, not on how many rows were
+read. Peak memory is therefore set by the chunk size. The store reproduces
+the notebook's five analyses exactly, so the streamed tables equal those of
+an in-memory master_df.
+
+The five analyses need only each race's season; finishing is read from
+statusId directly, so the status table is not joined.
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import analyses
+from aggregate_store import (
+    RESULT_COLUMNS,
+    AggregateStore,
+    assert_same_analyses,
+    prepare_rows,
+)
+from dimensions import DimensionTable
+from loaders import read_table
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CHUNK_ROWS = 500_000
+
+
+def load_race_years(data_dir: str = DATA_DIR) -> DimensionTable:
+    """The race dimension, reduced to each race's season."""
+    return DimensionTable(
+        "races", "raceId", read_table("races", data_dir, columns=["raceId", "year"])
+    )
+
+
+def stream_aggregates(
+    path: str,
+    races: DimensionTable,
+    chunksize: int = CHUNK_ROWS,
+    store: Optional[AggregateStore] = None,
+) -> AggregateStore:
+    """Fold a results CSV into aggregate state, one chunk at a time.
+
+    Args:
+        path: CSV with the results.csv schema
+        races: Race dimension with a year column
+        chunksize: Rows per chunk; bounds peak memory
+        store: Store to add to (defaults to a new one)
+
+    Returns:
+        The store
+    """
+    store = AggregateStore() if store is None else store
+    chunks = read_table(
+        "results", columns=RESULT_COLUMNS, path=path, chunksize=chunksize
+    )
+    with chunks:
+        for chunk in chunks:
+            store.ingest(prepare_rows(chunk, races), skip_seen=False)
+    return store
+
+
+def write_synthetic_results(source: str, destination: str, rows: int) -> None:
+    """Write a results CSV of the given length by repeating source's rows.
+
+    Each repetition shifts resultId past the previous one, so every row stays
+    a distinct result; races, drivers and constructors are unchanged.
+
+    Args:
+        source: results.csv to repeat
+        destination: Output path
+        rows: Number of data rows to write
+    """
+    with open(source, "rb") as handle:
+        header, *lines = handle.read().splitlines()
+    ids, rests = zip(*(line.split(b",", 1) for line in lines))
+    ids = [int(i) for i in ids]
+    span = max(ids)
+    with open(destination, "wb") as handle:
+        handle.write(header + b"\n")
+        copy = 0
+        while rows > 0:
+            count = min(rows, len(lines))
+            shift = copy * span
+            handle.write(
+                b"".join(b"%d,%b\n" % (ids[i] + shift, rests[i]) for i in range(count))
+            )
+            rows -= count
+            copy += 1
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident memory of this process, in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _streamed(
+    path: str, data_dir: str, chunksize: int
+) -> Tuple[float, float, Dict[str, pd.DataFrame]]:
+    """Worker: stream the file and return (seconds, peak MB, analyses)."""
+    start = time.perf_counter()
+    store = stream_aggregates(path, load_race_years(data_dir), chunksize)
+    frames = store.frames()
+    return time.perf_counter() - start, _peak_rss_mb(), frames
+
+
+def _in_memory(
+    path: str, data_dir: str
+) -> Tuple[float, float, Dict[str, pd.DataFrame]]:
+    """Worker: load the whole file and run analyses.py on it."""
+    start = time.perf_counter()
+    rows = read_table("results", columns=RESULT_COLUMNS, path=path)
+    master_df = prepare_rows(rows, load_race_years(data_dir))
+    del rows
+    frames = {name: func(master_df) for name, func in analyses.ANALYSES.items()}
+    return time.perf_counter() - start, _peak_rss_mb(), frames
+
+
+def _isolated(func, *args):
+    """Run func in a fresh process, so its peak memory is its own."""
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(func, *args).result()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Compare streamed and in-memory aggregation on synthetic results.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Out-of-core aggregation benchmark")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    source = os.path.join(args.data_dir, "results.csv")
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"Chunks of {args.chunksize:,} rows")
+        print(f"{'rows':>12}{'CSV':>9}{'':>4}{'streamed':>18}{'in memory':>20}")
+        for rows in args.rows:
+            path = os.path.join(directory, "results.csv")
+            write_synthetic_results(source, path, rows)
+            size = os.path.getsize(path) / 2**20
+            streamed, streamed_mb, frames = _isolated(
+                _streamed, path, args.data_dir, args.chunksize
+            )
+            loaded, loaded_mb, expected = _isolated(_in_memory, path, args.data_dir)
+            assert_same_analyses(frames, expected)
+            print(
+                f"{rows:>12,}{size:>6.0f} MB{'':>4}"
+                f"{streamed:>6.1f} s {streamed_mb:>6.0f} MB"
+                f"{loaded:>8.1f} s {loaded_mb:>6.0f} MB"
+            )
+            os.remove(path)
+        print("Streamed analyses match the in-memory results")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
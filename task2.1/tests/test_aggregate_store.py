@@ -0,0 +1,134 @@
+"""
+Tests for incrementally maintained analysis aggregates.
+Each scenario checks all five analyses against a full recompute: appends,
+a rewritten tail (rebuild), re-ingested resultIds and a race moved to
+another season.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import analyses
+from aggregate_store import (
+    AggregateStore,
+    assert_same_analyses,
+    full_recompute,
+    update_store,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# Results held back from the initial build and appended by the tests
+APPENDED = 60
+
+
+class TestAggregateStore(unittest.TestCase):
+    """Test update_store() against full recomputes."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name in ("races.csv", "status.csv"):
+            shutil.copy(os.path.join(DATA_DIR, name), self.directory)
+        with open(os.path.join(DATA_DIR, "results.csv"), "rb") as handle:
+            self.header, *self.lines = handle.read().splitlines(keepends=True)
+        self.results = os.path.join(self.directory, "results.csv")
+        self.store_path = os.path.join(self.directory, "aggregates.npz")
+        self.write(self.lines[:-APPENDED])
+        _, self.built = update_store(self.directory, self.store_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, lines, mode="wb"):
+        with open(self.results, mode) as handle:
+            if mode == "wb":
+                handle.write(self.header)
+            handle.write(b"".join(lines))
+
+    def assert_matches_full_recompute(self, store):
+        expected = full_recompute(self.directory)
+        actual = store.frames()
+        for name in analyses.ANALYSES:
+            with self.subTest(analysis=name):
+                assert_same_analyses({name: actual[name]}, {name: expected[name]})
+
+    def test_initial_build(self):
+        """A first update ingests every row and equals a full recompute."""
+        store = AggregateStore.load(self.store_path)
+        self.assertEqual(self.built, len(self.lines) - APPENDED)
+        self.assertEqual(store.results, self.built)
+        self.assert_matches_full_recompute(store)
+
+    def test_append(self):
+        """Appended rows are the only rows ingested, in any number of steps."""
+        for start in range(len(self.lines) - APPENDED, len(self.lines), 20):
+            self.write(self.lines[start : start + 20], mode="ab")
+            store, ingested = update_store(self.directory, self.store_path)
+            self.assertEqual(ingested, 20)
+        self.assertEqual(store.results, len(self.lines))
+        self.assert_matches_full_recompute(store)
+
+    def test_partial_last_line_waits(self):
+        """A half-written line is left for the next update."""
+        line = self.lines[-APPENDED]
+        self.write([line[:10]], mode="ab")
+        _, ingested = update_store(self.directory, self.store_path)
+        self.assertEqual(ingested, 0)
+        self.write([line[10:]], mode="ab")
+        store, ingested = update_store(self.directory, self.store_path)
+        self.assertEqual(ingested, 1)
+        self.assertEqual(store.results, self.built + 1)
+
+    def test_changed_guard_rebuilds(self):
+        """Rewriting already ingested bytes rebuilds from scratch."""
+        lines = self.lines[:-APPENDED]
+        fields = lines[-1].split(b",")
+        # The points column of the last ingested row
+        fields[9] = b"99" if fields[9] != b"99" else b"98"
+        lines[-1] = b",".join(fields)
+        self.write(lines)
+        store, ingested = update_store(self.directory, self.store_path)
+        self.assertEqual(ingested, len(lines))
+        self.assert_matches_full_recompute(store)
+
+    def test_reingested_result_ids_are_skipped(self):
+        """Rows whose resultId was already ingested are not counted twice."""
+        before = AggregateStore.load(self.store_path).frames()
+        self.write(self.lines[:20], mode="ab")
+        store, ingested = update_store(self.directory, self.store_path)
+        self.assertEqual(ingested, 0)
+        assert_same_analyses(store.frames(), before)
+
+        rows = self.lines[-APPENDED:]
+        self.write(rows + rows, mode="ab")
+        store, ingested = update_store(self.directory, self.store_path)
+        self.assertEqual(ingested, APPENDED)
+        self.assertEqual(store.results, len(self.lines))
+
+    def test_moved_race_rebuilds(self):
+        """Moving an ingested race to another season rebuilds the store."""
+        race_id = self.lines[0].split(b",")[1]
+        path = os.path.join(self.directory, "races.csv")
+        with open(path, "rb") as handle:
+            header, *races = handle.read().splitlines(keepends=True)
+        for i, line in enumerate(races):
+            fields = line.split(b",")
+            if fields[0] == race_id:
+                fields[1] = b"%d" % (int(fields[1]) + 10)
+                races[i] = b",".join(fields)
+        with open(path, "wb") as handle:
+            handle.write(header + b"".join(races))
+
+        store, ingested = update_store(self.directory, self.store_path)
+        self.assertEqual(ingested, self.built)
+        self.assert_matches_full_recompute(store)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Tests for the year-partitioned Parquet store.
+Covers partition pruning, the bytes a query reads and query results against
+filtering a full master_df.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from columnar_store import open_dataset, query, write_dataset
+from master_data import build_master_df, load_sources
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def plain(frame):
+    """frame with categoricals as their values and a fresh index."""
+    frame = frame.reset_index(drop=True)
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(frame[column].cat.categories.dtype)
+    return frame
+
+
+class TestColumnarStore(unittest.TestCase):
+    """Test write_dataset() and query()."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.root = os.path.join(cls.directory, "results_by_year")
+        cls.master_df = build_master_df(**load_sources(DATA_DIR))
+        # Small row groups, so a season spans several of them
+        write_dataset(cls.master_df, cls.root, row_group_rows=100)
+        cls.dataset = open_dataset(cls.root)
+        cls.seasons = cls.master_df["year"].nunique()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def expected(self, columns, years=None, driver_ids=None, constructor_ids=None):
+        mask = np.ones(len(self.master_df), dtype=bool)
+        if years is not None:
+            mask &= self.master_df["year"].between(*years).to_numpy()
+        if driver_ids is not None:
+            mask &= self.master_df["driverId"].isin(driver_ids).to_numpy()
+        if constructor_ids is not None:
+            mask &= self.master_df["constructorId"].isin(constructor_ids).to_numpy()
+        rows = self.master_df[mask].sort_values(["year", "raceId", "resultId"])
+        return rows[columns]
+
+    def assert_same_rows(self, actual, expected):
+        pd.testing.assert_frame_equal(
+            plain(actual), plain(expected), check_dtype=False
+        )
+
+    def test_one_file_per_season(self):
+        """Each season is its own partition file."""
+        self.assertEqual(len(self.dataset.files), self.seasons)
+        self.assertTrue(all("year=" in path for path in self.dataset.files))
+
+    def test_season_query_reads_one_partition(self):
+        """A one-season query opens one file and reads only its chunks."""
+        rows, stats = query(years=(2021, 2021), dataset=self.dataset)
+        self.assertEqual(stats.files, 1)
+        self.assertGreater(stats.row_groups, 1)
+        self.assertLess(stats.bytes_read, stats.total_bytes / 10)
+        self.assert_same_rows(rows, self.expected(list(rows.columns), (2021, 2021)))
+
+    def test_year_range_and_driver_filter(self):
+        """Seasons outside the range are pruned; rows match a full load."""
+        columns = ["raceId", "year", "points", "final_position"]
+        rows, stats = query(
+            columns, years=(2010, 2019), driver_ids=[1], dataset=self.dataset
+        )
+        self.assertEqual(stats.files, 10)
+        self.assertEqual(list(rows.columns), columns)
+        self.assertGreater(len(rows), 0)
+        self.assert_same_rows(rows, self.expected(columns, (2010, 2019), [1]))
+
+    def test_projection_reads_fewer_bytes(self):
+        """Reading fewer columns reads fewer bytes from the same row groups."""
+        _, narrow = query(["points"], years=(2000, 2009), dataset=self.dataset)
+        _, wide = query(years=(2000, 2009), dataset=self.dataset)
+        self.assertEqual(narrow.row_groups, wide.row_groups)
+        self.assertLess(narrow.bytes_read, wide.bytes_read)
+
+    def test_constructor_filter_matches_full_load(self):
+        """A filter without a year range scans every season correctly."""
+        columns = ["year", "points", "finished_race"]
+        rows, stats = query(columns, constructor_ids=[6, 131], dataset=self.dataset)
+        self.assertEqual(stats.files, self.seasons)
+        self.assert_same_rows(rows, self.expected(columns, constructor_ids=[6, 131]))
+
+    def test_empty_year_range(self):
+        """A range with no seasons reads nothing and returns no rows."""
+        rows, stats = query(["points"], years=(1900, 1901), dataset=self.dataset)
+        self.assertEqual(len(rows), 0)
+        self.assertEqual((stats.files, stats.row_groups, stats.bytes_read), (0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
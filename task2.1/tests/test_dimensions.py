@@ -0,0 +1,141 @@
+"""
+Tests for dense dimension tables.
+Covers key validation, unknown keys, decorate() against pd.merge and the
+circuit and status tables against groupby and value_counts.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from dimensions import MISSING, DimensionTable, circuit_frame, status_distribution
+from loaders import read_table
+from master_data import RACE_COLUMNS
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def colors():
+    """A small dimension with a gap in its keys and mixed column dtypes."""
+    return pd.DataFrame(
+        {
+            "colorId": np.array([1, 2, 4], dtype=np.int16),
+            "rank": np.array([10, 20, 40], dtype=np.int32),
+            "name": pd.Categorical(["red", "green", "blue"]),
+            "hex": pd.array([None, "00ff00", "0000ff"], dtype="string"),
+        }
+    )
+
+
+class TestDimensionTable(unittest.TestCase):
+    """Test DimensionTable lookups, gathers and validation."""
+
+    def test_take_and_lookup(self):
+        """Known keys gather their rows; unknown keys are missing."""
+        table = DimensionTable("colors", "colorId", colors())
+        self.assertEqual(len(table), 3)
+        keys = np.array([4, 1, 3, 0, -2, 99])
+        np.testing.assert_array_equal(
+            table.rows(keys), [2, 0, MISSING, MISSING, MISSING, MISSING]
+        )
+        taken = table.take(keys, ["rank", "name"])
+        self.assertEqual(taken["rank"].tolist()[:2], [40, 10])
+        self.assertTrue(taken["rank"].iloc[2:].isna().all())
+        self.assertEqual(taken["name"].tolist()[:2], ["blue", "red"])
+        self.assertIsInstance(taken["name"].dtype, pd.CategoricalDtype)
+
+        self.assertEqual(table.lookup(2, "name"), "green")
+        for key in (3, 0, -1, 5):
+            with self.subTest(key=key):
+                with self.assertRaisesRegex(KeyError, "colors"):
+                    table.lookup(key, "name")
+
+    def test_known_keys_keep_dtypes(self):
+        """Without unknown keys, gathered columns keep their dtypes."""
+        frame = colors()
+        taken = DimensionTable("colors", "colorId", frame).take(
+            pd.Series([2, 2, 4], index=[7, 8, 9])
+        )
+        self.assertEqual(list(taken.index), [7, 8, 9])
+        for column in ("rank", "name", "hex"):
+            self.assertEqual(taken[column].dtype, frame[column].dtype)
+
+    def test_invalid_keys_rejected(self):
+        """Negative, missing and duplicate keys raise ValueError."""
+        bad = {
+            "negative": pd.DataFrame({"k": [0, -1], "v": [1, 2]}),
+            "missing": pd.DataFrame({"k": pd.array([1, None], dtype="Int16")}),
+            "duplicate": pd.DataFrame({"k": [3, 1, 3], "v": [1, 2, 3]}),
+        }
+        for case, frame in bad.items():
+            with self.subTest(case=case):
+                with self.assertRaisesRegex(ValueError, "t.k"):
+                    DimensionTable("t", "k", frame)
+
+    def test_decorate_matches_merge(self):
+        """decorate() equals a left merge, including for unknown keys."""
+        races = read_table("races", DATA_DIR)[RACE_COLUMNS]
+        status = read_table("status", DATA_DIR)
+        results = read_table("results", DATA_DIR, columns=["raceId", "statusId"])
+        tables = (
+            (DimensionTable("races", "raceId", races), races),
+            (DimensionTable("status", "statusId", status), status),
+        )
+        unknown = pd.DataFrame(
+            {"raceId": [1, 5000], "statusId": [1, 5000]}, dtype=np.int16
+        )
+        for facts in (results, unknown):
+            for table, frame in tables:
+                with self.subTest(table=table.name, rows=len(facts)):
+                    pd.testing.assert_frame_equal(
+                        table.decorate(facts),
+                        facts.merge(frame, on=table.key, how="left"),
+                    )
+
+
+class TestDerivedTables(unittest.TestCase):
+    """Test circuit_frame() and status_distribution()."""
+
+    def test_circuit_frame_matches_groupby(self):
+        """Race counts and season ranges equal a groupby per circuit."""
+        races = read_table("races", DATA_DIR)
+        expected = (
+            races.groupby("circuitId")
+            .agg(
+                races=("raceId", "size"),
+                first_year=("year", "min"),
+                last_year=("year", "max"),
+            )
+            .reset_index()
+        )
+        pd.testing.assert_frame_equal(circuit_frame(races), expected, check_dtype=False)
+
+    def test_status_distribution(self):
+        """Counts equal value_counts; ties keep statusId order; names match."""
+        status = DimensionTable(
+            "status",
+            "statusId",
+            pd.DataFrame({"statusId": [1, 2, 3, 4], "status": list("abcd")}),
+        )
+        top = status_distribution([3, 1, 3, 4, 1, 2, 3], status, top=3)
+        self.assertEqual(top["statusId"].tolist(), [3, 1, 2])
+        self.assertEqual(top["status"].tolist(), ["c", "a", "b"])
+        self.assertEqual(top["count"].tolist(), [3, 2, 1])
+
+        results = read_table("results", DATA_DIR, columns=["statusId"])
+        table = DimensionTable("status", "statusId", read_table("status", DATA_DIR))
+        full = status_distribution(results["statusId"], table)
+        counts = results["statusId"].value_counts()
+        self.assertEqual(full["count"].sum(), len(results))
+        self.assertEqual(dict(zip(full["statusId"], full["count"])), dict(counts))
+        self.assertTrue((np.diff(full["count"]) <= 0).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for vectorized feature engineering.
+Covers race_time_ms against the recorded milliseconds column and its
+derivation from gaps when milliseconds is missing.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from features import engineer_features, parse_duration_ms
+from master_data import build_master_df, load_sources
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def results(race_ids, times, milliseconds):
+    """Merged result rows with the columns engineer_features() reads."""
+    count = len(race_ids)
+    return pd.DataFrame(
+        {
+            "raceId": race_ids,
+            "year": [2020] * count,
+            "grid": list(range(1, count + 1)),
+            "positionText": [str(i) for i in range(1, count + 1)],
+            "statusId": [1] * count,
+            "status": ["Finished"] * count,
+            "time": times,
+            "milliseconds": pd.array(milliseconds, dtype="Int32"),
+            "fastestLapTime": [None] * count,
+            "fastestLapSpeed": [np.nan] * count,
+        }
+    )
+
+
+class TestParseDuration(unittest.TestCase):
+    """Test parse_duration_ms()."""
+
+    def test_absolute_and_gap_forms(self):
+        """Hours, minutes and seconds parse; "+" marks gaps."""
+        text = pd.Series(["1:34:50.616", "58:03.5", "+5.478", "+1:02.345", None])
+        milliseconds, is_gap = parse_duration_ms(text)
+        np.testing.assert_array_equal(
+            milliseconds.to_numpy(),
+            [5690616.0, 3483500.0, 5478.0, 62345.0, np.nan],
+        )
+        self.assertEqual(is_gap.tolist(), [False, False, True, True, False])
+
+
+class TestRaceTime(unittest.TestCase):
+    """Test race_time_ms."""
+
+    def test_matches_recorded_milliseconds(self):
+        """Every timed result in results.csv keeps its recorded milliseconds."""
+        master_df = build_master_df(**load_sources(DATA_DIR))
+        timed = master_df["milliseconds"].notna()
+        self.assertGreater(timed.sum(), 0)
+        np.testing.assert_array_equal(
+            master_df.loc[timed, "race_time_ms"].to_numpy(),
+            master_df.loc[timed, "milliseconds"].to_numpy(dtype="float64"),
+        )
+
+    def test_recorded_milliseconds_win_over_gaps(self):
+        """A gap that disagrees with milliseconds does not override it."""
+        frame = engineer_features(
+            results([1, 1], ["1:36:28.645", "+1:41.069"], [5788645, 5799996])
+        )
+        self.assertEqual(frame["race_time_ms"].tolist(), [5788645.0, 5799996.0])
+        self.assertEqual(frame["gap_ms"].tolist(), [0.0, 101069.0])
+
+    def test_gaps_resolve_against_an_absolute_leader(self):
+        """Without milliseconds, a gap is added to the race's leading time."""
+        frame = engineer_features(
+            results([1, 1, 2], ["1:00:00.000", "+5.5", "1:00:00.000"], [None] * 3)
+        )
+        self.assertEqual(
+            frame["race_time_ms"].tolist(), [3600000.0, 3605500.0, 3600000.0]
+        )
+
+    def test_race_without_absolute_time_is_nan(self):
+        """When every time in a race is a gap, none becomes an absolute time."""
+        frame = engineer_features(
+            results([7, 7, 8], ["+0.526", "+12.000", "1:00:00.000"], [None] * 3)
+        )
+        self.assertTrue(frame["race_time_ms"].iloc[:2].isna().all())
+        self.assertEqual(frame["race_time_ms"].iloc[2], 3600000.0)
+        self.assertEqual(frame["gap_ms"].iloc[:2].tolist(), [526.0, 12000.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
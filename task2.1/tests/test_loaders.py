@@ -0,0 +1,111 @@
+"""
+Tests for schema-driven typed CSV loading.
+Covers the \\N sentinel, narrowed and nullable dtypes, categoricals, column
+projection, chunked reads and the C and pyarrow engines agreeing.
+"""
+
+import io
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from loaders import SCHEMAS, _pyarrow_available, read_table
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+RESULTS = (
+    "resultId,raceId,driverId,constructorId,number,grid,position,positionText,"
+    "positionOrder,points,laps,time,milliseconds,fastestLap,rank,fastestLapTime,"
+    "fastestLapSpeed,statusId\n"
+    '1,18,1,1,22,1,1,"1",1,10,58,"1:34:50.616",5690616,39,2,"1:27.452",'
+    '"218.300",1\n'
+    '2,18,2,2,\\N,5,\\N,"R",2,0,30,\\N,\\N,\\N,\\N,\\N,\\N,5\n'
+    '3,19,3,3,7,0,\\N,"D",3,0.5,58,\\N,\\N,12,\\N,"1:29.001","205.125",2\n'
+)
+
+
+def read_results(**kwargs):
+    """read_table() over the RESULTS sample."""
+    return read_table("results", path=io.BytesIO(RESULTS.encode()), **kwargs)
+
+
+class TestReadTable(unittest.TestCase):
+    """Test read_table() on a small sample and the shipped tables."""
+
+    def engines(self):
+        """Engines to check: always C, pyarrow when it is installed."""
+        return ["c", "pyarrow"] if _pyarrow_available() else ["c"]
+
+    def test_sentinel_is_missing(self):
+        """\\N becomes NA in numeric and text columns alike."""
+        for engine in self.engines():
+            with self.subTest(engine=engine):
+                frame = read_results(engine=engine)
+                for column in ("number", "position", "milliseconds", "time"):
+                    self.assertTrue(frame[column].isna().iloc[1], column)
+                self.assertTrue(frame["fastestLapSpeed"].isna().iloc[1])
+                self.assertFalse(frame.isin(["\\N"]).any().any())
+                self.assertEqual(frame["milliseconds"].iloc[0], 5690616)
+
+    def test_schema_dtypes(self):
+        """Identifiers are narrowed; columns with missing values are nullable."""
+        frame = read_results(engine="c")
+        self.assertEqual(frame["resultId"].dtype, "int32")
+        self.assertEqual(frame["raceId"].dtype, "int16")
+        self.assertEqual(frame["position"].dtype, pd.Int8Dtype())
+        self.assertEqual(frame["milliseconds"].dtype, pd.Int32Dtype())
+        self.assertEqual(frame["fastestLapSpeed"].dtype, "float32")
+        self.assertEqual(frame["points"].tolist(), [10.0, 0.0, 0.5])
+        self.assertEqual(frame["position"].tolist()[0], 1)
+
+    def test_categorical_columns(self):
+        """Repeated labels are categoricals of their distinct values."""
+        frame = read_results(engine="c")
+        self.assertIsInstance(frame["positionText"].dtype, pd.CategoricalDtype)
+        self.assertEqual(sorted(frame["positionText"].cat.categories), ["1", "D", "R"])
+        status = read_table("status", DATA_DIR)
+        self.assertIsInstance(status["status"].dtype, pd.CategoricalDtype)
+
+    def test_column_projection(self):
+        """Only requested columns are read, in file order."""
+        for engine in self.engines():
+            with self.subTest(engine=engine):
+                frame = read_results(columns=["points", "raceId"], engine=engine)
+                self.assertEqual(list(frame.columns), ["raceId", "points"])
+        with self.assertRaisesRegex(KeyError, "podium"):
+            read_results(columns=["raceId", "podium"])
+        with self.assertRaises(KeyError):
+            read_table("laps", DATA_DIR)
+
+    def test_chunked_read_equals_whole_read(self):
+        """Chunks of a streamed read concatenate to the whole table."""
+        whole = read_table("results", DATA_DIR, engine="c")
+        chunks = list(read_table("results", DATA_DIR, chunksize=5000))
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            # Categories differ between chunks; the dtype kinds do not
+            pd.testing.assert_series_equal(
+                chunk.dtypes.astype(str), whole.dtypes.astype(str)
+            )
+        combined = pd.concat(chunks, ignore_index=True)
+        pd.testing.assert_frame_equal(combined.astype(whole.dtypes.to_dict()), whole)
+
+    def test_engines_agree(self):
+        """The C and pyarrow engines yield the same frames for every table."""
+        if not _pyarrow_available():
+            self.skipTest("pyarrow is not installed")
+        for table in SCHEMAS:
+            with self.subTest(table=table):
+                pd.testing.assert_frame_equal(
+                    read_table(table, DATA_DIR, engine="pyarrow"),
+                    read_table(table, DATA_DIR, engine="c"),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
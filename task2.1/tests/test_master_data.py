@@ -0,0 +1,96 @@
+"""
+Tests for the cached master_df builder.
+Covers the Feather cache round trip and its invalidation when a source CSV
+or CACHE_VERSION changes.
+"""
+
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import master_data
+from master_data import SOURCES, load_master_df
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+class TestMasterDataCache(unittest.TestCase):
+    """Test load_master_df() caching."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.directory, "data")
+        self.cache_dir = os.path.join(self.directory, "cache")
+        os.makedirs(self.data_dir)
+        for name in SOURCES:
+            shutil.copy(os.path.join(DATA_DIR, name), self.data_dir)
+        self.builds = patch.object(
+            master_data, "build_master_df", wraps=master_data.build_master_df
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def cached_files(self):
+        return glob.glob(os.path.join(self.cache_dir, "master_*.feather"))
+
+    def test_cache_round_trips(self):
+        """A warm load returns the built frame without rebuilding."""
+        built = load_master_df(self.data_dir, self.cache_dir)
+        self.assertEqual(len(self.cached_files()), 1)
+
+        cached = load_master_df(self.data_dir, self.cache_dir)
+
+        self.assertEqual(self.builds.call_count, 1)
+        pd.testing.assert_frame_equal(cached, built)
+        uncached = load_master_df(self.data_dir, cache_dir=None)
+        pd.testing.assert_frame_equal(cached, uncached)
+
+    def test_rebuilds_when_a_source_changes(self):
+        """Editing a CSV rebuilds the frame and replaces the stale cache."""
+        load_master_df(self.data_dir, self.cache_dir)
+        (stale,) = self.cached_files()
+
+        path = os.path.join(self.data_dir, "results.csv")
+        with open(path, "rb") as handle:
+            header, *lines = handle.read().splitlines(keepends=True)
+        with open(path, "wb") as handle:
+            handle.write(header + b"".join(lines[:-1]))
+        master_df = load_master_df(self.data_dir, self.cache_dir)
+
+        self.assertEqual(self.builds.call_count, 2)
+        self.assertEqual(len(master_df), len(lines) - 1)
+        (fresh,) = self.cached_files()
+        self.assertNotEqual(fresh, stale)
+
+    def test_rebuilds_when_cache_version_changes(self):
+        """Bumping CACHE_VERSION rebuilds instead of reading the old file."""
+        load_master_df(self.data_dir, self.cache_dir)
+        (stale,) = self.cached_files()
+
+        with patch.object(master_data, "CACHE_VERSION", master_data.CACHE_VERSION + 1):
+            load_master_df(self.data_dir, self.cache_dir)
+
+        self.assertEqual(self.builds.call_count, 2)
+        (fresh,) = self.cached_files()
+        self.assertNotEqual(fresh, stale)
+
+    def test_refresh_forces_a_rebuild(self):
+        """refresh=True ignores a matching cache."""
+        load_master_df(self.data_dir, self.cache_dir)
+        load_master_df(self.data_dir, self.cache_dir, refresh=True)
+        self.assertEqual(self.builds.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+Tests for the shared-memory parallel analyses runner.
+Covers parallel results against the serial analyses, zero-copy attachment
+and the release of every shared memory block, on success and on failure.
+"""
+
+import os
+import sys
+import unittest
+from multiprocessing import shared_memory
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import analyses
+from master_data import build_master_df, load_sources
+from parallel_analyses import SharedColumns, attach_columns, run_parallel, run_serial
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def block_exists(name):
+    """Whether a shared memory block of this name can still be opened."""
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    block.close()
+    return True
+
+
+class RecordBlocks:
+    """Record the names of shared memory blocks created while active."""
+
+    def __init__(self):
+        self.names = []
+        self._create = shared_memory.SharedMemory
+        self._patch = patch.object(shared_memory, "SharedMemory", self._record)
+
+    def _record(self, *args, **kwargs):
+        block = self._create(*args, **kwargs)
+        if kwargs.get("create"):
+            self.names.append(block.name)
+        return block
+
+    def __enter__(self):
+        self._patch.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._patch.stop()
+
+
+class TestParallelAnalyses(unittest.TestCase):
+    """Test run_parallel() against run_serial()."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.master_df = build_master_df(**load_sources(DATA_DIR))[analyses.COLUMNS]
+
+    def test_parallel_matches_serial(self):
+        """Every analysis run in the pool equals the serial result."""
+        expected = run_serial(self.master_df)
+        with RecordBlocks() as recorded:
+            results = run_parallel(self.master_df, workers=2)
+        self.assertEqual(set(results), set(analyses.ANALYSES))
+        for name, frame in expected.items():
+            with self.subTest(analysis=name):
+                pd.testing.assert_frame_equal(results[name], frame)
+        self.assertEqual(len(recorded.names), len(analyses.COLUMNS))
+        self.assertFalse(any(block_exists(name) for name in recorded.names))
+
+    def test_blocks_released_when_an_analysis_fails(self):
+        """A failing task still unlinks every block."""
+        with RecordBlocks() as recorded:
+            with self.assertRaises(KeyError):
+                run_parallel(self.master_df, ["driver_points", "missing"], workers=1)
+        self.assertTrue(recorded.names)
+        self.assertFalse(any(block_exists(name) for name in recorded.names))
+
+
+class TestSharedColumns(unittest.TestCase):
+    """Test SharedColumns and attach_columns()."""
+
+    def test_attach_round_trips_without_copying(self):
+        """Attached columns equal the source and are read-only."""
+        frame = pd.DataFrame(
+            {
+                "points": np.array([0.0, 25.0, 18.5]),
+                "driverId": np.array([1, 2, 3], dtype=np.int16),
+                "decade_label": pd.Categorical(["1950s", "2020s", "1950s"]),
+            }
+        )
+        with SharedColumns(frame, list(frame.columns)) as shared:
+            attached, blocks = attach_columns(shared.spec)
+            try:
+                pd.testing.assert_frame_equal(attached, frame)
+                values = attached["points"].to_numpy()
+                self.assertFalse(values.flags.writeable)
+                self.assertFalse(values.flags.owndata)
+            finally:
+                del attached, values
+                for block in blocks:
+                    block.close()
+            names = [block.name for block in shared.blocks]
+        self.assertFalse(any(block_exists(name) for name in names))
+
+    def test_unsupported_column_releases_published_blocks(self):
+        """A column that cannot be published unlinks those already published."""
+        frame = pd.DataFrame(
+            {"points": [1.0, 2.0], "name": pd.array(["a", "b"], dtype="string")}
+        )
+        with RecordBlocks() as recorded:
+            with self.assertRaises(TypeError):
+                SharedColumns(frame, ["points", "name"])
+        self.assertEqual(len(recorded.names), 1)
+        self.assertFalse(block_exists(recorded.names[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Tests for the headless figure report.
+Covers the figure cache key, reuse of cached figures without redrawing and
+the lazy import of matplotlib.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest.mock import patch
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import report
+from master_data import load_master_df
+from report import FIGURES, build_report, figure_key
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# The cheapest figure to draw
+NAME = "driver_points"
+
+
+def run_python(code):
+    """Run code in a fresh interpreter in src/ and return its stdout."""
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=SRC_DIR,
+    ).stdout.strip()
+
+
+class TestFigureKey(unittest.TestCase):
+    """Test figure_key()."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.master_df = load_master_df(DATA_DIR, cache_dir=None)
+
+    def setUp(self):
+        self.figure = FIGURES[NAME]
+        self.inputs = self.figure.inputs(self.master_df)
+        self.key = figure_key(NAME, self.figure, self.inputs)
+
+    def test_equal_inputs_give_equal_keys(self):
+        """Rebuilt inputs and copies hash to the same key."""
+        inputs = self.figure.inputs(self.master_df.copy())
+        self.assertEqual(figure_key(NAME, self.figure, inputs), self.key)
+
+    def test_key_changes_with_inputs(self):
+        """Changing one value, a label or a dtype changes the key."""
+        drivers = self.inputs["drivers"]
+        changed = drivers.copy()
+        changed.iloc[0, 0] += 1
+        relabelled = drivers.rename(index={drivers.index[0]: -1})
+        retyped = drivers.astype({"race_starts": "float64"})
+        for frame in (changed, relabelled, retyped, drivers.iloc[1:]):
+            with self.subTest(frame=frame.shape):
+                key = figure_key(NAME, self.figure, {"drivers": frame})
+                self.assertNotEqual(key, self.key)
+
+    def test_key_changes_with_options(self):
+        """Changing an option, the title or the name changes the key."""
+        options = dict(self.figure.options, top=self.figure.options["top"] + 1)
+        for name, figure in [
+            (NAME, self.figure._replace(options=options)),
+            (NAME, self.figure._replace(title="Another title")),
+            ("another_name", self.figure),
+        ]:
+            with self.subTest(name=name, title=figure.title):
+                self.assertNotEqual(figure_key(name, figure, self.inputs), self.key)
+
+    def test_key_changes_with_render_version(self):
+        """Bumping RENDER_VERSION changes every key."""
+        with patch.object(report, "RENDER_VERSION", report.RENDER_VERSION + 1):
+            key = figure_key(NAME, self.figure, self.inputs)
+        self.assertNotEqual(key, self.key)
+
+
+class TestBuildReport(unittest.TestCase):
+    """Test build_report() caching."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.master_df = load_master_df(DATA_DIR, cache_dir=None)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.out_dir = os.path.join(self.directory, "report")
+        self.cache_dir = os.path.join(self.directory, "figures")
+        self.figures = {NAME: FIGURES[NAME]}
+        self.renders = patch.object(
+            report, "render_figure", wraps=report.render_figure
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def build(self, figures=None, **kwargs):
+        kwargs.setdefault("cache_dir", self.cache_dir)
+        return build_report(
+            self.master_df,
+            self.out_dir,
+            figures=self.figures if figures is None else figures,
+            workers=0,
+            **kwargs,
+        )
+
+    def test_cached_figure_is_not_redrawn(self):
+        """A second build copies the cached PNG without drawing it."""
+        (first,) = self.build()
+        self.assertFalse(first.cached)
+        self.assertEqual(self.renders.call_count, 1)
+        with open(first.path, "rb") as handle:
+            drawn = handle.read()
+        os.remove(first.path)
+
+        (second,) = self.build()
+
+        self.assertTrue(second.cached)
+        self.assertEqual(self.renders.call_count, 1)
+        self.assertEqual((second.import_seconds, second.render_seconds), (0.0, 0.0))
+        self.assertEqual(second.key, first.key)
+        with open(second.path, "rb") as handle:
+            self.assertEqual(handle.read(), drawn)
+
+    def test_changed_options_are_redrawn(self):
+        """A figure whose options change gets a new key and is drawn again."""
+        (first,) = self.build()
+        figure = FIGURES[NAME]
+        options = dict(figure.options, top=5)
+        (second,) = self.build({NAME: figure._replace(options=options)})
+        self.assertFalse(second.cached)
+        self.assertNotEqual(second.key, first.key)
+        self.assertEqual(self.renders.call_count, 2)
+
+    def test_no_cache_always_redraws(self):
+        """cache_dir=None draws every time and leaves no cache behind."""
+        self.build(cache_dir=None)
+        (rendered,) = self.build(cache_dir=None)
+        self.assertFalse(rendered.cached)
+        self.assertEqual(self.renders.call_count, 2)
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self.assertTrue(os.path.exists(rendered.path))
+
+
+class TestLazyImport(unittest.TestCase):
+    """Test that matplotlib is imported only to draw."""
+
+    def test_import_does_not_load_matplotlib(self):
+        """Importing report leaves matplotlib unimported."""
+        output = run_python("""
+            import sys
+            import report
+            print("matplotlib" in sys.modules)
+            """)
+        self.assertEqual(output, "False")
+
+    def test_fully_cached_report_does_not_load_matplotlib(self):
+        """A build where every figure is cached never imports matplotlib."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        code = f"""
+            import sys
+            from master_data import load_master_df
+            from report import FIGURES, build_report
+            master_df = load_master_df({DATA_DIR!r}, cache_dir=None)
+            figures = {{{NAME!r}: FIGURES[{NAME!r}]}}
+            (rendered,) = build_report(
+                master_df,
+                {os.path.join(directory, "report")!r},
+                {os.path.join(directory, "figures")!r},
+                figures,
+                workers=0,
+            )
+            print(rendered.cached, "matplotlib" in sys.modules)
+            """
+        self.assertEqual(run_python(code), "False True")
+        self.assertEqual(run_python(code), "True False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+"""
+Tests for the stats query service.
+Covers lookups of present, missing and out-of-range keys, refreshes after
+appended results and the HTTP routes, including their error responses.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.client import HTTPConnection
+
+import numpy as np
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stats_service import StatsService, _check_against, make_server
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# Results held back and appended by the refresh tests
+APPENDED = 20
+
+
+class StatsServiceCase(unittest.TestCase):
+    """A service over a copy of the data, missing its last results."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name in ("races.csv", "status.csv"):
+            shutil.copy(os.path.join(DATA_DIR, name), self.directory)
+        with open(os.path.join(DATA_DIR, "results.csv"), "rb") as handle:
+            header, *self.lines = handle.read().splitlines(keepends=True)
+        self.results = os.path.join(self.directory, "results.csv")
+        with open(self.results, "wb") as handle:
+            handle.write(header + b"".join(self.lines[:-APPENDED]))
+        self.service = StatsService(
+            self.directory, os.path.join(self.directory, "aggregates.npz")
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def append(self):
+        with open(self.results, "ab") as handle:
+            handle.write(b"".join(self.lines[-APPENDED:]))
+
+    def appended_driver(self):
+        return int(self.lines[-1].split(b",")[2])
+
+
+class TestLookups(StatsServiceCase):
+    """Test StatsService lookups."""
+
+    def test_driver_table_matches_groupby(self):
+        """The driver table equals a groupby over master_df."""
+        _check_against(self.service, self.directory)
+
+    def test_present_key(self):
+        """A key with results returns every field."""
+        stats = self.service.driver(1)
+        self.assertEqual(
+            set(stats),
+            {"points", "starts", "points_per_race", "finish_rate"}
+            | {"avg_positions_gained"},
+        )
+        self.assertIsInstance(stats["starts"], int)
+        self.assertAlmostEqual(
+            stats["points_per_race"], stats["points"] / stats["starts"]
+        )
+        self.assertEqual(self.service.lookup("seasons", 1950)["starts"], 160)
+
+    def test_missing_key_in_range(self):
+        """A key inside the array without results returns None."""
+        keys = self.service.tables["constructors"].keys()
+        gaps = np.setdiff1d(np.arange(keys.max()), keys)
+        self.assertGreater(len(gaps), 0)
+        self.assertIsNone(self.service.constructor(int(gaps[0])))
+        self.assertIsNone(self.service.season(1900))
+
+    def test_out_of_range_keys(self):
+        """Keys past either end of the array return None."""
+        for key in (-1, -10_000, 10**9):
+            with self.subTest(key=key):
+                self.assertIsNone(self.service.driver(key))
+                self.assertIsNone(self.service.lookup("seasons", key))
+
+    def test_unknown_kind(self):
+        """Only the KINDS tables can be looked up."""
+        with self.assertRaises(KeyError):
+            self.service.lookup("circuits", 1)
+
+
+class TestRefresh(StatsServiceCase):
+    """Test StatsService.refresh()."""
+
+    def test_refresh_picks_up_appended_rows(self):
+        """Appended results change the tables after a refresh."""
+        driver = self.appended_driver()
+        before = self.service.driver(driver)
+        self.assertEqual(self.service.refresh(), 0)
+
+        self.append()
+        self.assertEqual(self.service.driver(driver), before)
+        self.assertEqual(self.service.refresh(), APPENDED)
+
+        after = self.service.driver(driver)
+        added = sum(
+            1 for line in self.lines[-APPENDED:] if int(line.split(b",")[2]) == driver
+        )
+        starts = 0 if before is None else before["starts"]
+        self.assertEqual(after["starts"], starts + added)
+
+    def test_new_service_reuses_the_store(self):
+        """A second service loads the saved store and sees the same stats."""
+        self.append()
+        self.service.refresh()
+        other = StatsService(
+            self.directory, os.path.join(self.directory, "aggregates.npz")
+        )
+        self.assertEqual(other.refresh(), 0)
+        self.assertEqual(other.driver(1), self.service.driver(1))
+
+
+class TestHTTP(StatsServiceCase):
+    """Test the HTTP routes."""
+
+    def setUp(self):
+        super().setUp()
+        self.server = make_server(self.service, port=0)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.connection = HTTPConnection("127.0.0.1", self.server.server_address[1])
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def request(self, method, path):
+        self.connection.request(method, path)
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_lookup(self):
+        """GET returns the same stats as the Python API."""
+        for path, stats in [
+            ("/drivers/1", self.service.driver(1)),
+            ("/constructors/6", self.service.constructor(6)),
+            ("/seasons/2021", self.service.season(2021)),
+        ]:
+            with self.subTest(path=path):
+                self.assertEqual(self.request("GET", path), (200, stats))
+
+    def test_not_found(self):
+        """Unknown keys, kinds and paths are 404s."""
+        paths = ("/drivers/999999", "/drivers/-1", "/circuits/1", "/constructors/", "/")
+        for path in paths:
+            with self.subTest(path=path):
+                status, body = self.request("GET", path)
+                self.assertEqual(status, 404)
+                self.assertIn("error", body)
+        self.assertEqual(self.request("POST", "/drivers/1")[0], 404)
+
+    def test_bad_key(self):
+        """A key that is not an integer is a 400."""
+        for path in ("/drivers/abc", "/seasons/20.5", "/constructors/x1"):
+            with self.subTest(path=path):
+                status, body = self.request("GET", path)
+                self.assertEqual(status, 400)
+                self.assertIn("error", body)
+
+    def test_refresh(self):
+        """POST /refresh ingests appended rows."""
+        self.append()
+        self.assertEqual(self.request("POST", "/refresh"), (200, {"ingested": 20}))
+        status, stats = self.request("GET", f"/drivers/{self.appended_driver()}")
+        self.assertEqual(status, 200)
+        self.assertEqual(stats, self.service.driver(self.appended_driver()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests for out-of-core aggregation.
+Covers streamed analyses against the in-memory path on the bundled results,
+with chunks small enough that races straddle chunk boundaries.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import analyses
+from aggregate_store import RESULT_COLUMNS, assert_same_analyses, prepare_rows
+from loaders import read_table
+from streaming import load_race_years, stream_aggregates, write_synthetic_results
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..")
+RESULTS = os.path.join(DATA_DIR, "results.csv")
+
+
+class TestStreamAggregates(unittest.TestCase):
+    """Test stream_aggregates() against in-memory analyses."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.races = load_race_years(DATA_DIR)
+        rows = read_table("results", columns=RESULT_COLUMNS, path=RESULTS)
+        master_df = prepare_rows(rows, cls.races)
+        cls.rows = len(rows)
+        cls.expected = {
+            name: analysis(master_df) for name, analysis in analyses.ANALYSES.items()
+        }
+
+    def test_chunked_matches_in_memory(self):
+        """Chunks smaller than the file give the in-memory tables."""
+        # 7,001 does not divide the row count, so the last chunk is short
+        for chunksize in (7_001, 1_000):
+            with self.subTest(chunksize=chunksize):
+                self.assertLess(chunksize, self.rows)
+                store = stream_aggregates(RESULTS, self.races, chunksize=chunksize)
+                self.assertEqual(store.results, self.rows)
+                assert_same_analyses(store.frames(), self.expected)
+
+    def test_single_chunk_matches_chunked(self):
+        """One chunk and many chunks fold into the same state."""
+        whole = stream_aggregates(RESULTS, self.races, chunksize=self.rows + 1)
+        chunked = stream_aggregates(RESULTS, self.races, chunksize=2_500)
+        assert_same_analyses(chunked.frames(), whole.frames())
+
+
+class TestSyntheticResults(unittest.TestCase):
+    """Test write_synthetic_results()."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_repeats_with_distinct_result_ids(self):
+        """Rows are repeated to the requested count with fresh resultIds."""
+        source = read_table("results", columns=RESULT_COLUMNS, path=RESULTS)
+        path = os.path.join(self.directory, "results.csv")
+        rows = len(source) * 2 + 123
+        write_synthetic_results(RESULTS, path, rows)
+
+        written = read_table("results", columns=RESULT_COLUMNS, path=path)
+        self.assertEqual(len(written), rows)
+        self.assertTrue(written["resultId"].is_unique)
+        pd.testing.assert_series_equal(
+            written["driverId"].iloc[len(source) : 2 * len(source)].reset_index(
+                drop=True
+            ),
+            source["driverId"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()